@@ -0,0 +1,133 @@
+"""Fixtures for the hot-path benchmark suite.
+
+The dataset comes from ``scripts/dev/generate_dataset.py`` and is built once
+per preset (and generator version) into the pytest cache, so only the first
+run pays for it. Read-only benchmarks share it; benchmarks that write get a
+fresh copy.
+"""
+import hashlib
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+_bootstrap_db = Path(tempfile.mkdtemp()) / "bootstrap.db"
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_bootstrap_db.as_posix()}")
+os.environ.setdefault("PLAID_CLIENT_ID", "bench")
+os.environ.setdefault("PLAID_SECRET", "bench")
+os.environ.setdefault("SECRET_KEY", "bench")
+SERVER_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SERVER_DIR))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from bt_app.core.config import settings  # noqa: E402
+
+_GENERATOR = SERVER_DIR / "scripts" / "dev" / "generate_dataset.py"
+_spec = importlib.util.spec_from_file_location("generate_dataset", _GENERATOR)
+dataset = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(dataset)
+
+BASELINES_DIR = Path(__file__).resolve().parent / "baselines"
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-preset", choices=sorted(dataset.PRESETS), default="small",
+                     help="Synthetic dataset size for the benchmarks (default: small)")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # Keep saved runs (the regression baselines) next to the suite
+    if getattr(config.option, "benchmark_storage", "file://./.benchmarks") == "file://./.benchmarks":
+        config.option.benchmark_storage = f"file://{BASELINES_DIR.as_posix()}"
+
+
+@pytest.fixture(scope="session")
+def bench_spec(request):
+    return dataset.PRESETS[request.config.getoption("--bench-preset")]
+
+
+@pytest.fixture(scope="session")
+def dataset_path(request, bench_spec):
+    """The generated database for the preset, built on first use."""
+    version = hashlib.sha1(_GENERATOR.read_bytes()).hexdigest()[:12]
+    preset = request.config.getoption("--bench-preset")
+    path = request.config.cache.mkdir(f"bt-dataset-{preset}-{version}") / "dataset.db"
+    if not path.exists():
+        partial = path.with_suffix(".partial")
+        partial.unlink(missing_ok=True)
+        engine = create_engine(f"sqlite:///{partial.as_posix()}")
+        dataset.generate(engine, bench_spec)
+        engine.dispose()
+        partial.replace(path)
+    return path
+
+
+@pytest.fixture(scope="session")
+def dataset_engine(dataset_path):
+    engine = create_engine(f"sqlite:///{dataset_path.as_posix()}", connect_args={"check_same_thread": False})
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def db(dataset_engine):
+    """Session on the shared dataset; benchmarks using it must not write."""
+    session = sessionmaker(bind=dataset_engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def scratch_db(dataset_path, tmp_path):
+    """Session on a private copy of the dataset, for benchmarks that write."""
+    copy = tmp_path / "scratch.db"
+    shutil.copyfile(dataset_path, copy)
+    engine = create_engine(f"sqlite:///{copy.as_posix()}", connect_args={"check_same_thread": False})
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def uncached(monkeypatch):
+    """Measure the work itself: no result cache and no conditional GETs."""
+    monkeypatch.setattr(settings, "enable_result_cache", False)
+    monkeypatch.setattr(settings, "enable_etags", False)
+
+
+@pytest.fixture(scope="session")
+def client(dataset_engine):
+    """TestClient whose requests each get their own session on the shared dataset."""
+    from fastapi.testclient import TestClient
+
+    from bt_app.api.deps import get_database
+    from bt_app.main import app
+
+    make_session = sessionmaker(bind=dataset_engine)
+
+    def _override():
+        session = make_session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_database] = _override
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_database, None)
@@ -0,0 +1,62 @@
+"""Benchmarks for the heaviest read endpoints, measured through the full app stack."""
+from datetime import timedelta
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def window(bench_spec):
+    """The final year of the dataset."""
+    end = bench_spec.end_date
+    return {"date_from": (end - timedelta(days=364)).isoformat(), "date_to": end.isoformat()}
+
+
+def _get(client, url, **params):
+    def call():
+        response = client.get(url, params=params)
+        assert response.status_code == 200, response.text[:500]
+        return response
+    return call
+
+
+def test_transaction_list(benchmark, client):
+    benchmark(_get(client, "/api/transactions", page=1, per_page=100))
+
+
+def test_transaction_list_filtered(benchmark, client, window):
+    benchmark(_get(client, "/api/transactions", page=3, per_page=100, txn_type="expense", **window))
+
+
+def test_search(benchmark, client):
+    benchmark(_get(client, "/api/transactions/search", q="starbucks", limit=50))
+
+
+def test_dashboard_bundle(benchmark, client, bench_spec):
+    benchmark(_get(client, "/api/dashboard/bundle", month=bench_spec.end_date.strftime("%Y-%m")))
+
+
+def test_analytics_summary_range(benchmark, client, window):
+    benchmark(_get(client, "/api/analytics/summary-range", **window))
+
+
+def test_all_categories_series(benchmark, client, window):
+    benchmark(_get(client, "/api/analytics/all-categories-series", **window))
+
+
+def test_category_matrix(benchmark, client, window):
+    benchmark(_get(client, "/api/analytics/category-matrix", **window))
+
+
+def test_budget_matrix(benchmark, client, bench_spec):
+    """A year view: the twelve months ending with the dataset."""
+    end = bench_spec.end_date
+    months = {"from": (end - timedelta(days=334)).strftime("%Y-%m"), "to": end.strftime("%Y-%m")}
+    benchmark(_get(client, "/api/budgets/matrix", **months))
+
+
+def test_recurring_subscriptions(benchmark, client, window):
+    benchmark.pedantic(_get(client, "/api/analytics/recurring-subscriptions", **window), rounds=3)
+
+
+def test_export_excel(benchmark, client):
+    benchmark.pedantic(_get(client, "/api/transactions/export/excel"), rounds=1)
@@ -0,0 +1,119 @@
+"""Benchmarks for normalization, rule application, recurring detection, subscription refresh and the Plaid staging/commit path."""
+import itertools
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import text
+
+from bt_app.models.plaid_import import PlaidImport
+from bt_app.services.detected_subscriptions import refresh_subscriptions
+from bt_app.services.mapping_service import MappingService
+from bt_app.services.plaid_import_service import PlaidImportService
+from bt_app.services.recurring_engine import detect_recurring
+from bt_app.utils.merchant_cleaner import clean_final_merchant
+
+from .conftest import dataset
+
+STAGED_ROWS = 100
+RULES_WINDOW_DAYS = 7
+_runs = itertools.count()
+
+
+@pytest.fixture(scope="module")
+def raw_merchants(db):
+    return db.execute(text(
+        "SELECT merchant_raw, description_raw FROM transactions ORDER BY id DESC LIMIT 5000"
+    )).all()
+
+
+def test_normalize_merchant(benchmark, db, raw_merchants):
+    mapper = MappingService(db)
+    result = benchmark(lambda: [mapper.normalize_merchant(m, d) for m, d in raw_merchants])
+    assert all(result)
+
+
+def test_clean_final_merchant(benchmark, raw_merchants):
+    result = benchmark(lambda: [clean_final_merchant(m, d) for m, d in raw_merchants])
+    assert all(result)
+
+
+@pytest.fixture(scope="module")
+def recurring_columns(db):
+    """Every expense as (merchant code, month index, day, cents) arrays, as the detector feeds the engine."""
+    import numpy as np
+
+    rows = db.execute(text(
+        "SELECT canonical_merchant, posted_date, amount FROM transactions "
+        "WHERE amount < 0 AND canonical_merchant IS NOT NULL"
+    )).all()
+    codes = {}
+    key = np.array([codes.setdefault(m, len(codes)) for m, _, _ in rows])
+    posted = [str(d) for _, d, _ in rows]
+    month = np.array([int(d[:4]) * 12 + int(d[5:7]) - 1 for d in posted])
+    day = np.array([int(d[8:10]) for d in posted])
+    cents = np.array([round(abs(float(a)) * 100) for _, _, a in rows])
+    return key, month, day, cents
+
+
+def test_detect_recurring(benchmark, recurring_columns):
+    result = benchmark(detect_recurring, *recurring_columns)
+    assert not result.empty
+
+
+def test_refresh_subscriptions(benchmark, scratch_db, bench_spec):
+    """Full rebuild of the stored subscriptions, as after an alias or policy change."""
+    result = benchmark.pedantic(refresh_subscriptions, args=(scratch_db,), kwargs={"today": bench_spec.end_date},
+                                rounds=5)
+    assert result["detected"] > 0
+
+
+def test_apply_rules_to_unmapped(benchmark, scratch_db, bench_spec):
+    """Rule application over the last week, with part of it uncategorized again before each round."""
+    since = (bench_spec.end_date - timedelta(days=RULES_WINDOW_DAYS)).isoformat()
+
+    def unmap():
+        scratch_db.execute(text(
+            "UPDATE transactions SET category_id = NULL, subcategory_id = NULL "
+            "WHERE posted_date >= :since AND id % 3 = 0"
+        ), {"since": since})
+        scratch_db.commit()
+        return (), {}
+
+    result = benchmark.pedantic(lambda: MappingService(scratch_db).apply_rules_to_unmapped(since),
+                                setup=unmap, rounds=3)
+    assert result["mapped_count"] > 0
+
+
+def _new_import(db) -> int:
+    item_id = db.execute(text("SELECT MIN(id) FROM institution_items")).scalar()
+    plaid_import = PlaidImport(item_id=item_id, mode="get")
+    db.add(plaid_import)
+    db.commit()
+    return plaid_import.id
+
+
+def test_stage_transactions(benchmark, scratch_db, bench_spec):
+    service = PlaidImportService(scratch_db)
+
+    def setup():
+        payload = dataset.plaid_transactions(bench_spec, STAGED_ROWS, seed=next(_runs), id_prefix="stage")
+        return (_new_import(scratch_db), payload), {}
+
+    summary = benchmark.pedantic(service._stage_transactions, setup=setup, rounds=2)
+    assert summary["total"] == STAGED_ROWS
+
+
+def test_commit_import(benchmark, scratch_db, bench_spec):
+    service = PlaidImportService(scratch_db)
+
+    def setup():
+        import_id = _new_import(scratch_db)
+        payload = dataset.plaid_transactions(bench_spec, STAGED_ROWS, seed=next(_runs), id_prefix="commit")
+        service._stage_transactions(import_id, payload)
+        scratch_db.execute(text("UPDATE staging_transactions SET status = 'ready' WHERE import_id = :id"),
+                           {"id": import_id})
+        scratch_db.commit()
+        return (import_id,), {}
+
+    summary = benchmark.pedantic(service.commit_import, setup=setup, rounds=2)
+    assert summary["inserted"] > 0
@@ -1,24 +1,49 @@
 """API dependencies."""
-from typing import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Generator, Iterator, Optional
+from fastapi import HTTPException, Request
 from sqlalchemy.orm import Session
+from ..core.config import settings
 from ..core.db import get_db
-
-
-def get_database() -> Generator[Session, None, None]:
-    """Get database session dependency."""
-    yield from get_db()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+from ..core.tenancy import InvalidTenant, UnknownTenant, session_for_tenant, tenant_from_headers
+
+# Session lent to in-process sub-requests (see routes_batch)
+_shared_session: ContextVar[Optional[Session]] = ContextVar("bt_shared_session", default=None)
+
+
+def get_database(request: Request = None) -> Generator[Session, None, None]:
+    """Get database session dependency.
+
+    With tenant shards enabled the session is bound to the shard named by the
+    request's tenant header (see ``core.tenancy``); unprovisioned tenants get 404.
+    """
+    shared = _shared_session.get()
+    if shared is not None:
+        yield shared
+        return
+    if request is None or not settings.enable_tenant_shards:
+        yield from get_db()
+        return
+    try:
+        tenant_id = tenant_from_headers(request.headers)
+    except InvalidTenant as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        db = session_for_tenant(tenant_id)
+    except UnknownTenant as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@contextmanager
+def shared_session(db: Session) -> Iterator[None]:
+    """Make every ``get_database`` in this context reuse ``db`` (the owner closes it)."""
+    token = _shared_session.set(db)
+    try:
+        yield
+    finally:
+        _shared_session.reset(token)
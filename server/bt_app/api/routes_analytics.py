@@ -6,9 +6,14 @@ from fastapi import APIRouter, Depends, Query, HTTPException, Request
 from sqlalchemy.orm import Session
 from collections import defaultdict
 
+from ..core.responses import FastJSONResponse
+from ..core.negotiation import negotiated, to_series
 from ..services.analytics_service import AnalyticsService
+from ..services.analytics_engine import run_analytics_query
+from ..services.detected_subscriptions import list_subscriptions
+from ..services.monthly_aggregates import CATEGORY_CUBE, cube_source
 from .deps import get_database
-from ..utils.query import parse_date_range
+from ..utils.query import parse_date, parse_date_range
 import logging
 
 logger = logging.getLogger(__name__)
@@ -35,6 +40,7 @@ def __rev():
     return {"rev": ANALYTICS_REV}
 
 @router.get("/transaction-frequency-by-category")
+@negotiated
 def transaction_frequency_by_category_final(
     date_from: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     date_to: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
@@ -101,6 +107,7 @@ def transaction_frequency_by_category_final(
     }
 
 @router.get("/transaction-frequency-by-merchant")
+@negotiated
 def transaction_frequency_by_merchant_final(
     date_from: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     date_to: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
@@ -128,7 +135,7 @@ def transaction_frequency_by_merchant_final(
             COALESCE(NULLIF(TRIM(t.merchant_raw), ''), 'Unknown') as merchant,
             COUNT(t.id) as total_transactions,
             ROUND(CAST(COUNT(t.id) AS FLOAT) / :months, 2) as avg_per_month,
-            SUM(ABS(t.amount)) as total_amount
+            SUM(ABS(t.amount_cents)) / 100.0 as total_amount
         FROM transactions t
         WHERE t.posted_date >= :date_from
           AND t.posted_date <= :date_to
@@ -165,7 +172,7 @@ def transaction_frequency_by_merchant_final(
     }
 
 @router.get("/__ping_analytics")
-async def __ping_analytics():
+def __ping_analytics():
     return {"ok": True, "message": "Analytics router is working!"}
 
 @router.post("/populate-cleaned-merchants")
@@ -234,7 +241,7 @@ def get_analytics_summary_range(
     totals_query = text("""
         SELECT 
             txn_type,
-            SUM(amount) as total_amount,
+            SUM(amount_cents) / 100.0 as total_amount,
             COUNT(*) as transaction_count
         FROM transactions 
         WHERE posted_date >= :date_from 
@@ -243,10 +250,10 @@ def get_analytics_summary_range(
         GROUP BY txn_type
     """)
     
-    totals_result = db.execute(totals_query, {
+    totals_result = run_analytics_query(db, totals_query, {
         "date_from": date_from, 
         "date_to": date_to
-    }).fetchall()
+    })
     
     # Parse results
     income_total = 0.0
@@ -281,21 +288,21 @@ def get_analytics_summary_range(
     # Get monthly breakdown for charts
     monthly_query = text("""
         SELECT 
-            strftime('%Y-%m', posted_date) as month,
+            posted_month as month,
             txn_type,
-            SUM(amount) as amount
+            SUM(amount_cents) / 100.0 as amount
         FROM transactions 
         WHERE posted_date >= :date_from 
           AND posted_date <= :date_to
           AND txn_type IN ('income', 'expense')
-        GROUP BY strftime('%Y-%m', posted_date), txn_type
+        GROUP BY posted_month, txn_type
         ORDER BY month
     """)
     
-    monthly_result = db.execute(monthly_query, {
+    monthly_result = run_analytics_query(db, monthly_query, {
         "date_from": date_from,
         "date_to": date_to  
-    }).fetchall()
+    })
     
     # Group by month for chart data
     monthly_data = {}
@@ -345,342 +352,12 @@ def get_recurring_subscriptions(
     date_to: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     db: Session = Depends(get_database)
 ):
-    """Get recurring subscription transactions with improved price evolution tracking."""
-    from sqlalchemy import text
-    import datetime as dt
-    from collections import defaultdict, Counter
-    
-    # Get actual date range from database if not provided
-    if not date_from or not date_to:
-        date_range_query = text("""
-            SELECT 
-                MIN(posted_date) as min_date,
-                MAX(posted_date) as max_date
-            FROM transactions
-            WHERE txn_type = 'expense'
-        """)
-        date_range_result = db.execute(date_range_query).fetchone()
-        
-        if not date_from:
-            date_from = date_range_result.min_date or "2021-01-01"
-        if not date_to:
-            date_to = date_range_result.max_date or "2025-12-31"
-    
-    # Query to get monthly charges per canonical merchant with chronological data
-    query = text("""
-        WITH merchant_normalized AS (
-            SELECT 
-                t.merchant_raw,
-                t.description_raw,
-                t.posted_date,
-                t.amount,
-                c.name as category_name,
-                -- Create canonical merchant key that groups variations together (UPPERCASE for consistency)
-                UPPER(CASE 
-                    -- OPENAI patterns
-                    WHEN (t.merchant_raw = 'ONLINE PAYMENTS BY STRIPE' AND t.description_raw LIKE '%OPENAI%') 
-                      OR (t.merchant_raw = 'ONLINE PAYMENTS BY STRIPE' AND t.description_raw LIKE '%CHATGPT%')
-                      OR UPPER(t.merchant_raw) LIKE '%OPENAI%' THEN 'OPENAI'
-                    
-                    -- CURSOR patterns
-                    WHEN (t.merchant_raw = 'ONLINE PAYMENTS BY STRIPE' AND t.description_raw LIKE '%CURSOR%')
-                      OR UPPER(t.merchant_raw) LIKE '%CURSOR%' THEN 'CURSOR'
-                    
-                    -- TRADINGVIEW patterns
-                    WHEN (t.merchant_raw = 'B2B TRANSACTION' AND t.description_raw LIKE '%TRADINGVIEW%')
-                      OR UPPER(t.merchant_raw) LIKE '%TRADINGVIEW%' THEN 'TRADINGVIEW'
-                    
-                    -- LEETCODE patterns
-                    WHEN (t.merchant_raw = 'ONLINE PAYMENTS BY STRIPE' AND t.description_raw LIKE '%LEETCODE%')
-                      OR UPPER(t.merchant_raw) LIKE '%LEETCODE%' THEN 'LEETCODE'
-                    
-                    -- NETFLIX patterns
-                    WHEN UPPER(t.merchant_raw) LIKE '%NETFLIX%' 
-                      OR t.description_raw LIKE '%NETFLIX%' THEN 'NETFLIX'
-                    
-                    -- EQUINOX patterns (case-insensitive)
-                    WHEN UPPER(t.merchant_raw) LIKE '%EQUINOX%' THEN 'EQUINOX'
-                    
-                    -- MEMBERSHIP FEE patterns
-                    WHEN UPPER(t.merchant_raw) LIKE '%MEMBERSHIP FEE%'
-                      OR (t.merchant_raw = 'CHECKOUT.COM ECOMM MEDIUM EEA' AND t.description_raw LIKE '%PATREON% MEMBERSHIP%')
-                      OR (UPPER(t.merchant_raw) LIKE '%INTEREST%' AND t.description_raw LIKE '%MEMBERSHIP FEE%') THEN 'MEMBERSHIP_FEE'
-                    
-                    -- FIDO patterns
-                    WHEN UPPER(t.merchant_raw) LIKE '%FIDO%' 
-                      OR (t.merchant_raw = 'NEW MERCHANT' AND t.description_raw LIKE '%FIDO MOBILE%')
-                      OR t.description_raw LIKE '%FIDO MOBILE%' THEN 'FIDO'
-                    
-                    -- BELL CANADA patterns
-                    WHEN UPPER(t.merchant_raw) LIKE '%BELL CANADA%'
-                      OR (UPPER(t.merchant_raw) LIKE '%BELL%' AND t.description_raw LIKE '%BELL CANADA%') THEN 'BELL_CANADA'
-                    
-                    -- Default: use UPPER of merchant_raw for consistency
-                    ELSE UPPER(t.merchant_raw)
-                END) as canonical_merchant,
-                
-                t.merchant_raw as display_merchant
-            FROM transactions t
-            LEFT JOIN categories c ON t.category_id = c.id
-            WHERE t.txn_type = 'expense'
-              AND t.posted_date >= :date_from
-              AND t.posted_date <= :date_to
-              AND t.merchant_raw IS NOT NULL
-              AND t.merchant_raw != ''
-        ),
-        monthly_charges AS (
-            SELECT 
-                canonical_merchant,
-                strftime('%Y-%m', posted_date) as month,
-                COUNT(*) as transaction_count,
-                SUM(ABS(amount)) as monthly_total,
-                AVG(ABS(amount)) as avg_transaction_amount,
-                MIN(posted_date) as first_date_in_month,
-                MAX(posted_date) as last_date_in_month,
-                MAX(category_name) as category_name,
-                MAX(display_merchant) as latest_display_merchant,
-                MAX(description_raw) as latest_description
-            FROM merchant_normalized
-            GROUP BY canonical_merchant, strftime('%Y-%m', posted_date)
-        )
-        SELECT 
-            canonical_merchant,
-            month,
-            monthly_total,
-            avg_transaction_amount,
-            transaction_count,
-            first_date_in_month,
-            last_date_in_month,
-            category_name,
-            latest_display_merchant,
-            latest_description
-        FROM monthly_charges
-        ORDER BY canonical_merchant, month
-    """)
-    
-    results = db.execute(query, {
-        "date_from": date_from,
-        "date_to": date_to
-    }).fetchall()
-    
-    # Group monthly data by merchant
-    merchant_monthly_data = defaultdict(list)
-    for row in results:
-        merchant_monthly_data[row.canonical_merchant].append({
-            'month': row.month,
-            'amount': round(float(row.monthly_total), 2),  # Total for the month (for calculating total_charged)
-            'avg_amount': round(float(row.avg_transaction_amount), 2),  # Per-transaction average (for price evolution)
-            'txn_count': row.transaction_count,
-            'first_date': row.first_date_in_month,
-            'last_date': row.last_date_in_month,
-            'category': row.category_name,
-            'display_name': row.latest_display_merchant
-        })
-    
-    # Process results
-    subscriptions = []
-    current_date = dt.datetime.now().date()
-    cutoff_date = current_date - dt.timedelta(days=45)  # Reduced to 45 days for better inactive detection
-    
-    # Whitelist patterns for canonical merchants (UPPERCASE)
-    whitelisted_merchants = {
-        'TRADINGVIEW', 'EQUINOX', 'NETFLIX', 'SPOTIFY', 'APPLE', 'GOOGLE', 
-        'CURSOR', 'LEETCODE', 'OPENAI', 'BELL_CANADA', 'FIDO', 'ROGERS', 'TELUS', 
-        'OURARING', 'MEMBERSHIP_FEE'
-    }
-    
-    # Categories to exclude (non-subscription categories)
-    excluded_categories = {
-        'qsr', 'restaurant', 'ordering out', 'ordering in', 'groceries',
-        'home maintenance', 'going out', 'medical', 'healthcare',
-        'pharmacy', 'pickup sport', 'trading', 'retail', 'shopping', 
-        'clothing', 'public transportation', 'gas', 'fuel', 'travel', 
-        'hotels', 'coffee', 'tim hortons', 'starbucks', 'personal care', 
-        'grooming', 'cash withdrawal', 'atm', 'dollarama', 'amazon'
-    }
-    
-    # Specific merchants to exclude (high-frequency non-subscriptions)
-    excluded_merchants = {
-        'RENT', 'LONGOS', 'LOBLAWS', 'METRO', 'SOBEYS', 'WALMART', 
-        'DOLLARAMA', 'RESTAURANT', 'TIM HORTONS', 'STARBUCKS',
-        'SHELL', 'ESSO', 'PETRO', 'UBER RIDES', 'UBER EATS',
-        'REXALL', 'SHOPPERS', 'NATURES EMPORIUM', 'WINNERS', 
-        'INTEREST', 'PHARMACY', 'MCDONALD', 'SUBWAY',
-        'AMAZONCOM PAYMENTS-CA', 'AMAZON', 'BEST BUY'
-    }
-    
-    def calculate_stable_price(monthly_data):
-        """
-        Calculate the stable recurring price.
-        Uses mode of recent 6 months' per-transaction average, ignoring one-off spikes.
-        A price needs 2+ consecutive months to be considered 'stable'.
-        """
-        if not monthly_data:
-            return 0
-        
-        # Get last 6 months of data - use avg_amount (per-transaction) not total
-        recent_data = monthly_data[-6:]
-        amounts = [d['avg_amount'] for d in recent_data]
-        
-        if len(amounts) == 1:
-            return amounts[0]
-        
-        # Round to nearest dollar for grouping (to handle small variations like $49.13, $49.30)
-        rounded_amounts = [round(a) for a in amounts]
-        
-        # Find the most common rounded amount
-        amount_counts = Counter(rounded_amounts)
-        most_common_rounded = amount_counts.most_common(1)[0][0]
-        
-        # Get the actual amounts that round to this value
-        matching_amounts = [a for a, r in zip(amounts, rounded_amounts) if r == most_common_rounded]
-        
-        # Return the average of matching amounts
-        return round(sum(matching_amounts) / len(matching_amounts), 2)
-    
-    def calculate_price_evolution(monthly_data):
-        """
-        Calculate chronological price evolution based on per-transaction amount.
-        Only shows stable price changes - a price must appear 2+ consecutive months 
-        to be considered a 'price point'. One-off variations are ignored.
-        Uses avg_amount (per-transaction) instead of monthly_total to avoid
-        showing inflated amounts when multiple transactions occur in same month.
-        """
-        if len(monthly_data) < 3:
-            return None
-        
-        # Find stable price periods (2+ consecutive months at same rounded price)
-        stable_periods = []
-        current_price = None
-        consecutive_count = 0
-        period_start_month = None
-        
-        for data in monthly_data:
-            # Use avg_amount (per-transaction) for price comparison
-            rounded_price = round(data['avg_amount'])
-            
-            if current_price is None or abs(rounded_price - current_price) <= 3:
-                # Same price (within $3 tolerance for minor variations)
-                if current_price is None:
-                    current_price = rounded_price
-                    period_start_month = data['month']
-                consecutive_count += 1
-            else:
-                # Price changed - save previous period if it was stable (2+ months)
-                if consecutive_count >= 2:
-                    stable_periods.append({
-                        'price': current_price,
-                        'month': period_start_month,
-                        'duration': consecutive_count
-                    })
-                
-                # Start new period
-                current_price = rounded_price
-                period_start_month = data['month']
-                consecutive_count = 1
-        
-        # Don't forget the last period
-        if consecutive_count >= 2:
-            stable_periods.append({
-                'price': current_price,
-                'month': period_start_month,
-                'duration': consecutive_count
-            })
-        
-        if len(stable_periods) <= 1:
-            return None
-        
-        # Return prices in chronological order, avoiding duplicates
-        seen_prices = set()
-        evolution = []
-        for period in stable_periods:
-            if period['price'] not in seen_prices:
-                evolution.append(float(period['price']))
-                seen_prices.add(period['price'])
-        
-        return evolution if len(evolution) > 1 else None
-    
-    # Process each merchant
-    for canonical_merchant, monthly_data in merchant_monthly_data.items():
-        if not monthly_data:
-            continue
-        
-        # Sort by month chronologically
-        monthly_data.sort(key=lambda x: x['month'])
-        
-        display_name = monthly_data[-1]['display_name'] or canonical_merchant
-        category_name = monthly_data[-1]['category'] or "Subscription"
-        first_date = monthly_data[0]['first_date']
-        last_date = monthly_data[-1]['last_date']
-        months_count = len(monthly_data)
-        total_charged = sum(d['amount'] for d in monthly_data)
-        
-        # Check if whitelisted
-        is_whitelisted = canonical_merchant.upper() in whitelisted_merchants
-        
-        # Apply filtering
-        if not is_whitelisted:
-            # Check category exclusions
-            category_lower = category_name.lower()
-            if any(excluded_cat in category_lower for excluded_cat in excluded_categories):
-                continue
-            
-            # Check merchant exclusions
-            if canonical_merchant.upper() in excluded_merchants:
-                continue
-            
-            # Require minimum subscription categories for non-whitelisted
-            subscription_categories = {
-                'gym', 'fitness', 'telecom', 'entertainment', 'streaming',
-                'subscriptions', 'software', 'ai tools', 'education',
-                'membership', 'cc fee', 'electronics'
-            }
-            
-            if not any(sub_cat in category_lower for sub_cat in subscription_categories):
-                continue
-            
-            # Require at least 3 months for non-whitelisted
-            if months_count < 3:
-                continue
-        
-        # Check if subscription is current (using 45-day cutoff)
-        last_date_parsed = dt.datetime.strptime(last_date, "%Y-%m-%d").date()
-        is_current = last_date_parsed >= cutoff_date
-        
-        # Calculate stable monthly amount (ignores one-off spikes)
-        monthly_amount = calculate_stable_price(monthly_data)
-        
-        # Calculate chronological price evolution
-        price_evolution = calculate_price_evolution(monthly_data)
-        
-        subscriptions.append({
-            "merchant": canonical_merchant,
-            "monthly_amount": monthly_amount,
-            "months_count": months_count,
-            "total_charged": round(total_charged, 2),
-            "first_date": first_date,
-            "last_date": last_date,
-            "category": category_name,
-            "price_changes": price_evolution,
-            "is_current": is_current
-        })
-    
-    # Sort to show current subscriptions first, then by total charged
-    subscriptions.sort(key=lambda x: (not x["is_current"], -x["total_charged"]))
-    
-    # Calculate summary stats
-    current_subs = [s for s in subscriptions if s["is_current"]]
-    total_monthly = sum(s["monthly_amount"] for s in current_subs)
-    total_all_time = sum(s["total_charged"] for s in subscriptions)
-    
-    return {
-        "subscriptions": subscriptions,
-        "summary": {
-            "count": len(current_subs),
-            "total_monthly": round(total_monthly, 2),
-            "total_all_time": round(total_all_time, 2)
-        }
-    }
+    """Get detected recurring subscriptions with their price evolution.
+
+    Reads the persisted state kept current by ``services.detected_subscriptions``;
+    a date range keeps the subscriptions charged within it.
+    """
+    return FastJSONResponse(list_subscriptions(db, parse_date(date_from), parse_date(date_to)))
 
 @router.get("/latest-month-breakdowns")
 def get_latest_month_breakdowns(db: Session = Depends(get_database)):
@@ -689,7 +366,7 @@ def get_latest_month_breakdowns(db: Session = Depends(get_database)):
     
     # Get the latest month with transactions
     latest_month_query = text("""
-        SELECT strftime('%Y-%m', MAX(posted_date)) as latest_month
+        SELECT MAX(posted_month) as latest_month
         FROM transactions
         WHERE txn_type = 'expense'
     """)
@@ -701,11 +378,11 @@ def get_latest_month_breakdowns(db: Session = Depends(get_database)):
     category_query = text("""
         SELECT 
             c.name as category_name,
-            SUM(ABS(t.amount)) as total_amount,
+            SUM(ABS(t.amount_cents)) / 100.0 as total_amount,
             COUNT(t.id) as transaction_count
         FROM transactions t
         JOIN categories c ON t.category_id = c.id
-        WHERE strftime('%Y-%m', t.posted_date) = :latest_month
+        WHERE t.posted_month = :latest_month
           AND t.txn_type = 'expense'
           AND t.category_id IS NOT NULL
         GROUP BY c.id, c.name
@@ -719,10 +396,10 @@ def get_latest_month_breakdowns(db: Session = Depends(get_database)):
     merchant_query = text("""
         SELECT 
             COALESCE(NULLIF(TRIM(t.merchant_raw), ''), 'Unknown') as merchant,
-            SUM(ABS(t.amount)) as total_amount,
+            SUM(ABS(t.amount_cents)) / 100.0 as total_amount,
             COUNT(t.id) as transaction_count
         FROM transactions t
-        WHERE strftime('%Y-%m', t.posted_date) = :latest_month
+        WHERE t.posted_month = :latest_month
           AND t.txn_type = 'expense'
         GROUP BY merchant
         ORDER BY total_amount DESC
@@ -756,6 +433,7 @@ def get_latest_month_breakdowns(db: Session = Depends(get_database)):
     }
 
 @router.get("/category-series")
+@negotiated(columnar=to_series)
 def get_category_series(
     category_id: int = Query(..., description="Category ID"),
     date_from: str = Query(..., description="Start date (YYYY-MM-DD)"),
@@ -768,23 +446,23 @@ def get_category_series(
     # Get monthly spending and transaction counts for the specific category within date range
     series_query = text("""
         SELECT 
-            strftime('%Y-%m', t.posted_date) as month,
-            SUM(ABS(t.amount)) as amount,
+            t.posted_month as month,
+            SUM(ABS(t.amount_cents)) / 100.0 as amount,
             COUNT(t.id) as txn_count
         FROM transactions t
         WHERE t.category_id = :category_id
           AND t.posted_date >= :date_from
           AND t.posted_date <= :date_to
           AND t.txn_type = 'expense'
-        GROUP BY strftime('%Y-%m', t.posted_date)
+        GROUP BY t.posted_month
         ORDER BY month
     """)
     
-    series_results = db.execute(series_query, {
+    series_results = run_analytics_query(db, series_query, {
         "category_id": category_id,
         "date_from": date_from,
         "date_to": date_to
-    }).fetchall()
+    })
     
     # Format series data
     series = []
@@ -818,6 +496,7 @@ def get_category_series(
     }
 
 @router.get("/all-categories-series")
+@negotiated(columnar=to_series)
 def get_all_categories_series(
     date_from: str = Query(..., description="Start date (YYYY-MM-DD)"),
     date_to: str = Query(..., description="End date (YYYY-MM-DD)"),
@@ -827,23 +506,20 @@ def get_all_categories_series(
     from sqlalchemy import text
     
     # Get monthly spending and transaction counts for all categories within date range
-    series_query = text("""
+    start, end = parse_date_range(date_from, date_to)
+    source, params = cube_source(CATEGORY_CUBE, start, end)
+    series_query = text(f"""
         SELECT 
-            strftime('%Y-%m', t.posted_date) as month,
-            SUM(ABS(t.amount)) as amount,
-            COUNT(t.id) as txn_count
-        FROM transactions t
-        WHERE t.posted_date >= :date_from
-          AND t.posted_date <= :date_to
-          AND t.txn_type = 'expense'
-        GROUP BY strftime('%Y-%m', t.posted_date)
+            m.month,
+            SUM(m.abs_amount_cents) / 100.0 as amount,
+            SUM(m.txn_count) as txn_count
+        FROM ({source}) m
+        WHERE m.txn_type = 'expense'
+        GROUP BY m.month
         ORDER BY month
     """)
     
-    series_results = db.execute(series_query, {
-        "date_from": date_from,
-        "date_to": date_to
-    }).fetchall()
+    series_results = db.execute(series_query, params).fetchall()
     
     # Format series data
     series = []
@@ -876,6 +552,20 @@ def get_all_categories_series(
         "date_range": {"start_date": date_from, "end_date": date_to}
     }
 
+@router.get("/category-matrix")
+@negotiated(columnar=to_series)
+def get_category_matrix(
+    date_from: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    date_to: str = Query(..., description="End date (YYYY-MM-DD)"),
+    db: Session = Depends(get_database)
+):
+    """Get every category's monthly expense series, parent rollups and totals in one response."""
+    start, end = parse_date_range(date_from, date_to)
+    return {
+        **AnalyticsService(db).get_category_matrix(start, end),
+        "date_range": {"start_date": date_from, "end_date": date_to}
+    }
+
 @router.get("/category-merchant-breakdown")
 def get_category_merchant_breakdown(
     category_id: int = Query(..., description="Category ID"),
@@ -893,16 +583,16 @@ def get_category_merchant_breakdown(
         
         query = text("""
             SELECT 
-                strftime('%Y-%m', posted_date) as month,
+                posted_month as month,
                 cleaned_final_merchant,
-                ABS(SUM(amount)) as amount
+                ABS(SUM(amount_cents)) / 100.0 as amount
             FROM transactions 
             WHERE category_id = :category_id
             AND posted_date BETWEEN :date_from AND :date_to
             AND COALESCE(is_deleted, 0) = 0
             AND cleaned_final_merchant IS NOT NULL
             AND txn_type = 'expense'
-            GROUP BY strftime('%Y-%m', posted_date), cleaned_final_merchant
+            GROUP BY posted_month, cleaned_final_merchant
             ORDER BY month, amount DESC
         """)
         
@@ -5,6 +5,10 @@ from sqlalchemy import text
 from typing import Optional
 from .deps import get_database
 from ..utils.query import parse_date_range
+from ..services.analytics_engine import run_analytics_query
+from ..core.cache import cached
+from ..core.negotiation import negotiated
+from ..services.monthly_aggregates import ANALYTICS_SOURCE_TABLES, CATEGORY_CUBE, cube_source
 
 router = APIRouter()
 
@@ -14,6 +18,8 @@ def test_freq_router():
     return {"message": "Frequency router is working!", "timestamp": "2025-08-23"}
 
 @router.get("/transaction-frequency-by-category")
+@negotiated
+@cached(ANALYTICS_SOURCE_TABLES)
 def transaction_frequency_by_category(
     date_from: Optional[str] = Query(None),
     date_to: Optional[str] = Query(None),
@@ -22,7 +28,7 @@ def transaction_frequency_by_category(
 ):
     start, end = parse_date_range(date_from, date_to)
     months = ((end.year - start.year) * 12 + (end.month - start.month)) + 1
-    rows = db.execute(text("""
+    rows = run_analytics_query(db, text("""
         SELECT 
           c.name AS category_name,
           c.color AS category_color,
@@ -36,7 +42,7 @@ def transaction_frequency_by_category(
         GROUP BY c.id, c.name, c.color
         ORDER BY total_transactions DESC
         LIMIT :limit
-    """), {"start": start, "end": end, "months": months, "limit": limit}).fetchall()
+    """), {"start": start, "end": end, "months": months, "limit": limit})
     return {
         "data": [
             {
@@ -50,6 +56,8 @@ def transaction_frequency_by_category(
     }
 
 @router.get("/transaction-frequency-by-merchant")
+@negotiated
+@cached(ANALYTICS_SOURCE_TABLES)
 def transaction_frequency_by_merchant(
     date_from: Optional[str] = Query(None),
     date_to: Optional[str] = Query(None),
@@ -58,19 +66,19 @@ def transaction_frequency_by_merchant(
 ):
     start, end = parse_date_range(date_from, date_to)
     months = ((end.year - start.year) * 12 + (end.month - start.month)) + 1
-    rows = db.execute(text("""
+    rows = run_analytics_query(db, text("""
         SELECT 
           COALESCE(NULLIF(TRIM(t.cleaned_final_merchant), ''), NULLIF(TRIM(t.merchant_raw), ''), 'Unknown') AS merchant,
           COUNT(t.id) AS total_transactions,
           ROUND(CAST(COUNT(t.id) AS FLOAT) / :months, 2) AS avg_per_month,
-          SUM(t.amount) AS total_amount
+          SUM(t.amount_cents) / 100.0 AS total_amount
         FROM transactions t
         WHERE lower(t.txn_type)='expense'
           AND t.posted_date >= :start AND t.posted_date <= :end
         GROUP BY merchant
         ORDER BY total_transactions DESC
         LIMIT :limit
-    """), {"start": start, "end": end, "months": months, "limit": limit}).fetchall()
+    """), {"start": start, "end": end, "months": months, "limit": limit})
     return {
         "data": [
             {
@@ -84,6 +92,8 @@ def transaction_frequency_by_merchant(
     }
 
 @router.get("/spending-amount-by-category")
+@negotiated
+@cached(ANALYTICS_SOURCE_TABLES)
 def spending_amount_by_category(
     date_from: Optional[str] = Query(None),
     date_to: Optional[str] = Query(None),
@@ -92,23 +102,22 @@ def spending_amount_by_category(
 ):
     start, end = parse_date_range(date_from, date_to)
     months = ((end.year - start.year) * 12 + (end.month - start.month)) + 1
-    rows = db.execute(text("""
+    source, params = cube_source(CATEGORY_CUBE, start, end)
+    rows = db.execute(text(f"""
         SELECT 
           c.name AS category_name,
           c.color AS category_color,
-          ABS(SUM(t.amount)) AS total_amount,
-          ROUND(ABS(SUM(t.amount)) / :months, 2) AS avg_per_month,
-          COUNT(t.id) AS total_transactions
-        FROM transactions t
-        JOIN categories c ON t.category_id = c.id
-        WHERE lower(t.txn_type)='expense'
-          AND t.posted_date >= :start AND t.posted_date <= :end
-          AND t.category_id IS NOT NULL
+          ABS(SUM(m.amount_cents)) / 100.0 AS total_amount,
+          ROUND(ABS(SUM(m.amount_cents)) / 100.0 / :months, 2) AS avg_per_month,
+          SUM(m.txn_count) AS total_transactions
+        FROM ({source}) m
+        JOIN categories c ON m.category_id = c.id
+        WHERE lower(m.txn_type)='expense'
           AND lower(c.name) != 'rent'
         GROUP BY c.id, c.name, c.color
         ORDER BY total_amount DESC
         LIMIT :limit
-    """), {"start": start, "end": end, "months": months, "limit": limit}).fetchall()
+    """), {**params, "months": months, "limit": limit}).fetchall()
     return {
         "data": [
             {
@@ -123,6 +132,8 @@ def spending_amount_by_category(
     }
 
 @router.get("/spending-amount-by-merchant")
+@negotiated
+@cached(ANALYTICS_SOURCE_TABLES)
 def spending_amount_by_merchant(
     date_from: Optional[str] = Query(None),
     date_to: Optional[str] = Query(None),
@@ -131,11 +142,11 @@ def spending_amount_by_merchant(
 ):
     start, end = parse_date_range(date_from, date_to)
     months = ((end.year - start.year) * 12 + (end.month - start.month)) + 1
-    rows = db.execute(text("""
+    rows = run_analytics_query(db, text("""
         SELECT 
           COALESCE(NULLIF(TRIM(t.cleaned_final_merchant), ''), NULLIF(TRIM(t.merchant_raw), ''), 'Unknown') AS merchant,
-          ABS(SUM(t.amount)) AS total_amount,
-          ROUND(ABS(SUM(t.amount)) / :months, 2) AS avg_per_month,
+          ABS(SUM(t.amount_cents)) / 100.0 AS total_amount,
+          ROUND(ABS(SUM(t.amount_cents)) / 100.0 / :months, 2) AS avg_per_month,
           COUNT(t.id) AS total_transactions
         FROM transactions t
         WHERE lower(t.txn_type)='expense'
@@ -144,7 +155,7 @@ def spending_amount_by_merchant(
         GROUP BY merchant
         ORDER BY total_amount DESC
         LIMIT :limit
-    """), {"start": start, "end": end, "months": months, "limit": limit}).fetchall()
+    """), {"start": start, "end": end, "months": months, "limit": limit})
     return {
         "data": [
             {
@@ -5,7 +5,7 @@ import calendar
 from fastapi import APIRouter, Query, Depends
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from ..core.db import get_db
+from .deps import get_database
 
 router = APIRouter()
 
@@ -46,7 +46,7 @@ def transaction_frequency_by_merchant(
     }
 
 @router.get("/available-months")
-def available_months(db: Session = Depends(get_db)):
+def available_months(db: Session = Depends(get_database)):
     """Get the available months range from transactions."""
     row = db.execute(text("""
         SELECT
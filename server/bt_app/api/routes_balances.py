@@ -5,13 +5,14 @@ from sqlalchemy.orm import Session
 from typing import Optional, List
 
 from ..services.balances import BalanceService
+from ..core.negotiation import negotiated
 from .deps import get_database
 
 router = APIRouter(tags=["balances"])
 
 
 @router.get("/accounts")
-async def get_refreshable_accounts(db: Session = Depends(get_database)):
+def get_refreshable_accounts(db: Session = Depends(get_database)):
     """Get list of accounts that can be refreshed.
     
     Returns:
@@ -47,7 +48,7 @@ async def get_refreshable_accounts(db: Session = Depends(get_database)):
 
 
 @router.post("/refresh")
-async def refresh_balances(
+def refresh_balances(
     request_body: dict = {},
     db: Session = Depends(get_database)
 ):
@@ -69,7 +70,7 @@ async def refresh_balances(
 
 
 @router.get("")
-async def get_balances(db: Session = Depends(get_database)):
+def get_balances(db: Session = Depends(get_database)):
     """Get the latest balance snapshot for all accounts.
     
     Returns:
@@ -84,7 +85,8 @@ async def get_balances(db: Session = Depends(get_database)):
 
 
 @router.get("/history")
-async def get_balance_history(
+@negotiated
+def get_balance_history(
     account_id: int = Query(..., description="Account ID"),
     days: int = Query(30, description="Number of days of history"),
     db: Session = Depends(get_database)
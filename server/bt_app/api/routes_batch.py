@@ -0,0 +1,140 @@
+"""Batch API route: several GET requests in one round trip."""
+import logging
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import orjson
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import Response
+from pydantic import BaseModel, Field, field_validator
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from .deps import get_database, shared_session
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+MAX_BATCH_SIZE = 25
+_FORWARDED_HEADERS = ("accept", "if-none-match")
+
+
+class BatchItem(BaseModel):
+    """One GET sub-request."""
+    id: str
+    path: str = Field(..., description="Path under /api, optionally with a query string")
+    headers: Dict[str, str] = Field(default_factory=dict)
+
+
+class BatchRequest(BaseModel):
+    """Sub-requests to run in order."""
+    requests: List[BatchItem] = Field(..., max_length=MAX_BATCH_SIZE)
+    
+    @field_validator("requests")
+    @classmethod
+    def ids_unique(cls, items: List[BatchItem]) -> List[BatchItem]:
+        if len({item.id for item in items}) != len(items):
+            raise ValueError("sub-request ids must be unique")
+        return items
+
+
+def _rejection(item: BatchItem) -> Optional[str]:
+    path = urlsplit(item.path).path
+    if not path.startswith("/api/"):
+        return "path must start with /api/"
+    if path.rstrip("/") == "/api/batch":
+        return "batches cannot be nested"
+    return None
+
+
+async def _dispatch(request: Request, item: BatchItem):
+    """Run one GET through the full app in-process; return (status, headers, body)."""
+    url = urlsplit(item.path)
+    # Sub-requests share the batch's session, so they always run as the batch's tenant
+    tenant_header = settings.tenant_header.lower()
+    own = {k.lower(): v for k, v in item.headers.items() if k.lower() != tenant_header}
+    headers = [
+        (name.encode("latin-1"), value.encode("latin-1"))
+        for name, value in request.headers.items()
+        if name == tenant_header or (name in _FORWARDED_HEADERS and name not in own)
+    ]
+    headers += [(k.encode("latin-1"), v.encode("latin-1")) for k, v in own.items()]
+    scope = {
+        **{k: v for k, v in request.scope.items() if k in ("client", "server", "scheme", "http_version", "state")},
+        "type": "http",
+        "method": "GET",
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "root_path": "",
+        "query_string": url.query.encode(),
+        "headers": headers,
+    }
+    status = 500
+    response_headers: List = []
+    chunks: List[bytes] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status, response_headers
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await request.app(scope, receive, send)
+    return status, dict((k.decode("latin-1"), v.decode("latin-1")) for k, v in response_headers), b"".join(chunks)
+
+
+@router.post("")
+async def run_batch(
+    batch: BatchRequest,
+    request: Request,
+    db: Session = Depends(get_database)
+) -> Response:
+    """Run several GET endpoints in-process on one read session.
+    
+    Sub-requests go through the full app (routing, validation, ETags) in
+    order and share this request's database session, so a page load costs
+    one round trip and one connection checkout. A sub-request that fails,
+    even with an exception its route does not handle, only gets a 500 in
+    its own slot; the session is rolled back before the next one runs.
+    
+    Returns:
+        ``{"responses": {id: {"status", "etag"?, "body"}}}``; JSON bodies are
+        embedded as-is, other bodies as text
+    """
+    parts = []
+    with shared_session(db):
+        for item in batch.requests:
+            rejection = _rejection(item)
+            if rejection:
+                status, headers, body = 400, {}, orjson.dumps({"detail": rejection})
+                content_type = "application/json"
+            else:
+                try:
+                    status, headers, body = await _dispatch(request, item)
+                except Exception as exc:
+                    # Unhandled route errors propagate out of the app; keep them in this slot
+                    logger.exception("Batch sub-request %s (%s) failed", item.id, item.path)
+                    status, headers = 500, {"content-type": "application/json"}
+                    body = orjson.dumps({"detail": str(exc) or type(exc).__name__})
+                content_type = headers.get("content-type", "")
+                if status >= 500:
+                    # Leave the shared session usable for the remaining sub-requests
+                    db.rollback()
+            if not body:
+                body = b"null"
+            elif "json" not in content_type:
+                body = orjson.dumps(body.decode("utf-8", errors="replace"))
+            entry = {"status": status}
+            if "etag" in headers:
+                entry["etag"] = headers["etag"]
+            # Splice the sub-response JSON in without decoding and re-encoding it
+            parts.append(orjson.dumps(item.id) + b":" + orjson.dumps(entry)[:-1] + b',"body":' + body + b"}")
+    return Response(
+        content=b'{"responses":{' + b",".join(parts) + b"}}",
+        media_type="application/json",
+    )
@@ -12,13 +12,16 @@ from ..schemas.budgets import (
     BudgetUpdate,
     MonthlyBudgetSummary
 )
+from ..core.negotiation import negotiated
+from ..services.budget_matrix import budget_matrix
+from ..utils.query import parse_month
 from .deps import get_database
 
 router = APIRouter()
 
 
 @router.get("", response_model=List[BudgetSchema])
-async def get_budgets(
+def get_budgets(
     month: Optional[str] = Query(None, description="Filter by month (YYYY-MM)"),
     category_id: Optional[int] = Query(None, description="Filter by category ID"),
     db: Session = Depends(get_database)
@@ -48,7 +51,7 @@ async def get_budgets(
 
 
 @router.post("", response_model=BudgetSchema)
-async def create_budget(
+def create_budget(
     budget_data: BudgetCreate,
     db: Session = Depends(get_database)
 ) -> BudgetSchema:
@@ -95,7 +98,7 @@ async def create_budget(
 
 
 @router.put("/{budget_id}", response_model=BudgetSchema)
-async def update_budget(
+def update_budget(
     budget_id: int,
     budget_data: BudgetUpdate,
     db: Session = Depends(get_database)
@@ -131,7 +134,7 @@ async def update_budget(
 
 
 @router.delete("/{budget_id}")
-async def delete_budget(
+def delete_budget(
     budget_id: int,
     db: Session = Depends(get_database)
 ) -> dict:
@@ -161,7 +164,7 @@ async def delete_budget(
 
 
 @router.get("/summary/{month}", response_model=MonthlyBudgetSummary)
-async def get_monthly_summary(
+def get_monthly_summary(
     month: str,
     db: Session = Depends(get_database)
 ) -> MonthlyBudgetSummary:
@@ -204,6 +207,29 @@ async def get_monthly_summary(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/matrix")
+@negotiated
+def get_budget_matrix(
+    month_from: str = Query(..., alias="from", description="First month (YYYY-MM)"),
+    month_to: str = Query(..., alias="to", description="Last month (YYYY-MM)"),
+    db: Session = Depends(get_database)
+) -> dict:
+    """Get budget vs actual for every category and month of a range.
+    
+    Args:
+        month_from: First month in YYYY-MM format
+        month_to: Last month in YYYY-MM format
+        
+    Returns:
+        Per-category and parent-rollup monthly budget, actual, variance and
+        over-budget flags, with monthly and range totals
+    """
+    first, last = parse_month(month_from), parse_month(month_to)
+    if last < first:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    return {**budget_matrix(db, first, last), "from": month_from, "to": month_to}
+
+
 
 
 
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 import logging
 
 from ..services.dashboard_service import DashboardService
+from ..core.negotiation import negotiated
 from .deps import get_database
 from ..utils.query import parse_month
 
@@ -13,7 +14,7 @@ router = APIRouter()
 
 
 @router.get("/meta")
-async def get_dashboard_meta(db: Session = Depends(get_database)):
+def get_dashboard_meta(db: Session = Depends(get_database)):
     """Get dashboard metadata (first and latest data months)."""
     try:
         service = DashboardService(db)
@@ -24,7 +25,7 @@ async def get_dashboard_meta(db: Session = Depends(get_database)):
 
 
 @router.get("/cards")
-async def get_dashboard_cards(request: Request, db: Session = Depends(get_database)):
+def get_dashboard_cards(request: Request, db: Session = Depends(get_database)):
     """Get metric cards for specified month."""
     month = parse_month(request.query_params.get("month"))
     try:
@@ -36,7 +37,8 @@ async def get_dashboard_cards(request: Request, db: Session = Depends(get_databa
 
 
 @router.get("/lines")
-async def get_dashboard_lines(db: Session = Depends(get_database)):
+@negotiated
+def get_dashboard_lines(db: Session = Depends(get_database)):
     """Get monthly line chart data using real data from service."""
     try:
         service = DashboardService(db)
@@ -47,7 +49,7 @@ async def get_dashboard_lines(db: Session = Depends(get_database)):
 
 
 @router.get("/categories")
-async def get_dashboard_categories(request: Request, db: Session = Depends(get_database)):
+def get_dashboard_categories(request: Request, db: Session = Depends(get_database)):
     """Get category breakdown and details for specified month."""
     month = parse_month(request.query_params.get("month"))
     try:
@@ -59,7 +61,7 @@ async def get_dashboard_categories(request: Request, db: Session = Depends(get_d
 
 
 @router.get("/top-merchants")
-async def get_dashboard_top_merchants(request: Request, db: Session = Depends(get_database)):
+def get_dashboard_top_merchants(request: Request, db: Session = Depends(get_database)):
     """Get top merchants for specified month."""
     month = parse_month(request.query_params.get("month"))
     try:
@@ -70,3 +72,13 @@ async def get_dashboard_top_merchants(request: Request, db: Session = Depends(ge
         raise HTTPException(status_code=500, detail=f"dashboard_top_merchants failed: {e}")
 
 
+@router.get("/bundle")
+def get_dashboard_bundle(request: Request, db: Session = Depends(get_database)):
+    """Get meta, cards, lines, categories and top merchants in one payload."""
+    month = parse_month(request.query_params.get("month"))
+    try:
+        service = DashboardService(db)
+        return service.get_bundle(month.strftime("%Y-%m") if month else None)
+    except Exception as e:
+        logger.exception("dashboard_bundle failed")
+        raise HTTPException(status_code=500, detail=f"dashboard_bundle failed: {e}")
@@ -2,9 +2,9 @@
 import io
 from typing import Dict, Any, List
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-import pandas as pd
 
 from ..services.historical_importer import HistoricalImporter
 from ..services.mapping_service import MappingService
@@ -32,10 +32,11 @@ async def preview_historical(
         Sheet names and column previews
     """
     try:
+        import pandas as pd
+
         content = await file.read()
-        excel_file = pd.ExcelFile(io.BytesIO(content))
-        
-        sheet_names = excel_file.sheet_names
+        # Parsing the workbook is CPU-bound; keep it off the event loop
+        sheet_names = await run_in_threadpool(lambda: pd.ExcelFile(io.BytesIO(content)).sheet_names)
         
         # Simple response without data preview to avoid NaN serialization issues
         return {
@@ -83,7 +84,8 @@ async def commit_historical(
         
         # Import historical data - pass lists exactly as chosen; [] means "skip this kind"
         importer = HistoricalImporter(db)
-        results = importer.load_historical_excel_bytes(
+        results = await run_in_threadpool(
+            importer.load_historical_excel_bytes,
             content, 
             expense_sheets=exp_list,   # [] => skip expenses
             income_sheets=inc_list,    # [] => skip income
@@ -111,7 +113,7 @@ async def commit_historical(
 
 
 @router.post("/historical")
-async def import_historical(
+def import_historical(
     request: HistoricalImportRequest,
     db: Session = Depends(get_database)
 ) -> Dict[str, Any]:
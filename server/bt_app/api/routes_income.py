@@ -28,7 +28,7 @@ class IncomeCreate(BaseModel):
 
 
 @router.post("")
-async def create_income(
+def create_income(
     income_data: IncomeCreate,
     db: Session = Depends(get_database)
 ) -> TransactionSchema:
@@ -15,7 +15,7 @@ router = APIRouter(tags=["integrations"])
 
 
 @router.post("/ndax/connect")
-async def connect_ndax(
+def connect_ndax(
     api_key: str = Body(..., description="NDAX API Key"),
     api_secret: str = Body(..., description="NDAX API Secret"),
     uid: str = Body(..., description="NDAX UID (user id)"),
@@ -70,7 +70,7 @@ async def connect_ndax(
 
 
 @router.post("/ndax/test")
-async def test_ndax_connection(db: Session = Depends(get_database)):
+def test_ndax_connection(db: Session = Depends(get_database)):
     """Test existing NDAX connection.
     
     Returns:
@@ -104,7 +104,7 @@ async def test_ndax_connection(db: Session = Depends(get_database)):
 
 
 @router.post("/ndax/refresh")
-async def refresh_ndax_balances(db: Session = Depends(get_database)):
+def refresh_ndax_balances(db: Session = Depends(get_database)):
     """Refresh NDAX balances.
     
     Returns:
@@ -178,7 +178,7 @@ async def refresh_ndax_balances(db: Session = Depends(get_database)):
 
 
 @router.get("/ndax/balances")
-async def get_ndax_balances(db: Session = Depends(get_database)):
+def get_ndax_balances(db: Session = Depends(get_database)):
     """Return NDAX balances if connected; otherwise return an empty payload (200)."""
     try:
         # Get active NDAX integration
@@ -220,7 +220,7 @@ async def get_ndax_balances(db: Session = Depends(get_database)):
             }
         
         # Cache expired, refresh
-        return await refresh_ndax_balances(db)
+        return refresh_ndax_balances(db)
         
     except HTTPException:
         raise
@@ -229,7 +229,7 @@ async def get_ndax_balances(db: Session = Depends(get_database)):
 
 
 @router.delete("/ndax")
-async def disconnect_ndax(db: Session = Depends(get_database)):
+def disconnect_ndax(db: Session = Depends(get_database)):
     """Disconnect NDAX integration.
     
     Returns:
@@ -263,7 +263,7 @@ async def disconnect_ndax(db: Session = Depends(get_database)):
 
 
 @router.get("/status")
-async def get_integrations_status(db: Session = Depends(get_database)):
+def get_integrations_status(db: Session = Depends(get_database)):
     """Get status of all external integrations.
     
     Returns:
@@ -1,6 +1,5 @@
 """Enhanced Plaid API routes with staging workflow."""
 from fastapi import APIRouter, HTTPException, Depends, Query, Request, Body, Response
-from fastapi.responses import PlainTextResponse, JSONResponse
 from pydantic import BaseModel, field_validator
 from typing import Optional, List, Literal
 from datetime import date, datetime
@@ -10,6 +9,7 @@ import json
 import os
 import inspect
 
+from ..core.responses import FastJSONResponse
 from ..services.plaid_service import PlaidService
 from ..services.plaid_import_service import PlaidImportService
 from ..models.institution_item import InstitutionItem
@@ -324,7 +324,7 @@ def fix_atm_transactions(db: Session = Depends(get_database)):
         updated_count = 0
         for txn_id in atm_ids:
             result = db.execute(
-                text("UPDATE transactions SET txn_type = 'expense', amount = -ABS(amount) WHERE id = :txn_id AND txn_type = 'income'"),
+                text("UPDATE transactions SET txn_type = 'expense', amount = -ABS(amount), amount_cents = -ABS(amount_cents), updated_at = CURRENT_TIMESTAMP WHERE id = :txn_id AND txn_type = 'income'"),
                 {"txn_id": txn_id}
             )
             if result.rowcount > 0:
@@ -550,11 +550,9 @@ def get_staging_transactions(
         }
     }
     
-    # Return with no-cache headers to prevent stale data issues
-    return JSONResponse(
-        content=response_data,
-        headers={"Cache-Control": "no-store, no-cache, must-revalidate"}
-    )
+    # Freshness is handled by ETagMiddleware: every write to staging rows
+    # changes the ETag, and clients must revalidate before reuse
+    return FastJSONResponse(content=response_data)
 
 
 @router.get("/imports/{import_id}/staging/audit")
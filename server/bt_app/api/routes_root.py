@@ -1,5 +1,5 @@
 """Root API router that includes all other routers."""
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, FastAPI
 from sqlalchemy.orm import Session
 # from .routes_plaid import router as plaid_router  # DISABLED - using enhanced router
 from .routes_plaid_enhanced import router as plaid_enhanced_router
@@ -18,32 +18,49 @@ from .routes_dashboard import router as dashboard_router
 from .routes_search import router as search_router
 from .routes_balances import router as balances_router
 from .routes_integrations import router as integrations_router
+from .routes_batch import router as batch_router
 from .deps import get_database
 
+# (router, prefix under /api, tags), mounted in this order
+# ("/plaid" used to be routes_plaid; disabled in favor of the enhanced router)
+API_ROUTERS = (
+    (plaid_enhanced_router, "/plaid", ["plaid-enhanced"]),
+    (sync_router, "/sync", ["sync"]),
+    (transactions_router, "/transactions", ["transactions"]),
+    (rules_router, "/rules", ["rules"]),
+    (uploads_router, "/upload", ["uploads"]),
+    (summary_router, "/summary", ["summary"]),
+    (budgets_router, "/budgets", ["budgets"]),
+    (import_router, "/import", ["import"]),
+    (income_router, "/income", ["income"]),
+    (analytics_router, "/analytics", ["analytics"]),
+    (analytics_freq_router, "/analytics", ["analytics"]),
+    (analytics_simple_router, "/analytics", ["analytics-simple"]),
+    (dashboard_router, "/dashboard", ["dashboard"]),
+    (search_router, "/transactions", ["search"]),
+    (balances_router, "/balances", ["balances"]),  # Account balances endpoints
+    (integrations_router, "/integrations", ["integrations"]),  # External integrations (NDAX, etc)
+    (batch_router, "/batch", ["batch"]),  # Several GETs in one round trip
+)
+
+# Routes defined in this module (health, debug, refresh alias)
 api_router = APIRouter()
 
-# Include all routers with their prefixes
-# api_router.include_router(plaid_router, prefix="/plaid", tags=["plaid"])  # Disabled in favor of enhanced
-api_router.include_router(plaid_enhanced_router, prefix="/plaid", tags=["plaid-enhanced"])
-api_router.include_router(sync_router, prefix="/sync", tags=["sync"])
-api_router.include_router(transactions_router, prefix="/transactions", tags=["transactions"])
-api_router.include_router(rules_router, prefix="/rules", tags=["rules"])
-api_router.include_router(uploads_router, prefix="/upload", tags=["uploads"])
-api_router.include_router(summary_router, prefix="/summary", tags=["summary"])
-api_router.include_router(budgets_router, prefix="/budgets", tags=["budgets"])
-api_router.include_router(import_router, prefix="/import", tags=["import"])
-api_router.include_router(income_router, prefix="/income", tags=["income"])
-api_router.include_router(analytics_router, prefix="/analytics", tags=["analytics"])
-api_router.include_router(analytics_freq_router, prefix="/analytics", tags=["analytics"])
-api_router.include_router(analytics_simple_router, prefix="/analytics", tags=["analytics-simple"])
-api_router.include_router(dashboard_router, prefix="/dashboard", tags=["dashboard"])
-api_router.include_router(search_router, prefix="/transactions", tags=["search"])
-api_router.include_router(balances_router, prefix="/balances", tags=["balances"])  # Account balances endpoints
-api_router.include_router(integrations_router, prefix="/integrations", tags=["integrations"])  # External integrations (NDAX, etc)
+
+def include_api_routers(app: FastAPI, prefix: str = "/api") -> None:
+    """Mount every API router, then this module's own routes, under ``prefix``.
+
+    The routers are included on the app directly rather than nested in
+    ``api_router``: FastAPI rebuilds every route (and its pydantic
+    adapters) on each ``include_router``, which dominates startup time.
+    """
+    for router, router_prefix, tags in API_ROUTERS:
+        app.include_router(router, prefix=prefix + router_prefix, tags=tags)
+    app.include_router(api_router, prefix=prefix)
 
 
 @api_router.get("/health")
-async def health_check():
+def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
 
@@ -67,7 +84,7 @@ def db_debug(session: Session = Depends(get_database)):
 
 # Convenience refresh endpoint
 @api_router.post("/refresh")
-async def refresh_data():
+def refresh_data():
     """Alias for /summary/refresh for convenience."""
     from .routes_summary import refresh_data as summary_refresh
     from .deps import get_database
@@ -77,7 +94,7 @@ async def refresh_data():
     # Get a database session
     db = next(get_database())
     try:
-        return await summary_refresh(db)
+        return summary_refresh(db)
     finally:
         db.close()
 
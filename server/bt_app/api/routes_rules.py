@@ -17,7 +17,7 @@ router = APIRouter()
 
 
 @router.get("", response_model=List[MerchantRuleSchema])
-async def get_rules(
+def get_rules(
     db: Session = Depends(get_database)
 ) -> List[MerchantRuleSchema]:
     """Get all merchant mapping rules.
@@ -38,7 +38,7 @@ async def get_rules(
 
 
 @router.post("", response_model=RuleApplicationResult)
-async def create_rule(
+def create_rule(
     rule_data: MerchantRuleCreate,
     db: Session = Depends(get_database)
 ) -> RuleApplicationResult:
@@ -73,7 +73,7 @@ async def create_rule(
 
 
 @router.put("/{rule_id}", response_model=RuleApplicationResult)
-async def update_rule(
+def update_rule(
     rule_id: int,
     rule_data: MerchantRuleUpdate,
     db: Session = Depends(get_database)
@@ -117,7 +117,7 @@ async def update_rule(
 
 
 @router.delete("/{rule_id}")
-async def delete_rule(
+def delete_rule(
     rule_id: int,
     db: Session = Depends(get_database)
 ) -> dict:
@@ -147,7 +147,7 @@ async def delete_rule(
 
 
 @router.post("/{rule_id}/apply", response_model=RuleApplicationResult)
-async def apply_rule_to_history(
+def apply_rule_to_history(
     rule_id: int,
     db: Session = Depends(get_database)
 ) -> RuleApplicationResult:
@@ -179,7 +179,7 @@ async def apply_rule_to_history(
 
 
 @router.post("/bulk-assign")
-async def bulk_assign_rules(
+def bulk_assign_rules(
     rules_data: List[dict],
     db: Session = Depends(get_database)
 ):
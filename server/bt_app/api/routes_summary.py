@@ -1,10 +1,9 @@
 """Summary and dashboard API routes."""
 from typing import Dict, Any, List, Optional
 from datetime import date, datetime, timedelta
-from decimal import Decimal
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, extract, desc
+from sqlalchemy import func, and_, desc, text
 
 from ..models.transaction import Transaction
 from ..models.budget import Budget
@@ -12,14 +11,17 @@ from ..models.category import Category
 from ..models.account import Account
 from ..services.plaid_service import PlaidService
 from ..services.mapping_service import MappingService
+from ..services.monthly_aggregates import CATEGORY_CUBE, cube_source
+from ..core.parallel import DeadlineExceeded, run_parallel_reads
 from .deps import get_database
 from .routes_summary_income import get_income_summary
+from ..utils.money import from_cents
 
 router = APIRouter()
 
 
 @router.get("")
-async def get_summary(
+def get_summary(
     month: Optional[str] = Query(None, description="Month in YYYY-MM format"),
     db: Session = Depends(get_database)
 ) -> Dict[str, Any]:
@@ -46,51 +48,31 @@ async def get_summary(
         else:
             month_end = date(year, month_num + 1, 1) - timedelta(days=1)
         
-        # Get monthly totals for the last 12 months
-        monthly_totals = _get_monthly_totals(db)
-        
-        # Get budget vs actual for selected month
-        budget_vs_actual = _get_budget_vs_actual(db, month, month_start, month_end)
-        
-        # Get top categories for selected month
-        top_categories = _get_top_categories(db, month_start, month_end)
-        
-        # Get top merchants for selected month
-        top_merchants = _get_top_merchants(db, month_start, month_end)
-        
-        # Get unmapped transaction count (expenses only)
-        unmapped_count = db.query(Transaction).filter(
-            and_(
-                Transaction.category_id.is_(None),
-                Transaction.merchant_norm.isnot(None),
-                Transaction.merchant_norm != "",
-                Transaction.txn_type == "expense"
-            )
-        ).count()
-        
-        # Get account summaries
-        account_summaries = _get_account_summaries(db, month_start, month_end)
-        
-        # Get income summary for selected month
-        income_summary = get_income_summary(db, month_start, month_end)
+        # The sub-queries are independent; run them side by side on pooled
+        # read connections under one deadline
+        parts = run_parallel_reads(db, {
+            "monthly_totals": _get_monthly_totals,
+            "budget_vs_actual": lambda s: _get_budget_vs_actual(s, month, month_start, month_end),
+            "top_categories": lambda s: _get_top_categories(s, month_start, month_end),
+            "top_merchants": lambda s: _get_top_merchants(s, month_start, month_end),
+            "unmapped_count": _get_unmapped_count,
+            "account_summaries": lambda s: _get_account_summaries(s, month_start, month_end),
+            "income_summary": lambda s: get_income_summary(s, month_start, month_end),
+        })
         
         return {
             "month": month,
-            "monthly_totals": monthly_totals,
-            "budget_vs_actual": budget_vs_actual,
-            "top_categories": top_categories,
-            "top_merchants": top_merchants,
-            "unmapped_count": unmapped_count,
-            "account_summaries": account_summaries,
-            "income_summary": income_summary
+            **parts
         }
         
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/refresh")
-async def refresh_data(
+def refresh_data(
     db: Session = Depends(get_database)
 ) -> Dict[str, Any]:
     """Refresh all data: sync Plaid transactions and apply mappings.
@@ -135,48 +117,25 @@ def _get_monthly_totals(db: Session, months: int = 12) -> List[Dict[str, Any]]:
     end_date = date.today()
     start_date = date(end_date.year, end_date.month, 1) - timedelta(days=30 * (months - 1))
     
-    # Query monthly totals separately for expenses and income
-    expense_query = db.query(
-        extract('year', Transaction.posted_date).label('year'),
-        extract('month', Transaction.posted_date).label('month'),
-        func.sum(func.abs(Transaction.amount)).label('total')
-    ).filter(
-        and_(
-            Transaction.posted_date >= start_date,
-            Transaction.posted_date <= end_date,
-            Transaction.txn_type == 'expense'
-        )
-    ).group_by(
-        extract('year', Transaction.posted_date),
-        extract('month', Transaction.posted_date)
-    ).all()
-    
-    income_query = db.query(
-        extract('year', Transaction.posted_date).label('year'),
-        extract('month', Transaction.posted_date).label('month'),
-        func.sum(Transaction.amount).label('total')
-    ).filter(
-        and_(
-            Transaction.posted_date >= start_date,
-            Transaction.posted_date <= end_date,
-            Transaction.txn_type == 'income'
-        )
-    ).group_by(
-        extract('year', Transaction.posted_date),
-        extract('month', Transaction.posted_date)
-    ).all()
-    
-    # Combine results
-    totals = {}
-    for row in expense_query:
-        key = f"{int(row.year)}-{int(row.month):02d}"
-        totals[key] = {"spending": float(row.total or 0), "income": 0}
+    # Monthly expense and income totals from the category cube
+    source, params = cube_source(CATEGORY_CUBE, start_date, end_date)
+    rows = db.execute(text(f"""
+        SELECT
+            month,
+            SUM(CASE WHEN txn_type = 'expense' THEN abs_amount_cents END) AS spending,
+            SUM(CASE WHEN txn_type = 'income' THEN amount_cents END) AS income
+        FROM ({source}) m
+        WHERE txn_type IN ('expense', 'income')
+        GROUP BY month
+    """), params).fetchall()
     
-    for row in income_query:
-        key = f"{int(row.year)}-{int(row.month):02d}"
-        if key not in totals:
-            totals[key] = {"spending": 0, "income": 0}
-        totals[key]["income"] = float(row.total or 0)
+    totals = {
+        row.month: {
+            "spending": from_cents(row.spending) if row.spending is not None else 0,
+            "income": from_cents(row.income) if row.income is not None else 0,
+        }
+        for row in rows
+    }
     
     results = []
     for month in sorted(totals.keys()):
@@ -190,6 +149,18 @@ def _get_monthly_totals(db: Session, months: int = 12) -> List[Dict[str, Any]]:
     return results
 
 
+def _get_unmapped_count(db: Session) -> int:
+    """Count categorizable expenses that have no category yet."""
+    return db.query(Transaction).filter(
+        and_(
+            Transaction.category_id.is_(None),
+            Transaction.merchant_norm.isnot(None),
+            Transaction.merchant_norm != "",
+            Transaction.txn_type == "expense"
+        )
+    ).count()
+
+
 def _get_budget_vs_actual(db: Session, month: str, month_start: date, month_end: date) -> Dict[str, Any]:
     """Get budget vs actual for a specific month.
     
@@ -212,28 +183,29 @@ def _get_budget_vs_actual(db: Session, month: str, month_start: date, month_end:
     # Get actual spending by category for the month
     actual_spending = db.query(
         Transaction.category_id,
-        func.sum(func.abs(Transaction.amount)).label('actual_amount')
+        func.sum(func.abs(Transaction.amount_cents)).label('actual_cents')
     ).filter(
         and_(
             Transaction.posted_date >= month_start,
             Transaction.posted_date <= month_end,
-            Transaction.amount < 0,  # Only expenses
+            Transaction.amount_cents < 0,  # Only expenses
             Transaction.category_id.isnot(None)
         )
     ).group_by(Transaction.category_id).all()
     
-    # Convert to dictionary
-    actual_dict = {row.category_id: float(row.actual_amount) for row in actual_spending}
+    # Convert to dictionary (integer cents)
+    actual_dict = {row.category_id: row.actual_cents or 0 for row in actual_spending}
     
     # Build budget vs actual summary
     budget_items = []
-    total_budget = Decimal('0')
-    total_actual = Decimal('0')
+    total_budget = 0
+    total_actual = 0
     
     for budget, category in budgets:
-        actual = Decimal(str(actual_dict.get(budget.category_id, 0)))
-        variance = actual - budget.amount
-        variance_percent = float((variance / budget.amount) * 100) if budget.amount > 0 else 0
+        budget_cents = budget.amount_cents or 0
+        actual = actual_dict.get(budget.category_id, 0)
+        variance = actual - budget_cents
+        variance_percent = (variance / budget_cents) * 100 if budget_cents > 0 else 0
         
         budget_items.append({
             "category": {
@@ -241,14 +213,14 @@ def _get_budget_vs_actual(db: Session, month: str, month_start: date, month_end:
                 "name": category.name,
                 "color": category.color
             },
-            "budget_amount": float(budget.amount),
-            "actual_amount": float(actual),
-            "variance": float(variance),
+            "budget_amount": from_cents(budget_cents),
+            "actual_amount": from_cents(actual),
+            "variance": from_cents(variance),
             "variance_percent": variance_percent,
-            "is_over_budget": actual > budget.amount
+            "is_over_budget": actual > budget_cents
         })
         
-        total_budget += budget.amount
+        total_budget += budget_cents
         total_actual += actual
     
     total_variance = total_actual - total_budget
@@ -256,10 +228,10 @@ def _get_budget_vs_actual(db: Session, month: str, month_start: date, month_end:
     return {
         "month": month,
         "budget_items": budget_items,
-        "total_budget": float(total_budget),
-        "total_actual": float(total_actual),
-        "total_variance": float(total_variance),
-        "total_variance_percent": float((total_variance / total_budget) * 100) if total_budget > 0 else 0
+        "total_budget": from_cents(total_budget),
+        "total_actual": from_cents(total_actual),
+        "total_variance": from_cents(total_variance),
+        "total_variance_percent": (total_variance / total_budget) * 100 if total_budget > 0 else 0
     }
 
 
@@ -279,18 +251,18 @@ def _get_top_categories(db: Session, start_date: date, end_date: date, limit: in
         Category.id,
         Category.name,
         Category.color,
-        func.sum(func.abs(Transaction.amount)).label('total_amount'),
+        func.sum(func.abs(Transaction.amount_cents)).label('total_cents'),
         func.count(Transaction.id).label('transaction_count')
     ).select_from(Category).join(Transaction, Category.id == Transaction.category_id).filter(
         and_(
             Transaction.posted_date >= start_date,
             Transaction.posted_date <= end_date,
-            Transaction.amount < 0  # Only expenses
+            Transaction.amount_cents < 0  # Only expenses
         )
     ).group_by(
         Category.id, Category.name, Category.color
     ).order_by(
-        desc(func.sum(func.abs(Transaction.amount)))
+        desc(func.sum(func.abs(Transaction.amount_cents)))
     ).limit(limit).all()
     
     results = []
@@ -301,7 +273,7 @@ def _get_top_categories(db: Session, start_date: date, end_date: date, limit: in
                 "name": row.name,
                 "color": row.color
             },
-            "total_amount": float(row.total_amount),
+            "total_amount": from_cents(row.total_cents),
             "transaction_count": row.transaction_count
         })
     
@@ -322,27 +294,27 @@ def _get_top_merchants(db: Session, start_date: date, end_date: date, limit: int
     """
     query = db.query(
         Transaction.merchant_norm,
-        func.sum(func.abs(Transaction.amount)).label('total_amount'),
+        func.sum(func.abs(Transaction.amount_cents)).label('total_cents'),
         func.count(Transaction.id).label('transaction_count')
     ).filter(
         and_(
             Transaction.posted_date >= start_date,
             Transaction.posted_date <= end_date,
-            Transaction.amount < 0,  # Only expenses
+            Transaction.amount_cents < 0,  # Only expenses
             Transaction.merchant_norm.isnot(None),
             Transaction.merchant_norm != ""
         )
     ).group_by(
         Transaction.merchant_norm
     ).order_by(
-        desc(func.sum(func.abs(Transaction.amount)))
+        desc(func.sum(func.abs(Transaction.amount_cents)))
     ).limit(limit).all()
     
     results = []
     for row in query:
         results.append({
             "merchant_norm": row.merchant_norm,
-            "total_amount": float(row.total_amount),
+            "total_amount": from_cents(row.total_cents),
             "transaction_count": row.transaction_count
         })
     
@@ -365,7 +337,7 @@ def _get_account_summaries(db: Session, start_date: date, end_date: date) -> Lis
         Account.name,
         Account.mask,
         Account.account_type,
-        func.sum(func.abs(Transaction.amount)).label('total_amount'),
+        func.sum(func.abs(Transaction.amount_cents)).label('total_cents'),
         func.count(Transaction.id).label('transaction_count')
     ).select_from(Account).join(Transaction, Account.id == Transaction.account_id).filter(
         and_(
@@ -385,7 +357,7 @@ def _get_account_summaries(db: Session, start_date: date, end_date: date) -> Lis
                 "mask": row.mask,
                 "account_type": row.account_type
             },
-            "total_amount": float(row.total_amount),
+            "total_amount": from_cents(row.total_cents),
             "transaction_count": row.transaction_count
         })
     
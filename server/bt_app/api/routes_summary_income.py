@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, desc
 
 from ..models.transaction import Transaction
+from ..utils.money import from_cents
 
 
 def get_income_summary(db: Session, start_date: date, end_date: date) -> Dict[str, Any]:
@@ -20,7 +21,7 @@ def get_income_summary(db: Session, start_date: date, end_date: date) -> Dict[st
     """
     # Get total income
     total_income = db.query(
-        func.sum(Transaction.amount).label('total')
+        func.sum(Transaction.amount_cents).label('total')
     ).filter(
         and_(
             Transaction.posted_date >= start_date,
@@ -32,7 +33,7 @@ def get_income_summary(db: Session, start_date: date, end_date: date) -> Dict[st
     # Get income by source
     income_by_source = db.query(
         Transaction.merchant_norm,
-        func.sum(Transaction.amount).label('total'),
+        func.sum(Transaction.amount_cents).label('total'),
         func.count(Transaction.id).label('count')
     ).filter(
         and_(
@@ -43,12 +44,12 @@ def get_income_summary(db: Session, start_date: date, end_date: date) -> Dict[st
     ).group_by(
         Transaction.merchant_norm
     ).order_by(
-        desc(func.sum(Transaction.amount))
+        desc(func.sum(Transaction.amount_cents))
     ).limit(10).all()
     
     # Get total expenses for net calculation
     total_expenses = db.query(
-        func.sum(func.abs(Transaction.amount)).label('total')
+        func.sum(func.abs(Transaction.amount_cents)).label('total')
     ).filter(
         and_(
             Transaction.posted_date >= start_date,
@@ -58,13 +59,13 @@ def get_income_summary(db: Session, start_date: date, end_date: date) -> Dict[st
     ).scalar() or 0
     
     return {
-        "total_income": float(total_income),
-        "total_expenses": float(total_expenses),
-        "net_savings": float(total_income) - float(total_expenses),
+        "total_income": from_cents(total_income),
+        "total_expenses": from_cents(total_expenses),
+        "net_savings": from_cents(total_income - total_expenses),
         "income_by_source": [
             {
                 "source": row.merchant_norm or "Unknown",
-                "total": float(row.total),
+                "total": from_cents(row.total),
                 "count": row.count
             }
             for row in income_by_source
@@ -11,7 +11,7 @@ router = APIRouter()
 
 
 @router.post("/amex")
-async def sync_amex_transactions(
+def sync_amex_transactions(
     db: Session = Depends(get_database)
 ) -> Dict[str, Any]:
     """Sync transactions from all connected Amex accounts via Plaid.
@@ -28,7 +28,7 @@ async def sync_amex_transactions(
 
 
 @router.post("/item/{item_id}")
-async def sync_item_transactions(
+def sync_item_transactions(
     item_id: int,
     db: Session = Depends(get_database)
 ) -> Dict[str, Any]:
@@ -49,7 +49,7 @@ async def sync_item_transactions(
 
 
 @router.post("/normalize")
-async def normalize_transactions(
+def normalize_transactions(
     since_date: Optional[str] = None,
     db: Session = Depends(get_database)
 ) -> Dict[str, Any]:
@@ -70,7 +70,7 @@ async def normalize_transactions(
 
 
 @router.post("/map")
-async def apply_mapping_rules(
+def apply_mapping_rules(
     since_date: Optional[str] = None,
     db: Session = Depends(get_database)
 ) -> Dict[str, Any]:
@@ -1,6 +1,9 @@
 """System and app mode API routes."""
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import Response
+from ..core.cache import result_cache
 from ..core.config import settings
+from ..core.metrics import PROMETHEUS_CONTENT_TYPE, render_prometheus
 
 router = APIRouter(tags=["system"])
 
@@ -38,3 +41,42 @@ def health_check():
         "mode": "demo" if settings.is_demo_mode else "production",
     }
 
+
+@router.get("/cache")
+def get_cache_stats():
+    """Result cache hit/miss metrics and occupancy."""
+    return result_cache.stats()
+
+
+@router.get("/metrics")
+def get_metrics():
+    """Per-route latency, SQL and result cache metrics in the Prometheus text format."""
+    return Response(render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def _require_profiler_token(x_profile: str = Header(None)) -> None:
+    from ..core.profiler import token_matches
+
+    if not settings.profiler_token:
+        raise HTTPException(status_code=404, detail="Profiling is not enabled")
+    if not token_matches(x_profile):
+        raise HTTPException(status_code=403, detail="Invalid profiler token")
+
+
+@router.get("/profiles", dependencies=[Depends(_require_profiler_token)])
+def list_profiles():
+    """Stored request profiles, newest first (send the profiler token as X-Profile)."""
+    from ..core import profiler
+
+    return profiler.list_profiles()
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(_require_profiler_token)])
+def get_profile(profile_id: str):
+    """One stored request profile: profiler output, top allocations and slowest SQL with plans."""
+    from ..core import profiler
+
+    report = profiler.load_profile(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return report
@@ -2,14 +2,12 @@
 from typing import List, Optional
 from datetime import date
 from decimal import Decimal
-import time
 import io
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, or_, func, desc, text
-import pandas as pd
 
 from ..models.transaction import Transaction
 from ..models.account import Account
@@ -22,10 +20,13 @@ from ..schemas.transactions import (
     UnmappedMerchant
 )
 from ..services.mapping_service import MappingService
+from ..services.transaction_rows import AMOUNT_TEXT, transaction_rows
+from ..core.responses import FastJSONResponse
 from .deps import get_database
 from ..core.config import settings
 from ..utils.account_mapping import get_source_from_account_id
 from ..utils.query import parse_date_range, parse_pagination, parse_txn_type, parse_bool, get_any
+from ..utils.money import to_cents
 import logging
 
 logger = logging.getLogger(__name__)
@@ -44,7 +45,7 @@ def debug_db():
 
 
 @router.get("", response_model=TransactionList)
-async def get_transactions(
+def get_transactions(
     request: Request,
     db: Session = Depends(get_database)
 ) -> TransactionList:
@@ -54,8 +55,6 @@ async def get_transactions(
         Paginated list of transactions
     """
     try:
-        start_time = time.time()
-        
         # Parse query parameters safely
         qp = request.query_params
         # Support synonyms for txn_type
@@ -154,10 +153,10 @@ async def get_transactions(
                 )
         if amount_min is not None:
             logger.info(f"Filtering by amount_min: {amount_min}")
-            query = query.filter(func.abs(Transaction.amount) >= amount_min)
+            query = query.filter(func.abs(Transaction.amount_cents) >= to_cents(amount_min))
         if amount_max is not None:
             logger.info(f"Filtering by amount_max: {amount_max}")
-            query = query.filter(func.abs(Transaction.amount) <= amount_max)
+            query = query.filter(func.abs(Transaction.amount_cents) <= to_cents(amount_max))
         if source:
             query = query.filter(Transaction.source == source)
         if cleaned_merchant:
@@ -173,27 +172,21 @@ async def get_transactions(
         
         # Apply pagination and ordering
         offset = (page - 1) * per_page
-        transactions = query.options(
-            joinedload(Transaction.category),
-            joinedload(Transaction.subcategory)
-        ).order_by(desc(Transaction.posted_date), desc(Transaction.id)).offset(offset).limit(per_page).all()
+        page_query = query.order_by(
+            desc(Transaction.posted_date), desc(Transaction.id)
+        ).offset(offset).limit(per_page)
         
         # Calculate pagination info
         pages = (total + per_page - 1) // per_page
         
-        # Calculate timing
-        query_time_ms = int((time.time() - start_time) * 1000)
-        
-        result = TransactionList(
-            transactions=transactions,
-            total=total,
-            page=page,
-            per_page=per_page,
-            pages=pages
-        )
-        
-        # Add timing info as custom header (will be visible in dev tools)
-        return result
+        # Rows come straight from column tuples; same shape as TransactionList
+        return FastJSONResponse({
+            "transactions": transaction_rows(db, page_query),
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "pages": pages
+        })
         
     except HTTPException:
         raise
@@ -203,7 +196,7 @@ async def get_transactions(
 
 
 @router.post("", response_model=TransactionSchema)
-async def create_transaction(
+def create_transaction(
     transaction_data: TransactionCreate,
     db: Session = Depends(get_database)
 ) -> TransactionSchema:
@@ -288,7 +281,7 @@ async def create_transaction(
 
 
 @router.put("/{transaction_id}")
-async def update_transaction(
+def update_transaction(
     transaction_id: int,
     update_data: TransactionUpdate,
     db: Session = Depends(get_database)
@@ -340,7 +333,7 @@ async def update_transaction(
 
 
 @router.delete("/{transaction_id}")
-async def delete_transaction(
+def delete_transaction(
     transaction_id: int,
     db: Session = Depends(get_database)
 ) -> dict:
@@ -369,7 +362,7 @@ async def delete_transaction(
 
 
 @router.get("/unmapped/pairs")
-async def get_unmapped_pairs(
+def get_unmapped_pairs(
     db: Session = Depends(get_database),
     limit: int = Query(100, ge=1, le=500)
 ):
@@ -410,7 +403,7 @@ async def get_unmapped_pairs(
 
 
 @router.get("/unmapped", response_model=List[UnmappedMerchant])
-async def get_unmapped_merchants(
+def get_unmapped_merchants(
     db: Session = Depends(get_database),
     limit: int = Query(100, ge=1, le=500)
 ) -> List[UnmappedMerchant]:
@@ -432,7 +425,7 @@ async def get_unmapped_merchants(
 
 
 @router.get("/accounts")
-async def get_accounts(
+def get_accounts(
     db: Session = Depends(get_database)
 ) -> List[dict]:
     """Get all accounts for filtering.
@@ -464,7 +457,7 @@ class BulkCategoryUpdateRequest(BaseModel):
     category_id: int
 
 @router.get("/debug-search-vs-bulk/{transaction_id}")
-async def debug_search_vs_bulk(
+def debug_search_vs_bulk(
     transaction_id: int,
     db: Session = Depends(get_database)
 ):
@@ -504,7 +497,7 @@ async def debug_search_vs_bulk(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/similar-count/{transaction_id}")
-async def get_similar_transaction_count(
+def get_similar_transaction_count(
     transaction_id: int,
     db: Session = Depends(get_database)
 ):
@@ -521,27 +514,25 @@ async def get_similar_transaction_count(
             Transaction.id != transaction_id
         ).count()
         
-        # Get ALL similar transactions for full preview
-        all_similar_transactions = db.query(Transaction).filter(
+        # Get ALL similar transactions for full preview, as plain tuples
+        all_similar_transactions = db.query(
+            Transaction.id,
+            func.strftime('%Y-%m-%d', Transaction.posted_date),
+            AMOUNT_TEXT,
+            Transaction.description_raw,
+            Transaction.merchant_raw
+        ).filter(
             Transaction.merchant_raw == transaction.merchant_raw,
             Transaction.id != transaction_id
         ).order_by(desc(Transaction.posted_date)).all()
         
-        return {
+        keys = ("id", "posted_date", "amount", "description_raw", "merchant_raw")
+        return FastJSONResponse({
             "similar_count": similar_count,
             "merchant_norm": transaction.merchant_norm,
             "merchant_raw": transaction.merchant_raw,
-            "all_transactions": [
-                {
-                    "id": t.id,
-                    "posted_date": str(t.posted_date),
-                    "amount": str(t.amount),
-                    "description_raw": t.description_raw,
-                    "merchant_raw": t.merchant_raw
-                }
-                for t in all_similar_transactions
-            ]
-        }
+            "all_transactions": [dict(zip(keys, row)) for row in all_similar_transactions]
+        })
         
     except HTTPException:
         raise
@@ -549,7 +540,7 @@ async def get_similar_transaction_count(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/bulk-category-update")
-async def bulk_category_update(
+def bulk_category_update(
     request: BulkCategoryUpdateRequest,
     db: Session = Depends(get_database)
 ):
@@ -591,7 +582,7 @@ class BulkUpdateByMerchantRequest(BaseModel):
     category_id: int
 
 @router.post("/bulk-update-by-merchant")
-async def bulk_update_by_merchant(
+def bulk_update_by_merchant(
     request: BulkUpdateByMerchantRequest,
     db: Session = Depends(get_database)
 ):
@@ -626,7 +617,7 @@ async def bulk_update_by_merchant(
 
 
 @router.get("/categories")
-async def get_categories(
+def get_categories(
     request: Request,
     db: Session = Depends(get_database)
 ) -> List[dict]:
@@ -667,7 +658,7 @@ async def get_categories(
 
 
 @router.get("/debug/db")
-async def debug_database(db: Session = Depends(get_database)) -> dict:
+def debug_database(db: Session = Depends(get_database)) -> dict:
     """Debug endpoint to check database counts and paths."""
     try:
         # Get transaction counts by type
@@ -695,7 +686,7 @@ async def debug_database(db: Session = Depends(get_database)) -> dict:
 
 
 @router.post("/clear-income")
-async def clear_income_transactions(db: Session = Depends(get_database)) -> dict:
+def clear_income_transactions(db: Session = Depends(get_database)) -> dict:
     """Clear all income transactions to allow re-import."""
     try:
         deleted_count = db.query(Transaction).filter(Transaction.txn_type == 'income').count()
@@ -712,7 +703,7 @@ async def clear_income_transactions(db: Session = Depends(get_database)) -> dict
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/fix-plaid-types")
-async def fix_plaid_transaction_types(db: Session = Depends(get_database)) -> dict:
+def fix_plaid_transaction_types(db: Session = Depends(get_database)) -> dict:
     """Fix wrongly committed Plaid transactions: charges→expenses, refunds→income."""
     try:
         from sqlalchemy import text
@@ -721,7 +712,9 @@ async def fix_plaid_transaction_types(db: Session = Depends(get_database)) -> di
         charges_fixed = db.execute(text("""
             UPDATE transactions 
             SET txn_type = 'expense',
-                amount = -ABS(amount)
+                amount = -ABS(amount),
+                amount_cents = -ABS(amount_cents),
+                updated_at = CURRENT_TIMESTAMP
             WHERE source = 'Amex'
               AND txn_type = 'income' 
               AND amount > 0
@@ -732,7 +725,9 @@ async def fix_plaid_transaction_types(db: Session = Depends(get_database)) -> di
         refunds_fixed = db.execute(text("""
             UPDATE transactions
             SET txn_type = 'income',
-                amount = ABS(amount)  
+                amount = ABS(amount),
+                amount_cents = ABS(amount_cents),
+                updated_at = CURRENT_TIMESTAMP
             WHERE source = 'Amex'
               AND txn_type = 'expense'
               AND amount < 0
@@ -751,11 +746,13 @@ async def fix_plaid_transaction_types(db: Session = Depends(get_database)) -> di
         raise HTTPException(status_code=500, detail=f"Failed to fix transaction types: {str(e)}")
 
 @router.get("/export/excel")
-async def export_transactions_excel(
+def export_transactions_excel(
     request: Request,
     db: Session = Depends(get_database)
 ):
     """Export all transactions to Excel file."""
+    import pandas as pd
+
     try:
         # Get all transactions with categories
         query = db.query(Transaction).options(
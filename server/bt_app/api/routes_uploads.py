@@ -1,6 +1,7 @@
 """File upload API routes."""
 from typing import Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from ..services.csv_importer import CSVImporter
@@ -35,7 +36,7 @@ async def preview_csv(
         content_str = content.decode(encoding)
         
         csv_importer = CSVImporter(db)
-        preview = csv_importer.preview_csv(content_str, delimiter, encoding)
+        preview = await run_in_threadpool(csv_importer.preview_csv, content_str, delimiter, encoding)
         
         return preview
         
@@ -97,8 +98,8 @@ async def import_csv(
             column_mapping["credit"] = credit_column
         
         csv_importer = CSVImporter(db)
-        result = csv_importer.import_csv(
-            content_str, account_id, column_mapping, delimiter, encoding, skip_header
+        result = await run_in_threadpool(
+            csv_importer.import_csv, content_str, account_id, column_mapping, delimiter, encoding, skip_header
         )
         
         return result
@@ -131,7 +132,7 @@ async def preview_excel(
         content = await file.read()
         
         excel_importer = ExcelImporter(db)
-        preview = excel_importer.preview_excel(content, sheet_name)
+        preview = await run_in_threadpool(excel_importer.preview_excel, content, sheet_name)
         
         return preview
         
@@ -161,7 +162,7 @@ async def import_budgets_excel(
         content = await file.read()
         
         excel_importer = ExcelImporter(db)
-        result = excel_importer.import_budgets(content, sheet_name)
+        result = await run_in_threadpool(excel_importer.import_budgets, content, sheet_name)
         
         return result
         
@@ -191,7 +192,7 @@ async def import_rules_excel(
         content = await file.read()
         
         excel_importer = ExcelImporter(db)
-        result = excel_importer.import_merchant_rules(content, sheet_name)
+        result = await run_in_threadpool(excel_importer.import_merchant_rules, content, sheet_name)
         
         return result
         
@@ -200,7 +201,7 @@ async def import_rules_excel(
 
 
 @router.get("/template/{template_type}")
-async def download_template(
+def download_template(
     template_type: str,
     db: Session = Depends(get_database)
 ):
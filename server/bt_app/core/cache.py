@@ -0,0 +1,322 @@
+"""Write-generation invalidated result cache for read-only service methods.
+
+Every engine gets per-table write generations. Any INSERT/UPDATE/DELETE that
+goes through SQLAlchemy bumps the generation of the table it writes, both
+when the statement runs and again when its transaction commits or rolls
+back. Imports, commits, rule application, manual edits and raw SQL are
+therefore all covered without each write path having to remember to
+invalidate.
+
+Writes by other processes (workers, the scheduler leader, maintenance
+scripts) never pass through this process's engine events, so entries also
+remember the shared, trigger-maintained counters of ``write_generations``
+(see ``models.write_generation``) and are served only while those match too.
+
+A cached entry remembers the generations of the tables it depends on as they
+were *before* it was computed, so a result that raced with a write is never
+served once that write is visible. Keys hold the call's bound arguments
+(defaults applied) and today's date, since ``None`` arguments commonly mean
+"the current month".
+"""
+import functools
+import inspect
+import itertools
+import re
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .metrics import record_cache_lookup
+from ..models.write_generation import GENERATION_TABLE
+
+_WRITE_RE = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+[\"`\[]?(\w+)",
+    re.IGNORECASE,
+)
+_PENDING_KEY = "bt_cache_written_tables"
+
+
+class WriteGenerations:
+    """Per-table write counters for one engine."""
+
+    def __init__(self, token: int):
+        self.token = token
+        self._lock = threading.Lock()
+        self._tables: Dict[str, int] = {}
+        self.total = 0
+
+    def bump(self, tables: Iterable[str]) -> None:
+        with self._lock:
+            for table in tables:
+                self._tables[table] = self._tables.get(table, 0) + 1
+                self.total += 1
+
+    def snapshot(self, tables: Tuple[str, ...]) -> Tuple[int, ...]:
+        get = self._tables.get
+        return tuple(get(table, 0) for table in tables)
+
+
+_tokens = itertools.count(1)
+_generations: "weakref.WeakKeyDictionary[Engine, WriteGenerations]" = weakref.WeakKeyDictionary()
+_generations_lock = threading.Lock()
+
+
+def generations_for(engine: Engine) -> WriteGenerations:
+    """Return (creating on first use) the write generations of an engine."""
+    gens = _generations.get(engine)
+    if gens is None:
+        with _generations_lock:
+            gens = _generations.get(engine)
+            if gens is None:
+                gens = _generations[engine] = WriteGenerations(next(_tokens))
+    return gens
+
+
+def bump_write_generation(engine: Engine, *tables: str) -> None:
+    """Invalidate cached results depending on ``tables`` (e.g. after out-of-band writes)."""
+    generations_for(engine).bump(tables)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _track_write(conn, cursor, statement, parameters, context, executemany):
+    match = _WRITE_RE.match(statement)
+    if match:
+        table = match.group(1).lower()
+        conn.info.setdefault(_PENDING_KEY, set()).add(table)
+        generations_for(conn.engine).bump((table,))
+
+
+def _flush_pending(conn):
+    tables = conn.info.pop(_PENDING_KEY, None)
+    if tables:
+        generations_for(conn.engine).bump(tables)
+
+
+event.listen(Engine, "commit", _flush_pending)
+event.listen(Engine, "rollback", _flush_pending)
+
+
+_counter_engines: "weakref.WeakKeyDictionary[Engine, bool]" = weakref.WeakKeyDictionary()
+
+
+def _has_shared_counters(connection: Connection) -> bool:
+    engine = connection.engine
+    if _counter_engines.get(engine):
+        return True
+    if connection.dialect.name != "sqlite":
+        return False
+    found = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (GENERATION_TABLE,)
+    ).first() is not None
+    if found:
+        _counter_engines[engine] = True
+    return found
+
+
+def shared_generations(connection: Connection, tables: Tuple[str, ...]) -> Optional[Tuple[int, ...]]:
+    """Committed cross-process generations of ``tables``, or None if the database has no counters.
+
+    Unlike ``WriteGenerations`` these see every writer of the database file.
+    """
+    if not _has_shared_counters(connection):
+        return None
+    counters = dict(connection.exec_driver_sql(f"SELECT table_name, generation FROM {GENERATION_TABLE}").all())
+    return tuple(counters.get(table, 0) for table in tables)
+
+
+def _approx_size(obj: Any, depth: int = 0) -> int:
+    """Rough deep size of a JSON-like result in bytes."""
+    size = sys.getsizeof(obj)
+    if depth > 6:
+        return size
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += _approx_size(key, depth + 1) + _approx_size(value, depth + 1)
+    elif isinstance(obj, (list, tuple, set)):
+        for item in obj:
+            size += _approx_size(item, depth + 1)
+    return size
+
+
+def _normalize(value: Any) -> Any:
+    """Hashable, order-independent form of a call argument."""
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_normalize(v) for v in value]
+        return tuple(sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items)
+    return repr(value)
+
+
+class ResultCache:
+    """Thread-safe LRU + TTL cache with an approximate memory budget.
+
+    Entries are ``key -> (generation snapshot, expires_at, size, value)``.
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 32 * 1024 * 1024, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple, Tuple[Tuple[int, ...], float, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get(self, key: Tuple, snapshot: Tuple[int, ...]) -> Tuple[bool, Any]:
+        """Return (found, value) for an entry that is still valid for ``snapshot``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] != snapshot:
+                    self.stale += 1
+                    self._drop(key)
+                elif entry[1] < time.monotonic():
+                    self.expired += 1
+                    self._drop(key)
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, entry[3]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Tuple, snapshot: Tuple[int, ...], value: Any, ttl: Optional[float] = None) -> None:
+        size = _approx_size(value)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (self.ttl_seconds if ttl is None else ttl)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (snapshot, expires_at, size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def _drop(self, key: Tuple) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry[2]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": settings.enable_result_cache,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "stale_invalidations": self.stale,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+result_cache = ResultCache(
+    max_entries=settings.result_cache_max_entries,
+    max_bytes=settings.result_cache_max_mb * 1024 * 1024,
+    ttl_seconds=settings.result_cache_ttl_seconds,
+)
+
+
+def _engine_of(session: Session) -> Optional[Engine]:
+    bind = session.get_bind()
+    if isinstance(bind, Connection):
+        return bind.engine
+    return bind
+
+
+def cached(tables: Iterable[str], ttl: Optional[float] = None) -> Callable:
+    """Cache a read-only method or route function until one of ``tables`` is written.
+
+    The session is taken from ``self.db`` for service methods or from the
+    first ``Session`` argument for route functions; it is not part of the key.
+
+    Args:
+        tables: Tables whose writes invalidate the cached result
+        ttl: Override of the default time-to-live in seconds
+    """
+    tables = tuple(sorted(tables))
+
+    def decorator(func: Callable) -> Callable:
+        name = func.__qualname__
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not settings.enable_result_cache:
+                return func(*args, **kwargs)
+            try:
+                bound = signature.bind(*args, **kwargs)
+            except TypeError:
+                return func(*args, **kwargs)  # let the call raise as usual
+            bound.apply_defaults()
+
+            session = None
+            key_args = []
+            for arg_name, value in bound.arguments.items():
+                if isinstance(value, Session):
+                    session = value
+                elif session is None and isinstance(getattr(value, "db", None), Session):
+                    session = value.db
+                else:
+                    key_args.append((arg_name, _normalize(value)))
+            if session is None:
+                return func(*args, **kwargs)
+
+            engine = _engine_of(session)
+            gens = generations_for(engine)
+            key = (gens.token, name, date.today().isoformat(), tuple(key_args))
+            # Never cache (or serve) around this session's own uncommitted writes
+            if session.new or session.dirty or session.deleted or (
+                session.in_transaction() and session.connection().info.get(_PENDING_KEY)
+            ):
+                return func(*args, **kwargs)
+
+            snapshot = gens.snapshot(tables) + (shared_generations(session.connection(), tables) or ())
+            found, value = result_cache.get(key, snapshot)
+            record_cache_lookup(found)
+            if found:
+                return value
+            value = func(*args, **kwargs)
+            result_cache.put(key, snapshot, value, ttl)
+            return value
+
+        wrapper.cache_tables = tables
+        return wrapper
+
+    return decorator
@@ -1,7 +1,7 @@
 """Application configuration."""
 import os
 from pathlib import Path
-from typing import List, Literal
+from typing import List, Literal, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -62,6 +62,45 @@ class Settings(BaseSettings):
     # Feature Flags
     enable_plaid_in_demo: bool = False
     
+    # Analytics engine (optional DuckDB mirror of transactions/categories/accounts)
+    enable_duckdb_mirror: bool = False
+    duckdb_path: str = ":memory:"
+    
+    # Result cache for read-only analytics (invalidated by table write generations)
+    enable_result_cache: bool = True
+    result_cache_ttl_seconds: int = 300
+    result_cache_max_entries: int = 512
+    result_cache_max_mb: int = 32
+    
+    # Concurrent read fan-out (summary sub-queries on pooled connections)
+    sqlite_wal: bool = True
+    parallel_read_workers: int = 4
+    summary_deadline_seconds: float = 10.0
+    
+    # Conditional GET (ETag from table write generations, 304 before the handler runs)
+    enable_etags: bool = True
+    
+    # Per-tenant SQLite shards (one database file per tenant, picked by request header)
+    enable_tenant_shards: bool = False
+    tenant_shard_dir: str = "./bt_app/tenants"
+    tenant_header: str = "X-Tenant-ID"
+    tenant_max_open_engines: int = 32
+    
+    # Background jobs: one leader process (lease row), persistent job store
+    scheduler_leader_election: bool = True
+    scheduler_lease_seconds: int = 60
+    scheduler_misfire_grace_seconds: int = 6 * 3600
+    
+    # Request metrics (/api/system/metrics, Server-Timing header, N+1 warnings)
+    enable_metrics: bool = True
+    n_plus_one_threshold: int = 10
+    
+    # On-demand request profiler (off unless a token is set; send it as X-Profile)
+    profiler_token: Optional[str] = None
+    profile_dir: str = "./bt_app/profiles"
+    profile_keep: int = 50
+    profile_slow_sql: int = 5
+    
     @property
     def is_demo_mode(self) -> bool:
         """Check if running in demo mode."""
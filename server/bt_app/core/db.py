@@ -1,26 +1,49 @@
 """Database configuration and session management."""
 import logging
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
 
 DB_URL = settings.absolute_database_url
 
-# If it's sqlite, make sure the directory exists, verify file exists and has data
-if DB_URL.startswith("sqlite:///"):
-    assert DB_URL.startswith("sqlite:///"), f"Unexpected DB_URL: {DB_URL}"
+
+def check_database() -> None:
+    """Fail loudly if the configured SQLite file is missing or empty.
+
+    Called from the app's startup probe rather than at import, so importing
+    the package (tests, scripts) never touches the filesystem.
+    """
+    if not DB_URL.startswith("sqlite:///"):
+        return
     db_path = Path(DB_URL.replace("sqlite:///", ""))  # absolute now
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    
     if not db_path.exists() or db_path.stat().st_size == 0:
         raise RuntimeError(f"SQLite file missing or empty: {db_path}")
-    
-    logging.getLogger(__name__).info("Opening SQLite: %s (size=%s)", 
+    logging.getLogger(__name__).info("Opening SQLite: %s (size=%s)",
                                      db_path, db_path.stat().st_size)
 
+
 engine = create_engine(DB_URL, connect_args={"check_same_thread": False})
+
+
+def _enable_wal(dbapi_conn, connection_record):
+    """WAL lets pooled readers run alongside each other and a writer."""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+def configure_sqlite_engine(engine) -> None:
+    """Apply the connection pragmas every file-backed SQLite engine uses."""
+    url = engine.url
+    if url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:") and settings.sqlite_wal:
+        event.listen(engine, "connect", _enable_wal)
+
+
+configure_sqlite_engine(engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -0,0 +1,138 @@
+"""Conditional GET for read endpoints, keyed on table write generations.
+
+For the GET routes listed in ``ETAG_POLICIES`` the ETag is a hash of the
+request (path, query string, ``Accept``), today's date and the write
+generations of the tables the route reads. It is computed before the
+handler runs, so a matching ``If-None-Match`` is answered with 304 at the
+cost of one read of the shared counters (in the threadpool, off the event
+loop) and no route query.
+
+The generations are the trigger-maintained ``write_generations`` counters
+(see ``models.write_generation``), which every process writing the database
+bumps, so a write through another worker, the scheduler or a script changes
+the tag everywhere and tags are valid across workers. A database without the
+counters falls back to this process's own generations plus a per-process
+token, which cannot see other processes' writes.
+"""
+import hashlib
+import os
+from datetime import date
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .cache import generations_for, shared_generations
+from .config import settings
+from .tenancy import InvalidTenant, UnknownTenant, engine_for_tenant, tenant_from_headers
+from ..services.monthly_aggregates import ANALYTICS_SOURCE_TABLES
+
+CACHE_CONTROL = "private, max-age=0, must-revalidate"
+
+# (path prefix, tables the routes under it read); first match wins
+ETAG_POLICIES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    # Persisted detection state, refreshed by background jobs after the response is sent
+    ("/api/analytics/recurring-subscriptions",
+     ANALYTICS_SOURCE_TABLES + ("detected_subscriptions", "merchant_aliases", "canonical_merchants")),
+    ("/api/analytics", ANALYTICS_SOURCE_TABLES),
+    ("/api/dashboard", ANALYTICS_SOURCE_TABLES),
+    ("/api/summary", ANALYTICS_SOURCE_TABLES + ("budgets",)),
+    ("/api/budgets", ANALYTICS_SOURCE_TABLES + ("budgets",)),
+    ("/api/transactions", ("transactions", "categories", "accounts", "merchant_rules")),
+    ("/api/balances", ("account_balances", "accounts", "institution_items")),
+    ("/api/plaid/imports", ("plaid_imports", "staging_transactions", "accounts", "categories")),
+)
+
+_PROCESS_TOKEN = os.urandom(8).hex()
+
+
+def _default_engine(scope: Scope) -> Engine:
+    return engine_for_tenant(tenant_from_headers(Headers(scope=scope)))
+
+
+# Resolves the engine whose generations describe a request's data
+engine_for_request: Callable[[Scope], Engine] = _default_engine
+
+
+def tables_for_path(path: str) -> Optional[Tuple[str, ...]]:
+    """Tables backing a GET path, or None if the path is not ETag-managed."""
+    for prefix, tables in ETAG_POLICIES:
+        if path == prefix or path.startswith(prefix + "/"):
+            return tables
+    return None
+
+
+def _generation_key(engine: Engine, tables: Tuple[str, ...]) -> str:
+    with engine.connect() as conn:
+        shared = shared_generations(conn, tables)
+    if shared is not None:
+        return "|".join((str(engine.url.database), ",".join(map(str, shared))))
+    gens = generations_for(engine)
+    return "|".join((_PROCESS_TOKEN, str(gens.token), ",".join(map(str, gens.snapshot(tables)))))
+
+
+def compute_etag(scope: Scope, tables: Tuple[str, ...]) -> str:
+    """Strong ETag for a request against the current write generations."""
+    headers = Headers(scope=scope)
+    key = "|".join((
+        _generation_key(engine_for_request(scope), tables),
+        date.today().isoformat(),
+        scope["path"],
+        scope.get("query_string", b"").decode("latin-1"),
+        headers.get("accept", ""),
+    ))
+    return '"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+class ETagMiddleware:
+    """Answer unchanged GETs with 304 and tag fresh 200 responses."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET" or not settings.enable_etags:
+            await self.app(scope, receive, send)
+            return
+        tables = tables_for_path(scope["path"])
+        if tables is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            # Opening the tenant engine and reading the counters block
+            etag = await run_in_threadpool(compute_etag, scope, tables)
+        except (InvalidTenant, UnknownTenant):
+            await self.app(scope, receive, send)  # the route answers 400 / 404
+            return
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [
+                    (b"etag", etag.encode()),
+                    (b"cache-control", CACHE_CONTROL.encode()),
+                    (b"vary", b"Accept"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                if "etag" not in headers:
+                    headers["ETag"] = etag
+                    headers["Cache-Control"] = CACHE_CONTROL
+                    headers.add_vary_header("Accept")
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
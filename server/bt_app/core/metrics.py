@@ -0,0 +1,286 @@
+"""Request instrumentation: route latency, SQL per request, N+1 detection.
+
+``MetricsMiddleware`` opens a ``RequestStats`` for every HTTP request in a
+context variable. SQLAlchemy cursor events add each statement's count and
+duration to it (threadpool handlers and ``core.parallel`` workers run in a
+copy of the request context, so their queries count too), and ``@cached``
+records its hits and misses. When the response starts the middleware:
+
+- adds a ``Server-Timing`` header with ``app``, ``db`` and ``cache`` entries
+- observes the latency and SQL histograms of the matched route template
+- flags the request as N+1 when one statement shape ran more than
+  ``n_plus_one_threshold`` times (logged once per route and statement)
+
+``render_prometheus`` serializes the registry, plus the result cache
+counters, in the Prometheus text format for ``/api/system/metrics``.
+"""
+import functools
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250, 1000)
+UNROUTED = "unrouted"
+
+_current: ContextVar[Optional["RequestStats"]] = ContextVar("bt_request_stats", default=None)
+_QUERY_START = "bt_metrics_query_start"
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """Statement shape with literals and IN-lists collapsed, for grouping similar queries."""
+    shape = _LITERALS.sub("?", statement)
+    shape = _IN_LISTS.sub("(?)", shape)
+    return _SPACES.sub(" ", shape).strip()
+
+
+class RequestStats:
+    """SQL and cache activity of one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.statements: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record_sql(self, statement: str, seconds: float) -> None:
+        shape = fingerprint(statement)
+        with self._lock:
+            self.sql_count += 1
+            self.sql_seconds += seconds
+            self.statements[shape] += 1
+
+    def record_cache(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes that ran more than ``threshold`` times, most frequent first."""
+        with self._lock:
+            return [(shape, n) for shape, n in self.statements.most_common() if n > threshold]
+
+    def server_timing(self) -> str:
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        parts = [
+            f"app;dur={elapsed_ms:.1f}",
+            f'db;dur={self.sql_seconds * 1000:.1f};desc="{self.sql_count} queries"',
+        ]
+        if self.cache_hits or self.cache_misses:
+            parts.append(f'cache;desc="{self.cache_hits} hit, {self.cache_misses} miss"')
+        return ", ".join(parts)
+
+
+def current_stats() -> Optional[RequestStats]:
+    """Stats of the request being served in this context, if any."""
+    return _current.get()
+
+
+@contextmanager
+def collecting() -> Iterator[RequestStats]:
+    """Collect SQL and cache activity for the enclosed block (jobs, scripts, tests)."""
+    stats = RequestStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def record_cache_lookup(hit: bool) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.record_cache(hit)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault(_QUERY_START, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    starts = conn.info.get(_QUERY_START)
+    if stats is None or not starts:
+        return
+    stats.record_sql(statement, time.perf_counter() - starts.pop())
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Process-wide per-route aggregates."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Counter = Counter()
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.sql_statements: Dict[Tuple[str, str], Histogram] = {}
+        self.db_seconds: Counter = Counter()
+        self.n_plus_one: Counter = Counter()
+        self._flagged: set = set()
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        key = (method, route)
+        repeated = stats.repeated(settings.n_plus_one_threshold)
+        with self._lock:
+            self.requests[(method, route, str(status))] += 1
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(seconds)
+            self.sql_statements.setdefault(key, Histogram(SQL_COUNT_BUCKETS)).observe(stats.sql_count)
+            self.db_seconds[key] += stats.sql_seconds
+            if repeated:
+                self.n_plus_one[key] += 1
+            new_flags = [(shape, n) for shape, n in repeated if (route, shape) not in self._flagged]
+            self._flagged.update((route, shape) for shape, _ in new_flags)
+        for shape, n in new_flags:
+            logger.warning("Possible N+1 on %s %s: %d x %s", method, route, n, shape[:300])
+
+    def reset(self) -> None:
+        with self._lock:
+            self.__init__()
+
+
+registry = MetricsRegistry()
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNROUTED
+
+
+class MetricsMiddleware:
+    """Time every HTTP request, count its SQL and add a Server-Timing header."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.enable_metrics:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            registry.observe(
+                scope["method"], _route_template(scope), status,
+                time.perf_counter() - stats.started, stats,
+            )
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _histogram_lines(name: str, series: Dict[Tuple[str, str], Histogram]) -> List[str]:
+    lines = []
+    for (method, route), hist in sorted(series.items()):
+        for bound, count in zip(hist.buckets, hist.counts):
+            lines.append(f"{name}_bucket{_labels(method=method, route=route, le=f'{bound:g}')} {count}")
+        lines.append(f"{name}_bucket{_labels(method=method, route=route, le='+Inf')} {hist.count}")
+        lines.append(f"{name}_sum{_labels(method=method, route=route)} {hist.sum:.6f}")
+        lines.append(f"{name}_count{_labels(method=method, route=route)} {hist.count}")
+    return lines
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    from .cache import result_cache
+
+    out: List[str] = []
+
+    def metric(name: str, kind: str, help_text: str, lines: List[str]) -> None:
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} {kind}")
+        out.extend(lines)
+
+    with registry._lock:
+        metric("bt_http_requests_total", "counter", "HTTP requests by route template and status.", [
+            f"bt_http_requests_total{_labels(method=m, route=r, status=s)} {n}"
+            for (m, r, s), n in sorted(registry.requests.items())
+        ])
+        metric("bt_http_request_duration_seconds", "histogram", "Request latency by route template.",
+               _histogram_lines("bt_http_request_duration_seconds", registry.latency))
+        metric("bt_http_request_sql_statements", "histogram", "SQL statements executed per request.",
+               _histogram_lines("bt_http_request_sql_statements", registry.sql_statements))
+        metric("bt_http_request_db_seconds_total", "counter", "Time spent executing SQL, by route template.", [
+            f"bt_http_request_db_seconds_total{_labels(method=m, route=r)} {s:.6f}"
+            for (m, r), s in sorted(registry.db_seconds.items())
+        ])
+        metric("bt_http_n_plus_one_requests_total", "counter",
+               f"Requests that ran one statement shape more than {settings.n_plus_one_threshold} times.", [
+                   f"bt_http_n_plus_one_requests_total{_labels(method=m, route=r)} {n}"
+                   for (m, r), n in sorted(registry.n_plus_one.items())
+               ])
+
+    cache = result_cache.stats()
+    for key, kind, help_text in (
+        ("hits", "counter", "Result cache hits."),
+        ("misses", "counter", "Result cache misses."),
+        ("stale_invalidations", "counter", "Entries dropped because a source table was written."),
+        ("evictions", "counter", "Entries evicted by the entry or memory cap."),
+        ("entries", "gauge", "Entries currently cached."),
+        ("bytes", "gauge", "Approximate bytes currently cached."),
+        ("hit_ratio", "gauge", "Hits over lookups since start."),
+    ):
+        name = f"bt_result_cache_{key}_total" if kind == "counter" else f"bt_result_cache_{key}"
+        metric(name, kind, help_text, [f"{name} {cache[key]}"])
+    return "\n".join(out) + "\n"
@@ -0,0 +1,156 @@
+"""Content negotiation for chart payloads: row JSON, columnar JSON or MessagePack.
+
+Chart endpoints return lists of records that repeat the same keys for every
+point. Clients that ask for it get those lists transposed into columns::
+
+    [{"month": "2024-01", "amount": 10.0}, ...]  ->  {"month": [...], "amount": [...]}
+
+Per-category month series (``category-series``, ``all-categories-series``,
+``category-matrix``) use ``to_series`` instead, which keys each category's
+monthly values by category id next to one shared month axis::
+
+    {"months": [...], "series": {"3": [...], "7": [...]}, "txn_counts": {...}, ...}
+
+Selection, by ``Accept`` header or the ``format`` query parameter:
+
+- ``application/json`` / ``format=json`` (default): the payload unchanged
+- ``application/vnd.bt.columnar+json`` / ``format=columnar``: columnar JSON
+- ``application/msgpack`` / ``format=msgpack``: columnar MessagePack
+  (requires the optional ``msgpack`` package, otherwise 406)
+
+Routes opt in with ``@negotiated`` (or ``@negotiated(columnar=to_series)``);
+called directly (tests, other routes) they still return their plain payload.
+"""
+import functools
+import inspect
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.responses import Response
+
+from .responses import FastJSONResponse
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+COLUMNAR_JSON = "application/vnd.bt.columnar+json"
+MSGPACK = "application/msgpack"
+_MSGPACK_TYPES = (MSGPACK, "application/x-msgpack")
+_REQUEST_PARAM = "_negotiation_request"
+
+
+def to_columnar(value: Any) -> Any:
+    """Transpose every list of same-keyed records inside ``value`` into columns."""
+    if isinstance(value, dict):
+        return {key: to_columnar(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)) and value and isinstance(value[0], dict):
+        keys = list(value[0])
+        if all(isinstance(row, dict) and len(row) == len(keys) for row in value):
+            try:
+                return {key: [to_columnar(row[key]) for row in value] for key in keys}
+            except KeyError:
+                pass
+        return [to_columnar(item) for item in value]
+    return value
+
+
+def _keyed_series(rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    series, txn_counts, categories = {}, {}, {}
+    for row in rows:
+        rest = dict(row)
+        key = str(rest.pop("category_id", None) or 0)  # "0" is uncategorized, as in the cubes
+        series[key] = rest.pop("values")
+        txn_counts[key] = rest.pop("txn_counts")
+        categories[key] = rest
+    return {"series": series, "txn_counts": txn_counts, "categories": categories}
+
+
+def to_series(value: Any) -> Any:
+    """Series-shaped columnar form of a per-category month series payload.
+
+    Each category's ``values`` and ``txn_counts`` are keyed by category id
+    under ``series`` / ``txn_counts``, aligned with ``months``; the remaining
+    per-category fields move to ``categories``. Matrix payloads get the same
+    treatment for their ``rollups``. Other payloads fall back to ``to_columnar``.
+    """
+    if not isinstance(value, dict) or "months" not in value or not ("values" in value or "categories" in value):
+        return to_columnar(value)
+    if "categories" in value:  # category x month matrix
+        encoded = {key: item for key, item in value.items() if key not in ("categories", "rollups")}
+        encoded.update(_keyed_series(value["categories"]))
+        encoded["rollups"] = _keyed_series(value.get("rollups", []))
+        return encoded
+    # A single series; its per-month records repeat months/values/txn_counts
+    encoded = {key: item for key, item in value.items() if key not in ("series", "values", "txn_counts")}
+    keyed = _keyed_series([{"category_id": value.get("category_id"), "values": value["values"],
+                            "txn_counts": value["txn_counts"]}])
+    encoded["series"], encoded["txn_counts"] = keyed["series"], keyed["txn_counts"]
+    return encoded
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if hasattr(obj, "item"):  # numpy scalars
+        return obj.item()
+    raise TypeError(f"Type is not MessagePack serializable: {type(obj).__name__}")
+
+
+def preferred_format(request: Request) -> str:
+    """``json``, ``columnar`` or ``msgpack`` for this request."""
+    requested = request.query_params.get("format")
+    if requested in ("json", "columnar", "msgpack"):
+        return requested
+    accept = request.headers.get("accept", "")
+    if any(media in accept for media in _MSGPACK_TYPES):
+        return "msgpack"
+    if COLUMNAR_JSON in accept:
+        return "columnar"
+    return "json"
+
+
+def negotiate(request: Request, payload: Any, columnar: Callable[[Any], Any] = to_columnar) -> Any:
+    """Encode ``payload`` in the format the client asked for, using ``columnar`` for the column shape."""
+    fmt = preferred_format(request)
+    if fmt == "json" or isinstance(payload, Response):
+        return payload
+    headers = {"Vary": "Accept"}
+    if fmt == "columnar":
+        return FastJSONResponse(columnar(payload), media_type=COLUMNAR_JSON, headers=headers)
+    if msgpack is None:
+        raise HTTPException(status_code=406, detail="MessagePack encoding is not available on this server")
+    body = msgpack.packb(columnar(payload), default=_msgpack_default, use_bin_type=True)
+    return Response(content=body, media_type=MSGPACK, headers=headers)
+
+
+def negotiated(func: Optional[Callable] = None, *, columnar: Callable[[Any], Any] = to_columnar) -> Callable:
+    """Let a sync route's payload be served as row JSON, columnar JSON or MessagePack.
+
+    Args:
+        func: The route function
+        columnar: Encoder producing the column shape (``to_columnar`` or ``to_series``)
+    """
+    if func is None:
+        return functools.partial(negotiated, columnar=columnar)
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        request = kwargs.pop(_REQUEST_PARAM, None)
+        payload = func(*args, **kwargs)
+        if request is None:
+            return payload
+        return negotiate(request, payload, columnar)
+
+    # FastAPI injects the request through this extra keyword-only parameter
+    wrapper.__signature__ = signature.replace(parameters=[
+        *signature.parameters.values(),
+        inspect.Parameter(_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+    ])
+    return wrapper
@@ -0,0 +1,106 @@
+"""Run independent read queries concurrently on pooled connections.
+
+Each task gets its own short-lived session bound to the caller's engine, so
+the sub-queries of one request check out separate pooled connections and
+SQLite (in WAL mode) serves them in parallel. In-memory SQLite databases are
+private to one connection, so there the tasks fall back to running one after
+another on the caller's session.
+"""
+import contextvars
+import logging
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+ReadTask = Callable[[Session], Any]
+
+_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.parallel_read_workers),
+    thread_name_prefix="bt-read",
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when parallel reads do not finish before the request deadline."""
+
+    def __init__(self, pending):
+        self.pending = sorted(pending)
+        super().__init__(f"Read deadline exceeded waiting for: {', '.join(self.pending)}")
+
+
+def _engine_of(db: Session) -> Engine:
+    bind = db.get_bind()
+    return bind.engine if isinstance(bind, Connection) else bind
+
+
+def _shares_connections(engine: Engine) -> bool:
+    """Whether separate connections of ``engine`` see the same database."""
+    if engine.dialect.name != "sqlite":
+        return True
+    database = engine.url.database
+    return bool(database) and database != ":memory:" and "mode=memory" not in str(engine.url)
+
+
+def _run_task(engine: Engine, task: ReadTask) -> Any:
+    with Session(bind=engine, autoflush=False) as session:
+        return task(session)
+
+
+def run_parallel_reads(
+    db: Session,
+    tasks: Dict[str, ReadTask],
+    deadline_seconds: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Run read-only tasks concurrently and collect their results by name.
+
+    Args:
+        db: The request's session (used for the engine, or directly as fallback)
+        tasks: Name -> callable taking a session and returning a result
+        deadline_seconds: Wall-clock budget for all tasks together
+
+    Returns:
+        Name -> task result
+
+    Raises:
+        DeadlineExceeded: If any task is still running at the deadline
+    """
+    if deadline_seconds is None:
+        deadline_seconds = settings.summary_deadline_seconds
+    engine = _engine_of(db)
+
+    if len(tasks) < 2 or not _shares_connections(engine):
+        started = time.monotonic()
+        results = {}
+        for name, task in tasks.items():
+            if time.monotonic() - started > deadline_seconds:
+                raise DeadlineExceeded(set(tasks) - set(results))
+            results[name] = task(db)
+        return results
+
+    # Each task runs in a copy of the caller's context so per-request
+    # instrumentation (core.metrics) sees its queries
+    futures = {
+        _executor.submit(contextvars.copy_context().run, _run_task, engine, task): name
+        for name, task in tasks.items()
+    }
+    done, pending = wait(futures, timeout=deadline_seconds, return_when=FIRST_EXCEPTION)
+    for future in done:
+        if future.exception() is not None:
+            for other in pending:
+                other.cancel()
+            raise future.exception()
+    if pending:
+        for future in pending:
+            future.cancel()
+        names = {futures[future] for future in pending}
+        logger.warning("Parallel reads abandoned after %.1fs: %s", deadline_seconds, sorted(names))
+        raise DeadlineExceeded(names)
+    results = {futures[future]: future.result() for future in done}
+    return {name: results[name] for name in tasks}
@@ -0,0 +1,342 @@
+"""On-demand profiling of single requests.
+
+Only installed when ``profiler_token`` is configured; otherwise this module
+is never imported and adds nothing to the request path. With it installed,
+a request carrying the token in the ``X-Profile`` header (or the ``_profile``
+query parameter) is profiled:
+
+- the endpoint runs under pyinstrument when it is installed, else cProfile
+  (in the thread that runs it, so sync handlers are covered)
+- tracemalloc records allocations while the request runs; the top
+  allocation sites are kept (process wide, so concurrent requests show up)
+- every SQL statement is timed, and the slowest ones are re-run under
+  ``EXPLAIN QUERY PLAN`` once the response is sent
+
+The report is written to ``profile_dir`` as ``<id>.json`` (the newest
+``profile_keep`` are kept), the response carries its id in ``X-Profile-Id``,
+and ``GET /api/system/profiles/{id}`` returns it.
+"""
+import cProfile
+import functools
+import heapq
+import hmac
+import inspect
+import io
+import itertools
+import json
+import logging
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "_profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+REPORTS_PATH = "/api/system/profiles"
+TOP_ALLOCATIONS = 20
+
+_PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+_QUERY_START = "bt_profiler_query_start"
+_current: ContextVar[Optional["ProfileSession"]] = ContextVar("bt_profile_session", default=None)
+
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_owned = False  # started here (not by PYTHONTRACEMALLOC), so stopped here
+
+
+def token_matches(candidate: Optional[str]) -> bool:
+    """True when profiling is configured and ``candidate`` is its token."""
+    token = settings.profiler_token
+    return bool(token and candidate) and hmac.compare_digest(candidate.encode(), token.encode())
+
+
+class ProfileSession:
+    """Everything captured for one profiled request."""
+
+    def __init__(self, scope: Scope):
+        self.id = uuid.uuid4().hex
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.started = time.perf_counter()
+        self.profiles: List[Dict[str, str]] = []
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self._slowest: List[tuple] = []  # min-heap of (seconds, seq, statement, parameters, engine)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def record_sql(self, statement: str, parameters: Any, engine: Optional[Engine], seconds: float) -> None:
+        entry = (seconds, next(self._seq), statement, parameters, engine)
+        with self._lock:
+            self.sql_count += 1
+            self.sql_seconds += seconds
+            if len(self._slowest) < settings.profile_slow_sql:
+                heapq.heappush(self._slowest, entry)
+            elif self._slowest and seconds > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def slowest_sql(self) -> List[Dict[str, Any]]:
+        """Slowest statements, slowest first, with their SQLite query plans."""
+        with self._lock:
+            slowest = sorted(self._slowest, reverse=True)
+        return [
+            {
+                "ms": round(seconds * 1000, 3),
+                "statement": statement,
+                "parameters": repr(parameters)[:500],
+                "query_plan": _explain(engine, statement, parameters),
+            }
+            for seconds, _, statement, parameters, engine in slowest
+        ]
+
+
+def _explain(engine: Optional[Engine], statement: str, parameters: Any) -> Optional[List[str]]:
+    if engine is None or engine.dialect.name != "sqlite":
+        return None
+    if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+    try:
+        with engine.connect() as conn:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).fetchall()
+    except Exception as e:
+        return [f"unavailable: {e}"]
+    return [row[-1] for row in rows]
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault(_QUERY_START, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    session = _current.get()
+    starts = conn.info.get(_QUERY_START)
+    if session is None or not starts:
+        return
+    session.record_sql(statement, None if executemany else parameters, conn.engine,
+                       time.perf_counter() - starts.pop())
+
+
+def _start_tracemalloc() -> None:
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+
+
+def _stop_tracemalloc() -> List[Dict[str, Any]]:
+    """Top allocation sites; tracing stops when the last profiled request ends."""
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+    if snapshot is None:
+        return []
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    return [
+        {"site": str(stat.traceback), "kb": round(stat.size / 1024, 1), "count": stat.count}
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+    ]
+
+
+def _cprofile_report(profiler: cProfile.Profile) -> Dict[str, str]:
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(60)
+    return {"profiler": "cProfile", "text": out.getvalue()}
+
+
+def _profile_call(session: ProfileSession, func: Callable, *args, **kwargs):
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        Profiler = None
+
+    if Profiler is None:
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args, **kwargs)
+        finally:
+            session.profiles.append(_cprofile_report(profiler))
+
+    profiler = Profiler(async_mode="disabled")
+    profiler.start()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.stop()
+        session.profiles.append({"profiler": "pyinstrument", "text": profiler.output_text(unicode=False, color=False)})
+
+
+def _profiled_endpoint(func: Callable) -> Callable:
+    """Wrap an endpoint so it runs under the profiler when its request is profiled."""
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            session = _current.get()
+            if session is None:
+                return await func(*args, **kwargs)
+            # Runs on the event loop thread, so other requests' coroutines
+            # interleaved with this one are included
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                profiler.disable()
+                session.profiles.append(_cprofile_report(profiler))
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        session = _current.get()
+        if session is None:
+            return func(*args, **kwargs)
+        return _profile_call(session, func, *args, **kwargs)
+    return wrapper
+
+
+def instrument_endpoints(routes) -> None:
+    """Wrap every API endpoint so profiled requests run it under the profiler.
+
+    FastAPI looks the endpoint up on the route's dependant per request, and
+    sync endpoints run in the threadpool, so this is where a per-thread
+    profiler has to start.
+    """
+    for route in routes:
+        if isinstance(route, APIRoute) and not getattr(route.dependant.call, "bt_profiled", False):
+            route.dependant.call = _profiled_endpoint(route.dependant.call)
+            route.dependant.call.bt_profiled = True
+
+
+def _requested(scope: Scope) -> bool:
+    if scope["path"].startswith(REPORTS_PATH):
+        return False  # fetching reports sends the token too
+    candidate = Headers(scope=scope).get(PROFILE_HEADER)
+    if candidate is None and scope.get("query_string"):
+        values = parse_qs(scope["query_string"].decode("latin-1")).get(PROFILE_QUERY_PARAM)
+        candidate = values[0] if values else None
+    return token_matches(candidate)
+
+
+class ProfilerMiddleware:
+    """Profile requests that carry the profiler token and store their reports."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        session = ProfileSession(scope)
+        status = 500
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, session.id)
+            await send(message)
+
+        token = _current.set(session)
+        _start_tracemalloc()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            elapsed = time.perf_counter() - session.started
+            allocations = _stop_tracemalloc()
+            _current.reset(token)
+            try:
+                await run_in_threadpool(_write_report, session, status, elapsed, allocations)
+            except Exception:
+                logger.exception("Could not store profile %s", session.id)
+
+
+def _profile_dir() -> Path:
+    return Path(settings.profile_dir)
+
+
+def _write_report(session: ProfileSession, status: int, elapsed: float, allocations: List[Dict[str, Any]]) -> None:
+    report = {
+        "id": session.id,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "method": session.method,
+        "path": session.path,
+        "status": status,
+        "duration_ms": round(elapsed * 1000, 3),
+        "profiles": session.profiles,
+        "allocations": allocations,
+        "sql": {
+            "count": session.sql_count,
+            "total_ms": round(session.sql_seconds * 1000, 3),
+            "slowest": session.slowest_sql(),
+        },
+    }
+    directory = _profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp = directory / f"{session.id}.json.tmp"
+    tmp.write_text(json.dumps(report, indent=1), encoding="utf-8")
+    tmp.replace(directory / f"{session.id}.json")
+
+    reports = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in reports[settings.profile_keep:]:
+        old.unlink(missing_ok=True)
+    logger.info("Stored profile %s for %s %s (%.0f ms)", session.id, session.method, session.path, elapsed * 1000)
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Stored reports, newest first, without their bodies."""
+    directory = _profile_dir()
+    if not directory.is_dir():
+        return []
+    summaries = []
+    for path in sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True):
+        try:
+            report = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        summaries.append({key: report.get(key) for key in ("id", "created_at", "method", "path", "status", "duration_ms")})
+    return summaries
+
+
+def load_profile(profile_id: str) -> Optional[Dict[str, Any]]:
+    """The stored report with this id, or None."""
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    path = _profile_dir() / f"{profile_id}.json"
+    if not path.is_file():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def install_profiler(app) -> None:
+    """Instrument the app's endpoints and add the profiler middleware."""
+    instrument_endpoints(app.routes)
+    app.add_middleware(ProfilerMiddleware)
@@ -1,68 +1,284 @@
-"""Background scheduler for automated tasks."""
+"""Background scheduler for automated tasks.
+
+Every API worker calls ``start_scheduler`` from its lifespan, but only one
+process at a time runs jobs: workers compete for a lease row in
+``scheduler_leases`` and the holder renews it every third of the lease
+period. A worker that loses the lease (or cannot reach the database) shuts
+its scheduler down; another worker takes over once the lease expires.
+
+Jobs live in an APScheduler SQLAlchemy job store in the main database, so
+next run times survive restarts and leader changes. A run missed while no
+leader was up is caught up once (coalesced) when it is less than
+``scheduler_misfire_grace_seconds`` late. Each job is also wrapped in a
+per-job guard so a slow run is never overlapped by the next one or by a
+manual call in the same process.
+"""
+import functools
 import logging
-from datetime import datetime
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+from sqlalchemy import or_, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from ..core.db import SessionLocal
+from ..core.config import settings
+from ..core.tenancy import iter_tenant_sessions
+from ..models.scheduler_lease import SchedulerLease
 from ..services.plaid_service import PlaidService
 from ..services.mapping_service import MappingService
+from ..services.detected_subscriptions import refresh_dirty_subscriptions, sweep_inactive_subscriptions
+
+if TYPE_CHECKING:
+    from apscheduler.schedulers.background import BackgroundScheduler
 
 logger = logging.getLogger(__name__)
 
-scheduler = BackgroundScheduler()
+JOBSTORE_TABLE = "apscheduler_jobs"
+LEASE_NAME = "scheduler"
+
+# Running scheduler of this process (only while it holds the lease);
+# APScheduler is only imported when the app starts
+scheduler: Optional["BackgroundScheduler"] = None
+_leader: Optional["_LeaderLoop"] = None
+_job_locks: Dict[str, threading.Lock] = {}
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def guarded(job_id: str) -> Callable:
+    """Skip a job run (with a warning) while the previous run is still going."""
+    lock = _job_locks.setdefault(job_id, threading.Lock())
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not lock.acquire(blocking=False):
+                logger.warning("Job %s is still running; skipping this run", job_id)
+                return None
+            try:
+                return func(*args, **kwargs)
+            finally:
+                lock.release()
+        return wrapper
+    return decorator
+
+
+class LeaderLease:
+    """A lease row that at most one holder owns until it expires."""
+
+    def __init__(self, engine: Engine, ttl_seconds: int, name: str = LEASE_NAME,
+                 holder: Optional[str] = None):
+        self.engine = engine
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.name = name
+        self.holder = holder or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def acquire(self) -> bool:
+        """Take the lease if it is free or expired, or renew it if held; True when held."""
+        now = _utcnow()
+        table = SchedulerLease.__table__
+        with self.engine.begin() as conn:
+            renewed = conn.execute(
+                update(table)
+                .where(table.c.name == self.name)
+                .where(or_(table.c.holder == self.holder, table.c.expires_at < now))
+                .values(holder=self.holder, expires_at=now + self.ttl)
+            )
+            if renewed.rowcount:
+                return True
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(table.insert().values(name=self.name, holder=self.holder, expires_at=now + self.ttl))
+            return True
+        except IntegrityError:
+            return False  # another holder has a live lease
+
+    def release(self) -> None:
+        """Give the lease up so another process can take over immediately."""
+        table = SchedulerLease.__table__
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(table)
+                .where(table.c.name == self.name, table.c.holder == self.holder)
+                .values(expires_at=datetime(1970, 1, 1))
+            )
+
+
+class _LeaderLoop(threading.Thread):
+    """Renews the lease and starts/stops this process's scheduler to match."""
+
+    def __init__(self, lease: LeaderLease):
+        super().__init__(name="bt-scheduler-leader", daemon=True)
+        self.lease = lease
+        self._stopped = threading.Event()
+
+    def tick(self) -> bool:
+        try:
+            leader = self.lease.acquire()
+        except Exception:
+            logger.exception("Scheduler lease check failed")
+            leader = False
+        if leader and scheduler is None:
+            logger.info("Acquired scheduler lease as %s", self.lease.holder)
+            _start_jobs(self.lease.engine)
+        elif not leader and scheduler is not None:
+            logger.warning("Lost scheduler lease; stopping scheduled jobs in this process")
+            _stop_jobs(wait=False)
+        return leader
+
+    def run(self) -> None:
+        interval = max(1.0, self.lease.ttl.total_seconds() / 3)
+        while not self._stopped.wait(interval):
+            self.tick()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+def _sync_database(db: Session) -> None:
+    """Sync Plaid items and map new transactions in one database."""
+    plaid_service = PlaidService(db)
+    mapping_service = MappingService(db)
 
+    # Sync all Plaid items
+    sync_results = plaid_service.sync_all_items()
 
+    # Apply normalization and mapping to new transactions
+    mapping_service.normalize_unmapped_transactions()
+    mapping_results = mapping_service.apply_rules_to_unmapped()
+    subscription_results = refresh_dirty_subscriptions(db)
+
+    logger.info(f"Sync completed: {sync_results}, Mapping results: {mapping_results}, "
+                f"Subscriptions: {subscription_results}")
+
+
+@guarded("daily_sync")
 def sync_transactions_job():
-    """Background job to sync transactions and apply mappings."""
+    """Background job to sync transactions and apply mappings.
+
+    Runs against the main database and, with tenant shards enabled, every
+    shard on disk in turn; one tenant failing does not stop the others.
+    """
     logger.info("Starting scheduled transaction sync")
-    
-    db: Session = SessionLocal()
-    try:
-        plaid_service = PlaidService(db)
-        mapping_service = MappingService(db)
-        
-        # Sync all Plaid items
-        sync_results = plaid_service.sync_all_items()
-        
-        # Apply normalization and mapping to new transactions
-        mapping_service.normalize_unmapped_transactions()
-        mapping_results = mapping_service.apply_rules_to_unmapped()
-        
-        logger.info(f"Sync completed: {sync_results}, Mapping results: {mapping_results}")
-        
-    except Exception as e:
-        logger.error(f"Scheduled sync failed: {e}")
-    finally:
-        db.close()
-
-
-def start_scheduler():
-    """Start the background scheduler."""
-    # Schedule daily sync at 2:00 AM
-    scheduler.add_job(
-        func=sync_transactions_job,
-        trigger=CronTrigger(hour=2, minute=0),
-        id="daily_sync",
-        name="Daily transaction sync and mapping",
-        replace_existing=True,
-    )
-    
-    scheduler.start()
-    logger.info("Scheduler started")
 
+    for tenant_id, db in iter_tenant_sessions():
+        try:
+            _sync_database(db)
+        except Exception as e:
+            logger.error(f"Scheduled sync failed for tenant {tenant_id}: {e}")
 
-def stop_scheduler():
-    """Stop the background scheduler."""
-    scheduler.shutdown()
-    logger.info("Scheduler stopped")
 
+@guarded("subscription_refresh")
+def refresh_subscriptions_job():
+    """Re-evaluate the subscriptions of merchants whose transactions changed since the last run.
+
+    Catches writes outside the import paths (edits, rule runs, Excel loads).
+    """
+    for tenant_id, db in iter_tenant_sessions():
+        try:
+            refresh_dirty_subscriptions(db)
+        except Exception as e:
+            logger.error(f"Subscription refresh failed for tenant {tenant_id}: {e}")
 
 
+@guarded("subscription_sweep")
+def sweep_subscriptions_job():
+    """Daily refresh of the subscriptions' active flags."""
+    for tenant_id, db in iter_tenant_sessions():
+        try:
+            sweep_inactive_subscriptions(db)
+        except Exception as e:
+            logger.error(f"Subscription sweep failed for tenant {tenant_id}: {e}")
 
 
+def _job_definitions():
+    """(id, name, textual function reference, trigger) for every scheduled job."""
+    from apscheduler.triggers.cron import CronTrigger
 
+    return [
+        # Daily sync at 2:00 AM
+        ("daily_sync", "Daily transaction sync and mapping",
+         f"{__name__}:sync_transactions_job", CronTrigger(hour=2, minute=0)),
+        ("subscription_refresh", "Refresh subscriptions of changed merchants",
+         f"{__name__}:refresh_subscriptions_job", CronTrigger(minute="*/15")),
+        ("subscription_sweep", "Daily subscription activity sweep",
+         f"{__name__}:sweep_subscriptions_job", CronTrigger(hour=3, minute=0)),
+    ]
 
 
+def _start_jobs(engine: Engine) -> None:
+    """Start this process's scheduler on the persistent job store."""
+    global scheduler
+    from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+    from apscheduler.schedulers.background import BackgroundScheduler
 
+    sched = BackgroundScheduler(
+        jobstores={"default": SQLAlchemyJobStore(engine=engine, tablename=JOBSTORE_TABLE)},
+        job_defaults={
+            "coalesce": True,
+            "max_instances": 1,
+            "misfire_grace_time": settings.scheduler_misfire_grace_seconds,
+        },
+    )
+    # Start paused so stored jobs keep their next run time (and catch up a
+    # missed one) instead of being replaced by a fresh definition
+    sched.start(paused=True)
+    for job_id, name, func, trigger in _job_definitions():
+        job = sched.get_job(job_id)
+        if job is None:
+            sched.add_job(func, trigger=trigger, id=job_id, name=name)
+        elif str(job.trigger) != str(trigger):
+            sched.reschedule_job(job_id, trigger=trigger)
+    sched.resume()
+    scheduler = sched
+    logger.info("Scheduler started")
 
+
+def _stop_jobs(wait: bool = True) -> None:
+    global scheduler
+    if scheduler is None:
+        return
+    sched, scheduler = scheduler, None
+    sched.shutdown(wait=wait)
+    logger.info("Scheduler stopped")
+
+
+def start_scheduler(engine: Optional[Engine] = None):
+    """Start the background scheduler, or stand by until this process is elected leader.
+
+    Args:
+        engine: Database for the job store and lease (defaults to the main database)
+    """
+    global _leader
+    if engine is None:
+        from ..core.db import engine
+    SchedulerLease.__table__.create(engine, checkfirst=True)
+
+    if not settings.scheduler_leader_election:
+        _start_jobs(engine)
+        return
+
+    _leader = _LeaderLoop(LeaderLease(engine, settings.scheduler_lease_seconds))
+    if not _leader.tick():
+        logger.info("Scheduler standing by; another process holds the lease")
+    _leader.start()
+
+
+def stop_scheduler():
+    """Stop the background scheduler and hand the lease to another process."""
+    global _leader
+    leader, _leader = _leader, None
+    if leader is not None:
+        leader.stop()
+    _stop_jobs()
+    if leader is not None:
+        try:
+            leader.lease.release()
+        except Exception:
+            logger.exception("Could not release the scheduler lease")
@@ -0,0 +1,253 @@
+"""Per-tenant SQLite shards.
+
+With ``enable_tenant_shards`` on, every tenant gets its own database file
+``<tenant_shard_dir>/<tenant_id>.db``, picked per request from the
+``tenant_header`` header. Requests without the header (or with the
+``default`` tenant) keep using the main database, so single-user installs
+are unaffected.
+
+Shards are created only by ``provision_tenant`` (or
+``scripts/maintenance/provision_tenant.py``); requests naming a tenant
+without a shard file raise ``UnknownTenant`` (404) instead of creating one,
+so an arbitrary header value cannot fill the disk with databases.
+
+Shard engines are created lazily and kept in an LRU capped at
+``tenant_max_open_engines``; the least recently used engine is disposed
+(its pooled connections and file handles closed) when the cap is exceeded
+and reopened on the next request. Provisioning creates the schema from the
+models and stamps it; the first open of an existing shard in a process
+upgrades it to the Alembic heads in place.
+
+Everything keyed by engine (result cache, write generations, ETags) is
+therefore per tenant as well.
+"""
+import logging
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.datastructures import Headers
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT = "default"
+
+_TENANT_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+_SERVER_DIR = Path(__file__).resolve().parents[2]
+
+
+class InvalidTenant(ValueError):
+    """Raised for tenant ids that cannot name a shard file."""
+
+
+class UnknownTenant(LookupError):
+    """Raised for tenants that have not been provisioned."""
+
+
+def validate_tenant_id(tenant_id: str) -> str:
+    """Return ``tenant_id`` if it is a safe shard name, else raise InvalidTenant."""
+    if not _TENANT_ID.match(tenant_id or ""):
+        raise InvalidTenant(f"Invalid tenant id: {tenant_id!r}")
+    return tenant_id
+
+
+def tenant_from_headers(headers: Headers) -> str:
+    """Tenant id named by a request's headers (``default`` when sharding is off or absent)."""
+    if not settings.enable_tenant_shards:
+        return DEFAULT_TENANT
+    raw = headers.get(settings.tenant_header)
+    if not raw:
+        return DEFAULT_TENANT
+    return validate_tenant_id(raw.strip())
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    cfg = Config(str(_SERVER_DIR / "alembic.ini"))
+    cfg.set_main_option("script_location", str(_SERVER_DIR / "migrations"))
+    return cfg
+
+
+def migrate_shard(engine: Engine) -> None:
+    """Bring a shard's schema to the Alembic heads.
+
+    The migration chain starts from an existing schema, so a new shard is
+    created from the models and stamped; an existing one is upgraded.
+    """
+    from alembic import command
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    from . import db as core_db
+    from ..models import (  # noqa: F401  (register every table on Base.metadata)
+        account, account_balance, audit_log, budget, category, detected_subscription, external_integration,
+        institution_item, merchant_alias, merchant_rule, monthly_aggregate, plaid_import, scheduler_lease,
+        staging_transaction, transaction, write_generation,
+    )
+
+    cfg = _alembic_config()
+    heads = set(ScriptDirectory.from_config(cfg).get_heads())
+
+    with engine.begin() as conn:
+        current = set(MigrationContext.configure(conn).get_current_heads())
+        if current == heads:
+            return
+        cfg.attributes["connection"] = conn
+        if not current and "transactions" not in inspect(conn).get_table_names():
+            core_db.Base.metadata.create_all(bind=conn)
+            command.stamp(cfg, "heads")
+            logger.info("Created tenant shard %s", engine.url.database)
+        else:
+            command.upgrade(cfg, "heads")
+            logger.info("Upgraded tenant shard %s", engine.url.database)
+
+
+class ShardRegistry:
+    """LRU of open tenant shard engines."""
+
+    def __init__(self, shard_dir: Path, max_open: int):
+        self.shard_dir = Path(shard_dir)
+        self.max_open = max(1, max_open)
+        self._open: "OrderedDict[str, Tuple[Engine, sessionmaker]]" = OrderedDict()
+        self._migrated = set()
+        self._lock = threading.Lock()
+
+    def path_for(self, tenant_id: str) -> Path:
+        return self.shard_dir / f"{validate_tenant_id(tenant_id)}.db"
+
+    def _entry(self, tenant_id: str, create: bool = False) -> Tuple[Engine, sessionmaker]:
+        with self._lock:
+            entry = self._open.get(tenant_id)
+            if entry is not None:
+                self._open.move_to_end(tenant_id)
+                return entry
+
+            from .db import configure_sqlite_engine
+
+            path = self.path_for(tenant_id)
+            if not path.exists():
+                if not create:
+                    raise UnknownTenant(f"Unknown tenant: {tenant_id!r}")
+                path.parent.mkdir(parents=True, exist_ok=True)
+                logger.info("Provisioning tenant shard %s", tenant_id)
+            engine = create_engine(f"sqlite:///{path.as_posix()}", connect_args={"check_same_thread": False})
+            configure_sqlite_engine(engine)
+            if tenant_id not in self._migrated:
+                try:
+                    migrate_shard(engine)
+                except Exception:
+                    engine.dispose()
+                    raise
+                self._migrated.add(tenant_id)
+
+            entry = (engine, sessionmaker(autocommit=False, autoflush=False, bind=engine))
+            self._open[tenant_id] = entry
+            while len(self._open) > self.max_open:
+                evicted, (old_engine, _) = self._open.popitem(last=False)
+                old_engine.dispose()
+                logger.debug("Closed tenant shard %s (LRU)", evicted)
+            return entry
+
+    def engine(self, tenant_id: str) -> Engine:
+        """Engine for a provisioned tenant's shard, opening (and migrating) it on first use."""
+        return self._entry(tenant_id)[0]
+
+    def session(self, tenant_id: str) -> Session:
+        """New session on a provisioned tenant's shard."""
+        return self._entry(tenant_id)[1]()
+
+    def provision(self, tenant_id: str) -> Engine:
+        """Create a tenant's shard at the Alembic heads (a no-op for existing shards)."""
+        return self._entry(tenant_id, create=True)[0]
+
+    def open_tenants(self) -> List[str]:
+        """Tenants with an open engine, least recently used first."""
+        with self._lock:
+            return list(self._open)
+
+    def tenant_ids(self) -> List[str]:
+        """Every tenant with a shard file on disk."""
+        if not self.shard_dir.is_dir():
+            return []
+        return sorted(p.stem for p in self.shard_dir.glob("*.db") if _TENANT_ID.match(p.stem))
+
+    def dispose(self) -> None:
+        """Close every open shard engine."""
+        with self._lock:
+            for engine, _ in self._open.values():
+                engine.dispose()
+            self._open.clear()
+
+
+_registry: Optional[ShardRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ShardRegistry:
+    """The process-wide shard registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                shard_dir = Path(settings.tenant_shard_dir)
+                if not shard_dir.is_absolute():
+                    shard_dir = (Path.cwd() / shard_dir).resolve()
+                _registry = ShardRegistry(shard_dir, settings.tenant_max_open_engines)
+    return _registry
+
+
+def set_registry(registry: Optional[ShardRegistry]) -> None:
+    """Install (or clear, with None) the process-wide registry."""
+    global _registry
+    _registry = registry
+
+
+def engine_for_tenant(tenant_id: str) -> Engine:
+    """Engine holding a tenant's data (the main engine for the default tenant)."""
+    if tenant_id == DEFAULT_TENANT:
+        from .db import engine
+        return engine
+    return get_registry().engine(tenant_id)
+
+
+def provision_tenant(tenant_id: str) -> Engine:
+    """Create the shard of a new tenant; the only path that creates shard files."""
+    if tenant_id == DEFAULT_TENANT:
+        raise InvalidTenant(f"{DEFAULT_TENANT!r} is the main database, not a shard")
+    return get_registry().provision(tenant_id)
+
+
+def session_for_tenant(tenant_id: str) -> Session:
+    """New session on a tenant's database (the main database for the default tenant)."""
+    if tenant_id == DEFAULT_TENANT:
+        from .db import SessionLocal
+        return SessionLocal()
+    return get_registry().session(tenant_id)
+
+
+def iter_tenant_sessions() -> Iterator[Tuple[str, Session]]:
+    """Yield ``(tenant_id, session)`` for the main database and every shard on disk.
+
+    Each session is closed once the caller moves on to the next tenant.
+    """
+    tenants = [DEFAULT_TENANT]
+    if settings.enable_tenant_shards:
+        tenants += [t for t in get_registry().tenant_ids() if t != DEFAULT_TENANT]
+    for tenant_id in tenants:
+        try:
+            db = session_for_tenant(tenant_id)
+        except Exception:
+            logger.exception("Could not open tenant shard %s", tenant_id)
+            continue
+        try:
+            yield tenant_id, db
+        finally:
+            db.close()
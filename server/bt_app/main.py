@@ -3,14 +3,17 @@ import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
 
 from .core.config import settings
 from .core.db import engine
+from .core.etag import ETagMiddleware
+from .core.metrics import MetricsMiddleware
+from .core.responses import FastJSONResponse
 from .core.scheduler import start_scheduler, stop_scheduler
 from .models import base  # Import to register models
-from .api.routes_root import api_router
+from .api.routes_root import include_api_routers
 from .api.routes_analytics_freq import router as analytics_freq_router
 from .api.routes_system import router as system_router
 # from .api.routes_ndax import router as ndax_router  # DISABLED - using old integrations router instead
@@ -39,15 +42,28 @@ async def lifespan(app: FastAPI):
     # DB connection probe
     try:
         from sqlalchemy import text
-        from .core.db import SessionLocal
+        from .core.db import SessionLocal, check_database
         from .core.config import settings
         
+        check_database()
         with SessionLocal() as s:
             s.execute(text("SELECT 1"))
         logger.info("DB check OK -> %s", settings.absolute_database_url)
     except Exception as e:
         logger.exception("DB check FAILED -> %s", e)
-    
+
+    # Warm the DuckDB analytics mirror in the background (no-op unless enabled)
+    try:
+        from .core.db import SessionLocal
+        from .services.analytics_engine import get_mirror
+
+        mirror = get_mirror()
+        if mirror is not None:
+            mirror.refresh_in_background(SessionLocal)
+            logger.info("DuckDB analytics mirror warming -> %s", settings.duckdb_path)
+    except Exception as e:
+        logger.error(f"Failed to start DuckDB analytics mirror: {e}")
+
     yield
     
     # Shutdown
@@ -59,6 +75,11 @@ async def lifespan(app: FastAPI):
         logger.info("Scheduler stopped successfully")
     except Exception as e:
         logger.error(f"Failed to stop scheduler: {e}")
+    
+    # Close any open tenant shard engines
+    if settings.enable_tenant_shards:
+        from .core.tenancy import get_registry
+        get_registry().dispose()
 
 
 # Create FastAPI app
@@ -66,9 +87,13 @@ app = FastAPI(
     title="Budget Tracker API",
     description="Personal budget tracking application with Plaid integration",
     version="1.0.0",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
+# Answer unchanged GETs with 304 from the write generations (inside CORS)
+app.add_middleware(ETagMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -83,8 +108,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include API router
-app.include_router(api_router, prefix="/api")
+# Per-route latency, SQL counts and Server-Timing (outermost, so 304s are timed too)
+app.add_middleware(MetricsMiddleware)
+
+# Include API routers
+include_api_routers(app)
 
 # Mount the frequency router under the same prefix the FE expects
 app.include_router(analytics_freq_router, prefix="/api/analytics", tags=["analytics"])
@@ -95,6 +123,11 @@ app.include_router(system_router, prefix="/api/system", tags=["system"])
 # Mount the NDAX router - DISABLED, using old integrations router instead
 # app.include_router(ndax_router)
 
+# On-demand request profiler; not even imported unless a token is configured
+if settings.profiler_token:
+    from .core.profiler import install_profiler
+    install_profiler(app)
+
 
 @app.get("/")
 async def root():
@@ -1,7 +1,8 @@
 """Account balance model for daily snapshots."""
 from sqlalchemy import Column, String, Integer, ForeignKey, Date, Numeric, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from .base import BaseModel
+from ..utils.money import to_cents
 
 
 class AccountBalance(BaseModel):
@@ -13,6 +14,8 @@ class AccountBalance(BaseModel):
     as_of = Column(Date, nullable=False, index=True)  # Daily snapshot date
     available = Column(Numeric(15, 2), nullable=True)  # Available balance
     current = Column(Numeric(15, 2), nullable=True)  # Current balance
+    available_cents = Column(Integer, nullable=True)  # available in integer cents
+    current_cents = Column(Integer, nullable=True)  # current in integer cents
     iso_currency_code = Column(String(3))  # ISO 4217 currency code
     
     # Relationships
@@ -23,5 +26,11 @@ class AccountBalance(BaseModel):
         UniqueConstraint('account_id', 'as_of', name='_account_date_uc'),
     )
     
+    @validates("available", "current")
+    def _sync_cents(self, key, value):
+        """Keep the *_cents columns in step with the balance amounts on every ORM write."""
+        setattr(self, f"{key}_cents", to_cents(value))
+        return value
+    
     def __repr__(self):
         return f"<AccountBalance(account_id={self.account_id}, as_of={self.as_of}, current={self.current})>"
\ No newline at end of file
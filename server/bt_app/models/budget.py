@@ -1,7 +1,8 @@
 """Budget model for monthly spending targets."""
 from sqlalchemy import Column, String, Integer, ForeignKey, Numeric, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from .base import BaseModel
+from ..utils.money import to_cents
 
 
 class Budget(BaseModel):
@@ -12,6 +13,7 @@ class Budget(BaseModel):
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
     month = Column(String(7), nullable=False)  # Format: YYYY-MM
     amount = Column(Numeric(10, 2), nullable=False)
+    amount_cents = Column(Integer)  # amount in integer cents, kept in sync on write
     
     # Relationships
     category = relationship("Category")
@@ -21,6 +23,12 @@ class Budget(BaseModel):
         UniqueConstraint('category_id', 'month', name='_budget_category_month_uc'),
     )
     
+    @validates("amount")
+    def _sync_amount_cents(self, key, value):
+        """Keep amount_cents in step with amount on every ORM write."""
+        self.amount_cents = to_cents(value)
+        return value
+    
     def __repr__(self):
         return f"<Budget(id={self.id}, category_id={self.category_id}, month={self.month}, amount={self.amount})>"
 
@@ -0,0 +1,109 @@
+"""Persisted recurring-subscription state and its refresh queue.
+
+``detected_subscriptions`` holds one row per canonical merchant currently
+detected as a subscription. It is not recomputed on read: SQLite triggers
+queue the canonical merchant of every transaction insert, delete or relevant
+update (and of subscription policy changes) in
+``subscription_dirty_merchants``, and ``services.detected_subscriptions``
+re-evaluates only the queued merchants after imports and on a schedule.
+"""
+from typing import List
+
+from sqlalchemy import Boolean, Column, Date, DateTime, Integer, String, Text, event, inspect
+from sqlalchemy.sql import func
+
+from ..core.db import Base
+
+
+class DetectedSubscription(Base):
+    """A canonical merchant detected as a recurring subscription."""
+
+    __tablename__ = "detected_subscriptions"
+
+    merchant_key = Column(String(255), primary_key=True)  # transactions.canonical_merchant
+    cadence = Column(String(10), nullable=False, default="monthly")
+    category = Column(String(255))
+    current_price_cents = Column(Integer, nullable=False)  # stable recent per-charge price
+    price_history = Column(Text)  # JSON list of stable prices in chronological order, NULL when unchanged
+    months_count = Column(Integer, nullable=False)
+    total_cents = Column(Integer, nullable=False)  # sum of absolute charge amounts
+    first_charge_date = Column(Date, nullable=False)
+    last_charge_date = Column(Date, nullable=False, index=True)
+    is_active = Column(Boolean, nullable=False, default=True)  # last charge within the activity window
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<DetectedSubscription(merchant_key={self.merchant_key}, is_active={self.is_active})>"
+
+
+class SubscriptionDirtyMerchant(Base):
+    """A canonical merchant whose subscription state must be re-evaluated."""
+
+    __tablename__ = "subscription_dirty_merchants"
+
+    merchant_key = Column(String(255), primary_key=True)
+
+
+# Transaction columns the detection reads; updates touching none of them change nothing
+TRACKED_COLUMNS = ("posted_date", "amount_cents", "txn_type", "category_id", "canonical_merchant")
+
+DIRTY_TRIGGERS = (
+    "trg_subscriptions_txn_insert", "trg_subscriptions_txn_update", "trg_subscriptions_txn_delete",
+    "trg_subscriptions_policy_insert", "trg_subscriptions_policy_update", "trg_subscriptions_category_update",
+)
+
+
+def _enqueue(expr: str) -> str:
+    return (
+        f"INSERT OR IGNORE INTO subscription_dirty_merchants (merchant_key) "
+        f"SELECT {expr} WHERE {expr} IS NOT NULL;"
+    )
+
+
+def dirty_trigger_ddl() -> List[str]:
+    """CREATE TRIGGER statements that queue merchants whose detection inputs changed."""
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_subscriptions_txn_insert AFTER INSERT ON transactions
+        BEGIN {_enqueue("NEW.canonical_merchant")} END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_subscriptions_txn_update
+        AFTER UPDATE OF {", ".join(TRACKED_COLUMNS)} ON transactions
+        BEGIN {_enqueue("OLD.canonical_merchant")} {_enqueue("NEW.canonical_merchant")} END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_subscriptions_txn_delete AFTER DELETE ON transactions
+        BEGIN {_enqueue("OLD.canonical_merchant")} END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_subscriptions_policy_insert AFTER INSERT ON canonical_merchants
+        BEGIN {_enqueue("NEW.key")} END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_subscriptions_policy_update
+        AFTER UPDATE OF subscription ON canonical_merchants
+        BEGIN {_enqueue("NEW.key")} END
+        """,
+        # Category names drive the subscription heuristics
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_subscriptions_category_update AFTER UPDATE OF name ON categories
+        BEGIN
+            INSERT OR IGNORE INTO subscription_dirty_merchants (merchant_key)
+            SELECT DISTINCT canonical_merchant FROM transactions
+            WHERE category_id = NEW.id AND canonical_merchant IS NOT NULL;
+        END
+        """,
+    ]
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_dirty_triggers(target, connection, **kw):
+    """Install the queue triggers whenever the schema is created with create_all."""
+    if connection.dialect.name != "sqlite":
+        return
+    tables = inspect(connection).get_table_names()
+    if not {"transactions", "canonical_merchants", "categories", SubscriptionDirtyMerchant.__tablename__} <= set(tables):
+        return
+    for ddl in dirty_trigger_ddl():
+        connection.exec_driver_sql(ddl)
@@ -0,0 +1,102 @@
+"""Canonical merchant keys and the aliases that map raw merchant text onto them.
+
+``transactions.canonical_merchant`` is derived from these tables when a
+transaction is written (see ``services.canonical_merchants``): the first
+alias, by priority, whose patterns match the raw merchant and description
+gives the key, otherwise it is the upper-cased raw merchant. Patterns use
+SQLite ``LIKE`` syntax (``%`` and ``_`` wildcards, case-insensitive).
+"""
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Column, ForeignKey, Integer, String, event, exists, inspect, select
+
+from ..core.db import Base
+from .base import BaseModel
+
+SUBSCRIPTION_ALWAYS = "always"  # reported as recurring without the category heuristics
+SUBSCRIPTION_NEVER = "never"  # high-frequency merchants that are never subscriptions
+
+
+class CanonicalMerchant(Base):
+    """A canonical merchant key and how subscription detection treats it."""
+
+    __tablename__ = "canonical_merchants"
+
+    key = Column(String(255), primary_key=True)  # UPPERCASE
+    subscription = Column(String(10))  # 'always', 'never' or NULL (decide from category and history)
+
+    def __repr__(self):
+        return f"<CanonicalMerchant(key={self.key}, subscription={self.subscription})>"
+
+
+class MerchantAlias(BaseModel):
+    """Maps raw merchant/description text to a canonical merchant key."""
+
+    __tablename__ = "merchant_aliases"
+
+    canonical_key = Column(String(255), ForeignKey("canonical_merchants.key"), nullable=False, index=True)
+    merchant_pattern = Column(String(500))  # LIKE pattern on merchant_raw; NULL matches any merchant
+    description_pattern = Column(String(500))  # LIKE pattern on description_raw; NULL matches any description
+    priority = Column(Integer, nullable=False, default=0)  # Higher priority aliases are tried first
+
+    def __repr__(self):
+        return f"<MerchantAlias(id={self.id}, canonical_key={self.canonical_key}, merchant_pattern={self.merchant_pattern})>"
+
+
+DEFAULT_CANONICAL_MERCHANTS: List[Tuple[str, str]] = [
+    *((key, SUBSCRIPTION_ALWAYS) for key in (
+        "OPENAI", "CURSOR", "TRADINGVIEW", "LEETCODE", "NETFLIX", "EQUINOX", "MEMBERSHIP_FEE",
+        "FIDO", "BELL_CANADA", "SPOTIFY", "APPLE", "GOOGLE", "ROGERS", "TELUS", "OURARING",
+    )),
+    *((key, SUBSCRIPTION_NEVER) for key in (
+        "RENT", "LONGOS", "LOBLAWS", "METRO", "SOBEYS", "WALMART", "DOLLARAMA", "RESTAURANT",
+        "TIM HORTONS", "STARBUCKS", "SHELL", "ESSO", "PETRO", "UBER RIDES", "UBER EATS", "REXALL",
+        "SHOPPERS", "NATURES EMPORIUM", "WINNERS", "INTEREST", "PHARMACY", "MCDONALD", "SUBWAY",
+        "AMAZONCOM PAYMENTS-CA", "AMAZON", "BEST BUY",
+    )),
+]
+
+# (canonical key, merchant pattern, description pattern) in match order
+DEFAULT_ALIASES: List[Tuple[str, Optional[str], Optional[str]]] = [
+    ("OPENAI", "ONLINE PAYMENTS BY STRIPE", "%OPENAI%"),
+    ("OPENAI", "ONLINE PAYMENTS BY STRIPE", "%CHATGPT%"),
+    ("OPENAI", "%OPENAI%", None),
+    ("CURSOR", "ONLINE PAYMENTS BY STRIPE", "%CURSOR%"),
+    ("CURSOR", "%CURSOR%", None),
+    ("TRADINGVIEW", "B2B TRANSACTION", "%TRADINGVIEW%"),
+    ("TRADINGVIEW", "%TRADINGVIEW%", None),
+    ("LEETCODE", "ONLINE PAYMENTS BY STRIPE", "%LEETCODE%"),
+    ("LEETCODE", "%LEETCODE%", None),
+    ("NETFLIX", "%NETFLIX%", None),
+    ("NETFLIX", None, "%NETFLIX%"),
+    ("EQUINOX", "%EQUINOX%", None),
+    ("MEMBERSHIP_FEE", "%MEMBERSHIP FEE%", None),
+    ("MEMBERSHIP_FEE", "CHECKOUT.COM ECOMM MEDIUM EEA", "%PATREON% MEMBERSHIP%"),
+    ("MEMBERSHIP_FEE", "%INTEREST%", "%MEMBERSHIP FEE%"),
+    ("FIDO", "%FIDO%", None),
+    ("FIDO", None, "%FIDO MOBILE%"),
+    ("BELL_CANADA", "%BELL CANADA%", None),
+    ("BELL_CANADA", "%BELL%", "%BELL CANADA%"),
+]
+
+
+def seed_default_aliases(connection) -> None:
+    """Insert the default canonical merchants and aliases."""
+    connection.execute(CanonicalMerchant.__table__.insert(), [
+        {"key": key, "subscription": subscription} for key, subscription in DEFAULT_CANONICAL_MERCHANTS
+    ])
+    connection.execute(MerchantAlias.__table__.insert(), [
+        {"canonical_key": key, "merchant_pattern": merchant, "description_pattern": description,
+         "priority": len(DEFAULT_ALIASES) - i}
+        for i, (key, merchant, description) in enumerate(DEFAULT_ALIASES)
+    ])
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _seed_aliases(target, connection, **kw):
+    """Seed the defaults when create_all has just created the (still empty) alias tables."""
+    if not inspect(connection).has_table(CanonicalMerchant.__tablename__):
+        return
+    if connection.execute(select(exists().select_from(CanonicalMerchant.__table__))).scalar():
+        return
+    seed_default_aliases(connection)
@@ -0,0 +1,278 @@
+"""Monthly aggregate (cube) models maintained from transactions.
+
+The cubes hold count, signed cents and absolute cents for every group of
+non-deleted transactions and are kept current by SQLite triggers on
+``transactions`` (insert, update, soft delete and delete), so raw SQL and
+bulk ORM writes are covered as well as regular ORM flushes.
+
+``monthly_networth`` is a prefix-sum series over the same rows: each month's
+income and expense totals plus the running net worth and balance up to and
+including it. Its triggers adjust the changed month and the running sums of
+that month and every later one, so appending to the latest month touches a
+single row and the whole series is read in O(months).
+"""
+from typing import List
+
+from sqlalchemy import Column, String, Integer, event, inspect
+
+from ..core.db import Base
+
+
+class MonthlyCategoryTotal(Base):
+    """Per-month totals by transaction type, category and subcategory.
+
+    category_id / subcategory_id are 0 for uncategorized transactions so they
+    can be part of the primary key.
+    """
+
+    __tablename__ = "monthly_category_totals"
+
+    month = Column(String(7), primary_key=True)  # YYYY-MM
+    txn_type = Column(String(10), primary_key=True)
+    category_id = Column(Integer, primary_key=True, default=0)
+    subcategory_id = Column(Integer, primary_key=True, default=0)
+    txn_count = Column(Integer, nullable=False, default=0)
+    amount_cents = Column(Integer, nullable=False, default=0)  # signed sum
+    abs_amount_cents = Column(Integer, nullable=False, default=0)  # sum of absolute values
+
+    def __repr__(self):
+        return f"<MonthlyCategoryTotal(month={self.month}, txn_type={self.txn_type}, category_id={self.category_id})>"
+
+
+class MonthlyMerchantTotal(Base):
+    """Per-month totals by merchant key (merchant_norm, else merchant_raw, else 'Unknown')."""
+
+    __tablename__ = "monthly_merchant_totals"
+
+    month = Column(String(7), primary_key=True)
+    txn_type = Column(String(10), primary_key=True)
+    merchant_key = Column(String(500), primary_key=True)
+    txn_count = Column(Integer, nullable=False, default=0)
+    amount_cents = Column(Integer, nullable=False, default=0)
+    abs_amount_cents = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<MonthlyMerchantTotal(month={self.month}, txn_type={self.txn_type}, merchant_key={self.merchant_key})>"
+
+
+class MonthlyAccountTotal(Base):
+    """Per-month totals by account."""
+
+    __tablename__ = "monthly_account_totals"
+
+    month = Column(String(7), primary_key=True)
+    txn_type = Column(String(10), primary_key=True)
+    account_id = Column(Integer, primary_key=True)
+    txn_count = Column(Integer, nullable=False, default=0)
+    amount_cents = Column(Integer, nullable=False, default=0)
+    abs_amount_cents = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<MonthlyAccountTotal(month={self.month}, txn_type={self.txn_type}, account_id={self.account_id})>"
+
+
+class MonthlyNetworth(Base):
+    """Per-month income and expenses with running (prefix-sum) net worth and balance.
+
+    Net worth counts income-type amounts against expenses; the balance counts
+    every inflow that is not an expense (the dashboard's definition of income).
+    """
+
+    __tablename__ = "monthly_networth"
+
+    month = Column(String(7), primary_key=True)  # YYYY-MM
+    txn_count = Column(Integer, nullable=False, default=0)  # every non-deleted transaction of the month
+    income_expense_count = Column(Integer, nullable=False, default=0)  # income and expense transactions
+    income_cents = Column(Integer, nullable=False, default=0)  # signed sum of income transactions
+    inflow_cents = Column(Integer, nullable=False, default=0)  # income plus positive non-expense amounts
+    expense_cents = Column(Integer, nullable=False, default=0)  # absolute sum of expense transactions
+    cumulative_net_cents = Column(Integer, nullable=False, default=0)  # income - expenses through this month
+    cumulative_balance_cents = Column(Integer, nullable=False, default=0)  # inflow - expenses through this month
+
+    def __repr__(self):
+        return f"<MonthlyNetworth(month={self.month}, cumulative_net_cents={self.cumulative_net_cents})>"
+
+
+# Group key of each cube as (column, expression over a transactions row).
+# ``{row}`` is NEW/OLD inside triggers and the table alias in rebuild queries.
+CUBE_KEYS = {
+    MonthlyCategoryTotal.__tablename__: [
+        ("month", "{row}.posted_month"),
+        ("txn_type", "{row}.txn_type"),
+        ("category_id", "COALESCE({row}.category_id, 0)"),
+        ("subcategory_id", "COALESCE({row}.subcategory_id, 0)"),
+    ],
+    MonthlyMerchantTotal.__tablename__: [
+        ("month", "{row}.posted_month"),
+        ("txn_type", "{row}.txn_type"),
+        ("merchant_key", "COALESCE({row}.merchant_norm, {row}.merchant_raw, 'Unknown')"),
+    ],
+    MonthlyAccountTotal.__tablename__: [
+        ("month", "{row}.posted_month"),
+        ("txn_type", "{row}.txn_type"),
+        ("account_id", "{row}.account_id"),
+    ],
+}
+
+# Updates that touch none of these columns cannot move a transaction between groups
+TRACKED_COLUMNS = (
+    "posted_date", "amount_cents", "txn_type", "category_id", "subcategory_id",
+    "merchant_norm", "merchant_raw", "account_id", "is_deleted",
+)
+
+
+def _apply_row(table: str, row: str, sign: str) -> str:
+    """SQL adding (sign '+') or removing (sign '-') one transactions row from a cube."""
+    keys = CUBE_KEYS[table]
+    columns = ", ".join(name for name, _ in keys)
+    values = ", ".join(expr.format(row=row) for _, expr in keys)
+    cents = f"COALESCE({row}.amount_cents, 0)"
+    prefix = "-" if sign == "-" else ""
+    sql = f"""
+        INSERT INTO {table} ({columns}, txn_count, amount_cents, abs_amount_cents)
+        SELECT {values}, {prefix}1, {prefix}{cents}, {prefix}ABS({cents})
+        WHERE COALESCE({row}.is_deleted, 0) = 0
+        ON CONFLICT ({columns}) DO UPDATE SET
+            txn_count = txn_count + excluded.txn_count,
+            amount_cents = amount_cents + excluded.amount_cents,
+            abs_amount_cents = abs_amount_cents + excluded.abs_amount_cents;
+    """
+    if sign == "-":
+        match = " AND ".join(f"{name} = {expr.format(row=row)}" for name, expr in keys)
+        sql += f"DELETE FROM {table} WHERE {match} AND txn_count = 0;"
+    return sql
+
+
+def cube_trigger_ddl() -> List[str]:
+    """CREATE TRIGGER statements that keep every cube in step with transactions."""
+    statements = []
+    for table in CUBE_KEYS:
+        statements.append(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_insert AFTER INSERT ON transactions
+            BEGIN {_apply_row(table, "NEW", "+")} END
+        """)
+        statements.append(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_update
+            AFTER UPDATE OF {", ".join(TRACKED_COLUMNS)} ON transactions
+            BEGIN {_apply_row(table, "OLD", "-")} {_apply_row(table, "NEW", "+")} END
+        """)
+        statements.append(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_delete AFTER DELETE ON transactions
+            BEGIN {_apply_row(table, "OLD", "-")} END
+        """)
+    return statements
+
+
+def cube_rebuild_sql(table: str, where: str = "1 = 1") -> str:
+    """SELECT producing the rows of ``table`` from transactions matching ``where`` (alias t)."""
+    keys = CUBE_KEYS[table]
+    exprs = ", ".join(expr.format(row="t") for _, expr in keys)
+    aliased = ", ".join(f"{expr.format(row='t')} AS {name}" for name, expr in keys)
+    return f"""
+        SELECT {aliased},
+               COUNT(*) AS txn_count,
+               SUM(COALESCE(t.amount_cents, 0)) AS amount_cents,
+               SUM(ABS(COALESCE(t.amount_cents, 0))) AS abs_amount_cents
+        FROM transactions t
+        WHERE COALESCE(t.is_deleted, 0) = 0 AND ({where})
+        GROUP BY {exprs}
+    """
+
+
+NETWORTH_TABLE = MonthlyNetworth.__tablename__
+
+# Contribution of one transactions row to each monthly_networth total
+NETWORTH_TERMS = {
+    "txn_count": "1",
+    "income_expense_count": "CASE WHEN {row}.txn_type IN ('income', 'expense') THEN 1 ELSE 0 END",
+    "income_cents": "CASE WHEN {row}.txn_type = 'income' THEN COALESCE({row}.amount_cents, 0) ELSE 0 END",
+    "inflow_cents": (
+        "CASE WHEN {row}.txn_type = 'income' THEN COALESCE({row}.amount_cents, 0) "
+        "WHEN {row}.txn_type != 'expense' THEN MAX(COALESCE({row}.amount_cents, 0), 0) ELSE 0 END"
+    ),
+    "expense_cents": "CASE WHEN {row}.txn_type = 'expense' THEN ABS(COALESCE({row}.amount_cents, 0)) ELSE 0 END",
+}
+
+# Running sums as (column, monthly expression over NETWORTH_TERMS)
+NETWORTH_CUMULATIVE = {
+    "cumulative_net_cents": "({income_cents}) - ({expense_cents})",
+    "cumulative_balance_cents": "({inflow_cents}) - ({expense_cents})",
+}
+
+NETWORTH_TRACKED_COLUMNS = ("posted_date", "amount_cents", "txn_type", "is_deleted")
+
+
+def _apply_networth_row(row: str, sign: str) -> str:
+    """SQL adding (sign '+') or removing (sign '-') one transactions row from monthly_networth."""
+    terms = {name: expr.format(row=row) for name, expr in NETWORTH_TERMS.items()}
+    live = f"COALESCE({row}.is_deleted, 0) = 0 AND {row}.posted_month IS NOT NULL"
+    # A new month starts from the running sums of the month before it
+    previous = {
+        name: f"COALESCE((SELECT p.{name} FROM {NETWORTH_TABLE} p WHERE p.month < {row}.posted_month "
+              f"ORDER BY p.month DESC LIMIT 1), 0)"
+        for name in NETWORTH_CUMULATIVE
+    }
+    sql = f"""
+        INSERT INTO {NETWORTH_TABLE} (month, {", ".join(NETWORTH_TERMS)}, {", ".join(NETWORTH_CUMULATIVE)})
+        SELECT {row}.posted_month, {", ".join("0" for _ in NETWORTH_TERMS)}, {", ".join(previous.values())}
+        WHERE {live}
+        ON CONFLICT (month) DO NOTHING;
+        UPDATE {NETWORTH_TABLE}
+        SET {", ".join(f"{name} = {name} {sign} ({expr})" for name, expr in terms.items())}
+        WHERE month = {row}.posted_month AND {live};
+        UPDATE {NETWORTH_TABLE}
+        SET {", ".join(f"{name} = {name} {sign} ({expr.format(**terms)})" for name, expr in NETWORTH_CUMULATIVE.items())}
+        WHERE month >= {row}.posted_month AND {live};
+    """
+    if sign == "-":
+        sql += f"DELETE FROM {NETWORTH_TABLE} WHERE month = {row}.posted_month AND txn_count = 0;"
+    return sql
+
+
+def networth_trigger_ddl() -> List[str]:
+    """CREATE TRIGGER statements that keep monthly_networth in step with transactions."""
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{NETWORTH_TABLE}_insert AFTER INSERT ON transactions
+        BEGIN {_apply_networth_row("NEW", "+")} END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{NETWORTH_TABLE}_update
+        AFTER UPDATE OF {", ".join(NETWORTH_TRACKED_COLUMNS)} ON transactions
+        BEGIN {_apply_networth_row("OLD", "-")} {_apply_networth_row("NEW", "+")} END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{NETWORTH_TABLE}_delete AFTER DELETE ON transactions
+        BEGIN {_apply_networth_row("OLD", "-")} END
+        """,
+    ]
+
+
+def networth_rebuild_sql() -> str:
+    """SELECT producing every monthly_networth row from scratch, in column order."""
+    totals = {name: f"SUM({expr.format(row='t')})" for name, expr in NETWORTH_TERMS.items()}
+    running = [
+        f"SUM({expr.format(**totals)}) OVER (ORDER BY t.posted_month) AS {name}"
+        for name, expr in NETWORTH_CUMULATIVE.items()
+    ]
+    return f"""
+        SELECT t.posted_month AS month,
+               {", ".join(f"{expr} AS {name}" for name, expr in totals.items())},
+               {", ".join(running)}
+        FROM transactions t
+        WHERE COALESCE(t.is_deleted, 0) = 0 AND t.posted_month IS NOT NULL
+        GROUP BY t.posted_month
+        ORDER BY t.posted_month
+    """
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_cube_triggers(target, connection, **kw):
+    """Install the cube and net worth triggers whenever the schema is created with create_all."""
+    if connection.dialect.name != "sqlite":
+        return
+    created = {t.name for t in kw.get("tables") or target.sorted_tables}
+    if not created & {*CUBE_KEYS, NETWORTH_TABLE} or not inspect(connection).has_table("transactions"):
+        return
+    for ddl in cube_trigger_ddl() + networth_trigger_ddl():
+        connection.exec_driver_sql(ddl)
@@ -0,0 +1,16 @@
+"""Lease rows used to elect the single process that runs scheduled jobs."""
+from sqlalchemy import Column, DateTime, String
+from ..core.db import Base
+
+
+class SchedulerLease(Base):
+    """A named lease held by one process until ``expires_at`` (naive UTC)."""
+    
+    __tablename__ = "scheduler_leases"
+    
+    name = Column(String(64), primary_key=True)
+    holder = Column(String(128), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<SchedulerLease(name={self.name}, holder={self.holder}, expires_at={self.expires_at})>"
@@ -1,7 +1,8 @@
 """Staging transaction model for Plaid imports."""
 from sqlalchemy import Column, String, Integer, ForeignKey, Date, Numeric, Text, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from .base import BaseModel
+from ..utils.money import to_cents
 
 
 class StagingTransaction(BaseModel):
@@ -25,6 +26,7 @@ class StagingTransaction(BaseModel):
     name = Column(String(500))  # Plaid transaction name
     merchant_name = Column(String(500))  # Plaid merchant name
     amount = Column(Numeric(10, 2), nullable=False)  # Keep original sign
+    amount_cents = Column(Integer)  # amount in integer cents, kept in sync on write
     currency = Column(String(3), default="USD")
     
     # Plaid categories
@@ -57,5 +59,11 @@ class StagingTransaction(BaseModel):
         Index('ix_staging_hash_key', 'hash_key'),
     )
     
+    @validates("amount")
+    def _sync_amount_cents(self, key, value):
+        """Keep amount_cents in step with amount on every ORM write."""
+        self.amount_cents = to_cents(value)
+        return value
+    
     def __repr__(self):
         return f"<StagingTransaction(id={self.id}, plaid_id={self.plaid_transaction_id}, status={self.status})>"
\ No newline at end of file
@@ -1,7 +1,9 @@
 """Transaction model."""
-from sqlalchemy import Column, String, Integer, ForeignKey, Date, Numeric, Index, UniqueConstraint, Boolean, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, ForeignKey, Date, Numeric, Index, UniqueConstraint, Boolean, Text, Computed, event, inspect
+from sqlalchemy.orm import Session, object_session, relationship, validates
 from .base import BaseModel
+from . import merchant_alias  # noqa: F401  (canonical_merchant is derived from its tables)
+from ..utils.money import to_cents
 
 
 class Transaction(BaseModel):
@@ -12,7 +14,9 @@ class Transaction(BaseModel):
     account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
     plaid_transaction_id = Column(String(255), unique=True, index=True)  # Nullable for manual imports
     posted_date = Column(Date, nullable=False, index=True)
+    posted_month = Column(String(7), Computed("strftime('%Y-%m', posted_date)", persisted=False))  # YYYY-MM bucket for indexed month lookups
     amount = Column(Numeric(10, 2), nullable=False)  # Negative for expenses, positive for income
+    amount_cents = Column(Integer)  # amount in integer cents, kept in sync on write
     currency = Column(String(3), default="CAD")
     
     # Raw data from source
@@ -23,6 +27,7 @@ class Transaction(BaseModel):
     merchant_norm = Column(String(255), index=True)
     description_norm = Column(String(255), index=True)  # Added for 2-level mapping
     cleaned_final_merchant = Column(String(255), index=True)  # Final merchant name for analysis
+    canonical_merchant = Column(String(255))  # Alias-table key grouping merchant variants, set on write
     category_id = Column(Integer, ForeignKey("categories.id"))
     subcategory_id = Column(Integer, ForeignKey("categories.id"))
     
@@ -47,24 +52,48 @@ class Transaction(BaseModel):
     __table_args__ = (
         UniqueConstraint('account_id', 'posted_date', 'amount', 'hash_dedupe', name='_transaction_dedupe_uc'),
         Index('ix_transactions_unmapped', 'merchant_norm', 'category_id'),
-        Index('ix_transactions_external_id', 'external_id'),
         Index('ix_transactions_import_id', 'import_id'),
+        Index('ix_transactions_month_type_cat_cents', 'posted_month', 'txn_type', 'category_id', 'amount_cents'),
+        Index('ix_transactions_updated_at', 'updated_at'),
+        Index('ix_transactions_canonical_month', 'canonical_merchant', 'posted_month'),
     )
     
+    @validates("amount")
+    def _sync_amount_cents(self, key, value):
+        """Keep amount_cents in step with amount on every ORM write."""
+        self.amount_cents = to_cents(value)
+        return value
+    
     def __repr__(self):
         return f"<Transaction(id={self.id}, date={self.posted_date}, amount={self.amount}, merchant={self.merchant_norm})>"
 
 
+FLUSH_MATCHER_KEY = "canonical_matcher"  # session.info slot holding the matcher of the current flush
 
 
+@event.listens_for(Session, "before_flush")
+def _reset_flush_matcher(session, flush_context, instances):
+    """Start every flush without a matcher, so alias changes since the last one are seen."""
+    session.info.pop(FLUSH_MATCHER_KEY, None)
 
 
+@event.listens_for(Transaction, "before_insert")
+@event.listens_for(Transaction, "before_update")
+def _set_canonical_merchant(mapper, connection, target):
+    """Derive canonical_merchant from the alias table when the raw merchant text is written.
 
+    The matcher (and its check of the alias generations) is fetched once per
+    flush and reused for every row in it.
+    """
+    attrs = inspect(target).attrs
+    if inspect(target).persistent and not (
+        attrs.merchant_raw.history.has_changes() or attrs.description_raw.history.has_changes()
+    ):
+        return
+    info = object_session(target).info
+    matcher = info.get(FLUSH_MATCHER_KEY)
+    if matcher is None:
+        from ..services.canonical_merchants import canonical_matcher
 
-
-
-
-
-
-
-
+        matcher = info[FLUSH_MATCHER_KEY] = canonical_matcher(connection)
+    target.canonical_merchant = matcher(target.merchant_raw, target.description_raw)
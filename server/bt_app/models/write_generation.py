@@ -0,0 +1,90 @@
+"""Per-table write generations shared by every process using the database.
+
+The result cache, ETags, the canonical merchant matcher and the DuckDB
+mirror all need to know whether a table changed since they last read it.
+Watching this process's own statements (``core.cache``) misses writes made
+by other workers, the scheduler leader and maintenance scripts, so SQLite
+triggers bump a counter in ``write_generations`` for every row written to a
+tracked table. Reading the counters is one small query; the counters only
+grow, and a commit makes a bump visible to every connection at once.
+
+The monthly cubes and the net worth series are maintained by triggers on
+``transactions`` and therefore change together with it; they have counters
+too, bumped explicitly by their rebuilds instead of per row.
+"""
+from typing import Iterable, List
+
+from sqlalchemy import Column, Integer, String, event, inspect
+
+from ..core.db import Base
+
+
+class WriteGeneration(Base):
+    """Number of row writes (or explicit bumps) seen by one table."""
+
+    __tablename__ = "write_generations"
+
+    table_name = Column(String(64), primary_key=True)
+    generation = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<WriteGeneration(table_name={self.table_name}, generation={self.generation})>"
+
+
+GENERATION_TABLE = WriteGeneration.__tablename__
+
+# Tables whose row writes bump their counter through triggers
+TRACKED_TABLES = (
+    "accounts", "account_balances", "budgets", "canonical_merchants", "categories",
+    "detected_subscriptions", "external_integrations", "institution_items", "merchant_aliases",
+    "merchant_rules", "plaid_imports", "staging_transactions", "transactions",
+)
+
+# Trigger-maintained from transactions; bumped by their rebuilds (see bump_generations_sql)
+DERIVED_TABLES = ("monthly_account_totals", "monthly_category_totals", "monthly_merchant_totals", "monthly_networth")
+
+_OPERATIONS = ("insert", "update", "delete")
+
+
+def generation_trigger_names(tables: Iterable[str] = TRACKED_TABLES) -> List[str]:
+    """Names of the generation triggers of ``tables``."""
+    return [f"trg_generation_{table}_{op}" for table in tables for op in _OPERATIONS]
+
+
+def generation_trigger_ddl(tables: Iterable[str] = TRACKED_TABLES) -> List[str]:
+    """CREATE TRIGGER statements that bump a table's counter on every row write."""
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_generation_{table}_{op} AFTER {op.upper()} ON {table}
+        BEGIN
+            UPDATE {GENERATION_TABLE} SET generation = generation + 1 WHERE table_name = '{table}';
+        END
+        """
+        for table in tables
+        for op in _OPERATIONS
+    ]
+
+
+def seed_generations_sql(tables: Iterable[str] = TRACKED_TABLES + DERIVED_TABLES) -> str:
+    """INSERT of the zero counters the triggers and bumps update."""
+    values = ", ".join(f"('{table}', 0)" for table in tables)
+    return f"INSERT OR IGNORE INTO {GENERATION_TABLE} (table_name, generation) VALUES {values}"
+
+
+def bump_generations_sql(tables: Iterable[str]) -> str:
+    """UPDATE bumping the counters of ``tables`` (for writes that bypass the triggers)."""
+    names = ", ".join(f"'{table}'" for table in tables)
+    return f"UPDATE {GENERATION_TABLE} SET generation = generation + 1 WHERE table_name IN ({names})"
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_generation_triggers(target, connection, **kw):
+    """Seed the counters and install the triggers whenever the schema is created with create_all."""
+    if connection.dialect.name != "sqlite":
+        return
+    tables = set(inspect(connection).get_table_names())
+    if GENERATION_TABLE not in tables:
+        return
+    connection.exec_driver_sql(seed_generations_sql())
+    for ddl in generation_trigger_ddl(t for t in TRACKED_TABLES if t in tables):
+        connection.exec_driver_sql(ddl)
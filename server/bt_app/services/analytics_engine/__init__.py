@@ -0,0 +1,17 @@
+"""Columnar analytics engine package."""
+from .router import get_mirror, run_analytics_query, set_mirror
+
+__all__ = [
+    "DuckDBMirror",
+    "get_mirror",
+    "run_analytics_query",
+    "set_mirror",
+]
+
+
+def __getattr__(name):
+    # The mirror module pulls in pandas and duckdb; load it on first use
+    if name == "DuckDBMirror":
+        from .mirror import DuckDBMirror
+        return DuckDBMirror
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,277 @@
+"""In-process DuckDB mirror of the analytical tables."""
+import logging
+import re
+import threading
+from collections import namedtuple
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ...core.cache import shared_generations
+
+try:
+    import duckdb
+except ImportError:  # optional dependency
+    duckdb = None
+
+logger = logging.getLogger(__name__)
+
+# Dates are mirrored as ISO strings, exactly as SQLite stores them, so MIN/MAX
+# and string comparisons behave the same on both engines.
+MIRROR_SCHEMA = {
+    "transactions": """
+        CREATE TABLE IF NOT EXISTS transactions (
+            id BIGINT PRIMARY KEY,
+            account_id BIGINT,
+            posted_date VARCHAR,
+            posted_month VARCHAR,
+            amount DOUBLE,
+            amount_cents BIGINT,
+            txn_type VARCHAR,
+            category_id BIGINT,
+            subcategory_id BIGINT,
+            merchant_raw VARCHAR,
+            merchant_norm VARCHAR,
+            description_raw VARCHAR,
+            description_norm VARCHAR,
+            cleaned_final_merchant VARCHAR,
+            source VARCHAR,
+            is_deleted BOOLEAN,
+            updated_at VARCHAR,
+            canonical_merchant VARCHAR
+        )
+    """,
+    "categories": """
+        CREATE TABLE IF NOT EXISTS categories (
+            id BIGINT PRIMARY KEY,
+            name VARCHAR,
+            parent_id BIGINT,
+            color VARCHAR
+        )
+    """,
+    "accounts": """
+        CREATE TABLE IF NOT EXISTS accounts (
+            id BIGINT PRIMARY KEY,
+            institution_item_id BIGINT,
+            name VARCHAR,
+            mask VARCHAR,
+            account_type VARCHAR,
+            account_subtype VARCHAR,
+            currency VARCHAR
+        )
+    """,
+}
+
+TRANSACTION_COLUMNS = (
+    "id, account_id, posted_date, posted_month, amount, amount_cents, txn_type, "
+    "category_id, subcategory_id, merchant_raw, merchant_norm, description_raw, "
+    "description_norm, cleaned_final_merchant, source, is_deleted, updated_at, canonical_merchant"
+)
+CATEGORY_COLUMNS = "id, name, parent_id, color"
+ACCOUNT_COLUMNS = "id, institution_item_id, name, mask, account_type, account_subtype, currency"
+
+MIRRORED_TABLES = tuple(MIRROR_SCHEMA)
+
+# Where the next incremental sync of transactions starts
+SYNC_POINT_QUERY = text("SELECT MAX(id), MAX(updated_at) FROM transactions")
+
+# Change probe for databases without the shared write counters (before migration 027)
+FALLBACK_PROBE_QUERY = text("""
+    SELECT
+        (SELECT MAX(id) FROM transactions),
+        (SELECT MAX(updated_at) FROM transactions),
+        (SELECT COUNT(*) FROM transactions),
+        (SELECT MAX(COALESCE(updated_at, created_at)) FROM categories),
+        (SELECT COUNT(*) FROM categories),
+        (SELECT MAX(COALESCE(updated_at, created_at)) FROM accounts),
+        (SELECT COUNT(*) FROM accounts)
+""")
+
+CHUNK_SIZE = 50_000
+
+_PARAM_RE = re.compile(r"(?<![:\w]):([A-Za-z_]\w*)")
+
+
+def to_duckdb_sql(sql: str) -> str:
+    """Translate the SQLite dialect used by the analytics queries to DuckDB."""
+    sql = _PARAM_RE.sub(r"$\1", sql)
+    # SQLite LIKE is case-insensitive for ASCII; DuckDB LIKE is not
+    sql = re.sub(r"\bLIKE\b", "ILIKE", sql, flags=re.IGNORECASE)
+    # SQLite FLOAT is 8 bytes; DuckDB FLOAT is 4, which would leak rounding noise
+    return re.sub(r"\bAS FLOAT\b", "AS DOUBLE", sql, flags=re.IGNORECASE)
+
+
+def _bind_value(value: Any) -> Any:
+    """Dates are compared as ISO strings in the mirror, like in SQLite."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class DuckDBMirror:
+    """Columnar copy of transactions, categories and accounts for read-only analytics.
+
+    Freshness is tracked with the shared, trigger-maintained write generations
+    of the mirrored tables (``write_generations``), which every write by any
+    process bumps: ``is_fresh`` is one read of those counters, and tells the
+    query router whether it is safe to serve from the mirror or whether it has
+    to fall back to SQLite. ``refresh`` pulls only transactions past the sync
+    point (max id and max updated_at) recorded by the previous refresh, and
+    counts rows only then, to detect hard deletes.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        if duckdb is None:
+            raise RuntimeError("duckdb is not installed; pip install duckdb to enable the analytics mirror")
+        self.path = path
+        self._conn = duckdb.connect(path)
+        self._lock = threading.Lock()
+        self._refreshing = threading.Event()
+        self._watermark: Optional[Tuple] = None
+        self._sync_point: Optional[Tuple] = None
+        for ddl in MIRROR_SCHEMA.values():
+            self._conn.execute(ddl)
+        # Mirror files created before canonical_merchant existed (reloaded on the first refresh)
+        self._conn.execute("ALTER TABLE transactions ADD COLUMN IF NOT EXISTS canonical_merchant VARCHAR")
+
+    @property
+    def watermark(self) -> Optional[Tuple]:
+        """Source write generations the mirror was last synced to (None before the first load)."""
+        return self._watermark
+
+    def _probe(self, db: Session) -> Tuple:
+        generations = shared_generations(db.connection(), MIRRORED_TABLES)
+        if generations is not None:
+            return generations
+        return tuple(db.execute(FALLBACK_PROBE_QUERY).first())
+
+    def is_fresh(self, db: Session) -> bool:
+        """Return True if the mirror reflects every committed change in SQLite."""
+        return self._watermark is not None and self._probe(db) == self._watermark
+
+    def refresh(self, db: Session, full: bool = False) -> Dict[str, Any]:
+        """Bring the mirror up to date with SQLite.
+
+        Args:
+            db: SQLite session to read from
+            full: Reload everything instead of syncing past the last sync point
+
+        Returns:
+            Summary of what was synced
+        """
+        with self._lock:
+            probe = self._probe(db)
+            if not full and probe == self._watermark:
+                return {"mode": "noop", "rows": 0}
+
+            cursor = self._conn.cursor()
+            previous = self._sync_point
+            incremental = not full and previous is not None
+            sync_point = tuple(db.execute(SYNC_POINT_QUERY).first())
+
+            # Dimension tables are small; always reload them whole
+            self._load(cursor, "categories", f"SELECT {CATEGORY_COLUMNS} FROM categories", db, replace=True)
+            self._load(cursor, "accounts", f"SELECT {ACCOUNT_COLUMNS} FROM accounts", db, replace=True)
+
+            if incremental:
+                last_id, last_updated_at = previous[0] or 0, previous[1]
+                where = "id > :last_id"
+                params = {"last_id": last_id}
+                if last_updated_at is not None:
+                    # >= so rows touched within the same second as the watermark are re-read
+                    where += " OR updated_at >= :last_updated_at"
+                    params["last_updated_at"] = last_updated_at
+                rows = self._load(
+                    cursor, "transactions",
+                    f"SELECT {TRANSACTION_COLUMNS} FROM transactions WHERE {where}",
+                    db, params=params
+                )
+                # Hard deletes leave no trace past the sync point; a count mismatch means rebuild
+                mirrored = cursor.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+                source = db.execute(text("SELECT COUNT(*) FROM transactions")).scalar()
+                if mirrored != source:
+                    logger.info("DuckDB mirror row count drifted (%s != %s); rebuilding", mirrored, source)
+                    incremental = False
+
+            if not incremental:
+                rows = self._load(
+                    cursor, "transactions",
+                    f"SELECT {TRANSACTION_COLUMNS} FROM transactions",
+                    db, replace=True
+                )
+
+            self._watermark = probe
+            self._sync_point = sync_point
+            mode = "incremental" if incremental else "full"
+            logger.info("DuckDB mirror %s refresh synced %s transactions", mode, rows)
+            return {"mode": mode, "rows": rows}
+
+    def refresh_in_background(self, session_factory) -> bool:
+        """Start a refresh on a worker thread unless one is already running.
+
+        Returns:
+            True if a refresh was started
+        """
+        if self._refreshing.is_set():
+            return False
+        self._refreshing.set()
+
+        def _run():
+            db = session_factory()
+            try:
+                self.refresh(db)
+            except Exception:
+                logger.exception("DuckDB mirror background refresh failed")
+            finally:
+                db.close()
+                self._refreshing.clear()
+
+        threading.Thread(target=_run, name="duckdb-mirror-refresh", daemon=True).start()
+        return True
+
+    def _load(self, cursor, table: str, select_sql: str, db: Session,
+              params: Optional[Dict[str, Any]] = None, replace: bool = False) -> int:
+        """Copy the result of ``select_sql`` from SQLite into ``table``."""
+        import pandas as pd
+
+        if replace:
+            cursor.execute(f"DELETE FROM {table}")
+
+        total = 0
+        conn = db.connection()
+        for chunk in pd.read_sql(text(select_sql), conn, params=params or {}, chunksize=CHUNK_SIZE):
+            if chunk.empty:
+                continue
+            if table == "transactions":
+                chunk["is_deleted"] = chunk["is_deleted"].fillna(0).astype(bool)
+                for column in ("posted_date", "updated_at"):
+                    chunk[column] = chunk[column].astype("string")
+            cursor.register("_mirror_chunk", chunk)
+            cursor.execute(f"INSERT OR REPLACE INTO {table} SELECT * FROM _mirror_chunk")
+            cursor.unregister("_mirror_chunk")
+            total += len(chunk)
+        return total
+
+    def execute(self, sql: str, params: Optional[Dict[str, Any]] = None) -> List[Tuple]:
+        """Run a read-only SQLite-dialect analytics query against the mirror.
+
+        Rows support attribute access by column label, like SQLAlchemy rows.
+        """
+        cursor = self._conn.cursor()
+        try:
+            duck_sql = to_duckdb_sql(sql)
+            bound = {
+                k: _bind_value(v) for k, v in (params or {}).items()
+                if re.search(rf"\${k}\b", duck_sql)
+            }
+            result = cursor.execute(duck_sql, bound)
+            Row = namedtuple("Row", [d[0] for d in result.description], rename=True)
+            return [Row(*values) for values in result.fetchall()]
+        finally:
+            cursor.close()
+
+    def close(self) -> None:
+        """Close the DuckDB connection."""
+        self._conn.close()
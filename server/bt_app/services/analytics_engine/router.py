@@ -0,0 +1,77 @@
+"""Query router that sends read-only analytics to the DuckDB mirror when it is fresh."""
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.orm import Session
+
+from ...core.config import settings
+
+if TYPE_CHECKING:
+    from .mirror import DuckDBMirror
+
+logger = logging.getLogger(__name__)
+
+_mirror: Optional["DuckDBMirror"] = None
+_mirror_lock = threading.Lock()
+
+
+def get_mirror() -> Optional["DuckDBMirror"]:
+    """Return the process-wide mirror, or None when it is disabled or unavailable."""
+    global _mirror
+    if not settings.enable_duckdb_mirror:
+        return None
+    from .mirror import DuckDBMirror, duckdb  # pandas/duckdb load only when the mirror is on
+    if duckdb is None:
+        return None
+    if _mirror is None:
+        with _mirror_lock:
+            if _mirror is None:
+                _mirror = DuckDBMirror(settings.duckdb_path)
+    return _mirror
+
+
+def set_mirror(mirror: Optional["DuckDBMirror"]) -> None:
+    """Install (or clear, with None) the process-wide mirror."""
+    global _mirror
+    _mirror = mirror
+
+
+def _is_main_database(db: Session) -> bool:
+    """The mirror copies the main database only; tenant shards always use SQLite."""
+    if not settings.enable_tenant_shards:
+        return True
+    from ...core.db import engine
+    return db.get_bind() is engine
+
+
+def run_analytics_query(db: Session, sql: Union[str, TextClause],
+                        params: Optional[Dict[str, Any]] = None) -> List[Any]:
+    """Run a read-only analytics query on the mirror, falling back to SQLite.
+
+    The query must only read ``transactions``, ``categories`` and ``accounts``.
+    When the mirror is behind SQLite the query is answered by SQLite and a
+    background refresh is started so later requests can use the mirror again.
+
+    Args:
+        db: SQLite session (used for the freshness probe and the fallback)
+        sql: Query (string or ``text()``) in the SQLite dialect with ``:name`` parameters
+        params: Bound parameters
+
+    Returns:
+        Rows with attribute access by column label
+    """
+    if isinstance(sql, TextClause):
+        sql = sql.text
+    mirror = get_mirror()
+    if mirror is not None and _is_main_database(db):
+        try:
+            if mirror.is_fresh(db):
+                return mirror.execute(sql, params)
+            from ...core.db import SessionLocal
+            mirror.refresh_in_background(SessionLocal)
+        except Exception:
+            logger.exception("DuckDB mirror query failed; falling back to SQLite")
+    return db.execute(text(sql), params or {}).fetchall()
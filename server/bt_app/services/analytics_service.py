@@ -9,6 +9,9 @@ import re
 
 from ..models.transaction import Transaction
 from ..models.category import Category
+from .analytics_engine import run_analytics_query
+from ..core.cache import cached
+from .monthly_aggregates import ANALYTICS_SOURCE_TABLES, CATEGORY_CUBE, cube_source
 
 # Subscription detection configuration
 PRICE_TOL_ABS = 3.00        # absolute tolerance in $
@@ -41,6 +44,35 @@ def _amount_same(a: float, b: float) -> bool:
     return abs(a - b) / base <= PRICE_TOL_PCT
 
 
+def rollup_pairs(category_ids: List[int], parent_of: Dict[int, Any]) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """Parent categories above ``category_ids`` and how the categories roll up into them.
+
+    Each category counts towards itself (when it is a parent) and every
+    ancestor; cycles in the parent links are cut.
+
+    Args:
+        category_ids: Categories with data, in row order
+        parent_of: Parent id (or None) of every category
+
+    Returns:
+        (sorted parent ids, (parent position, category position) pairs)
+    """
+    chains = {}
+    for category_id in category_ids:
+        chain, node = [], category_id
+        while node in parent_of and node not in chain:
+            chain.append(node)
+            node = parent_of[node]
+        chains[category_id] = chain
+    parents = sorted({node for chain in chains.values() for node in chain[1:]})
+    parent_pos = {category_id: i for i, category_id in enumerate(parents)}
+    pairs = [
+        (parent_pos[node], i)
+        for i, category_id in enumerate(category_ids)
+        for node in chains[category_id] if node in parent_pos
+    ]
+    return parents, pairs
+
 
 class AnalyticsService:
     """Service for analytics with date range support."""
@@ -48,14 +80,16 @@ class AnalyticsService:
     def __init__(self, db: Session):
         self.db = db
     
+    @cached(ANALYTICS_SOURCE_TABLES)
     def get_available_months(self) -> Dict[str, str]:
         """Return min, max, and latest month with data."""
         result = self.db.execute(text("""
             SELECT 
-                MIN(strftime('%Y-%m', posted_date)) as min_month,
-                MAX(strftime('%Y-%m', posted_date)) as max_month,
-                MAX(strftime('%Y-%m', posted_date)) as latest_with_data
+                MIN(posted_month) as min_month,
+                MAX(posted_month) as max_month,
+                MAX(posted_month) as latest_with_data
             FROM transactions
+            WHERE COALESCE(is_deleted, 0) = 0
         """)).first()
         
         if result and result.min_month:
@@ -86,24 +120,21 @@ class AnalyticsService:
         
         return months
     
+    @cached(ANALYTICS_SOURCE_TABLES)
     def monthly_income_expense(self, start: date, end: date) -> Dict[str, Dict[str, float]]:
         """Return dict {month: {"income": x, "expense": y}} for the range (zero-filled)."""
         # Get actual data from database
-        results = self.db.execute(text("""
+        source, params = cube_source(CATEGORY_CUBE, start, end)
+        results = self.db.execute(text(f"""
             SELECT 
-                strftime('%Y-%m', posted_date) as month,
-                SUM(CASE WHEN txn_type = 'income' THEN amount ELSE 0 END) as income,
-                SUM(CASE WHEN txn_type = 'expense' THEN ABS(amount) ELSE 0 END) as expense
-            FROM transactions
-            WHERE posted_date >= :start_date 
-                AND posted_date <= :end_date
-                AND txn_type IN ('income', 'expense')
-            GROUP BY strftime('%Y-%m', posted_date)
+                month,
+                SUM(CASE WHEN txn_type = 'income' THEN amount_cents ELSE 0 END) / 100.0 as income,
+                SUM(CASE WHEN txn_type = 'expense' THEN abs_amount_cents ELSE 0 END) / 100.0 as expense
+            FROM ({source}) m
+            WHERE txn_type IN ('income', 'expense')
+            GROUP BY month
             ORDER BY month
-        """), {
-            "start_date": start.strftime('%Y-%m-%d'),
-            "end_date": end.strftime('%Y-%m-%d')
-        }).fetchall()
+        """), params).fetchall()
         
         # Create zero-filled dict for all months in range
         month_data = {}
@@ -147,15 +178,18 @@ class AnalyticsService:
             for month, data in monthly.items()
         }
     
+    @cached(ANALYTICS_SOURCE_TABLES)
     def latest_month_with_data(self) -> str:
         """Return latest month string 'YYYY-MM' that actually has transactions."""
         result = self.db.execute(text("""
-            SELECT MAX(strftime('%Y-%m', posted_date)) as latest_month
+            SELECT MAX(posted_month) as latest_month
             FROM transactions
+            WHERE COALESCE(is_deleted, 0) = 0
         """)).first()
         
         return result.latest_month if result and result.latest_month else None
     
+    @cached(ANALYTICS_SOURCE_TABLES)
     def get_summary_range(self, start: date, end: date) -> Dict[str, Any]:
         """Get summary data for date range."""
         monthly = self.monthly_income_expense(start, end)
@@ -173,25 +207,27 @@ class AnalyticsService:
             **totals
         }
     
+    @cached(ANALYTICS_SOURCE_TABLES)
     def get_category_series(self, category_id: int, start: date, end: date) -> Dict[str, Any]:
         """Get monthly series for a single expense category."""
         # Get actual data for the category
-        results = self.db.execute(text("""
+        results = run_analytics_query(self.db, text("""
             SELECT 
-                strftime('%Y-%m', posted_date) as month,
-                SUM(ABS(amount)) as total
+                posted_month as month,
+                SUM(ABS(amount_cents)) / 100.0 as total
             FROM transactions
             WHERE category_id = :category_id
                 AND txn_type = 'expense'
+                AND COALESCE(is_deleted, 0) = 0
                 AND posted_date >= :start_date 
                 AND posted_date <= :end_date
-            GROUP BY strftime('%Y-%m', posted_date)
+            GROUP BY posted_month
             ORDER BY month
         """), {
             "category_id": category_id,
             "start_date": start.strftime('%Y-%m-%d'),
             "end_date": end.strftime('%Y-%m-%d')
-        }).fetchall()
+        })
         
         # Create zero-filled dict for all months in range
         months = self.month_range(start, end)
@@ -212,7 +248,78 @@ class AnalyticsService:
             "total": total,
             "monthly_avg": monthly_avg
         }
-    
+
+    @cached(ANALYTICS_SOURCE_TABLES)
+    def get_category_matrix(self, start: date, end: date) -> Dict[str, Any]:
+        """Get the category x month expense matrix for a range, with parent rollups and totals.
+
+        One grouped query over the category cube is scattered into a zeroed
+        (category, month) array, so every category's series comes back in one
+        call. ``categories`` holds the spending booked to each category itself
+        (``category_id`` None for uncategorized); ``rollups`` holds, for every
+        parent category, its own spending plus that of all its descendants.
+        """
+        import numpy as np
+
+        source, params = cube_source(CATEGORY_CUBE, start, end)
+        rows = self.db.execute(text(f"""
+            SELECT category_id, month, SUM(abs_amount_cents) AS cents, SUM(txn_count) AS txn_count
+            FROM ({source}) m
+            WHERE txn_type = 'expense'
+            GROUP BY category_id, month
+        """), params).fetchall()
+        categories = {
+            row.id: (row.name, row.parent_id)
+            for row in self.db.execute(text("SELECT id, name, parent_id FROM categories"))
+        }
+
+        months = self.month_range(start, end)
+        category_ids, row_pos = np.unique(
+            np.array([row.category_id for row in rows], dtype=np.int64), return_inverse=True
+        )
+        month_pos = np.searchsorted(np.array(months), np.array([row.month for row in rows], dtype=str))
+        cents = np.zeros((len(category_ids), len(months)), dtype=np.int64)
+        counts = np.zeros_like(cents)
+        cents[row_pos, month_pos] = [row.cents for row in rows]
+        counts[row_pos, month_pos] = [row.txn_count for row in rows]
+
+        parents, pairs = rollup_pairs(category_ids.tolist(), {k: v[1] for k, v in categories.items()})
+        rollup_cents = np.zeros((len(parents), len(months)), dtype=np.int64)
+        rollup_counts = np.zeros_like(rollup_cents)
+        if pairs:
+            targets, sources = np.array(pairs).T
+            np.add.at(rollup_cents, targets, cents[sources])
+            np.add.at(rollup_counts, targets, counts[sources])
+
+        def series(amounts, txn_counts) -> Dict[str, Any]:
+            total = int(amounts.sum()) / 100
+            return {
+                "values": (amounts / 100).tolist(),
+                "txn_counts": txn_counts.tolist(),
+                "total": total,
+                "monthly_avg": total / len(months) if months else 0.0,
+            }
+
+        def labelled(category_ids, amounts, txn_counts) -> List[Dict[str, Any]]:
+            entries = []
+            for i, category_id in enumerate(category_ids):
+                name, parent_id = categories.get(category_id, ("Uncategorized", None))
+                entries.append({
+                    "category_id": category_id or None,
+                    "name": name,
+                    "parent_id": parent_id,
+                    **series(amounts[i], txn_counts[i]),
+                })
+            return sorted(entries, key=lambda entry: -entry["total"])
+
+        return {
+            "months": months,
+            "categories": labelled(category_ids.tolist(), cents, counts),
+            "rollups": labelled(parents, rollup_cents, rollup_counts),
+            "totals": series(cents.sum(axis=0), counts.sum(axis=0)),
+        }
+
+    @cached(ANALYTICS_SOURCE_TABLES)
     def get_latest_month_breakdowns(self) -> Dict[str, Any]:
         """Get category details and top merchants for latest month."""
         latest_month = self.latest_month_with_data()
@@ -228,11 +335,12 @@ class AnalyticsService:
             SELECT 
                 COALESCE(c.name, 'Uncategorized') as category,
                 COALESCE(t.description_norm, t.description_raw, 'Unknown') as description,
-                SUM(ABS(t.amount)) as amount
+                SUM(ABS(t.amount_cents)) / 100.0 as amount
             FROM transactions t
             LEFT JOIN categories c ON t.category_id = c.id
-            WHERE strftime('%Y-%m', t.posted_date) = :month
+            WHERE t.posted_month = :month
                 AND t.txn_type = 'expense'
+                AND COALESCE(t.is_deleted, 0) = 0
             GROUP BY c.name, description
             ORDER BY c.name, amount DESC
         """), {"month": latest_month}).fetchall()
@@ -265,10 +373,11 @@ class AnalyticsService:
         merchant_results = self.db.execute(text("""
             SELECT 
                 COALESCE(merchant_norm, merchant_raw, 'Unknown') as merchant,
-                SUM(ABS(amount)) as amount
+                SUM(ABS(amount_cents)) / 100.0 as amount
             FROM transactions
-            WHERE strftime('%Y-%m', posted_date) = :month
+            WHERE posted_month = :month
                 AND txn_type = 'expense'
+                AND COALESCE(is_deleted, 0) = 0
             GROUP BY merchant
             ORDER BY amount DESC
             LIMIT 10
@@ -288,6 +397,7 @@ class AnalyticsService:
             "top_merchants": top_merchants
         }
     
+    @cached(ANALYTICS_SOURCE_TABLES)
     def get_transaction_counts(self, start: date, end: date) -> Dict[str, int]:
         """Get transaction counts for date range."""
         result = self.db.execute(text("""
@@ -298,6 +408,7 @@ class AnalyticsService:
             FROM transactions
             WHERE posted_date >= :start_date 
                 AND posted_date <= :end_date
+                AND COALESCE(is_deleted, 0) = 0
         """), {
             "start_date": start.strftime('%Y-%m-%d'),
             "end_date": end.strftime('%Y-%m-%d')
@@ -309,33 +420,36 @@ class AnalyticsService:
             "categories": result.categories if result else 0
         }
     
+    @cached(ANALYTICS_SOURCE_TABLES)
     def get_cumulative_networth(self) -> Dict[str, Any]:
-        """Get net worth progression from first to latest month (all time)."""
+        """Get net worth progression from first to latest month (all time).
+
+        Reads the trigger-maintained prefix sums, so the cost is one row per month.
+        """
         results = self.db.execute(text("""
-            SELECT 
-                strftime('%Y-%m', posted_date) as month,
-                SUM(CASE WHEN txn_type = 'income' THEN amount ELSE 0 END) as income,
-                SUM(CASE WHEN txn_type = 'expense' THEN ABS(amount) ELSE 0 END) as expense
-            FROM transactions
-            WHERE txn_type IN ('income', 'expense')
-            GROUP BY strftime('%Y-%m', posted_date)
+            SELECT month, cumulative_net_cents
+            FROM monthly_networth
+            WHERE income_expense_count > 0
             ORDER BY month
         """)).fetchall()
         
-        months = []
-        networth_values = []
-        cumulative = 0.0
-        
-        for row in results:
-            income = float(row.income or 0)
-            expense = float(row.expense or 0)
-            net_savings = income - expense
-            cumulative += net_savings
-            
-            months.append(row.month)
-            networth_values.append(cumulative)
+        return {
+            "months": [row.month for row in results],
+            "networth_cumulative": [row.cumulative_net_cents / 100 for row in results]
+        }
+    
+    @cached(ANALYTICS_SOURCE_TABLES)
+    def get_latest_networth(self) -> Dict[str, Any]:
+        """Get the all-time net worth as of the latest month with income or expenses."""
+        row = self.db.execute(text("""
+            SELECT month, cumulative_net_cents
+            FROM monthly_networth
+            WHERE income_expense_count > 0
+            ORDER BY month DESC
+            LIMIT 1
+        """)).first()
         
         return {
-            "months": months,
-            "networth_cumulative": networth_values
+            "month": row.month if row else None,
+            "networth": row.cumulative_net_cents / 100 if row else 0.0
         }
\ No newline at end of file
@@ -4,8 +4,6 @@ from typing import List, Optional, Protocol, TypedDict
 from dateutil import tz
 from decimal import Decimal
 
-from plaid.model.accounts_balance_get_request import AccountsBalanceGetRequest
-
 from ...services.plaid_service import get_plaid_client
 
 
@@ -86,6 +84,8 @@ class PlaidBalanceProvider:
         Returns:
             List of account balance DTOs
         """
+        from plaid.model.accounts_balance_get_request import AccountsBalanceGetRequest
+
         all_balances = []
         
         for item_id, access_token, institution_name in access_tokens:
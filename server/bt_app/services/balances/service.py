@@ -10,6 +10,7 @@ from .provider import PlaidBalanceProvider, AccountBalanceDTO, today_local_date
 from ...models.account import Account
 from ...models.account_balance import AccountBalance
 from ...models.institution_item import InstitutionItem
+from ...utils.money import from_cents
 
 
 class RefreshResult:
@@ -311,7 +312,13 @@ class BalanceService:
         
         cutoff_date = today_local_date() - timedelta(days=days)
         
-        balances = self.db.query(AccountBalance).filter(
+        # Select the cents columns directly so rows skip Decimal hydration
+        balances = self.db.query(
+            AccountBalance.as_of,
+            AccountBalance.available_cents,
+            AccountBalance.current_cents,
+            AccountBalance.iso_currency_code
+        ).filter(
             and_(
                 AccountBalance.account_id == account_id,
                 AccountBalance.as_of >= cutoff_date
@@ -321,8 +328,8 @@ class BalanceService:
         return [
             {
                 "date": balance.as_of.isoformat(),
-                "available": float(balance.available) if balance.available else None,
-                "current": float(balance.current) if balance.current else None,
+                "available": from_cents(balance.available_cents) if balance.available_cents else None,
+                "current": from_cents(balance.current_cents) if balance.current_cents else None,
                 "currency": balance.iso_currency_code,
             }
             for balance in balances
@@ -0,0 +1,146 @@
+"""Budget vs actual for a range of months, as (category, month) matrices.
+
+The single-month summary (``routes_summary._get_budget_vs_actual``) runs two
+queries per month. Here one query reads every budget of the range and one
+grouped read of the category cube reads every actual, both are scattered into
+zeroed (category, month) arrays, and variance, variance percent and the
+over-budget flags come out of whole-array operations. Subcategories roll up
+into their parents the same way as in ``AnalyticsService.get_category_matrix``.
+"""
+import calendar
+from datetime import date
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..core.cache import cached
+from .analytics_service import rollup_pairs
+from .monthly_aggregates import ANALYTICS_SOURCE_TABLES, CATEGORY_CUBE, cube_source
+
+BUDGET_SOURCE_TABLES = (*ANALYTICS_SOURCE_TABLES, "budgets")
+
+
+def _months(first: date, last: date) -> List[str]:
+    months = []
+    year, month = first.year, first.month
+    while (year, month) <= (last.year, last.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _figures(budget, actual) -> Dict[str, Any]:
+    """Variance columns of budget/actual cent arrays (any shape, months on the last axis)."""
+    import numpy as np
+
+    variance = actual - budget
+    percent = np.divide(variance * 100.0, budget, out=np.zeros(variance.shape), where=budget > 0)
+    return {
+        "budget": budget / 100,
+        "actual": actual / 100,
+        "variance": variance / 100,
+        "variance_percent": percent,
+        "is_over_budget": actual > budget,
+    }
+
+
+@cached(BUDGET_SOURCE_TABLES)
+def budget_matrix(db: Session, first: date, last: date) -> Dict[str, Any]:
+    """Budget vs actual of every category for every month from ``first`` to ``last``.
+
+    Actuals are expense transactions; categories appear when they have a
+    budget or spending in the range. Uncategorized spending is left out since
+    it cannot be budgeted.
+
+    Args:
+        db: Database session
+        first: Any day of the first month
+        last: Any day of the last month
+
+    Returns:
+        ``months``, per-category rows (``categories``), parent rollups
+        (``rollups``) and column ``totals`` over the category rows; each carries
+        monthly ``budget``/``actual``/``variance``/``variance_percent``/
+        ``is_over_budget`` lists and range totals
+    """
+    import numpy as np
+
+    months = _months(first, last)
+    budgets = db.execute(text("""
+        SELECT category_id, month, COALESCE(amount_cents, 0) AS cents
+        FROM budgets
+        WHERE month >= :first_month AND month <= :last_month
+    """), {"first_month": months[0], "last_month": months[-1]}).fetchall()
+    source, params = cube_source(
+        CATEGORY_CUBE, first.replace(day=1), last.replace(day=calendar.monthrange(last.year, last.month)[1])
+    )
+    actuals = db.execute(text(f"""
+        SELECT category_id, month, SUM(abs_amount_cents) AS cents
+        FROM ({source}) m
+        WHERE txn_type = 'expense' AND category_id != 0
+        GROUP BY category_id, month
+    """), params).fetchall()
+    categories = {
+        row.id: row for row in db.execute(text("SELECT id, name, color, parent_id FROM categories"))
+    }
+
+    month_axis = np.array(months)
+    category_ids = np.unique(np.array([row.category_id for row in (*budgets, *actuals)], dtype=np.int64))
+
+    def scatter(rows):
+        cents = np.zeros((len(category_ids), len(months)), dtype=np.int64)
+        if rows:
+            cents[
+                np.searchsorted(category_ids, [row.category_id for row in rows]),
+                np.searchsorted(month_axis, [row.month for row in rows]),
+            ] = [row.cents for row in rows]
+        return cents
+
+    budget, actual = scatter(budgets), scatter(actuals)
+    parents, pairs = rollup_pairs(category_ids.tolist(), {k: row.parent_id for k, row in categories.items()})
+    rollup_budget = np.zeros((len(parents), len(months)), dtype=np.int64)
+    rollup_actual = np.zeros_like(rollup_budget)
+    if pairs:
+        targets, sources = np.array(pairs).T
+        np.add.at(rollup_budget, targets, budget[sources])
+        np.add.at(rollup_actual, targets, actual[sources])
+
+    def summarize(budget_cents, actual_cents) -> Dict[str, Any]:
+        total_budget, total_actual = int(budget_cents.sum()), int(actual_cents.sum())
+        return {
+            "total_budget": total_budget / 100,
+            "total_actual": total_actual / 100,
+            "total_variance": (total_actual - total_budget) / 100,
+            "total_variance_percent": (
+                (total_actual - total_budget) / total_budget * 100 if total_budget > 0 else 0
+            ),
+        }
+
+    def rows_of(ids, budget_cents, actual_cents) -> List[Dict[str, Any]]:
+        figures = _figures(budget_cents, actual_cents)
+        rows = []
+        for i, category_id in enumerate(ids):
+            category = categories.get(category_id)
+            rows.append({
+                "category": {
+                    "id": category_id,
+                    "name": category.name if category else None,
+                    "color": category.color if category else None,
+                },
+                "parent_id": category.parent_id if category else None,
+                **{key: values[i].tolist() for key, values in figures.items()},
+                **summarize(budget_cents[i], actual_cents[i]),
+            })
+        return sorted(rows, key=lambda row: row["category"]["name"] or "")
+
+    total_budget, total_actual = budget.sum(axis=0), actual.sum(axis=0)
+    return {
+        "months": months,
+        "categories": rows_of(category_ids.tolist(), budget, actual),
+        "rollups": rows_of(parents, rollup_budget, rollup_actual),
+        "totals": {
+            **{key: values.tolist() for key, values in _figures(total_budget, total_actual).items()},
+            **summarize(total_budget, total_actual),
+        },
+    }
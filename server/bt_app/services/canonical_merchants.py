@@ -0,0 +1,136 @@
+"""Canonical merchant keys for transactions, derived from the alias table.
+
+The aliases are compiled into a ``CanonicalMatcher`` once per engine and
+recompiled only when ``merchant_aliases`` is written, by this process or by
+any other (tracked by the result cache's local and shared write
+generations). The transaction model computes
+``canonical_merchant`` with it on every insert and on updates that change the
+raw merchant or description; ``backfill_canonical_merchants`` recomputes
+every row after aliases are added or edited, or after bulk loads that bypass
+the ORM.
+"""
+import functools
+import logging
+import re
+import threading
+import weakref
+from typing import Dict, Iterable, Optional, Pattern, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from ..core.cache import generations_for, shared_generations
+from ..models.merchant_alias import CanonicalMerchant, MerchantAlias
+
+logger = logging.getLogger(__name__)
+
+ALIAS_TABLES = (MerchantAlias.__tablename__,)
+
+
+def like_to_regex(pattern: str) -> Pattern:
+    """Compile a SQLite LIKE pattern (case-insensitive, ``%``/``_`` wildcards) for ``fullmatch``."""
+    parts = [".*" if ch == "%" else "." if ch == "_" else re.escape(ch) for ch in pattern]
+    return re.compile("".join(parts), re.IGNORECASE | re.DOTALL)
+
+
+class CanonicalMatcher:
+    """Maps (merchant_raw, description_raw) to a canonical merchant key."""
+
+    def __init__(self, aliases: Iterable[Tuple[str, Optional[str], Optional[str]]]):
+        self._aliases = [
+            (key, like_to_regex(merchant) if merchant else None, like_to_regex(description) if description else None)
+            for key, merchant, description in aliases
+        ]
+        self.match = functools.lru_cache(maxsize=16384)(self._match)
+
+    def _match(self, merchant_raw: Optional[str], description_raw: Optional[str]) -> Optional[str]:
+        if not merchant_raw:
+            return None
+        for key, merchant_re, description_re in self._aliases:
+            if merchant_re is not None and not merchant_re.fullmatch(merchant_raw):
+                continue
+            if description_re is not None and not (description_raw and description_re.fullmatch(description_raw)):
+                continue
+            return key
+        return merchant_raw.upper()
+
+    def __call__(self, merchant_raw: Optional[str], description_raw: Optional[str]) -> Optional[str]:
+        return self.match(merchant_raw, description_raw)
+
+
+def load_matcher(connection: Connection) -> CanonicalMatcher:
+    """Compile the aliases currently in the database, highest priority first."""
+    aliases = MerchantAlias.__table__.c
+    rows = connection.execute(
+        select(aliases.canonical_key, aliases.merchant_pattern, aliases.description_pattern)
+        .order_by(aliases.priority.desc(), aliases.id)
+    ).all()
+    return CanonicalMatcher((row.canonical_key, row.merchant_pattern, row.description_pattern) for row in rows)
+
+
+_matchers: "weakref.WeakKeyDictionary[Engine, Tuple[Tuple[int, ...], CanonicalMatcher]]" = weakref.WeakKeyDictionary()
+_matchers_lock = threading.Lock()
+
+
+def canonical_matcher(connection: Connection) -> CanonicalMatcher:
+    """The compiled matcher for this connection's engine, reloaded when the aliases change."""
+    engine = connection.engine
+    generation = generations_for(engine).snapshot(ALIAS_TABLES) + (shared_generations(connection, ALIAS_TABLES) or ())
+    cached = _matchers.get(engine)
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+    matcher = load_matcher(connection)
+    with _matchers_lock:
+        _matchers[engine] = (generation, matcher)
+    return matcher
+
+
+def subscription_policies(db: Session) -> Dict[str, Optional[str]]:
+    """Subscription policy ('always' / 'never' / None) of every canonical key in the table."""
+    merchants = CanonicalMerchant.__table__.c
+    return dict(db.execute(select(merchants.key, merchants.subscription)).all())
+
+
+def backfill_canonical_merchants(db: Session) -> int:
+    """Recompute ``canonical_merchant`` for every transaction.
+
+    The matcher runs once per distinct (merchant, description) pair; the keys
+    are then applied with a single joined UPDATE. Changed rows get a new
+    ``updated_at`` so incremental consumers (the DuckDB mirror) pick them up.
+
+    Args:
+        db: Database session (committed on success)
+
+    Returns:
+        Number of transactions whose key changed
+    """
+    matcher = load_matcher(db.connection())
+    pairs = db.execute(text(
+        "SELECT DISTINCT COALESCE(merchant_raw, ''), COALESCE(description_raw, '') FROM transactions"
+    )).all()
+
+    db.execute(text("DROP TABLE IF EXISTS temp.canonical_merchant_map"))
+    db.execute(text(
+        "CREATE TEMP TABLE canonical_merchant_map ("
+        "merchant_raw TEXT NOT NULL, description_raw TEXT NOT NULL, canonical TEXT, "
+        "PRIMARY KEY (merchant_raw, description_raw))"
+    ))
+    if pairs:
+        db.execute(
+            text("INSERT INTO temp.canonical_merchant_map VALUES (:m, :d, :c)"),
+            [{"m": m, "d": d, "c": matcher(m, d)} for m, d in pairs],
+        )
+    updated = db.execute(text("""
+        UPDATE transactions
+        SET canonical_merchant = m.canonical, updated_at = CURRENT_TIMESTAMP
+        FROM temp.canonical_merchant_map AS m
+        WHERE m.merchant_raw = COALESCE(transactions.merchant_raw, '')
+          AND m.description_raw = COALESCE(transactions.description_raw, '')
+          AND transactions.canonical_merchant IS NOT m.canonical
+    """)).rowcount
+    db.execute(text("DROP TABLE temp.canonical_merchant_map"))
+    db.commit()
+    logger.info("Backfilled canonical merchants: %s transactions updated (%s merchant/description pairs)",
+                updated, len(pairs))
+    return updated
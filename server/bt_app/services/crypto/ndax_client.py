@@ -1,5 +1,4 @@
-"""NDAX exchange client using ccxt."""
-import ccxt
+"""NDAX exchange client using ccxt (imported on first client construction; it is slow to load)."""
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import json
@@ -38,6 +37,7 @@ class NDAXClient:
         if password:
             config['password'] = password
             
+        import ccxt
         self.exchange = ccxt.ndax(config)
         
         # Store credentials for debugging
@@ -56,6 +56,8 @@ class NDAXClient:
         Returns:
             Dictionary with success status and message
         """
+        import ccxt
+
         try:
             # Try to fetch account info or balance as a test
             balance = self.exchange.fetch_balance()
@@ -12,6 +12,7 @@ from ..models.account import Account
 from ..models.transaction import Transaction
 from ..models.institution_item import InstitutionItem
 from .mapping_service import MappingService
+from .detected_subscriptions import refresh_dirty_subscriptions
 from ..utils.account_mapping import get_source_from_account_name
 
 
@@ -238,6 +239,7 @@ class CSVImporter:
                 
                 # Apply normalization and mapping
                 mapping_results = self.mapping_service.apply_rules_to_unmapped()
+                refresh_dirty_subscriptions(self.db)
             else:
                 mapping_results = {"normalized_count": 0, "mapped_count": 0}
             
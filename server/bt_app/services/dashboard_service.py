@@ -8,6 +8,8 @@ from collections import defaultdict
 
 from ..models.transaction import Transaction
 from ..models.category import Category
+from ..core.cache import cached
+from .monthly_aggregates import ANALYTICS_SOURCE_TABLES, INCOME_CENTS_SQL
 
 
 class DashboardService:
@@ -16,13 +18,14 @@ class DashboardService:
     def __init__(self, db: Session):
         self.db = db
     
+    @cached(ANALYTICS_SOURCE_TABLES)
     def _get_data_range(self) -> Tuple[Optional[str], Optional[str]]:
-        """Get first and latest data months from transactions."""
+        """Get first and latest data months from the monthly rollup."""
         result = self.db.execute(text("""
             SELECT 
-                MIN(strftime('%Y-%m', posted_date)) as first_month,
-                MAX(strftime('%Y-%m', posted_date)) as latest_month
-            FROM transactions
+                MIN(month) as first_month,
+                MAX(month) as latest_month
+            FROM monthly_category_totals
         """)).first()
         
         if result and result.first_month:
@@ -38,6 +41,7 @@ class DashboardService:
         # Compare YYYY-MM strings directly (works for ISO format)
         return min(selected_month, latest_month)
     
+    @cached(ANALYTICS_SOURCE_TABLES)
     def get_meta(self) -> Dict[str, Any]:
         """Get dashboard metadata."""
         first_month, latest_month = self._get_data_range()
@@ -46,6 +50,7 @@ class DashboardService:
             "latest_data_month": latest_month
         }
     
+    @cached(ANALYTICS_SOURCE_TABLES)
     def get_cards(self, month: Optional[str] = None) -> Dict[str, Any]:
         """Get metric cards for specified month."""
         if not month:
@@ -53,92 +58,71 @@ class DashboardService:
         
         effective_month = self._get_effective_month(month)
         
-        # Get income (positive inflows only)
-        income_result = self.db.execute(text("""
-            SELECT COALESCE(SUM(amount), 0) as income
-            FROM transactions
-            WHERE strftime('%Y-%m', posted_date) = :month
-                AND (txn_type = 'income' OR amount > 0)
-                AND txn_type != 'expense'
-        """), {"month": effective_month}).first()
-        
-        # Get expenses (expense type, abs amount)
-        expense_result = self.db.execute(text("""
-            SELECT COALESCE(SUM(ABS(amount)), 0) as expenses
-            FROM transactions
-            WHERE strftime('%Y-%m', posted_date) = :month
-                AND txn_type = 'expense'
-        """), {"month": effective_month}).first()
-        
-        # Get transaction counts
-        counts_result = self.db.execute(text("""
+        # Income (positive inflows only), expenses (abs amount) and counts for the month
+        month_result = self.db.execute(text(f"""
             SELECT 
-                COUNT(*) as total_txns,
-                COUNT(CASE WHEN txn_type = 'expense' AND category_id IS NULL THEN 1 END) as unmapped
-            FROM transactions
-            WHERE strftime('%Y-%m', posted_date) = :month
+                COALESCE(SUM({INCOME_CENTS_SQL}), 0) / 100.0 as income,
+                COALESCE(SUM(CASE WHEN txn_type = 'expense' THEN abs_amount_cents ELSE 0 END), 0) / 100.0 as expenses,
+                COALESCE(SUM(txn_count), 0) as total_txns,
+                COALESCE(SUM(CASE WHEN txn_type = 'expense' AND category_id = 0 THEN txn_count ELSE 0 END), 0) as unmapped
+            FROM monthly_category_totals
+            WHERE month = :month
         """), {"month": effective_month}).first()
         
         # Get active categories count (all time)
         categories_result = self.db.execute(text("""
             SELECT COUNT(DISTINCT category_id) as active_categories
-            FROM transactions
-            WHERE category_id IS NOT NULL
+            FROM monthly_category_totals
+            WHERE category_id != 0
         """)).first()
         
-        income = float(income_result.income) if income_result else 0.0
-        expenses = float(expense_result.expenses) if expense_result else 0.0
+        return self._format_cards(month_result, categories_result.active_categories if categories_result else 0)
+    
+    @staticmethod
+    def _format_cards(month_row, active_categories: int) -> Dict[str, Any]:
+        """Build the cards payload from a (income, expenses, total_txns, unmapped) row."""
+        income = float(month_row.income) if month_row else 0.0
+        expenses = float(month_row.expenses) if month_row else 0.0
         
         return {
             "income": income,
             "expenses": expenses,
             "net_savings": income - expenses,
-            "total_txns": counts_result.total_txns if counts_result else 0,
-            "unmapped": counts_result.unmapped if counts_result else 0,
-            "active_categories": categories_result.active_categories if categories_result else 0
+            "total_txns": month_row.total_txns if month_row else 0,
+            "unmapped": month_row.unmapped if month_row else 0,
+            "active_categories": active_categories
         }
     
+    @cached(ANALYTICS_SOURCE_TABLES)
     def get_lines(self) -> Dict[str, Any]:
-        """Get monthly line chart data for full range."""
-        first_month, latest_month = self._get_data_range()
-        if not first_month or not latest_month:
-            return {
-                "income_by_month": [],
-                "expenses_by_month": [],
-                "networth_cumulative": []
-            }
-        
-        # Get monthly income and expenses
+        """Get monthly line chart data for full range.
+
+        Reads the trigger-maintained monthly totals and running balance, so
+        the cost is one row per month.
+        """
         results = self.db.execute(text("""
             SELECT 
-                strftime('%Y-%m', posted_date) as month,
-                COALESCE(SUM(CASE 
-                    WHEN txn_type = 'income' OR (amount > 0 AND txn_type != 'expense') 
-                    THEN amount ELSE 0 END), 0) as income,
-                COALESCE(SUM(CASE 
-                    WHEN txn_type = 'expense' 
-                    THEN ABS(amount) ELSE 0 END), 0) as expenses
-            FROM transactions
-            WHERE strftime('%Y-%m', posted_date) BETWEEN :first_month AND :latest_month
-            GROUP BY strftime('%Y-%m', posted_date)
+                month,
+                inflow_cents / 100.0 as income,
+                expense_cents / 100.0 as expenses,
+                cumulative_balance_cents as balance_cents
+            FROM monthly_networth
             ORDER BY month
-        """), {"first_month": first_month, "latest_month": latest_month}).fetchall()
+        """)).fetchall()
         
+        return self._format_lines(results)
+    
+    @staticmethod
+    def _format_lines(results) -> Dict[str, Any]:
+        """Build the line chart payload from (month, income, expenses, balance_cents) rows."""
         income_by_month = []
         expenses_by_month = []
         networth_cumulative = []
         
-        cumulative_networth = 0.0
-        
         for row in results:
-            income = float(row.income)
-            expenses = float(row.expenses)
-            net = income - expenses
-            cumulative_networth += net
-            
-            income_by_month.append({"month": row.month, "amount": income})
-            expenses_by_month.append({"month": row.month, "amount": expenses})
-            networth_cumulative.append({"month": row.month, "amount": cumulative_networth})
+            income_by_month.append({"month": row.month, "amount": float(row.income)})
+            expenses_by_month.append({"month": row.month, "amount": float(row.expenses)})
+            networth_cumulative.append({"month": row.month, "amount": (row.balance_cents or 0) / 100})
         
         return {
             "income_by_month": income_by_month,
@@ -146,6 +130,7 @@ class DashboardService:
             "networth_cumulative": networth_cumulative
         }
     
+    @cached(ANALYTICS_SOURCE_TABLES)
     def get_categories(self, month: Optional[str] = None) -> Dict[str, Any]:
         """Get category breakdown and details for specified month."""
         if not month:
@@ -157,15 +142,35 @@ class DashboardService:
         breakdown_results = self.db.execute(text("""
             SELECT 
                 COALESCE(c.name, 'Uncategorized') as category,
-                SUM(ABS(t.amount)) as amount
+                SUM(m.abs_amount_cents) / 100.0 as amount
+            FROM monthly_category_totals m
+            LEFT JOIN categories c ON m.category_id = c.id
+            WHERE m.month = :month
+                AND m.txn_type = 'expense'
+            GROUP BY c.name
+            ORDER BY amount DESC
+        """), {"month": effective_month}).fetchall()
+        
+        # Get category details (Category → Description breakdown)
+        details_results = self.db.execute(text("""
+            SELECT 
+                COALESCE(c.name, 'Uncategorized') as category,
+                COALESCE(t.description_norm, t.description_raw, 'Unknown') as description,
+                SUM(ABS(t.amount_cents)) / 100.0 as amount
             FROM transactions t
             LEFT JOIN categories c ON t.category_id = c.id
-            WHERE strftime('%Y-%m', t.posted_date) = :month
+            WHERE t.posted_month = :month
                 AND t.txn_type = 'expense'
-            GROUP BY c.name
-            ORDER BY amount DESC
+                AND COALESCE(t.is_deleted, 0) = 0
+            GROUP BY c.name, description
+            ORDER BY c.name, amount DESC
         """), {"month": effective_month}).fetchall()
         
+        return self._format_categories(breakdown_results, details_results)
+    
+    @staticmethod
+    def _format_categories(breakdown_results, details_results) -> Dict[str, Any]:
+        """Build the categories payload from (category, amount) and (category, description, amount) rows."""
         # Calculate total and percentages
         total_expenses = sum(float(row.amount) for row in breakdown_results)
         
@@ -187,20 +192,6 @@ class DashboardService:
                 "amount": amount
             })
         
-        # Get category details (Category → Description breakdown)
-        details_results = self.db.execute(text("""
-            SELECT 
-                COALESCE(c.name, 'Uncategorized') as category,
-                COALESCE(t.description_norm, t.description_raw, 'Unknown') as description,
-                SUM(ABS(t.amount)) as amount
-            FROM transactions t
-            LEFT JOIN categories c ON t.category_id = c.id
-            WHERE strftime('%Y-%m', t.posted_date) = :month
-                AND t.txn_type = 'expense'
-            GROUP BY c.name, description
-            ORDER BY c.name, amount DESC
-        """), {"month": effective_month}).fetchall()
-        
         # Group details by category
         category_details_dict = defaultdict(lambda: {"category": "", "amount": 0.0, "items": []})
         
@@ -231,6 +222,7 @@ class DashboardService:
             "category_details": category_details
         }
     
+    @cached(ANALYTICS_SOURCE_TABLES)
     def get_top_merchants(self, month: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get top merchants for specified month."""
         if not month:
@@ -240,20 +232,115 @@ class DashboardService:
         
         results = self.db.execute(text("""
             SELECT 
-                COALESCE(merchant_norm, merchant_raw, 'Unknown') as merchant,
-                SUM(ABS(amount)) as amount
-            FROM transactions
-            WHERE strftime('%Y-%m', posted_date) = :month
+                merchant_key as merchant,
+                SUM(abs_amount_cents) / 100.0 as amount
+            FROM monthly_merchant_totals
+            WHERE month = :month
                 AND txn_type = 'expense'
-            GROUP BY merchant
+            GROUP BY merchant_key
             ORDER BY amount DESC
             LIMIT 10
         """), {"month": effective_month}).fetchall()
         
+        return self._format_top_merchants(results)
+    
+    @staticmethod
+    def _format_top_merchants(results) -> List[Dict[str, Any]]:
+        """Build the top merchants payload from (merchant, amount) rows."""
         return [
             {
                 "merchant": row.merchant,
                 "amount": float(row.amount)
             }
             for row in results
-        ]
\ No newline at end of file
+        ]
+    
+    @cached(ANALYTICS_SOURCE_TABLES)
+    def get_bundle(self, month: Optional[str] = None) -> Dict[str, Any]:
+        """Get meta, cards, lines, categories and top merchants in two queries.
+        
+        The first query reads the per-month rollup once (data range, line
+        series with the stored running balance, and the selected month's
+        cards); the second reads everything specific to the effective month.
+        """
+        if not month:
+            month = datetime.now().strftime('%Y-%m')
+        
+        month_rows = self.db.execute(text(f"""
+            SELECT 
+                month,
+                COALESCE(SUM({INCOME_CENTS_SQL}), 0) / 100.0 as income,
+                COALESCE(SUM(CASE WHEN txn_type = 'expense' THEN abs_amount_cents ELSE 0 END), 0) / 100.0 as expenses,
+                COALESCE(SUM(txn_count), 0) as total_txns,
+                COALESCE(SUM(CASE WHEN txn_type = 'expense' AND category_id = 0 THEN txn_count ELSE 0 END), 0) as unmapped,
+                (SELECT COUNT(DISTINCT category_id) FROM monthly_category_totals WHERE category_id != 0) as active_categories,
+                (SELECT n.cumulative_balance_cents FROM monthly_networth n WHERE n.month = monthly_category_totals.month) as balance_cents
+            FROM monthly_category_totals
+            GROUP BY month
+            ORDER BY month
+        """)).fetchall()
+        
+        first_month = month_rows[0].month if month_rows else None
+        latest_month = month_rows[-1].month if month_rows else None
+        effective_month = min(month, latest_month) if latest_month else month
+        month_row = next((row for row in month_rows if row.month == effective_month), None)
+        
+        detail_rows = self.db.execute(text("""
+            SELECT * FROM (
+                SELECT 
+                    'category' as kind,
+                    COALESCE(c.name, 'Uncategorized') as category,
+                    NULL as description,
+                    NULL as merchant,
+                    SUM(m.abs_amount_cents) / 100.0 as amount,
+                    '' as sort_key
+                FROM monthly_category_totals m
+                LEFT JOIN categories c ON m.category_id = c.id
+                WHERE m.month = :month
+                    AND m.txn_type = 'expense'
+                GROUP BY c.name
+                UNION ALL
+                SELECT 
+                    'detail',
+                    COALESCE(c.name, 'Uncategorized'),
+                    COALESCE(t.description_norm, t.description_raw, 'Unknown'),
+                    NULL,
+                    SUM(ABS(t.amount_cents)) / 100.0,
+                    COALESCE(c.name, '')
+                FROM transactions t
+                LEFT JOIN categories c ON t.category_id = c.id
+                WHERE t.posted_month = :month
+                    AND t.txn_type = 'expense'
+                    AND COALESCE(t.is_deleted, 0) = 0
+                GROUP BY c.name, COALESCE(t.description_norm, t.description_raw, 'Unknown')
+                UNION ALL
+                SELECT 'merchant', NULL, NULL, merchant, amount, ''
+                FROM (
+                    SELECT merchant_key as merchant, SUM(abs_amount_cents) / 100.0 as amount
+                    FROM monthly_merchant_totals
+                    WHERE month = :month
+                        AND txn_type = 'expense'
+                    GROUP BY merchant_key
+                    ORDER BY amount DESC
+                    LIMIT 10
+                )
+            )
+            ORDER BY kind, sort_key, amount DESC
+        """), {"month": effective_month}).fetchall()
+        
+        by_kind = defaultdict(list)
+        for row in detail_rows:
+            by_kind[row.kind].append(row)
+        
+        return {
+            "month": month,
+            "effective_month": effective_month,
+            "meta": {
+                "first_data_month": first_month,
+                "latest_data_month": latest_month
+            },
+            "cards": self._format_cards(month_row, month_rows[0].active_categories if month_rows else 0),
+            "lines": self._format_lines(month_rows),
+            "categories": self._format_categories(by_kind["category"], by_kind["detail"]),
+            "top_merchants": self._format_top_merchants(by_kind["merchant"])
+        }
@@ -0,0 +1,362 @@
+"""Incremental maintenance of the persisted recurring-subscription state.
+
+Detection works per canonical merchant over its whole expense history, so a
+write only affects the merchants it touches. Triggers queue those merchants
+(see ``models.detected_subscription``); ``refresh_dirty_subscriptions``
+drains the queue and re-evaluates just them, and is called after imports
+commit and by the scheduler. ``sweep_inactive_subscriptions`` flips the
+active flag of subscriptions whose last charge has aged out of the activity
+window, which needs no transaction reads, and runs daily. The API reads
+``detected_subscriptions`` directly.
+
+A batch of merchants is evaluated from its monthly charges read as columns:
+the category and policy filter is one call per merchant, and prices and
+price histories are grouped NumPy operations over all months at once.
+"""
+import functools
+import json
+import logging
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from ..models.detected_subscription import DetectedSubscription, SubscriptionDirtyMerchant
+from ..models.merchant_alias import SUBSCRIPTION_ALWAYS, SUBSCRIPTION_NEVER
+from .canonical_merchants import subscription_policies
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_WINDOW_DAYS = 45  # a subscription is current while its last charge is this recent
+MIN_MONTHS = 3  # months with charges required unless the merchant is whitelisted
+REFRESH_BATCH = 500  # merchants evaluated per query
+PRICE_WINDOW = 6  # latest months the current price is taken from
+PRICE_BAND = 3  # dollars a month may differ from the first month of its price point
+
+# Categories that are never subscriptions (substring match on the category name)
+EXCLUDED_CATEGORIES = {
+    'qsr', 'restaurant', 'ordering out', 'ordering in', 'groceries',
+    'home maintenance', 'going out', 'medical', 'healthcare',
+    'pharmacy', 'pickup sport', 'trading', 'retail', 'shopping',
+    'clothing', 'public transportation', 'gas', 'fuel', 'travel',
+    'hotels', 'coffee', 'tim hortons', 'starbucks', 'personal care',
+    'grooming', 'cash withdrawal', 'atm', 'dollarama', 'amazon'
+}
+
+# Categories a non-whitelisted merchant needs to be considered at all
+SUBSCRIPTION_CATEGORIES = {
+    'gym', 'fitness', 'telecom', 'entertainment', 'streaming',
+    'subscriptions', 'software', 'ai tools', 'education',
+    'membership', 'cc fee', 'electronics'
+}
+
+# Monthly expense charges per canonical merchant, grouped by merchant, oldest month first
+MONTHLY_CHARGES_SQL = """
+    SELECT
+        t.canonical_merchant,
+        SUM(ABS(t.amount_cents)) AS total_cents,
+        COUNT(*) AS txn_count,
+        MIN(t.posted_date) AS first_date,
+        MAX(t.posted_date) AS last_date,
+        MAX(c.name) AS category_name
+    FROM transactions t
+    LEFT JOIN categories c ON t.category_id = c.id
+    WHERE t.txn_type = 'expense'
+      AND t.canonical_merchant IS NOT NULL
+      {merchant_filter}
+    GROUP BY t.canonical_merchant, t.posted_month
+    ORDER BY t.canonical_merchant, t.posted_month
+"""
+
+
+@functools.lru_cache(maxsize=1024)
+def _category_rule(category: str) -> Optional[bool]:
+    """None for an excluded category, else whether it marks a subscription."""
+    category_lower = category.lower()
+    if any(excluded in category_lower for excluded in EXCLUDED_CATEGORIES):
+        return None
+    return any(sub in category_lower for sub in SUBSCRIPTION_CATEGORIES)
+
+
+def is_subscription(category: str, policy: Optional[str], months_count: int) -> bool:
+    """Whether a merchant with this latest category, policy and months of charges is a subscription."""
+    if policy == SUBSCRIPTION_ALWAYS:
+        return True
+    rule = _category_rule(category)
+    if rule is None or policy == SUBSCRIPTION_NEVER:
+        return False
+    return rule and months_count >= MIN_MONTHS
+
+
+def _groups(keys: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """(first row, size, group id per row) of the runs of equal ``keys``."""
+    import numpy as np
+
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    sizes = np.diff(np.append(starts, len(keys)))
+    return starts, sizes, np.repeat(np.arange(len(starts)), sizes)
+
+
+def stable_prices(cents: "np.ndarray", group: "np.ndarray", starts: "np.ndarray",
+                  sizes: "np.ndarray") -> "np.ndarray":
+    """Current price in cents per merchant, ignoring one-off spikes.
+
+    The mean of the months of the last ``PRICE_WINDOW`` whose dollar-rounded
+    price is the most common one (the earliest such price on ties).
+
+    Args:
+        cents: Average charge of each month in cents, grouped by merchant, oldest first
+        group: Merchant id (0..n-1, ascending) of each month
+        starts: First row of each merchant
+        sizes: Months of each merchant
+    """
+    import numpy as np
+
+    window = np.arange(len(cents)) >= (starts + np.maximum(sizes - PRICE_WINDOW, 0))[group]
+    w_group, w_cents = group[window], cents[window]
+    dollars = np.round(w_cents / 100).astype(np.int64)
+    radix = int(dollars.max()) + 1
+    pairs, first, inverse, counts = np.unique(
+        w_group * radix + dollars, return_index=True, return_inverse=True, return_counts=True
+    )
+    pair_group = pairs // radix
+    order = np.lexsort((first, -counts, pair_group))
+    most_common = order[np.r_[True, pair_group[order][1:] != pair_group[order][:-1]]]
+    matches = (inverse.ravel() == most_common[w_group]).astype(np.int64)
+    return np.round(
+        np.bincount(w_group, weights=w_cents * matches) / np.bincount(w_group, weights=matches)
+    ).astype(np.int64)
+
+
+def price_histories(cents: "np.ndarray", group: "np.ndarray", starts: "np.ndarray",
+                    sizes: "np.ndarray") -> List[Optional[List[float]]]:
+    """Chronological stable dollar prices per merchant, or None when the price never changed.
+
+    A price point starts at a merchant's first month and at every month more
+    than ``PRICE_BAND`` dollars from the first month of the current point; it
+    counts when it lasts 2+ months, so one-off variations are ignored. Every
+    pass finds the next point of all merchants at once, so the number of
+    passes is the largest number of points of any merchant. Arguments are
+    those of ``stable_prices``.
+    """
+    import numpy as np
+
+    dollars = np.round(cents / 100).astype(np.int64)
+    row = np.arange(len(dollars))
+    point = starts.copy()
+    point_starts = np.zeros(len(dollars), dtype=bool)
+    point_starts[starts] = True
+    while True:
+        current = point[group]
+        departs = np.flatnonzero((row > current) & (np.abs(dollars - dollars[current]) > PRICE_BAND))
+        moved, first = np.unique(group[departs], return_index=True)
+        if not len(moved):
+            break
+        point[moved] = departs[first]
+        point_starts[departs[first]] = True
+
+    points = np.flatnonzero(point_starts)
+    lasting = points[np.diff(np.append(points, len(dollars))) >= 2]
+    # Each price once, where it first appeared
+    radix = int(dollars.max()) + 1
+    _, first = np.unique(group[lasting] * radix + dollars[lasting], return_index=True)
+    lasting = lasting[np.sort(first)]
+    counts = np.bincount(group[lasting], minlength=len(starts))
+    prices = np.split(dollars[lasting].astype(np.float64), np.cumsum(counts)[:-1])
+    return [
+        prices[i].tolist() if counts[i] > 1 and sizes[i] >= 3 else None
+        for i in range(len(starts))
+    ]
+
+
+def _evaluate(db: Session, merchants: Optional[List[str]], policies: Dict[str, Optional[str]],
+              today: date) -> Tuple[int, List[Dict[str, Any]]]:
+    """(merchants with expense history, detected rows) for ``merchants`` (every merchant when None).
+
+    The monthly charges are read as columns; the merchant filter is a call
+    per merchant and the amounts are grouped NumPy reductions.
+    """
+    import numpy as np
+
+    if merchants is None:
+        query, params = text(MONTHLY_CHARGES_SQL.format(merchant_filter="")), {}
+    else:
+        query = text(MONTHLY_CHARGES_SQL.format(
+            merchant_filter="AND t.canonical_merchant IN :merchants"
+        )).bindparams(bindparam("merchants", expanding=True))
+        params = {"merchants": merchants}
+
+    rows = db.execute(query, params).all()
+    if not rows:
+        return 0, []
+    keys, totals, txn_counts, first_dates, last_dates, categories = (np.array(c, dtype=object) for c in zip(*rows))
+    starts, sizes, group = _groups(keys)
+    ends = starts + sizes - 1
+    latest_category = [category or "Subscription" for category in categories[ends]]
+    detected = np.array([
+        is_subscription(category, policies.get(key), int(size))
+        for key, category, size in zip(keys[starts], latest_category, sizes)
+    ], dtype=bool)
+    if not detected.any():
+        return len(starts), []
+
+    kept = detected[group]
+    total_cents = totals[kept].astype(np.int64)
+    cents = np.round(total_cents / txn_counts[kept].astype(np.int64)).astype(np.int64)
+    d_starts, d_sizes, d_group = _groups(keys[kept])
+    prices = stable_prices(cents, d_group, d_starts, d_sizes)
+    histories = price_histories(cents, d_group, d_starts, d_sizes)
+    merchant_totals = np.add.reduceat(total_cents, d_starts)
+
+    cutoff = today - timedelta(days=ACTIVE_WINDOW_DAYS)
+    index = np.flatnonzero(detected)
+    result = []
+    for i, merchant in enumerate(index):
+        last_charge = date.fromisoformat(str(last_dates[ends[merchant]]))
+        result.append({
+            "merchant_key": keys[starts[merchant]],
+            "cadence": "monthly",
+            "category": latest_category[merchant],
+            "current_price_cents": int(prices[i]),
+            "price_history": json.dumps(histories[i]) if histories[i] else None,
+            "months_count": int(sizes[merchant]),
+            "total_cents": int(merchant_totals[i]),
+            "first_charge_date": date.fromisoformat(str(first_dates[starts[merchant]])),
+            "last_charge_date": last_charge,
+            "is_active": last_charge >= cutoff,
+        })
+    return len(starts), result
+
+
+def refresh_subscriptions(
+    db: Session,
+    merchants: Optional[Iterable[str]] = None,
+    today: Optional[date] = None,
+) -> Dict[str, int]:
+    """Re-evaluate and store the subscription state of some or all merchants.
+
+    Args:
+        db: Database session (committed on success)
+        merchants: Canonical merchant keys to refresh; None rebuilds the whole
+            table and empties the refresh queue
+        today: Reference date for the active flag (defaults to today)
+
+    Returns:
+        Number of merchants evaluated and of subscriptions stored for them
+    """
+    today = today or date.today()
+    policies = subscription_policies(db)
+    table = DetectedSubscription.__table__
+    summary = {"evaluated": 0, "detected": 0}
+
+    if merchants is None:
+        db.execute(table.delete())
+        db.execute(SubscriptionDirtyMerchant.__table__.delete())
+        evaluated, rows = _evaluate(db, None, policies, today)
+        if rows:
+            db.execute(table.insert(), rows)
+        summary = {"evaluated": evaluated, "detected": len(rows)}
+    else:
+        keys = sorted(set(merchants))
+        for i in range(0, len(keys), REFRESH_BATCH):
+            batch = keys[i:i + REFRESH_BATCH]
+            db.execute(table.delete().where(table.c.merchant_key.in_(batch)))
+            _, rows = _evaluate(db, batch, policies, today)
+            if rows:
+                db.execute(table.insert(), rows)
+            summary["evaluated"] += len(batch)
+            summary["detected"] += len(rows)
+
+    db.commit()
+    logger.info("Refreshed detected subscriptions: %s", summary)
+    return summary
+
+
+def refresh_dirty_subscriptions(db: Session, today: Optional[date] = None) -> Dict[str, int]:
+    """Re-evaluate the merchants queued since the last refresh.
+
+    The queue is claimed with its first statement, so the refresh holds the
+    write lock throughout and no concurrent write can be dropped from it.
+
+    Args:
+        db: Database session (committed on success)
+        today: Reference date for the active flag (defaults to today)
+
+    Returns:
+        Number of merchants evaluated and of subscriptions stored for them
+    """
+    merchants = db.execute(text(
+        "DELETE FROM subscription_dirty_merchants RETURNING merchant_key"
+    )).scalars().all()
+    if not merchants:
+        db.commit()
+        return {"evaluated": 0, "detected": 0}
+    return refresh_subscriptions(db, merchants, today)
+
+
+def sweep_inactive_subscriptions(db: Session, today: Optional[date] = None) -> int:
+    """Update the active flag of every stored subscription from its last charge date.
+
+    Args:
+        db: Database session (committed on success)
+        today: Reference date (defaults to today)
+
+    Returns:
+        Number of subscriptions whose flag changed
+    """
+    cutoff = (today or date.today()) - timedelta(days=ACTIVE_WINDOW_DAYS)
+    changed = db.execute(text("""
+        UPDATE detected_subscriptions
+        SET is_active = (last_charge_date >= :cutoff), updated_at = CURRENT_TIMESTAMP
+        WHERE is_active != (last_charge_date >= :cutoff)
+    """), {"cutoff": cutoff.isoformat()}).rowcount
+    db.commit()
+    logger.info("Subscription sweep: %s active flags changed", changed)
+    return changed
+
+
+def list_subscriptions(
+    db: Session,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> Dict[str, Any]:
+    """Stored subscriptions (optionally those charged within a date range) with summary totals.
+
+    Current subscriptions come first, then by total charged.
+    """
+    table = DetectedSubscription.__table__
+    query = table.select()
+    if date_from:
+        query = query.where(table.c.last_charge_date >= date_from)
+    if date_to:
+        query = query.where(table.c.first_charge_date <= date_to)
+
+    subscriptions = [
+        {
+            "merchant": row.merchant_key,
+            "monthly_amount": row.current_price_cents / 100,
+            "months_count": row.months_count,
+            "total_charged": row.total_cents / 100,
+            "first_date": row.first_charge_date.isoformat(),
+            "last_date": row.last_charge_date.isoformat(),
+            "category": row.category,
+            "price_changes": json.loads(row.price_history) if row.price_history else None,
+            "is_current": bool(row.is_active),
+        }
+        for row in db.execute(query)
+    ]
+    subscriptions.sort(key=lambda s: (not s["is_current"], -s["total_charged"]))
+
+    current = [s for s in subscriptions if s["is_current"]]
+    return {
+        "subscriptions": subscriptions,
+        "summary": {
+            "count": len(current),
+            "total_monthly": round(sum(s["monthly_amount"] for s in current), 2),
+            "total_all_time": round(sum(s["total_charged"] for s in subscriptions), 2),
+        },
+    }
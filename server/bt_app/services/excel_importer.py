@@ -1,5 +1,4 @@
 """Service for importing Excel files (budgets and mapping seeds)."""
-import pandas as pd
 import io
 from typing import Dict, List, Optional, Any
 from decimal import Decimal
@@ -27,6 +26,8 @@ class ExcelImporter:
         Returns:
             Dictionary with preview information
         """
+        import pandas as pd
+
         try:
             # Read Excel file
             excel_file = pd.ExcelFile(io.BytesIO(file_content))
@@ -75,6 +76,8 @@ class ExcelImporter:
         Returns:
             Dictionary with import results
         """
+        import pandas as pd
+
         try:
             # Read Excel sheet
             df = pd.read_excel(io.BytesIO(file_content), sheet_name=sheet_name)
@@ -171,6 +174,8 @@ class ExcelImporter:
         Returns:
             Dictionary with import results
         """
+        import pandas as pd
+
         try:
             # Read Excel sheet
             df = pd.read_excel(io.BytesIO(file_content), sheet_name=sheet_name)
@@ -295,6 +300,8 @@ class ExcelImporter:
         Returns:
             Excel file content as bytes
         """
+        import pandas as pd
+
         if template_type == 'budgets':
             # Create budget template
             data = {
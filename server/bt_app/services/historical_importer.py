@@ -2,10 +2,9 @@
 import hashlib
 import io
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import TYPE_CHECKING, Dict, Optional, List
 from datetime import datetime
 from decimal import Decimal
-import pandas as pd
 import re
 from sqlalchemy.orm import Session
 from sqlalchemy import text
@@ -18,6 +17,9 @@ from ..models.account import Account
 from ..services.mapping_service import MappingService
 from ..utils.account_mapping import get_source_from_account_id
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 # Sentinel value to distinguish between "not provided" vs "empty list"
 _UNSET = object()
 
@@ -130,6 +132,8 @@ class HistoricalImporter:
         Returns:
             Dictionary with counts: {inserted, skipped, income, expenses}
         """
+        import pandas as pd
+
         # Read Excel from bytes
         excel_file = pd.ExcelFile(io.BytesIO(file_bytes))
         
@@ -220,7 +224,6 @@ class HistoricalImporter:
             print(f"Import completed successfully: {results}")
             
             # Verify commit worked by checking transaction count
-            from sqlalchemy import text
             count_result = self.db.execute(text("SELECT COUNT(*) FROM transactions WHERE txn_type = 'expense'"))
             expense_count = count_result.scalar()
             print(f"Database now contains {expense_count} expense transactions")
@@ -241,6 +244,8 @@ class HistoricalImporter:
         Returns:
             Dictionary with counts: {inserted, skipped, income, expenses}
         """
+        import pandas as pd
+
         file_path = Path(path)
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {path}")
@@ -337,8 +342,10 @@ class HistoricalImporter:
         
         return category_id, subcategory_id
     
-    def _process_expense_sheet(self, df: pd.DataFrame) -> Dict[str, int]:
+    def _process_expense_sheet(self, df: "pd.DataFrame") -> Dict[str, int]:
         """Process expense transactions from dataframe with 100% mapping from Excel."""
+        import pandas as pd
+
         counts = {"inserted": 0, "skipped": 0}
         COMMIT_EVERY = 1000
         inserted_since_commit = 0
@@ -451,14 +458,15 @@ class HistoricalImporter:
                 continue
         
         # Log post-commit count
-        from sqlalchemy import text
         post_count = self.db.execute(text("SELECT COUNT(*) FROM transactions WHERE txn_type = 'expense'")).scalar()
         print(f"[IMPORT][EXP] post-commit count(expense)={post_count}")
         
         return counts
         
-    def _process_income_sheet(self, df: pd.DataFrame) -> Dict[str, int]:
+    def _process_income_sheet(self, df: "pd.DataFrame") -> Dict[str, int]:
         """Process income transactions from dataframe."""
+        import pandas as pd
+
         counts = {"inserted": 0, "skipped": 0}
         COMMIT_EVERY = 1000
         inserted_since_commit = 0
@@ -560,7 +568,7 @@ class HistoricalImporter:
                 
         return counts
         
-    def _find_column(self, df: pd.DataFrame, candidates: List[str]) -> Optional[str]:
+    def _find_column(self, df: "pd.DataFrame", candidates: List[str]) -> Optional[str]:
         """Find column by trying multiple candidate names."""
         for candidate in candidates:
             for col in df.columns:
@@ -570,8 +578,6 @@ class HistoricalImporter:
     
     def derive_rules_from_historical_expenses(self) -> Dict[str, int]:
         """Auto-derive mapping rules from imported historical expense transactions."""
-        from sqlalchemy import text
-        
         # Query expense transactions with categories
         result = self.db.execute(text("""
             SELECT merchant_norm, description_norm, category_id, subcategory_id, COUNT(*) as freq
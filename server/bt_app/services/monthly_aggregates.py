@@ -0,0 +1,141 @@
+"""Read and rebuild helpers for the monthly aggregate cubes."""
+import calendar
+import logging
+from datetime import date, timedelta
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..models.monthly_aggregate import (
+    CUBE_KEYS,
+    NETWORTH_CUMULATIVE,
+    NETWORTH_TABLE,
+    NETWORTH_TERMS,
+    cube_rebuild_sql,
+    networth_rebuild_sql,
+)
+from ..models.write_generation import bump_generations_sql
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_CUBE = "monthly_category_totals"
+MERCHANT_CUBE = "monthly_merchant_totals"
+ACCOUNT_CUBE = "monthly_account_totals"
+
+# Tables whose writes can change any transaction-derived analytics result
+ANALYTICS_SOURCE_TABLES = ("transactions", "categories", "accounts", *CUBE_KEYS, NETWORTH_TABLE)
+
+NETWORTH_COLUMNS = ("month", *NETWORTH_TERMS, *NETWORTH_CUMULATIVE)
+
+# Income as the dashboard defines it: every income row, plus positive amounts of
+# types that are neither income nor expense. Positive cents of a group are
+# (signed sum + absolute sum) / 2.
+INCOME_CENTS_SQL = (
+    "CASE WHEN txn_type = 'income' THEN amount_cents "
+    "WHEN txn_type != 'expense' THEN (amount_cents + abs_amount_cents) / 2 "
+    "ELSE 0 END"
+)
+
+
+def rebuild_monthly_aggregates(db: Session) -> Dict[str, int]:
+    """Recompute every cube and the net worth series from transactions.
+
+    Args:
+        db: Database session (committed on success)
+
+    Returns:
+        Row count of each rebuilt cube
+    """
+    counts = {}
+    for table, keys in CUBE_KEYS.items():
+        columns = ", ".join(name for name, _ in keys)
+        db.execute(text(f"DELETE FROM {table}"))
+        db.execute(text(
+            f"INSERT INTO {table} ({columns}, txn_count, amount_cents, abs_amount_cents) "
+            f"{cube_rebuild_sql(table)}"
+        ))
+        counts[table] = db.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+    db.execute(text(f"DELETE FROM {NETWORTH_TABLE}"))
+    db.execute(text(f"INSERT INTO {NETWORTH_TABLE} ({', '.join(NETWORTH_COLUMNS)}) {networth_rebuild_sql()}"))
+    counts[NETWORTH_TABLE] = db.execute(text(f"SELECT COUNT(*) FROM {NETWORTH_TABLE}")).scalar()
+    # The derived tables have no generation triggers; tell other processes they changed
+    db.execute(text(bump_generations_sql(counts)))
+    db.commit()
+    logger.info("Rebuilt monthly aggregates: %s", counts)
+    return counts
+
+
+def check_networth_series(db: Session) -> List[Dict[str, Any]]:
+    """Compare the stored net worth series with a full recompute from transactions.
+
+    Args:
+        db: Database session
+
+    Returns:
+        One entry per differing value (``month``, ``column``, ``stored``,
+        ``expected``); empty when the series is exact. A month missing on
+        either side is reported with column ``month``.
+    """
+    columns = ", ".join(NETWORTH_COLUMNS)
+    stored = {row[0]: row for row in db.execute(text(f"SELECT {columns} FROM {NETWORTH_TABLE}"))}
+    expected = {row[0]: row for row in db.execute(text(networth_rebuild_sql()))}
+
+    mismatches = []
+    for month in sorted(stored.keys() | expected.keys()):
+        have, want = stored.get(month), expected.get(month)
+        if have is None or want is None:
+            mismatches.append({"month": month, "column": "month",
+                               "stored": have is not None, "expected": want is not None})
+            continue
+        for column, a, b in zip(NETWORTH_COLUMNS[1:], have[1:], want[1:]):
+            if a != b:
+                mismatches.append({"month": month, "column": column, "stored": a, "expected": b})
+    return mismatches
+
+
+def _full_month_span(start: date, end: date) -> Tuple[date, date]:
+    """First day of the first and last day of the last calendar month fully inside [start, end]."""
+    first = start if start.day == 1 else (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+    last_day = calendar.monthrange(end.year, end.month)[1]
+    last = end if end.day == last_day else end.replace(day=1) - timedelta(days=1)
+    return first, last
+
+
+def cube_source(table: str, start: date, end: date) -> Tuple[str, Dict[str, Any]]:
+    """Subquery with the rows of ``table`` restricted to a date range.
+
+    Whole months are read from the cube; the partial months at either edge of
+    the range are aggregated from transactions on the fly, so the result is
+    exact for any range while costing O(months) plus the edge days.
+
+    Args:
+        table: Cube table name
+        start: First day of the range (inclusive)
+        end: Last day of the range (inclusive)
+
+    Returns:
+        (SQL for use as ``FROM (<sql>) alias``, bound parameters)
+    """
+    columns = ", ".join(name for name, _ in CUBE_KEYS[table])
+    first, last = _full_month_span(start, end)
+    if first > last:
+        return cube_rebuild_sql(table, "t.posted_date >= :cube_start AND t.posted_date <= :cube_end"), {
+            "cube_start": start.isoformat(), "cube_end": end.isoformat(),
+        }
+
+    parts = [
+        f"SELECT {columns}, txn_count, amount_cents, abs_amount_cents FROM {table} "
+        "WHERE month >= :cube_first_month AND month <= :cube_last_month"
+    ]
+    params: Dict[str, Any] = {
+        "cube_first_month": first.strftime("%Y-%m"),
+        "cube_last_month": last.strftime("%Y-%m"),
+    }
+    if start < first:
+        parts.append(cube_rebuild_sql(table, "t.posted_date >= :cube_head_start AND t.posted_date < :cube_head_end"))
+        params.update(cube_head_start=start.isoformat(), cube_head_end=first.isoformat())
+    if end > last:
+        parts.append(cube_rebuild_sql(table, "t.posted_date > :cube_tail_start AND t.posted_date <= :cube_tail_end"))
+        params.update(cube_tail_start=last.isoformat(), cube_tail_end=end.isoformat())
+    return " UNION ALL ".join(parts), params
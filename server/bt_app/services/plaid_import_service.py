@@ -4,7 +4,7 @@ import json
 import datetime
 import logging
 from datetime import date
-from typing import Optional, Dict, Any, List
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 from decimal import Decimal
 from uuid import UUID
 import re
@@ -16,11 +16,9 @@ from sqlalchemy.exc import IntegrityError
 
 logger = logging.getLogger(__name__)
 
-from plaid import ApiClient, Configuration, Environment
-from plaid.api import plaid_api
-from plaid.model.transactions_get_request import TransactionsGetRequest
-from plaid.model.transactions_sync_request import TransactionsSyncRequest
-from plaid.model.accounts_get_request import AccountsGetRequest
+# plaid-python is imported where requests are built; its model package is slow to load
+if TYPE_CHECKING:
+    from plaid.api import plaid_api
 
 from ..core.config import settings
 from ..models.institution_item import InstitutionItem
@@ -30,6 +28,7 @@ from ..models.plaid_import import PlaidImport
 from ..models.staging_transaction import StagingTransaction
 from ..models.category import Category
 from ..services.mapping_service import MappingService
+from ..services.detected_subscriptions import refresh_dirty_subscriptions
 from ..utils.account_mapping import get_source_from_account_name
 
 def _safe_text(value) -> str:
@@ -120,8 +119,11 @@ class PlaidImportService:
         self.client = self._build_client()
         self.mapping_service = MappingService(db)
     
-    def _build_client(self) -> plaid_api.PlaidApi:
+    def _build_client(self) -> "plaid_api.PlaidApi":
         """Build Plaid API client."""
+        from plaid import ApiClient, Configuration, Environment
+        from plaid.api import plaid_api
+
         env_map = {
             "sandbox": Environment.Sandbox,
             "development": Environment.Development,
@@ -254,6 +256,8 @@ class PlaidImportService:
         account_ids: Optional[List[str]] = None
     ) -> List[Dict]:
         """Fetch transactions using /transactions/get endpoint with pagination."""
+        from plaid.model.transactions_get_request import TransactionsGetRequest
+
         from plaid.model.transactions_get_request_options import TransactionsGetRequestOptions
         from datetime import timedelta
         
@@ -408,6 +412,8 @@ class PlaidImportService:
         account_ids: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """Fetch transactions using /transactions/sync endpoint."""
+        from plaid.model.transactions_sync_request import TransactionsSyncRequest
+
         added = []
         modified = []
         removed = []
@@ -1010,6 +1016,9 @@ class PlaidImportService:
             print(f"[COMMIT] Added transaction: {staged.merchant_name or staged.name}, amount={amount_db}")
         
         self.db.commit()
+
+        # Re-evaluate subscriptions of the merchants that just got charges
+        refresh_dirty_subscriptions(self.db)
         return summary
     
     def get_staging_transactions(
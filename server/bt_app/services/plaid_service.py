@@ -1,17 +1,12 @@
 # server/app/services/plaid_service.py
 import os
-from typing import Optional, Dict, Any, List
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 from sqlalchemy.orm import Session
 
-from plaid import ApiClient, Configuration, Environment
-from plaid.api import plaid_api
-from plaid.model.country_code import CountryCode
-from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
-from plaid.model.link_token_create_request import LinkTokenCreateRequest
-from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
-from plaid.model.products import Products
-from plaid.model.transactions_sync_request import TransactionsSyncRequest
-from plaid.model.transactions_sync_request_options import TransactionsSyncRequestOptions
+# plaid-python's generated model package is slow to import, so it is loaded
+# inside the functions that build requests rather than at module import.
+if TYPE_CHECKING:
+    from plaid.api import plaid_api
 
 # Import settings to get environment variables
 from ..core.config import settings
@@ -21,24 +16,27 @@ PLAID_ENV = settings.plaid_env.lower()
 PLAID_CLIENT_ID = settings.plaid_client_id
 PLAID_SECRET = settings.plaid_secret
 
-_ENV_MAP = {
-    "sandbox": Environment.Sandbox,
-    "development": Environment.Development,
-    "production": Environment.Production,
+_ENV_NAMES = {
+    "sandbox": "Sandbox",
+    "development": "Development",
+    "production": "Production",
 }
 
-def _build_client() -> plaid_api.PlaidApi:
+def _build_client() -> "plaid_api.PlaidApi":
+    from plaid import ApiClient, Configuration, Environment
+    from plaid.api import plaid_api
+
     configuration = Configuration(
-        host=_ENV_MAP.get(PLAID_ENV, Environment.Sandbox),
+        host=getattr(Environment, _ENV_NAMES.get(PLAID_ENV, "Sandbox")),
         api_key={"clientId": PLAID_CLIENT_ID, "secret": PLAID_SECRET},
     )
     api_client = ApiClient(configuration)
     return plaid_api.PlaidApi(api_client)
 
 # Global client instance - lazy loaded to ensure proper environment
-_plaid_client: Optional[plaid_api.PlaidApi] = None
+_plaid_client: Optional["plaid_api.PlaidApi"] = None
 
-def get_plaid_client() -> plaid_api.PlaidApi:
+def get_plaid_client() -> "plaid_api.PlaidApi":
     """Get or create the global Plaid client with current environment settings."""
     global _plaid_client
     if _plaid_client is None:
@@ -62,6 +60,10 @@ class PlaidService:
         import json
         from uuid import uuid4
         from plaid.exceptions import ApiException
+        from plaid.model.country_code import CountryCode
+        from plaid.model.link_token_create_request import LinkTokenCreateRequest
+        from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
+        from plaid.model.products import Products
         
         # Debug what we're actually using
         env = os.environ.get("PLAID_ENV", "unknown")
@@ -109,6 +111,8 @@ class PlaidService:
 
     def exchange_public_token(self, public_token: str) -> Dict[str, str]:
         """Exchange the Link public_token for an access_token and item_id."""
+        from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
+
         res = self.client.item_public_token_exchange(
             ItemPublicTokenExchangeRequest(public_token=public_token)
         )
@@ -117,6 +121,9 @@ class PlaidService:
 
     def sync_transactions(self, access_token: str, cursor: Optional[str] = None, count: int = 500) -> Dict[str, Any]:
         """Call /transactions/sync and return added/modified/removed + next_cursor."""
+        from plaid.model.transactions_sync_request import TransactionsSyncRequest
+        from plaid.model.transactions_sync_request_options import TransactionsSyncRequestOptions
+
         added: List[dict] = []
         modified: List[dict] = []
         removed: List[dict] = []
@@ -266,6 +273,10 @@ def _legacy_create_link_token() -> Dict[str, str]:
     import json
     from uuid import uuid4
     from plaid.exceptions import ApiException
+    from plaid.model.country_code import CountryCode
+    from plaid.model.link_token_create_request import LinkTokenCreateRequest
+    from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
+    from plaid.model.products import Products
     import hashlib
     
     # Debug what we're actually using
@@ -313,6 +324,7 @@ def _legacy_exchange_public_token(public_token: str) -> Dict[str, str]:
     """Exchange the Link public_token for an access_token and item_id."""
     import json
     from plaid.exceptions import ApiException
+    from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
     
     try:
         client = get_plaid_client()
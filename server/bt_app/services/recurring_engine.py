@@ -0,0 +1,190 @@
+"""Vectorized recurring-charge detection over columnar transaction arrays.
+
+Works on parallel arrays of (merchant_key, month_index, day, amount_cents)
+for expense charges, where ``month_index`` is ``year * 12 + month - 1`` and
+amounts are positive. Every step is a grouped NumPy operation over the
+arrays sorted by merchant and month, so the cost is a few sorts rather than
+a Python loop per merchant and month:
+
+1. one pick per (merchant, month): the charge closest to the month's median
+   amount (earliest in input order on ties)
+2. runs of consecutive months per merchant, kept when at least
+   ``MIN_CONSEC_MONTHS`` long
+3. per run: median amount, share of picks outside the amount tolerance and
+   the largest distance from the median day of month
+4. adjacent valid runs of a merchant (at most 4 months apart) are merged
+   into one subscription, recording price changes between them
+
+The rules are those of ``SubscriptionDetector``; medians are computed the
+way ``statistics.median`` does, so results match it exactly.
+"""
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .subscription_detector import (
+    AMOUNT_ABS_TOL,
+    AMOUNT_PCT_TOL,
+    DAY_OF_MONTH_TOL,
+    MIN_CONSEC_MONTHS,
+    PRICE_CHANGE_THRESHOLD,
+)
+
+MAX_OUTLIER_RATIO = 0.3  # share of a run's picks allowed outside the amount tolerance
+MAX_MERGE_GAP_MONTHS = 4  # runs starting at most this many months after the previous one ends are merged
+
+SEGMENT_COLUMNS = [
+    "merchant_key", "first_month", "last_month", "monthly_amount", "months_count", "total_cents", "price_changes",
+]
+
+
+def month_label(month_index: int) -> str:
+    """``YYYY-MM`` of a month index."""
+    return f"{month_index // 12:04d}-{month_index % 12 + 1:02d}"
+
+
+def _group_starts(*columns: np.ndarray) -> np.ndarray:
+    """Boolean mask of rows that start a new group in arrays sorted by ``columns``."""
+    starts = np.zeros(len(columns[0]), dtype=bool)
+    starts[:1] = True
+    for column in columns:
+        starts[1:] |= column[1:] != column[:-1]
+    return starts
+
+
+def _sort_order(*columns: np.ndarray) -> np.ndarray:
+    """Indices sorting non-negative integer ``columns`` (most significant first).
+
+    The columns are packed into one int64 key when their ranges fit, which
+    sorts several times faster than ``np.lexsort``. Rows equal in every
+    column come out in no particular order.
+    """
+    packed = np.zeros(len(columns[0]), dtype=np.int64)
+    capacity = 1
+    for column in columns:
+        radix = int(column.max()) + 1 if len(column) else 1
+        capacity *= radix
+        if capacity >= 2 ** 62:
+            return np.lexsort(columns[::-1])
+        packed = packed * radix + column
+    return np.argsort(packed)
+
+
+def _sorted_medians(values: np.ndarray, starts: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    """Median of each contiguous group of ``values`` already sorted within groups."""
+    return (values[starts + (sizes - 1) // 2] + values[starts + sizes // 2]) / 2
+
+
+def _grouped_medians(values: np.ndarray, order_by: np.ndarray, group: np.ndarray,
+                     starts: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    """Median of ``values`` per contiguous, ascending ``group`` id; ``order_by`` ranks values like ``values``."""
+    return _sorted_medians(values[_sort_order(group, order_by)], starts, sizes)
+
+
+def detect_recurring(
+    merchant_key: np.ndarray,
+    month_index: np.ndarray,
+    day: np.ndarray,
+    amount_cents: np.ndarray,
+) -> pd.DataFrame:
+    """Find recurring monthly charges.
+
+    Args:
+        merchant_key: Merchant code per charge (small non-negative integers, e.g. ``0..n-1``)
+        month_index: ``year * 12 + month - 1`` per charge
+        day: Day of month per charge
+        amount_cents: Positive charge amount in cents
+
+    Returns:
+        One row per detected subscription (``SEGMENT_COLUMNS``), ordered by
+        merchant key and first month. ``monthly_amount`` is the latest
+        segment's median in dollars; ``price_changes`` lists
+        ``{"from", "to", "date"}`` dicts.
+    """
+    key = np.asarray(merchant_key, dtype=np.int64)
+    month = np.asarray(month_index, dtype=np.int64)
+    day = np.asarray(day, dtype=np.int64)
+    cents = np.asarray(amount_cents, dtype=np.int64)
+
+    # Merchants with fewer charges than the minimum run cannot qualify
+    if not len(key):
+        return pd.DataFrame(columns=SEGMENT_COLUMNS)
+    rows = np.flatnonzero(np.bincount(key)[key] >= MIN_CONSEC_MONTHS)
+    if not len(rows):
+        return pd.DataFrame(columns=SEGMENT_COLUMNS)
+    key, month, day, cents = key[rows], month[rows], day[rows], cents[rows]
+    amount = cents / 100
+
+    # 1. Monthly picks: the charge closest to its (merchant, month) median
+    by_month = _sort_order(key, month - month.min(), cents)
+    month_starts = _group_starts(key[by_month], month[by_month])
+    group = np.cumsum(month_starts) - 1
+    starts = np.flatnonzero(month_starts)
+    sizes = np.diff(np.append(starts, len(key)))
+    month_median = _sorted_medians(amount[by_month], starts, sizes)
+    distance = np.abs(amount[by_month] - month_median[group])
+    closest = distance == np.minimum.reduceat(distance, starts)[group]
+    # ascending group id, i.e. by merchant and month
+    picks = np.minimum.reduceat(np.where(closest, by_month, len(key)), starts)
+
+    key, month, day, cents, amount = key[picks], month[picks], day[picks], cents[picks], amount[picks]
+
+    # 2. Runs of consecutive months, long enough to count
+    run_starts = np.ones(len(key), dtype=bool)
+    run_starts[1:] = (key[1:] != key[:-1]) | (month[1:] - month[:-1] != 1)
+    run_lengths = np.diff(np.append(np.flatnonzero(run_starts), len(key)))
+    long_enough = np.repeat(run_lengths >= MIN_CONSEC_MONTHS, run_lengths)
+    if not long_enough.any():
+        return pd.DataFrame(columns=SEGMENT_COLUMNS)
+    run_starts, key, month, day, cents, amount = (
+        a[long_enough] for a in (run_starts, key, month, day, cents, amount)
+    )
+    run = np.cumsum(run_starts) - 1
+    starts = np.flatnonzero(run_starts)
+    sizes = np.diff(np.append(starts, len(key)))
+    ends = starts + sizes - 1
+
+    # 3. Amount and day-of-month consistency per run
+    run_median = _grouped_medians(amount, cents, run, starts, sizes)
+    tolerance = np.maximum(AMOUNT_ABS_TOL, np.abs(run_median) * AMOUNT_PCT_TOL)
+    outliers = np.add.reduceat((np.abs(amount - run_median[run]) > tolerance[run]).astype(np.int64), starts)
+    median_day = _grouped_medians(day.astype(np.float64), day, run, starts, sizes)
+    day_spread = np.maximum.reduceat(np.abs(day - median_day[run]), starts)
+    valid = (outliers / sizes <= MAX_OUTLIER_RATIO) & (day_spread <= DAY_OF_MONTH_TOL)
+    if not valid.any():
+        return pd.DataFrame(columns=SEGMENT_COLUMNS)
+
+    seg_key = key[starts][valid]
+    seg_first = month[starts][valid]
+    seg_last = month[ends][valid]
+    seg_median = run_median[valid]
+    seg_months = sizes[valid]
+    seg_total = np.add.reduceat(cents, starts)[valid]
+
+    # 4. Merge a merchant's runs separated by short gaps (price changes)
+    merge_starts = np.ones(len(seg_key), dtype=bool)
+    merge_starts[1:] = (seg_key[1:] != seg_key[:-1]) | (seg_first[1:] - seg_last[:-1] > MAX_MERGE_GAP_MONTHS)
+    starts = np.flatnonzero(merge_starts)
+    ends = np.append(starts[1:], len(seg_key)) - 1
+    merged = np.cumsum(merge_starts) - 1
+
+    price_changes: List[List[Dict[str, Any]]] = [[] for _ in starts]
+    changed = ~merge_starts
+    changed[1:] &= np.abs(seg_median[1:] - seg_median[:-1]) >= PRICE_CHANGE_THRESHOLD
+    for i in np.flatnonzero(changed):
+        price_changes[merged[i]].append({
+            "from": round(float(seg_median[i - 1]), 2),
+            "to": round(float(seg_median[i]), 2),
+            "date": month_label(int(seg_first[i])),
+        })
+
+    return pd.DataFrame({
+        "merchant_key": seg_key[starts],
+        "first_month": seg_first[starts],
+        "last_month": seg_last[ends],
+        "monthly_amount": seg_median[ends],
+        "months_count": np.add.reduceat(seg_months, starts),
+        "total_cents": np.add.reduceat(seg_total, starts),
+        "price_changes": price_changes,
+    })
@@ -0,0 +1,82 @@
+"""Build transaction list payloads straight from SQL column tuples.
+
+The list endpoints used to load ORM entities with their category
+relationships and validate every row through the Pydantic schema before
+encoding. Here the filtered query is narrowed to plain columns, amounts are
+formatted in SQL, and categories are resolved from one small lookup, so a
+page of 10,000 rows costs one tuple fetch and a dict per row. The output is
+identical to ``schemas.transactions.Transaction`` serialized in JSON mode.
+"""
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session
+
+from ..models.category import Category
+from ..models.transaction import Transaction
+from ..schemas.common import Category as CategorySchema
+from ..schemas.transactions import Transaction as TransactionSchema
+
+# Decimal(10, 2) renders as e.g. "-51.29"; printf reproduces it from exact cents
+AMOUNT_TEXT = func.printf("%.2f", Transaction.amount_cents / 100.0)
+
+_NESTED = ("category", "subcategory")
+_ROW_FIELDS = [name for name in TransactionSchema.model_fields if name not in _NESTED]
+_ROW_COLUMNS = [
+    AMOUNT_TEXT.label("amount") if name == "amount" else getattr(Transaction, name)
+    for name in _ROW_FIELDS
+]
+
+
+def category_payloads(db: Session) -> Dict[int, Dict[str, Any]]:
+    """Every category as its JSON schema payload, keyed by id."""
+    rows = db.query(
+        Category.id, Category.name, Category.parent_id, Category.color,
+        Category.created_at, Category.updated_at,
+    ).all()
+    by_id = {row.id: row for row in rows}
+
+    def full_path(row, depth: int = 0) -> str:
+        parent = by_id.get(row.parent_id)
+        if parent is None or depth > 10:
+            return row.name
+        return f"{full_path(parent, depth + 1)} > {row.name}"
+
+    payloads = {}
+    for row in rows:
+        values = row._asdict()
+        values["full_path"] = full_path(row)
+        payloads[row.id] = {name: values[name] for name in CategorySchema.model_fields}
+    return payloads
+
+
+def transaction_rows(
+    db: Session,
+    query: Query,
+    categories: Optional[Dict[int, Dict[str, Any]]] = None,
+) -> List[Dict[str, Any]]:
+    """Serialize the transactions selected by an ORM query.
+
+    Args:
+        db: Database session
+        query: Filtered, ordered and paginated ``db.query(Transaction)``
+        categories: Pre-fetched ``category_payloads`` (fetched when omitted)
+
+    Returns:
+        JSON-ready transaction dicts
+    """
+    rows = query.with_entities(*_ROW_COLUMNS).all()
+    if not rows:
+        return []
+    if categories is None:
+        categories = category_payloads(db)
+
+    fields = _ROW_FIELDS
+    get = categories.get
+    result = []
+    for row in rows:
+        item = dict(zip(fields, row))
+        item["category"] = get(item["category_id"])
+        item["subcategory"] = get(item["subcategory_id"])
+        result.append(item)
+    return result
@@ -0,0 +1,22 @@
+"""Integer minor-unit (cents) helpers for exact amount arithmetic."""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional, Union
+
+Number = Union[int, float, str, Decimal]
+
+
+def to_cents(value: Optional[Number]) -> Optional[int]:
+    """Convert a currency amount to integer cents, rounding half away from zero."""
+    if value is None:
+        return None
+    if not isinstance(value, Decimal):
+        # str() first so floats like 19.99 don't carry binary noise into the rounding
+        value = Decimal(str(value))
+    return int((value * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: Optional[int]) -> float:
+    """Convert integer cents to a float amount for API responses."""
+    if not cents:
+        return 0.0
+    return cents / 100
@@ -17,10 +17,15 @@ from bt_app.models import (
     transaction,
     category,
     merchant_rule,
+    merchant_alias,
     budget,
     audit_log,
     plaid_import,
-    staging_transaction
+    staging_transaction,
+    monthly_aggregate,
+    scheduler_lease,
+    detected_subscription,
+    write_generation
 )
 
 # this is the Alembic Config object, which provides
@@ -29,7 +34,8 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# (skipped when the app runs migrations in-process on a connection it owns)
+if config.config_file_name is not None and "connection" not in config.attributes:
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -81,6 +87,14 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        # Tenant shards are migrated on a connection handed in by core.tenancy
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     configuration = config.get_section(config.config_ini_section)
     configuration["sqlalchemy.url"] = get_url()
     
@@ -0,0 +1,40 @@
+"""Add indexed posted_month column to transactions
+
+Revision ID: 019_add_posted_month
+Revises: 018_add_login_password_external_integrations
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '019_add_posted_month'
+down_revision = '018_add_login_password_external_integrations'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add posted_month as a generated column and index month-bucketed lookups."""
+    # SQLite can only ADD virtual generated columns; the value is derived from
+    # posted_date so every existing and future row is filled in automatically.
+    op.execute(
+        "ALTER TABLE transactions ADD COLUMN posted_month VARCHAR(7) "
+        "GENERATED ALWAYS AS (strftime('%Y-%m', posted_date)) VIRTUAL"
+    )
+
+    # Building the index materializes posted_month for all existing rows
+    op.create_index(
+        'ix_transactions_month_type_cat_amount',
+        'transactions',
+        ['posted_month', 'txn_type', 'category_id', 'amount'],
+    )
+    op.execute("ANALYZE transactions")
+
+
+def downgrade() -> None:
+    """Remove posted_month column and its index."""
+    op.drop_index('ix_transactions_month_type_cat_amount', table_name='transactions')
+    op.drop_column('transactions', 'posted_month')
@@ -0,0 +1,56 @@
+"""Add integer cents columns for exact aggregation
+
+Revision ID: 020_add_amount_cents
+Revises: 019_add_posted_month
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '020_add_amount_cents'
+down_revision = '019_add_posted_month'
+branch_labels = None
+depends_on = None
+
+# (table, source column, cents column)
+CENTS_COLUMNS = [
+    ('transactions', 'amount', 'amount_cents'),
+    ('staging_transactions', 'amount', 'amount_cents'),
+    ('budgets', 'amount', 'amount_cents'),
+    ('account_balances', 'available', 'available_cents'),
+    ('account_balances', 'current', 'current_cents'),
+]
+
+
+def upgrade() -> None:
+    """Add *_cents columns, backfill them and move the month index onto cents."""
+    for table, source, target in CENTS_COLUMNS:
+        op.add_column(table, sa.Column(target, sa.Integer(), nullable=True))
+        op.execute(
+            f"UPDATE {table} SET {target} = CAST(ROUND({source} * 100) AS INTEGER) "
+            f"WHERE {source} IS NOT NULL"
+        )
+
+    # Month aggregates now sum amount_cents, so cover that instead of amount
+    op.drop_index('ix_transactions_month_type_cat_amount', table_name='transactions')
+    op.create_index(
+        'ix_transactions_month_type_cat_cents',
+        'transactions',
+        ['posted_month', 'txn_type', 'category_id', 'amount_cents'],
+    )
+
+
+def downgrade() -> None:
+    """Remove *_cents columns and restore the amount-based month index."""
+    op.drop_index('ix_transactions_month_type_cat_cents', table_name='transactions')
+    op.create_index(
+        'ix_transactions_month_type_cat_amount',
+        'transactions',
+        ['posted_month', 'txn_type', 'category_id', 'amount'],
+    )
+
+    for table, _, target in reversed(CENTS_COLUMNS):
+        op.drop_column(table, target)
@@ -0,0 +1,26 @@
+"""Index transactions.updated_at for change watermarks
+
+Revision ID: 021_add_transactions_updated_at_index
+Revises: 020_add_amount_cents
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '021_add_transactions_updated_at_index'
+down_revision = '020_add_amount_cents'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Index updated_at so MAX(updated_at) watermark probes are a single seek."""
+    op.create_index('ix_transactions_updated_at', 'transactions', ['updated_at'])
+
+
+def downgrade() -> None:
+    """Remove the updated_at index."""
+    op.drop_index('ix_transactions_updated_at', table_name='transactions')
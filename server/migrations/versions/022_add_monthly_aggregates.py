@@ -0,0 +1,247 @@
+"""Add trigger-maintained monthly aggregate tables
+
+Revision ID: 022_add_monthly_aggregates
+Revises: 021_add_transactions_updated_at_index
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '022_add_monthly_aggregates'
+down_revision = '021_add_transactions_updated_at_index'
+branch_labels = None
+depends_on = None
+
+TOTAL_COLUMNS = ['txn_count', 'amount_cents', 'abs_amount_cents']
+CUBE_TABLES = ['monthly_category_totals', 'monthly_merchant_totals', 'monthly_account_totals']
+
+# Frozen at this revision: the triggers keeping the cubes in step with transactions
+TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_monthly_category_totals_insert
+    AFTER INSERT ON transactions
+    BEGIN
+        INSERT INTO monthly_category_totals (month, txn_type, category_id, subcategory_id, txn_count, amount_cents, abs_amount_cents)
+        SELECT NEW.posted_month, NEW.txn_type, COALESCE(NEW.category_id, 0), COALESCE(NEW.subcategory_id, 0), 1, COALESCE(NEW.amount_cents, 0), ABS(COALESCE(NEW.amount_cents, 0))
+        WHERE COALESCE(NEW.is_deleted, 0) = 0
+        ON CONFLICT (month, txn_type, category_id, subcategory_id) DO UPDATE SET
+            txn_count = txn_count + excluded.txn_count,
+            amount_cents = amount_cents + excluded.amount_cents,
+            abs_amount_cents = abs_amount_cents + excluded.abs_amount_cents;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_monthly_category_totals_update
+    AFTER UPDATE OF posted_date, amount_cents, txn_type, category_id, subcategory_id, merchant_norm, merchant_raw, account_id, is_deleted ON transactions
+    BEGIN
+        INSERT INTO monthly_category_totals (month, txn_type, category_id, subcategory_id, txn_count, amount_cents, abs_amount_cents)
+        SELECT OLD.posted_month, OLD.txn_type, COALESCE(OLD.category_id, 0), COALESCE(OLD.subcategory_id, 0), -1, -COALESCE(OLD.amount_cents, 0), -ABS(COALESCE(OLD.amount_cents, 0))
+        WHERE COALESCE(OLD.is_deleted, 0) = 0
+        ON CONFLICT (month, txn_type, category_id, subcategory_id) DO UPDATE SET
+            txn_count = txn_count + excluded.txn_count,
+            amount_cents = amount_cents + excluded.amount_cents,
+            abs_amount_cents = abs_amount_cents + excluded.abs_amount_cents;
+        DELETE FROM monthly_category_totals WHERE month = OLD.posted_month AND txn_type = OLD.txn_type AND category_id = COALESCE(OLD.category_id, 0) AND subcategory_id = COALESCE(OLD.subcategory_id, 0) AND txn_count = 0;
+        INSERT INTO monthly_category_totals (month, txn_type, category_id, subcategory_id, txn_count, amount_cents, abs_amount_cents)
+        SELECT NEW.posted_month, NEW.txn_type, COALESCE(NEW.category_id, 0), COALESCE(NEW.subcategory_id, 0), 1, COALESCE(NEW.amount_cents, 0), ABS(COALESCE(NEW.amount_cents, 0))
+        WHERE COALESCE(NEW.is_deleted, 0) = 0
+        ON CONFLICT (month, txn_type, category_id, subcategory_id) DO UPDATE SET
+            txn_count = txn_count + excluded.txn_count,
+            amount_cents = amount_cents + excluded.amount_cents,
+            abs_amount_cents = abs_amount_cents + excluded.abs_amount_cents;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_monthly_category_totals_delete
+    AFTER DELETE ON transactions
+    BEGIN
+        INSERT INTO monthly_category_totals (month, txn_type, category_id, subcategory_id, txn_count, amount_cents, abs_amount_cents)
+        SELECT OLD.posted_month, OLD.txn_type, COALESCE(OLD.category_id, 0), COALESCE(OLD.subcategory_id, 0), -1, -COALESCE(OLD.amount_cents, 0), -ABS(COALESCE(OLD.amount_cents, 0))
+        WHERE COALESCE(OLD.is_deleted, 0) = 0
+        ON CONFLICT (month, txn_type, category_id, subcategory_id) DO UPDATE SET
+            txn_count = txn_count + excluded.txn_count,
+            amount_cents = amount_cents + excluded.amount_cents,
+            abs_amount_cents = abs_amount_cents + excluded.abs_amount_cents;
+        DELETE FROM monthly_category_totals WHERE month = OLD.posted_month AND txn_type = OLD.txn_type AND category_id = COALESCE(OLD.category_id, 0) AND subcategory_id = COALESCE(OLD.subcategory_id, 0) AND txn_count = 0;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_monthly_merchant_totals_insert
+    AFTER INSERT ON transactions
+    BEGIN
+        INSERT INTO monthly_merchant_totals (month, txn_type, merchant_key, txn_count, amount_cents, abs_amount_cents)
+        SELECT NEW.posted_month, NEW.txn_type, COALESCE(NEW.merchant_norm, NEW.merchant_raw, 'Unknown'), 1, COALESCE(NEW.amount_cents, 0), ABS(COALESCE(NEW.amount_cents, 0))
+        WHERE COALESCE(NEW.is_deleted, 0) = 0
+        ON CONFLICT (month, txn_type, merchant_key) DO UPDATE SET
+            txn_count = txn_count + excluded.txn_count,
+            amount_cents = amount_cents + excluded.amount_cents,
+            abs_amount_cents = abs_amount_cents + excluded.abs_amount_cents;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_monthly_merchant_totals_update
+    AFTER UPDATE OF posted_date, amount_cents, txn_type, category_id, subcategory_id, merchant_norm, merchant_raw, account_id, is_deleted ON transactions
+    BEGIN
+        INSERT INTO monthly_merchant_totals (month, txn_type, merchant_key, txn_count, amount_cents, abs_amount_cents)
+        SELECT OLD.posted_month, OLD.txn_type, COALESCE(OLD.merchant_norm, OLD.merchant_raw, 'Unknown'), -1, -COALESCE(OLD.amount_cents, 0), -ABS(COALESCE(OLD.amount_cents, 0))
+        WHERE COALESCE(OLD.is_deleted, 0) = 0
+        ON CONFLICT (month, txn_type, merchant_key) DO UPDATE SET
+            txn_count = txn_count + excluded.txn_count,
+            amount_cents = amount_cents + excluded.amount_cents,
+            abs_amount_cents = abs_amount_cents + excluded.abs_amount_cents;
+        DELETE FROM monthly_merchant_totals WHERE month = OLD.posted_month AND txn_type = OLD.txn_type AND merchant_key = COALESCE(OLD.merchant_norm, OLD.merchant_raw, 'Unknown') AND txn_count = 0;
+        INSERT INTO monthly_merchant_totals (month, txn_type, merchant_key, txn_count, amount_cents, abs_amount_cents)
+        SELECT NEW.posted_month, NEW.txn_type, COALESCE(NEW.merchant_norm, NEW.merchant_raw, 'Unknown'), 1, COALESCE(NEW.amount_cents, 0), ABS(COALESCE(NEW.amount_cents, 0))
+        WHERE COALESCE(NEW.is_deleted, 0) = 0
+        ON CONFLICT (month, txn_type, merchant_key) DO UPDATE SET
+            txn_count = txn_count + excluded.txn_count,
+            amount_cents = amount_cents + excluded.amount_cents,
+            abs_amount_cents = abs_amount_cents + excluded.abs_amount_cents;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_monthly_merchant_totals_delete
+    AFTER DELETE ON transactions
+    BEGIN
+        INSERT INTO monthly_merchant_totals (month, txn_type, merchant_key, txn_count, amount_cents, abs_amount_cents)
+        SELECT OLD.posted_month, OLD.txn_type, COALESCE(OLD.merchant_norm, OLD.merchant_raw, 'Unknown'), -1, -COALESCE(OLD.amount_cents, 0), -ABS(COALESCE(OLD.amount_cents, 0))
+        WHERE COALESCE(OLD.is_deleted, 0) = 0
+        ON CONFLICT (month, txn_type, merchant_key) DO UPDATE SET
+            txn_count = txn_count + excluded.txn_count,
+            amount_cents = amount_cents + excluded.amount_cents,
+            abs_amount_cents = abs_amount_cents + excluded.abs_amount_cents;
+        DELETE FROM monthly_merchant_totals WHERE month = OLD.posted_month AND txn_type = OLD.txn_type AND merchant_key = COALESCE(OLD.merchant_norm, OLD.merchant_raw, 'Unknown') AND txn_count = 0;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_monthly_account_totals_insert
+    AFTER INSERT ON transactions
+    BEGIN
+        INSERT INTO monthly_account_totals (month, txn_type, account_id, txn_count, amount_cents, abs_amount_cents)
+        SELECT NEW.posted_month, NEW.txn_type, NEW.account_id, 1, COALESCE(NEW.amount_cents, 0), ABS(COALESCE(NEW.amount_cents, 0))
+        WHERE COALESCE(NEW.is_deleted, 0) = 0
+        ON CONFLICT (month, txn_type, account_id) DO UPDATE SET
+            txn_count = txn_count + excluded.txn_count,
+            amount_cents = amount_cents + excluded.amount_cents,
+            abs_amount_cents = abs_amount_cents + excluded.abs_amount_cents;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_monthly_account_totals_update
+    AFTER UPDATE OF posted_date, amount_cents, txn_type, category_id, subcategory_id, merchant_norm, merchant_raw, account_id, is_deleted ON transactions
+    BEGIN
+        INSERT INTO monthly_account_totals (month, txn_type, account_id, txn_count, amount_cents, abs_amount_cents)
+        SELECT OLD.posted_month, OLD.txn_type, OLD.account_id, -1, -COALESCE(OLD.amount_cents, 0), -ABS(COALESCE(OLD.amount_cents, 0))
+        WHERE COALESCE(OLD.is_deleted, 0) = 0
+        ON CONFLICT (month, txn_type, account_id) DO UPDATE SET
+            txn_count = txn_count + excluded.txn_count,
+            amount_cents = amount_cents + excluded.amount_cents,
+            abs_amount_cents = abs_amount_cents + excluded.abs_amount_cents;
+        DELETE FROM monthly_account_totals WHERE month = OLD.posted_month AND txn_type = OLD.txn_type AND account_id = OLD.account_id AND txn_count = 0;
+        INSERT INTO monthly_account_totals (month, txn_type, account_id, txn_count, amount_cents, abs_amount_cents)
+        SELECT NEW.posted_month, NEW.txn_type, NEW.account_id, 1, COALESCE(NEW.amount_cents, 0), ABS(COALESCE(NEW.amount_cents, 0))
+        WHERE COALESCE(NEW.is_deleted, 0) = 0
+        ON CONFLICT (month, txn_type, account_id) DO UPDATE SET
+            txn_count = txn_count + excluded.txn_count,
+            amount_cents = amount_cents + excluded.amount_cents,
+            abs_amount_cents = abs_amount_cents + excluded.abs_amount_cents;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_monthly_account_totals_delete
+    AFTER DELETE ON transactions
+    BEGIN
+        INSERT INTO monthly_account_totals (month, txn_type, account_id, txn_count, amount_cents, abs_amount_cents)
+        SELECT OLD.posted_month, OLD.txn_type, OLD.account_id, -1, -COALESCE(OLD.amount_cents, 0), -ABS(COALESCE(OLD.amount_cents, 0))
+        WHERE COALESCE(OLD.is_deleted, 0) = 0
+        ON CONFLICT (month, txn_type, account_id) DO UPDATE SET
+            txn_count = txn_count + excluded.txn_count,
+            amount_cents = amount_cents + excluded.amount_cents,
+            abs_amount_cents = abs_amount_cents + excluded.abs_amount_cents;
+        DELETE FROM monthly_account_totals WHERE month = OLD.posted_month AND txn_type = OLD.txn_type AND account_id = OLD.account_id AND txn_count = 0;
+    END
+    """,
+]
+
+# Backfill of each cube from the existing transactions
+BACKFILL = [
+    """
+    INSERT INTO monthly_category_totals (month, txn_type, category_id, subcategory_id, txn_count, amount_cents, abs_amount_cents)
+    SELECT t.posted_month AS month, t.txn_type AS txn_type, COALESCE(t.category_id, 0) AS category_id, COALESCE(t.subcategory_id, 0) AS subcategory_id,
+        COUNT(*) AS txn_count,
+        SUM(COALESCE(t.amount_cents, 0)) AS amount_cents,
+        SUM(ABS(COALESCE(t.amount_cents, 0))) AS abs_amount_cents
+    FROM transactions t
+    WHERE COALESCE(t.is_deleted, 0) = 0
+    GROUP BY t.posted_month, t.txn_type, COALESCE(t.category_id, 0), COALESCE(t.subcategory_id, 0)
+    """,
+    """
+    INSERT INTO monthly_merchant_totals (month, txn_type, merchant_key, txn_count, amount_cents, abs_amount_cents)
+    SELECT t.posted_month AS month, t.txn_type AS txn_type, COALESCE(t.merchant_norm, t.merchant_raw, 'Unknown') AS merchant_key,
+        COUNT(*) AS txn_count,
+        SUM(COALESCE(t.amount_cents, 0)) AS amount_cents,
+        SUM(ABS(COALESCE(t.amount_cents, 0))) AS abs_amount_cents
+    FROM transactions t
+    WHERE COALESCE(t.is_deleted, 0) = 0
+    GROUP BY t.posted_month, t.txn_type, COALESCE(t.merchant_norm, t.merchant_raw, 'Unknown')
+    """,
+    """
+    INSERT INTO monthly_account_totals (month, txn_type, account_id, txn_count, amount_cents, abs_amount_cents)
+    SELECT t.posted_month AS month, t.txn_type AS txn_type, t.account_id AS account_id,
+        COUNT(*) AS txn_count,
+        SUM(COALESCE(t.amount_cents, 0)) AS amount_cents,
+        SUM(ABS(COALESCE(t.amount_cents, 0))) AS abs_amount_cents
+    FROM transactions t
+    WHERE COALESCE(t.is_deleted, 0) = 0
+    GROUP BY t.posted_month, t.txn_type, t.account_id
+    """,
+]
+
+
+def _totals():
+    return [sa.Column(name, sa.Integer(), nullable=False, server_default='0') for name in TOTAL_COLUMNS]
+
+
+def upgrade() -> None:
+    """Create the cubes, install the maintenance triggers and backfill from transactions."""
+    op.create_table(
+        'monthly_category_totals',
+        sa.Column('month', sa.String(length=7), nullable=False),
+        sa.Column('txn_type', sa.String(length=10), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('subcategory_id', sa.Integer(), nullable=False, server_default='0'),
+        *_totals(),
+        sa.PrimaryKeyConstraint('month', 'txn_type', 'category_id', 'subcategory_id'),
+    )
+    op.create_table(
+        'monthly_merchant_totals',
+        sa.Column('month', sa.String(length=7), nullable=False),
+        sa.Column('txn_type', sa.String(length=10), nullable=False),
+        sa.Column('merchant_key', sa.String(length=500), nullable=False),
+        *_totals(),
+        sa.PrimaryKeyConstraint('month', 'txn_type', 'merchant_key'),
+    )
+    op.create_table(
+        'monthly_account_totals',
+        sa.Column('month', sa.String(length=7), nullable=False),
+        sa.Column('txn_type', sa.String(length=10), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        *_totals(),
+        sa.PrimaryKeyConstraint('month', 'txn_type', 'account_id'),
+    )
+
+    for ddl in TRIGGERS:
+        op.execute(ddl)
+    for sql in BACKFILL:
+        op.execute(sql)
+
+
+def downgrade() -> None:
+    """Drop the triggers and cube tables."""
+    for table in reversed(CUBE_TABLES):
+        for event in ('insert', 'update', 'delete'):
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_{event}")
+        op.drop_table(table)
@@ -0,0 +1,32 @@
+"""Add scheduler lease table for single-leader job scheduling
+
+Revision ID: 023_add_scheduler_leases
+Revises: 022_add_monthly_aggregates
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '023_add_scheduler_leases'
+down_revision = '022_add_monthly_aggregates'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the lease table (APScheduler creates its own job store table on start)."""
+    op.create_table(
+        'scheduler_leases',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('holder', sa.String(length=128), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    """Drop the lease table."""
+    op.drop_table('scheduler_leases')
@@ -0,0 +1,155 @@
+"""Add the canonical merchant alias tables and transactions.canonical_merchant
+
+Revision ID: 024_add_canonical_merchants
+Revises: 023_add_scheduler_leases
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '024_add_canonical_merchants'
+down_revision = '023_add_scheduler_leases'
+branch_labels = None
+depends_on = None
+
+# Frozen at this revision: the seeded canonical merchants and aliases, and the matcher used to backfill
+CANONICAL_MERCHANTS = [
+    *((key, 'always') for key in (
+        "OPENAI", "CURSOR", "TRADINGVIEW", "LEETCODE", "NETFLIX", "EQUINOX", "MEMBERSHIP_FEE",
+        "FIDO", "BELL_CANADA", "SPOTIFY", "APPLE", "GOOGLE", "ROGERS", "TELUS", "OURARING",
+    )),
+    *((key, 'never') for key in (
+        "RENT", "LONGOS", "LOBLAWS", "METRO", "SOBEYS", "WALMART", "DOLLARAMA", "RESTAURANT",
+        "TIM HORTONS", "STARBUCKS", "SHELL", "ESSO", "PETRO", "UBER RIDES", "UBER EATS", "REXALL",
+        "SHOPPERS", "NATURES EMPORIUM", "WINNERS", "INTEREST", "PHARMACY", "MCDONALD", "SUBWAY",
+        "AMAZONCOM PAYMENTS-CA", "AMAZON", "BEST BUY",
+    )),
+]
+
+# (canonical key, merchant pattern, description pattern) in match order
+ALIASES = [
+    ("OPENAI", "ONLINE PAYMENTS BY STRIPE", "%OPENAI%"),
+    ("OPENAI", "ONLINE PAYMENTS BY STRIPE", "%CHATGPT%"),
+    ("OPENAI", "%OPENAI%", None),
+    ("CURSOR", "ONLINE PAYMENTS BY STRIPE", "%CURSOR%"),
+    ("CURSOR", "%CURSOR%", None),
+    ("TRADINGVIEW", "B2B TRANSACTION", "%TRADINGVIEW%"),
+    ("TRADINGVIEW", "%TRADINGVIEW%", None),
+    ("LEETCODE", "ONLINE PAYMENTS BY STRIPE", "%LEETCODE%"),
+    ("LEETCODE", "%LEETCODE%", None),
+    ("NETFLIX", "%NETFLIX%", None),
+    ("NETFLIX", None, "%NETFLIX%"),
+    ("EQUINOX", "%EQUINOX%", None),
+    ("MEMBERSHIP_FEE", "%MEMBERSHIP FEE%", None),
+    ("MEMBERSHIP_FEE", "CHECKOUT.COM ECOMM MEDIUM EEA", "%PATREON% MEMBERSHIP%"),
+    ("MEMBERSHIP_FEE", "%INTEREST%", "%MEMBERSHIP FEE%"),
+    ("FIDO", "%FIDO%", None),
+    ("FIDO", None, "%FIDO MOBILE%"),
+    ("BELL_CANADA", "%BELL CANADA%", None),
+    ("BELL_CANADA", "%BELL%", "%BELL CANADA%"),
+]
+
+
+def _like(pattern):
+    if pattern is None:
+        return None
+    parts = [".*" if ch == "%" else "." if ch == "_" else re.escape(ch) for ch in pattern]
+    return re.compile("".join(parts), re.IGNORECASE | re.DOTALL)
+
+
+def _canonical(merchant_raw, description_raw, compiled):
+    if not merchant_raw:
+        return None
+    for key, merchant_re, description_re in compiled:
+        if merchant_re is not None and not merchant_re.fullmatch(merchant_raw):
+            continue
+        if description_re is not None and not (description_raw and description_re.fullmatch(description_raw)):
+            continue
+        return key
+    return merchant_raw.upper()
+
+
+def _seed_aliases(connection) -> None:
+    merchants = sa.table('canonical_merchants', sa.column('key'), sa.column('subscription'))
+    aliases = sa.table(
+        'merchant_aliases', sa.column('canonical_key'), sa.column('merchant_pattern'),
+        sa.column('description_pattern'), sa.column('priority'),
+    )
+    connection.execute(merchants.insert(), [{"key": key, "subscription": sub} for key, sub in CANONICAL_MERCHANTS])
+    connection.execute(aliases.insert(), [
+        {"canonical_key": key, "merchant_pattern": merchant, "description_pattern": description,
+         "priority": len(ALIASES) - i}
+        for i, (key, merchant, description) in enumerate(ALIASES)
+    ])
+
+
+def _backfill(connection) -> None:
+    """Key every transaction once per distinct (merchant, description) pair, then apply with one UPDATE."""
+    compiled = [(key, _like(merchant), _like(description)) for key, merchant, description in ALIASES]
+    pairs = connection.execute(sa.text(
+        "SELECT DISTINCT COALESCE(merchant_raw, ''), COALESCE(description_raw, '') FROM transactions"
+    )).all()
+    connection.execute(sa.text(
+        "CREATE TEMP TABLE canonical_merchant_map ("
+        "merchant_raw TEXT NOT NULL, description_raw TEXT NOT NULL, canonical TEXT, "
+        "PRIMARY KEY (merchant_raw, description_raw))"
+    ))
+    if pairs:
+        connection.execute(
+            sa.text("INSERT INTO temp.canonical_merchant_map VALUES (:m, :d, :c)"),
+            [{"m": m, "d": d, "c": _canonical(m, d, compiled)} for m, d in pairs],
+        )
+    connection.execute(sa.text("""
+        UPDATE transactions
+        SET canonical_merchant = m.canonical, updated_at = CURRENT_TIMESTAMP
+        FROM temp.canonical_merchant_map AS m
+        WHERE m.merchant_raw = COALESCE(transactions.merchant_raw, '')
+          AND m.description_raw = COALESCE(transactions.description_raw, '')
+          AND transactions.canonical_merchant IS NOT m.canonical
+    """))
+    connection.execute(sa.text("DROP TABLE temp.canonical_merchant_map"))
+
+
+def upgrade() -> None:
+    """Create and seed the alias tables, then add and backfill the indexed key column."""
+    op.create_table(
+        'canonical_merchants',
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('subscription', sa.String(length=10), nullable=True),
+        sa.PrimaryKeyConstraint('key'),
+    )
+    op.create_table(
+        'merchant_aliases',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('canonical_key', sa.String(length=255), nullable=False),
+        sa.Column('merchant_pattern', sa.String(length=500), nullable=True),
+        sa.Column('description_pattern', sa.String(length=500), nullable=True),
+        sa.Column('priority', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['canonical_key'], ['canonical_merchants.key']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_merchant_aliases_id', 'merchant_aliases', ['id'])
+    op.create_index('ix_merchant_aliases_canonical_key', 'merchant_aliases', ['canonical_key'])
+    _seed_aliases(op.get_bind())
+
+    op.add_column('transactions', sa.Column('canonical_merchant', sa.String(length=255), nullable=True))
+    op.create_index('ix_transactions_canonical_month', 'transactions', ['canonical_merchant', 'posted_month'])
+    _backfill(op.get_bind())
+    op.execute("ANALYZE transactions")
+
+
+def downgrade() -> None:
+    """Drop the key column and the alias tables."""
+    op.drop_index('ix_transactions_canonical_month', table_name='transactions')
+    op.drop_column('transactions', 'canonical_merchant')
+    op.drop_index('ix_merchant_aliases_canonical_key', table_name='merchant_aliases')
+    op.drop_index('ix_merchant_aliases_id', table_name='merchant_aliases')
+    op.drop_table('merchant_aliases')
+    op.drop_table('canonical_merchants')
@@ -0,0 +1,117 @@
+"""Add the persisted detected_subscriptions state and its refresh queue
+
+Revision ID: 025_add_detected_subscriptions
+Revises: 024_add_canonical_merchants
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '025_add_detected_subscriptions'
+down_revision = '024_add_canonical_merchants'
+branch_labels = None
+depends_on = None
+
+# Frozen at this revision: the triggers queueing merchants whose detection inputs changed
+TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_subscriptions_txn_insert
+    AFTER INSERT ON transactions
+    BEGIN
+        INSERT OR IGNORE INTO subscription_dirty_merchants (merchant_key)
+        SELECT NEW.canonical_merchant WHERE NEW.canonical_merchant IS NOT NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_subscriptions_txn_update
+    AFTER UPDATE OF posted_date, amount_cents, txn_type, category_id, canonical_merchant ON transactions
+    BEGIN
+        INSERT OR IGNORE INTO subscription_dirty_merchants (merchant_key)
+        SELECT OLD.canonical_merchant WHERE OLD.canonical_merchant IS NOT NULL;
+        INSERT OR IGNORE INTO subscription_dirty_merchants (merchant_key)
+        SELECT NEW.canonical_merchant WHERE NEW.canonical_merchant IS NOT NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_subscriptions_txn_delete
+    AFTER DELETE ON transactions
+    BEGIN
+        INSERT OR IGNORE INTO subscription_dirty_merchants (merchant_key)
+        SELECT OLD.canonical_merchant WHERE OLD.canonical_merchant IS NOT NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_subscriptions_policy_insert
+    AFTER INSERT ON canonical_merchants
+    BEGIN
+        INSERT OR IGNORE INTO subscription_dirty_merchants (merchant_key)
+        SELECT NEW.key WHERE NEW.key IS NOT NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_subscriptions_policy_update
+    AFTER UPDATE OF subscription ON canonical_merchants
+    BEGIN
+        INSERT OR IGNORE INTO subscription_dirty_merchants (merchant_key)
+        SELECT NEW.key WHERE NEW.key IS NOT NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_subscriptions_category_update
+    AFTER UPDATE OF name ON categories
+    BEGIN
+        INSERT OR IGNORE INTO subscription_dirty_merchants (merchant_key)
+        SELECT DISTINCT canonical_merchant FROM transactions
+        WHERE category_id = NEW.id AND canonical_merchant IS NOT NULL;
+    END
+    """,
+]
+TRIGGER_NAMES = [
+    'trg_subscriptions_txn_insert', 'trg_subscriptions_txn_update', 'trg_subscriptions_txn_delete',
+    'trg_subscriptions_policy_insert', 'trg_subscriptions_policy_update', 'trg_subscriptions_category_update',
+]
+
+
+def upgrade() -> None:
+    """Create the tables, install the queue triggers and queue every merchant for detection."""
+    op.create_table(
+        'detected_subscriptions',
+        sa.Column('merchant_key', sa.String(length=255), nullable=False),
+        sa.Column('cadence', sa.String(length=10), nullable=False),
+        sa.Column('category', sa.String(length=255), nullable=True),
+        sa.Column('current_price_cents', sa.Integer(), nullable=False),
+        sa.Column('price_history', sa.Text(), nullable=True),
+        sa.Column('months_count', sa.Integer(), nullable=False),
+        sa.Column('total_cents', sa.Integer(), nullable=False),
+        sa.Column('first_charge_date', sa.Date(), nullable=False),
+        sa.Column('last_charge_date', sa.Date(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('merchant_key'),
+    )
+    op.create_index('ix_detected_subscriptions_last_charge_date', 'detected_subscriptions', ['last_charge_date'])
+    op.create_table(
+        'subscription_dirty_merchants',
+        sa.Column('merchant_key', sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint('merchant_key'),
+    )
+
+    for ddl in TRIGGERS:
+        op.execute(ddl)
+    # Detected by the next refresh_dirty_subscriptions run (the scheduler's subscription job)
+    op.execute(
+        "INSERT OR IGNORE INTO subscription_dirty_merchants (merchant_key) "
+        "SELECT DISTINCT canonical_merchant FROM transactions WHERE canonical_merchant IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Drop the triggers and tables."""
+    for trigger in TRIGGER_NAMES:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.drop_table('subscription_dirty_merchants')
+    op.drop_index('ix_detected_subscriptions_last_charge_date', table_name='detected_subscriptions')
+    op.drop_table('detected_subscriptions')
@@ -0,0 +1,150 @@
+"""Add the trigger-maintained monthly_networth prefix-sum series
+
+Revision ID: 026_add_monthly_networth
+Revises: 025_add_detected_subscriptions
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '026_add_monthly_networth'
+down_revision = '025_add_detected_subscriptions'
+branch_labels = None
+depends_on = None
+
+TOTAL_COLUMNS = ['txn_count', 'income_expense_count', 'income_cents', 'inflow_cents', 'expense_cents']
+CUMULATIVE_COLUMNS = ['cumulative_net_cents', 'cumulative_balance_cents']
+
+# Frozen at this revision: the triggers keeping the series in step with transactions
+TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_monthly_networth_insert
+    AFTER INSERT ON transactions
+    BEGIN
+        INSERT INTO monthly_networth (month, txn_count, income_expense_count, income_cents, inflow_cents, expense_cents, cumulative_net_cents, cumulative_balance_cents)
+        SELECT NEW.posted_month, 0, 0, 0, 0, 0,
+            COALESCE((SELECT p.cumulative_net_cents FROM monthly_networth p WHERE p.month < NEW.posted_month ORDER BY p.month DESC LIMIT 1), 0),
+            COALESCE((SELECT p.cumulative_balance_cents FROM monthly_networth p WHERE p.month < NEW.posted_month ORDER BY p.month DESC LIMIT 1), 0)
+        WHERE COALESCE(NEW.is_deleted, 0) = 0 AND NEW.posted_month IS NOT NULL
+        ON CONFLICT (month) DO NOTHING;
+        UPDATE monthly_networth SET
+            txn_count = txn_count + (1),
+            income_expense_count = income_expense_count + (CASE WHEN NEW.txn_type IN ('income', 'expense') THEN 1 ELSE 0 END),
+            income_cents = income_cents + (CASE WHEN NEW.txn_type = 'income' THEN COALESCE(NEW.amount_cents, 0) ELSE 0 END),
+            inflow_cents = inflow_cents + (CASE WHEN NEW.txn_type = 'income' THEN COALESCE(NEW.amount_cents, 0) WHEN NEW.txn_type != 'expense' THEN MAX(COALESCE(NEW.amount_cents, 0), 0) ELSE 0 END),
+            expense_cents = expense_cents + (CASE WHEN NEW.txn_type = 'expense' THEN ABS(COALESCE(NEW.amount_cents, 0)) ELSE 0 END)
+        WHERE month = NEW.posted_month AND COALESCE(NEW.is_deleted, 0) = 0 AND NEW.posted_month IS NOT NULL;
+        UPDATE monthly_networth SET
+            cumulative_net_cents = cumulative_net_cents + ((CASE WHEN NEW.txn_type = 'income' THEN COALESCE(NEW.amount_cents, 0) ELSE 0 END) - (CASE WHEN NEW.txn_type = 'expense' THEN ABS(COALESCE(NEW.amount_cents, 0)) ELSE 0 END)),
+            cumulative_balance_cents = cumulative_balance_cents + ((CASE WHEN NEW.txn_type = 'income' THEN COALESCE(NEW.amount_cents, 0) WHEN NEW.txn_type != 'expense' THEN MAX(COALESCE(NEW.amount_cents, 0), 0) ELSE 0 END) - (CASE WHEN NEW.txn_type = 'expense' THEN ABS(COALESCE(NEW.amount_cents, 0)) ELSE 0 END))
+        WHERE month >= NEW.posted_month AND COALESCE(NEW.is_deleted, 0) = 0 AND NEW.posted_month IS NOT NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_monthly_networth_update
+    AFTER UPDATE OF posted_date, amount_cents, txn_type, is_deleted ON transactions
+    BEGIN
+        INSERT INTO monthly_networth (month, txn_count, income_expense_count, income_cents, inflow_cents, expense_cents, cumulative_net_cents, cumulative_balance_cents)
+        SELECT OLD.posted_month, 0, 0, 0, 0, 0,
+            COALESCE((SELECT p.cumulative_net_cents FROM monthly_networth p WHERE p.month < OLD.posted_month ORDER BY p.month DESC LIMIT 1), 0),
+            COALESCE((SELECT p.cumulative_balance_cents FROM monthly_networth p WHERE p.month < OLD.posted_month ORDER BY p.month DESC LIMIT 1), 0)
+        WHERE COALESCE(OLD.is_deleted, 0) = 0 AND OLD.posted_month IS NOT NULL
+        ON CONFLICT (month) DO NOTHING;
+        UPDATE monthly_networth SET
+            txn_count = txn_count - (1),
+            income_expense_count = income_expense_count - (CASE WHEN OLD.txn_type IN ('income', 'expense') THEN 1 ELSE 0 END),
+            income_cents = income_cents - (CASE WHEN OLD.txn_type = 'income' THEN COALESCE(OLD.amount_cents, 0) ELSE 0 END),
+            inflow_cents = inflow_cents - (CASE WHEN OLD.txn_type = 'income' THEN COALESCE(OLD.amount_cents, 0) WHEN OLD.txn_type != 'expense' THEN MAX(COALESCE(OLD.amount_cents, 0), 0) ELSE 0 END),
+            expense_cents = expense_cents - (CASE WHEN OLD.txn_type = 'expense' THEN ABS(COALESCE(OLD.amount_cents, 0)) ELSE 0 END)
+        WHERE month = OLD.posted_month AND COALESCE(OLD.is_deleted, 0) = 0 AND OLD.posted_month IS NOT NULL;
+        UPDATE monthly_networth SET
+            cumulative_net_cents = cumulative_net_cents - ((CASE WHEN OLD.txn_type = 'income' THEN COALESCE(OLD.amount_cents, 0) ELSE 0 END) - (CASE WHEN OLD.txn_type = 'expense' THEN ABS(COALESCE(OLD.amount_cents, 0)) ELSE 0 END)),
+            cumulative_balance_cents = cumulative_balance_cents - ((CASE WHEN OLD.txn_type = 'income' THEN COALESCE(OLD.amount_cents, 0) WHEN OLD.txn_type != 'expense' THEN MAX(COALESCE(OLD.amount_cents, 0), 0) ELSE 0 END) - (CASE WHEN OLD.txn_type = 'expense' THEN ABS(COALESCE(OLD.amount_cents, 0)) ELSE 0 END))
+        WHERE month >= OLD.posted_month AND COALESCE(OLD.is_deleted, 0) = 0 AND OLD.posted_month IS NOT NULL;
+        DELETE FROM monthly_networth WHERE month = OLD.posted_month AND txn_count = 0;
+        INSERT INTO monthly_networth (month, txn_count, income_expense_count, income_cents, inflow_cents, expense_cents, cumulative_net_cents, cumulative_balance_cents)
+        SELECT NEW.posted_month, 0, 0, 0, 0, 0,
+            COALESCE((SELECT p.cumulative_net_cents FROM monthly_networth p WHERE p.month < NEW.posted_month ORDER BY p.month DESC LIMIT 1), 0),
+            COALESCE((SELECT p.cumulative_balance_cents FROM monthly_networth p WHERE p.month < NEW.posted_month ORDER BY p.month DESC LIMIT 1), 0)
+        WHERE COALESCE(NEW.is_deleted, 0) = 0 AND NEW.posted_month IS NOT NULL
+        ON CONFLICT (month) DO NOTHING;
+        UPDATE monthly_networth SET
+            txn_count = txn_count + (1),
+            income_expense_count = income_expense_count + (CASE WHEN NEW.txn_type IN ('income', 'expense') THEN 1 ELSE 0 END),
+            income_cents = income_cents + (CASE WHEN NEW.txn_type = 'income' THEN COALESCE(NEW.amount_cents, 0) ELSE 0 END),
+            inflow_cents = inflow_cents + (CASE WHEN NEW.txn_type = 'income' THEN COALESCE(NEW.amount_cents, 0) WHEN NEW.txn_type != 'expense' THEN MAX(COALESCE(NEW.amount_cents, 0), 0) ELSE 0 END),
+            expense_cents = expense_cents + (CASE WHEN NEW.txn_type = 'expense' THEN ABS(COALESCE(NEW.amount_cents, 0)) ELSE 0 END)
+        WHERE month = NEW.posted_month AND COALESCE(NEW.is_deleted, 0) = 0 AND NEW.posted_month IS NOT NULL;
+        UPDATE monthly_networth SET
+            cumulative_net_cents = cumulative_net_cents + ((CASE WHEN NEW.txn_type = 'income' THEN COALESCE(NEW.amount_cents, 0) ELSE 0 END) - (CASE WHEN NEW.txn_type = 'expense' THEN ABS(COALESCE(NEW.amount_cents, 0)) ELSE 0 END)),
+            cumulative_balance_cents = cumulative_balance_cents + ((CASE WHEN NEW.txn_type = 'income' THEN COALESCE(NEW.amount_cents, 0) WHEN NEW.txn_type != 'expense' THEN MAX(COALESCE(NEW.amount_cents, 0), 0) ELSE 0 END) - (CASE WHEN NEW.txn_type = 'expense' THEN ABS(COALESCE(NEW.amount_cents, 0)) ELSE 0 END))
+        WHERE month >= NEW.posted_month AND COALESCE(NEW.is_deleted, 0) = 0 AND NEW.posted_month IS NOT NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_monthly_networth_delete
+    AFTER DELETE ON transactions
+    BEGIN
+        INSERT INTO monthly_networth (month, txn_count, income_expense_count, income_cents, inflow_cents, expense_cents, cumulative_net_cents, cumulative_balance_cents)
+        SELECT OLD.posted_month, 0, 0, 0, 0, 0,
+            COALESCE((SELECT p.cumulative_net_cents FROM monthly_networth p WHERE p.month < OLD.posted_month ORDER BY p.month DESC LIMIT 1), 0),
+            COALESCE((SELECT p.cumulative_balance_cents FROM monthly_networth p WHERE p.month < OLD.posted_month ORDER BY p.month DESC LIMIT 1), 0)
+        WHERE COALESCE(OLD.is_deleted, 0) = 0 AND OLD.posted_month IS NOT NULL
+        ON CONFLICT (month) DO NOTHING;
+        UPDATE monthly_networth SET
+            txn_count = txn_count - (1),
+            income_expense_count = income_expense_count - (CASE WHEN OLD.txn_type IN ('income', 'expense') THEN 1 ELSE 0 END),
+            income_cents = income_cents - (CASE WHEN OLD.txn_type = 'income' THEN COALESCE(OLD.amount_cents, 0) ELSE 0 END),
+            inflow_cents = inflow_cents - (CASE WHEN OLD.txn_type = 'income' THEN COALESCE(OLD.amount_cents, 0) WHEN OLD.txn_type != 'expense' THEN MAX(COALESCE(OLD.amount_cents, 0), 0) ELSE 0 END),
+            expense_cents = expense_cents - (CASE WHEN OLD.txn_type = 'expense' THEN ABS(COALESCE(OLD.amount_cents, 0)) ELSE 0 END)
+        WHERE month = OLD.posted_month AND COALESCE(OLD.is_deleted, 0) = 0 AND OLD.posted_month IS NOT NULL;
+        UPDATE monthly_networth SET
+            cumulative_net_cents = cumulative_net_cents - ((CASE WHEN OLD.txn_type = 'income' THEN COALESCE(OLD.amount_cents, 0) ELSE 0 END) - (CASE WHEN OLD.txn_type = 'expense' THEN ABS(COALESCE(OLD.amount_cents, 0)) ELSE 0 END)),
+            cumulative_balance_cents = cumulative_balance_cents - ((CASE WHEN OLD.txn_type = 'income' THEN COALESCE(OLD.amount_cents, 0) WHEN OLD.txn_type != 'expense' THEN MAX(COALESCE(OLD.amount_cents, 0), 0) ELSE 0 END) - (CASE WHEN OLD.txn_type = 'expense' THEN ABS(COALESCE(OLD.amount_cents, 0)) ELSE 0 END))
+        WHERE month >= OLD.posted_month AND COALESCE(OLD.is_deleted, 0) = 0 AND OLD.posted_month IS NOT NULL;
+        DELETE FROM monthly_networth WHERE month = OLD.posted_month AND txn_count = 0;
+    END
+    """,
+]
+
+# Backfill of the series from the existing transactions
+BACKFILL = """
+    INSERT INTO monthly_networth (month, txn_count, income_expense_count, income_cents, inflow_cents, expense_cents, cumulative_net_cents, cumulative_balance_cents)
+    SELECT t.posted_month AS month,
+        SUM(1) AS txn_count,
+        SUM(CASE WHEN t.txn_type IN ('income', 'expense') THEN 1 ELSE 0 END) AS income_expense_count,
+        SUM(CASE WHEN t.txn_type = 'income' THEN COALESCE(t.amount_cents, 0) ELSE 0 END) AS income_cents,
+        SUM(CASE WHEN t.txn_type = 'income' THEN COALESCE(t.amount_cents, 0) WHEN t.txn_type != 'expense' THEN MAX(COALESCE(t.amount_cents, 0), 0) ELSE 0 END) AS inflow_cents,
+        SUM(CASE WHEN t.txn_type = 'expense' THEN ABS(COALESCE(t.amount_cents, 0)) ELSE 0 END) AS expense_cents,
+        SUM((SUM(CASE WHEN t.txn_type = 'income' THEN COALESCE(t.amount_cents, 0) ELSE 0 END)) - (SUM(CASE WHEN t.txn_type = 'expense' THEN ABS(COALESCE(t.amount_cents, 0)) ELSE 0 END))) OVER (ORDER BY t.posted_month) AS cumulative_net_cents,
+        SUM((SUM(CASE WHEN t.txn_type = 'income' THEN COALESCE(t.amount_cents, 0) WHEN t.txn_type != 'expense' THEN MAX(COALESCE(t.amount_cents, 0), 0) ELSE 0 END)) - (SUM(CASE WHEN t.txn_type = 'expense' THEN ABS(COALESCE(t.amount_cents, 0)) ELSE 0 END))) OVER (ORDER BY t.posted_month) AS cumulative_balance_cents
+    FROM transactions t
+    WHERE COALESCE(t.is_deleted, 0) = 0 AND t.posted_month IS NOT NULL
+    GROUP BY t.posted_month
+    ORDER BY t.posted_month
+    """
+
+
+def upgrade() -> None:
+    """Create the series, install its triggers and backfill it from transactions."""
+    op.create_table(
+        'monthly_networth',
+        sa.Column('month', sa.String(length=7), nullable=False),
+        *(sa.Column(name, sa.Integer(), nullable=False, server_default='0')
+          for name in TOTAL_COLUMNS + CUMULATIVE_COLUMNS),
+        sa.PrimaryKeyConstraint('month'),
+    )
+
+    for ddl in TRIGGERS:
+        op.execute(ddl)
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    """Drop the triggers and the series."""
+    for event in ('insert', 'update', 'delete'):
+        op.execute(f"DROP TRIGGER IF EXISTS trg_monthly_networth_{event}")
+    op.drop_table('monthly_networth')
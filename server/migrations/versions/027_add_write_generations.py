@@ -0,0 +1,54 @@
+"""Add the trigger-maintained per-table write generations shared across processes
+
+Revision ID: 027_add_write_generations
+Revises: 026_add_monthly_networth
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '027_add_write_generations'
+down_revision = '026_add_monthly_networth'
+branch_labels = None
+depends_on = None
+
+# Frozen at this revision: tables with per-row triggers, and trigger-derived tables bumped by rebuilds
+TRACKED_TABLES = (
+    "accounts", "account_balances", "budgets", "canonical_merchants", "categories",
+    "detected_subscriptions", "external_integrations", "institution_items", "merchant_aliases",
+    "merchant_rules", "plaid_imports", "staging_transactions", "transactions",
+)
+DERIVED_TABLES = ("monthly_account_totals", "monthly_category_totals", "monthly_merchant_totals", "monthly_networth")
+OPERATIONS = ("insert", "update", "delete")
+
+
+def upgrade() -> None:
+    """Create the counters, seed them at zero and install the triggers."""
+    op.create_table(
+        'write_generations',
+        sa.Column('table_name', sa.String(length=64), nullable=False),
+        sa.Column('generation', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('table_name'),
+    )
+    values = ", ".join(f"('{table}', 0)" for table in TRACKED_TABLES + DERIVED_TABLES)
+    op.execute(f"INSERT INTO write_generations (table_name, generation) VALUES {values}")
+    for table in TRACKED_TABLES:
+        for operation in OPERATIONS:
+            op.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_generation_{table}_{operation}
+                AFTER {operation.upper()} ON {table}
+                BEGIN
+                    UPDATE write_generations SET generation = generation + 1 WHERE table_name = '{table}';
+                END
+            """)
+
+
+def downgrade() -> None:
+    """Drop the triggers and the counters."""
+    for table in TRACKED_TABLES:
+        for operation in OPERATIONS:
+            op.execute(f"DROP TRIGGER IF EXISTS trg_generation_{table}_{operation}")
+    op.drop_table('write_generations')
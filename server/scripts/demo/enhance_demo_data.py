@@ -144,11 +144,11 @@ def enhance_demo_data():
                 cursor.execute("""
                     INSERT INTO staging_transactions 
                     (import_id, plaid_transaction_id, account_id, date, name, merchant_name, 
-                     amount, currency, suggested_category_id, status, hash_key, 
+                     amount, amount_cents, currency, suggested_category_id, status, hash_key, 
                      created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), datetime('now'))
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), datetime('now'))
                 """, (plaid_import_id, plaid_txn_id, account_id, txn_date.isoformat(),
-                      description, merchant, amount, 'USD', category_id, status, hash_dedupe))
+                      description, merchant, amount, int(round(amount * 100)), 'USD', category_id, status, hash_dedupe))
                 
                 total_staging_txns += 1
         
@@ -1,10 +1,20 @@
 """Quick SQL-based demo seeder - bypasses ORM relationship issues."""
+import sys
+import os
 import sqlite3
 from pathlib import Path
 from datetime import date, timedelta
 from decimal import Decimal
 import random
 
+# Add the app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from bt_app.services.canonical_merchants import backfill_canonical_merchants
+from bt_app.services.detected_subscriptions import refresh_subscriptions
+
 def seed_demo_sql():
     """Seed demo data using raw SQL."""
     db_path = Path(__file__).parent / "bt_app" / "demo.db"
@@ -56,9 +66,9 @@ def seed_demo_sql():
                 txn_type = 'income' if amount > 0 else 'expense'
             
             cursor.execute("""
-                INSERT INTO transactions (account_id, posted_date, amount, currency, merchant_raw, description_raw, merchant_norm, source, hash_dedupe, txn_type, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), datetime('now'))
-            """, (account_id, posted_date.isoformat(), float(amount), "USD", merchant, description, merchant, "demo", f"demo_{merchant}_{posted_date}_{random.randint(1, 9999)}", txn_type))
+                INSERT INTO transactions (account_id, posted_date, amount, amount_cents, currency, merchant_raw, description_raw, merchant_norm, source, hash_dedupe, txn_type, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), datetime('now'))
+            """, (account_id, posted_date.isoformat(), float(amount), int(round(amount * 100)), "USD", merchant, description, merchant, "demo", f"demo_{merchant}_{posted_date}_{random.randint(1, 9999)}", txn_type))
         
         # Generate transactions
         current = start_date
@@ -110,6 +120,12 @@ def seed_demo_sql():
         conn.commit()
         print(f"✓ Created {txn_count} demo transactions")
         
+        # The raw INSERTs skip the ORM hook that sets canonical_merchant
+        with Session(bind=create_engine(f"sqlite:///{db_path}")) as db:
+            backfill_canonical_merchants(db)
+            summary = refresh_subscriptions(db, today=end_date)
+        print(f"✓ Detected {summary['detected']} demo subscriptions")
+        
         print("\n✅ Demo database ready!")
         print(f"📍 Location: {db_path}")
         print("🚀 Start with: .\\start_demo.ps1")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Benchmark analytics queries on SQLite vs the DuckDB mirror.
+
+Builds a throwaway SQLite database with N synthetic transactions (1M by
+default), loads the DuckDB mirror from it and times the routed analytics
+queries on both engines.
+
+Usage:
+    python scripts/dev/bench_analytics_engine.py [--rows 1000000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(SERVER_DIR))
+
+_tmp = Path(tempfile.mkdtemp())
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{(_tmp / 'bench.db').as_posix()}")
+os.environ.setdefault("PLAID_CLIENT_ID", "bench")
+os.environ.setdefault("PLAID_SECRET", "bench")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from bt_app.core.db import Base  # noqa: E402
+from bt_app.models import account, category, institution_item, plaid_import, transaction  # noqa: E402,F401
+from bt_app.services.analytics_engine import DuckDBMirror  # noqa: E402
+
+MERCHANTS = ["LOBLAWS", "NETFLIX", "TIM HORTONS", "ROGERS", "SHELL", "AMAZON", "UBER", "SPOTIFY", "COSTCO", "METRO"]
+
+QUERIES = {
+    "summary totals": """
+        SELECT txn_type, SUM(amount_cents) / 100.0 AS total_amount, COUNT(*) AS transaction_count
+        FROM transactions
+        WHERE posted_date >= :date_from AND posted_date <= :date_to
+          AND txn_type IN ('income', 'expense')
+        GROUP BY txn_type
+    """,
+    "monthly income/expense": """
+        SELECT posted_month AS month,
+               SUM(CASE WHEN txn_type = 'income' THEN amount_cents ELSE 0 END) / 100.0 AS income,
+               SUM(CASE WHEN txn_type = 'expense' THEN ABS(amount_cents) ELSE 0 END) / 100.0 AS expense
+        FROM transactions
+        WHERE posted_date >= :date_from AND posted_date <= :date_to
+          AND txn_type IN ('income', 'expense')
+        GROUP BY posted_month
+        ORDER BY month
+    """,
+    "category frequency": """
+        SELECT c.name AS category_name, COUNT(t.id) AS total_transactions
+        FROM transactions t
+        JOIN categories c ON t.category_id = c.id
+        WHERE lower(t.txn_type) = 'expense'
+          AND t.posted_date >= :date_from AND t.posted_date <= :date_to
+        GROUP BY c.id, c.name
+        ORDER BY total_transactions DESC
+        LIMIT 10
+    """,
+    "merchant by month": """
+        SELECT UPPER(merchant_raw) AS merchant, posted_month AS month,
+               COUNT(*) AS n, SUM(ABS(amount_cents)) / 100.0 AS total
+        FROM transactions
+        WHERE txn_type = 'expense'
+          AND posted_date >= :date_from AND posted_date <= :date_to
+          AND merchant_raw LIKE '%O%'
+        GROUP BY UPPER(merchant_raw), posted_month
+        ORDER BY merchant, month
+    """,
+}
+
+
+def build_database(db_url: str, rows: int) -> None:
+    """Create the schema and bulk-insert synthetic rows."""
+    engine = create_engine(db_url)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    start = date(2019, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO institution_items (id, plaid_item_id, institution_name, access_token_encrypted) "
+            "VALUES (1, 'bench', 'Bench Bank', 'x')"
+        ))
+        conn.execute(text("INSERT INTO accounts (id, institution_item_id, name) VALUES (1, 1, 'Chequing')"))
+        conn.execute(
+            text("INSERT INTO categories (id, name, color) VALUES (:id, :name, '#888888')"),
+            [{"id": i, "name": f"Category {i}"} for i in range(1, 21)],
+        )
+        batch = []
+        for i in range(rows):
+            is_income = i % 20 == 0
+            cents = rng.randint(100, 500_000) if is_income else -rng.randint(100, 30_000)
+            batch.append({
+                "posted_date": (start + timedelta(days=rng.randrange(2190))).isoformat(),
+                "amount": cents / 100,
+                "amount_cents": cents,
+                "merchant_raw": rng.choice(MERCHANTS),
+                "category_id": rng.randint(1, 20),
+                "hash_dedupe": f"h{i}",
+                "txn_type": "income" if is_income else "expense",
+            })
+            if len(batch) == 50_000:
+                _insert(conn, batch)
+                batch = []
+        if batch:
+            _insert(conn, batch)
+        conn.execute(text("ANALYZE"))
+    engine.dispose()
+
+
+def _insert(conn, batch):
+    conn.execute(text("""
+        INSERT INTO transactions
+            (account_id, posted_date, amount, amount_cents, merchant_raw, category_id, hash_dedupe, txn_type, source, is_deleted)
+        VALUES
+            (1, :posted_date, :amount, :amount_cents, :merchant_raw, :category_id, :hash_dedupe, :txn_type, 'csv', 0)
+    """), batch)
+
+
+def timed(fn, repeat: int) -> float:
+    """Median wall time in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db_url = f"sqlite:///{(_tmp / 'bench.db').as_posix()}"
+    t0 = time.perf_counter()
+    build_database(db_url, args.rows)
+    print(f"Built {args.rows:,} transactions in {time.perf_counter() - t0:.1f}s")
+
+    engine = create_engine(db_url)
+    db = sessionmaker(bind=engine)()
+    mirror = DuckDBMirror()
+    t0 = time.perf_counter()
+    mirror.refresh(db)
+    print(f"Mirror full load in {time.perf_counter() - t0:.1f}s")
+    print(f"Freshness probe: {timed(lambda: mirror.is_fresh(db), args.repeat):.2f} ms\n")
+
+    params = {"date_from": "2020-01-01", "date_to": "2024-12-31"}
+    print(f"{'query':<26}{'sqlite ms':>12}{'duckdb ms':>12}{'speedup':>10}")
+    for name, sql in QUERIES.items():
+        sqlite_ms = timed(lambda: db.execute(text(sql), params).fetchall(), args.repeat)
+        duck_ms = timed(lambda: mirror.execute(sql, params), args.repeat)
+        print(f"{name:<26}{sqlite_ms:>12.1f}{duck_ms:>12.1f}{sqlite_ms / duck_ms:>9.1f}x")
+
+    db.close()
+    mirror.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Benchmark dashboard latency while a heavy export runs on the same worker.
+
+Builds a throwaway SQLite database with N synthetic transactions, then drives
+the ASGI app in-process (one event loop, like a single uvicorn worker):
+
+1. dashboard requests alone (baseline)
+2. dashboard requests while /api/transactions/export/excel runs
+3. the same, with the export wrapped in an ``async def`` that calls it
+   directly, which is how the routes behaved before they moved to the
+   threadpool
+
+p99 in (2) should stay close to the baseline; (3) shows the stall.
+
+Usage:
+    python scripts/dev/bench_event_loop.py [--rows 50000] [--requests 200] [--concurrency 4]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(SERVER_DIR))
+
+_tmp = Path(tempfile.mkdtemp())
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{(_tmp / 'bench.db').as_posix()}")
+os.environ.setdefault("PLAID_CLIENT_ID", "bench")
+os.environ.setdefault("PLAID_SECRET", "bench")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+import httpx  # noqa: E402
+from fastapi import Request  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from bt_app.api.routes_transactions import export_transactions_excel  # noqa: E402
+from bt_app.core.config import settings  # noqa: E402
+from bt_app.core.db import Base, SessionLocal, engine  # noqa: E402
+from bt_app.main import app  # noqa: E402
+
+MERCHANTS = ["LOBLAWS", "NETFLIX", "TIM HORTONS", "ROGERS", "SHELL", "AMAZON", "UBER", "SPOTIFY"]
+DASHBOARD_URLS = [
+    "/api/dashboard/cards?month=2023-06",
+    "/api/dashboard/categories?month=2023-06",
+    "/api/dashboard/top-merchants?month=2023-06",
+    "/api/dashboard/lines",
+]
+
+
+def build_database(rows: int) -> None:
+    """Create the schema and bulk-insert synthetic rows."""
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(7)
+    start = date(2021, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO institution_items (id, plaid_item_id, institution_name, access_token_encrypted) "
+            "VALUES (1, 'bench', 'Bench Bank', 'x')"
+        ))
+        conn.execute(text("INSERT INTO accounts (id, institution_item_id, name) VALUES (1, 1, 'Chequing')"))
+        conn.execute(
+            text("INSERT INTO categories (id, name, color) VALUES (:id, :name, '#888888')"),
+            [{"id": i, "name": f"Category {i}"} for i in range(1, 11)],
+        )
+        conn.execute(text("""
+            INSERT INTO transactions
+                (account_id, posted_date, amount, amount_cents, merchant_raw, category_id, hash_dedupe, txn_type, source, is_deleted)
+            VALUES
+                (1, :posted_date, :amount, :amount_cents, :merchant_raw, :category_id, :hash_dedupe, :txn_type, 'csv', 0)
+        """), [
+            {
+                "posted_date": (start + timedelta(days=rng.randrange(1095))).isoformat(),
+                "amount": -cents / 100,
+                "amount_cents": -cents,
+                "merchant_raw": rng.choice(MERCHANTS),
+                "category_id": rng.randint(1, 10),
+                "hash_dedupe": f"h{i}",
+                "txn_type": "expense",
+            }
+            for i, cents in enumerate(rng.randint(100, 30_000) for _ in range(rows))
+        ])
+
+
+async def blocking_export(request: Request):
+    """The export as an ``async def`` route calling sync code inline (the old shape)."""
+    db = SessionLocal()
+    try:
+        return export_transactions_excel(request, db)
+    finally:
+        db.close()
+
+
+app.add_api_route("/__bench/export-blocking", blocking_export, methods=["GET"])
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def dashboard_load(client: httpx.AsyncClient, requests: int, concurrency: int):
+    """Issue ``requests`` dashboard calls from ``concurrency`` clients; return latencies in ms."""
+    latencies = []
+    queue = [DASHBOARD_URLS[i % len(DASHBOARD_URLS)] for i in range(requests)]
+
+    async def worker():
+        while queue:
+            url = queue.pop()
+            t0 = time.perf_counter()
+            response = await client.get(url)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def scenario(client, label: str, export_url, args) -> None:
+    exports = 0
+
+    async def keep_exporting(stop: asyncio.Event):
+        nonlocal exports
+        while not stop.is_set():
+            (await client.get(export_url)).raise_for_status()
+            exports += 1
+
+    stop = asyncio.Event()
+    load = asyncio.create_task(dashboard_load(client, args.requests, args.concurrency))
+    background = None
+    if export_url:
+        await asyncio.sleep(0.02)  # dashboard traffic is in flight when the export starts
+        background = asyncio.create_task(keep_exporting(stop))
+    latencies = await load
+    stop.set()
+    if background:
+        await background
+    print(f"{label:<34}{statistics.median(latencies):>9.1f}{percentile(latencies, 95):>9.1f}"
+          f"{percentile(latencies, 99):>9.1f}{max(latencies):>9.1f}{exports:>9}")
+
+
+async def run(args) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        await dashboard_load(client, len(DASHBOARD_URLS), 1)  # warm up
+        print(f"{'scenario (ms)':<34}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'exports':>9}")
+        await scenario(client, "dashboard alone", None, args)
+        await scenario(client, "during export (threadpool)", "/api/transactions/export/excel", args)
+        await scenario(client, "during export (blocking async)", "/__bench/export-blocking", args)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    # Measure the queries themselves, not cache hits
+    settings.enable_result_cache = False
+
+    t0 = time.perf_counter()
+    build_database(args.rows)
+    print(f"Built {args.rows:,} transactions in {time.perf_counter() - t0:.1f}s\n")
+    asyncio.run(run(args))
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Benchmark serializing a page of transactions: ORM + Pydantic vs column tuples.
+
+Builds an in-memory database with N transactions (10k by default) and times
+the full path from query to response bytes for:
+
+- the previous path: ORM entities with joined categories, validated into
+  ``TransactionList`` and encoded with the stdlib JSON encoder
+- the same models encoded with orjson (default response class only)
+- the tuple path: ``transaction_rows`` + orjson
+
+Usage:
+    python scripts/dev/bench_serialization.py [--rows 10000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(SERVER_DIR))
+
+_tmp = Path(tempfile.mkdtemp())
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{(_tmp / 'bench.db').as_posix()}")
+os.environ.setdefault("PLAID_CLIENT_ID", "bench")
+os.environ.setdefault("PLAID_SECRET", "bench")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from sqlalchemy import create_engine, desc, text  # noqa: E402
+from sqlalchemy.orm import joinedload, sessionmaker  # noqa: E402
+
+from bt_app.core.db import Base  # noqa: E402
+from bt_app.core.responses import dumps  # noqa: E402
+from bt_app.models import (  # noqa: E402,F401
+    account, account_balance, budget, category, institution_item, merchant_rule, plaid_import,
+    staging_transaction, transaction,
+)
+from bt_app.models.transaction import Transaction  # noqa: E402
+from bt_app.schemas.transactions import TransactionList  # noqa: E402
+from bt_app.services.transaction_rows import transaction_rows  # noqa: E402
+
+MERCHANTS = ["LOBLAWS", "NETFLIX", "TIM HORTONS", "ROGERS", "SHELL", "AMAZON", "UBER", "SPOTIFY"]
+
+
+def build_session(rows: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(3)
+    start = date(2022, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO institution_items (id, plaid_item_id, institution_name, access_token_encrypted) "
+            "VALUES (1, 'bench', 'Bench Bank', 'x')"
+        ))
+        conn.execute(text("INSERT INTO accounts (id, institution_item_id, name) VALUES (1, 1, 'Chequing')"))
+        conn.execute(
+            text("INSERT INTO categories (id, name, parent_id, color) VALUES (:id, :name, :parent_id, '#888888')"),
+            [{"id": i, "name": f"Category {i}", "parent_id": None if i <= 5 else i - 5} for i in range(1, 16)],
+        )
+        conn.execute(text("""
+            INSERT INTO transactions
+                (account_id, posted_date, amount, amount_cents, merchant_raw, description_raw,
+                 category_id, subcategory_id, hash_dedupe, txn_type, source, currency, is_deleted)
+            VALUES
+                (1, :posted_date, :amount, :amount_cents, :merchant_raw, :merchant_raw,
+                 :category_id, :subcategory_id, :hash_dedupe, 'expense', 'csv', 'CAD', 0)
+        """), [
+            {
+                "posted_date": (start + timedelta(days=rng.randrange(730))).isoformat(),
+                "amount": -cents / 100,
+                "amount_cents": -cents,
+                "merchant_raw": rng.choice(MERCHANTS),
+                "category_id": rng.choice([None, 1, 2, 3, 4, 5]),
+                "subcategory_id": rng.choice([None, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15]),
+                "hash_dedupe": f"h{i}",
+            }
+            for i, cents in enumerate(rng.randint(100, 30_000) for _ in range(rows))
+        ])
+    return sessionmaker(bind=engine)()
+
+
+def timed(fn, repeat: int):
+    """Median wall time in milliseconds, plus the last result."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db = build_session(args.rows)
+    page = db.query(Transaction).order_by(desc(Transaction.posted_date), desc(Transaction.id)).limit(args.rows)
+
+    def models():
+        db.expunge_all()
+        transactions = page.options(
+            joinedload(Transaction.category), joinedload(Transaction.subcategory)
+        ).all()
+        return TransactionList(transactions=transactions, total=args.rows, page=1, per_page=args.rows, pages=1)
+
+    def orm_pydantic_stdlib():
+        payload = models().model_dump(mode="json")
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def orm_pydantic_orjson():
+        return dumps(models().model_dump(mode="json"))
+
+    def tuples_orjson():
+        return dumps({
+            "transactions": transaction_rows(db, page),
+            "total": args.rows, "page": 1, "per_page": args.rows, "pages": 1,
+        })
+
+    print(f"{'path':<30}{'ms':>10}{'KiB':>10}{'speedup':>10}")
+    baseline = None
+    for name, fn in [
+        ("ORM + Pydantic + json", orm_pydantic_stdlib),
+        ("ORM + Pydantic + orjson", orm_pydantic_orjson),
+        ("column tuples + orjson", tuples_orjson),
+    ]:
+        ms, body = timed(fn, args.repeat)
+        baseline = baseline or ms
+        print(f"{name:<30}{ms:>10.1f}{len(body) / 1024:>10.0f}{baseline / ms:>9.1f}x")
+
+    assert json.loads(orm_pydantic_stdlib()) == json.loads(tuples_orjson()), "payloads differ"
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
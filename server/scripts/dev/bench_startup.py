@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Measure API cold start: time to import ``bt_app.main`` in a fresh interpreter.
+
+Each run starts a new Python process with ``-X importtime``, imports the
+framework (FastAPI, SQLAlchemy, pydantic-settings) first and then the app,
+so the report separates what the framework costs from what ``bt_app`` adds.
+The slowest modules by cumulative import time are listed, and heavy
+optional dependencies that should only load on first use are flagged.
+
+Exits non-zero when the median app import exceeds ``--budget-ms``.
+
+Usage:
+    python scripts/dev/bench_startup.py [--runs 5] [--budget-ms 500] [--top 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parents[2]
+
+# Must not be imported until a request needs them
+DEFERRED_MODULES = ("pandas", "numpy", "openpyxl", "plaid", "ccxt", "apscheduler", "duckdb", "alembic",
+                    "bt_app.core.profiler")
+
+_PROBE = """
+import sys, time
+t0 = time.perf_counter()
+import fastapi, sqlalchemy.orm, pydantic_settings
+t1 = time.perf_counter()
+import bt_app.main
+t2 = time.perf_counter()
+print("framework_ms", (t1 - t0) * 1000)
+print("app_ms", (t2 - t1) * 1000)
+print("loaded", ",".join(m for m in {deferred!r} if m in sys.modules))
+"""
+
+
+def probe_env() -> dict:
+    """Environment for a child interpreter that never opens a real database."""
+    env = dict(os.environ)
+    tmp = Path(tempfile.mkdtemp())
+    env.setdefault("DATABASE_URL", f"sqlite:///{(tmp / 'startup.db').as_posix()}")
+    env.setdefault("PLAID_CLIENT_ID", "bench")
+    env.setdefault("PLAID_SECRET", "bench")
+    env.setdefault("SECRET_KEY", "bench")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SERVER_DIR), env.get("PYTHONPATH")]))
+    return env
+
+
+def run_once(importtime: bool = False) -> dict:
+    """Import the app in a fresh interpreter; return timings (and -X importtime lines)."""
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", _PROBE.format(deferred=DEFERRED_MODULES)]
+    proc = subprocess.run(cmd, cwd=SERVER_DIR, env=probe_env(), capture_output=True, text=True, check=True)
+    result = {"importtime": proc.stderr.splitlines() if importtime else []}
+    for line in proc.stdout.splitlines():
+        key, _, value = line.partition(" ")
+        if key in ("framework_ms", "app_ms"):
+            result[key] = float(value)
+        elif key == "loaded":
+            result[key] = [m for m in value.split(",") if m]
+    return result
+
+
+def slowest_modules(importtime_lines, top: int):
+    """(cumulative ms, module) for the slowest imports in an -X importtime log."""
+    rows = []
+    for line in importtime_lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cumulative.isdigit():
+            rows.append((int(cumulative) / 1000, name))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=500.0)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    framework = statistics.median(r["framework_ms"] for r in runs)
+    app = statistics.median(r["app_ms"] for r in runs)
+    loaded = sorted({m for r in runs for m in r["loaded"]})
+
+    print(f"framework import     {framework:8.0f} ms (median of {args.runs})")
+    print(f"bt_app.main import   {app:8.0f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"deferred deps loaded {', '.join(loaded) or 'none'}")
+
+    print("\nslowest imports (cumulative, one -X importtime run):")
+    for ms, name in slowest_modules(run_once(importtime=True)["importtime"], args.top):
+        print(f"  {ms:8.1f} ms  {name}")
+
+    if loaded or app > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
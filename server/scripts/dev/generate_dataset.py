@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""Generate a large synthetic dataset with bulk Core inserts.
+
+Merchants follow a Zipf-like popularity curve: a few chains (each with many
+store variants such as ``LOBLAWS #1042 TORONTO ON``) take most of the
+volume, followed by a long tail of independents (``SQ *MAPLE BISTRO``).
+Subscriptions bill monthly at a fixed price with occasional increases,
+payroll lands every other Friday, and a share of transactions is left
+uncategorized for the rule engine. Mapping rules target the most common
+normalized merchants. Everything derives from the seed, so the same spec
+always produces the same database.
+
+Also used by the benchmark suite in ``server/benchmarks``.
+
+Usage:
+    python scripts/dev/generate_dataset.py --out big.db [--preset large]
+        [--transactions N] [--merchants N] [--rules N] [--accounts N] [--years N] [--seed N]
+"""
+import argparse
+import bisect
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+SERVER_DIR = Path(__file__).resolve().parents[2]
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+if __name__ == "__main__":
+    _tmp = Path(tempfile.mkdtemp())
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{(_tmp / 'unused.db').as_posix()}")
+    os.environ.setdefault("PLAID_CLIENT_ID", "bench")
+    os.environ.setdefault("PLAID_SECRET", "bench")
+    os.environ.setdefault("SECRET_KEY", "bench")
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from bt_app.core.db import Base  # noqa: E402
+from bt_app.models import (  # noqa: E402,F401
+    account,
+    account_balance,
+    audit_log,
+    budget,
+    category,
+    detected_subscription,
+    external_integration,
+    institution_item,
+    merchant_alias,
+    merchant_rule,
+    monthly_aggregate,
+    plaid_import,
+    scheduler_lease,
+    staging_transaction,
+    transaction,
+    write_generation,
+)
+from bt_app.models.detected_subscription import DIRTY_TRIGGERS, dirty_trigger_ddl  # noqa: E402
+from bt_app.models.merchant_rule import RuleFields, RuleType  # noqa: E402
+from bt_app.models.monthly_aggregate import (  # noqa: E402
+    CUBE_KEYS,
+    NETWORTH_TABLE,
+    cube_trigger_ddl,
+    networth_trigger_ddl,
+)
+from bt_app.models.write_generation import generation_trigger_ddl, generation_trigger_names  # noqa: E402
+from bt_app.services.canonical_merchants import backfill_canonical_merchants  # noqa: E402
+from bt_app.services.detected_subscriptions import refresh_subscriptions  # noqa: E402
+from bt_app.services.mapping_service import MappingService  # noqa: E402
+from bt_app.services.monthly_aggregates import rebuild_monthly_aggregates  # noqa: E402
+from bt_app.utils.fts_setup import setup_fts5  # noqa: E402
+from bt_app.utils.merchant_cleaner import clean_final_merchant  # noqa: E402
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    transactions: int = 1_000_000
+    merchants: int = 5_000
+    rules: int = 2_000
+    accounts: int = 10
+    years: int = 8
+    end_date: date = date(2024, 12, 31)
+    uncategorized_share: float = 0.15
+    seed: int = 42
+
+
+PRESETS = {
+    "small": DatasetSpec(transactions=20_000, merchants=500, rules=200, accounts=4, years=2),
+    "medium": DatasetSpec(transactions=200_000, merchants=2_000, rules=800, accounts=10, years=4),
+    "large": DatasetSpec(),
+}
+
+BATCH_SIZE = 20_000
+
+# (category, subcategories, typical amount, chains)
+CHAINS = [
+    ("Groceries", ["Supermarket", "Bulk"], 85.0, [
+        "LOBLAWS", "METRO", "SOBEYS", "NO FRILLS", "FOOD BASICS", "FRESHCO", "COSTCO WHOLESALE",
+        "WALMART SUPERCENTER", "FARM BOY", "T&T SUPERMARKET", "LONGO'S", "REAL CDN SUPERSTORE",
+    ]),
+    ("Dining", ["Coffee", "Fast Food", "Restaurants"], 18.0, [
+        "TIM HORTONS", "STARBUCKS", "MCDONALD'S", "A&W", "SUBWAY", "PIZZA PIZZA", "SECOND CUP",
+        "HARVEY'S", "CHIPOTLE", "BOSTON PIZZA", "THE KEG", "POPEYES", "MARY BROWN'S",
+    ]),
+    ("Transport", ["Fuel", "Transit", "Rideshare", "Parking"], 45.0, [
+        "SHELL", "PETRO-CANADA", "ESSO", "PIONEER", "CIRCLE K", "UBER* TRIP", "LYFT *RIDE",
+        "PRESTO", "GREEN P PARKING", "IMPARK",
+    ]),
+    ("Shopping", ["Online", "Home", "Clothing", "Electronics"], 60.0, [
+        "AMZN MKTP CA", "AMAZON.CA", "CANADIAN TIRE", "BEST BUY", "IKEA", "WINNERS", "HOME DEPOT",
+        "DOLLARAMA", "SPORT CHEK", "HUDSON'S BAY", "STAPLES", "UNIQLO", "SEPHORA",
+    ]),
+    ("Health", ["Pharmacy", "Dental"], 35.0, [
+        "SHOPPERS DRUG MART", "REXALL", "PHARMASAVE", "LONDON DRUGS",
+    ]),
+    ("Bills", ["Phone", "Utilities", "Insurance"], 110.0, [
+        "ROGERS", "BELL CANADA", "TELUS", "FIDO", "HYDRO ONE", "ENBRIDGE GAS", "TORONTO HYDRO",
+    ]),
+]
+
+SUBSCRIPTIONS = [
+    ("NETFLIX.COM", 16.49), ("SPOTIFY P0A1B2C3", 10.99), ("DISNEY PLUS", 11.99),
+    ("APPLE.COM/BILL", 3.99), ("GOOGLE *YOUTUBEPREMIUM", 13.99), ("AMAZON PRIME MEMBERSHIP", 9.99),
+    ("CRAVE", 19.99), ("MICROSOFT*365", 8.99), ("GOODLIFE FITNESS", 49.99), ("ADOBE *CREATIVE CLD", 29.99),
+    ("DROPBOX", 15.99), ("NYTIMES DIGITAL", 4.00), ("PLAYSTATION NETWORK", 11.99), ("AUDIBLE", 14.95),
+]
+
+CITIES = [("TORONTO", "ON"), ("MISSISSAUGA", "ON"), ("OTTAWA", "ON"), ("MONTREAL", "QC"), ("LAVAL", "QC"),
+          ("VANCOUVER", "BC"), ("BURNABY", "BC"), ("CALGARY", "AB"), ("EDMONTON", "AB"), ("HALIFAX", "NS")]
+INDIE_PREFIXES = ["SQ *", "TST* ", "PAYPAL *", "SP ", "", "", ""]
+INDIE_WORDS = ["MAPLE", "BLUE", "NORTH", "CEDAR", "HARBOUR", "GOLDEN", "LITTLE", "URBAN", "OLD TOWN", "RED",
+               "LUCKY", "QUEEN ST", "KING", "SUNNY", "CORNER", "PARK", "RIVER", "STONE", "MILL", "BAY"]
+INDIE_KINDS = [("BISTRO", "Dining", "Restaurants", 32.0), ("CAFE", "Dining", "Coffee", 7.5),
+               ("DELI", "Dining", "Fast Food", 14.0), ("MARKET", "Groceries", "Supermarket", 28.0),
+               ("BAKERY", "Groceries", "Supermarket", 11.0), ("BOUTIQUE", "Shopping", "Clothing", 55.0),
+               ("HARDWARE", "Shopping", "Home", 40.0), ("BARBER", "Health", "Dental", 30.0),
+               ("NAILS", "Health", "Pharmacy", 45.0), ("SUSHI", "Dining", "Restaurants", 38.0)]
+DESCRIPTION_FORMATS = ["POS PURCHASE {m}", "VISA DEBIT PURCHASE - {m}", "{m}", "CONTACTLESS {m}"]
+PF_CATEGORIES = {
+    "Groceries": "FOOD_AND_DRINK", "Dining": "FOOD_AND_DRINK", "Transport": "TRANSPORTATION",
+    "Shopping": "GENERAL_MERCHANDISE", "Health": "MEDICAL", "Bills": "RENT_AND_UTILITIES",
+    "Subscriptions": "ENTERTAINMENT", "Income": "INCOME",
+}
+
+
+@dataclass
+class Merchant:
+    raw: str
+    description: str
+    category: str
+    subcategory: str
+    typical_amount: float
+    merchant_norm: str = ""
+    description_norm: str = ""
+    cleaned: str = ""
+
+
+def build_merchants(spec: DatasetSpec, rng: random.Random) -> List[Merchant]:
+    """``spec.merchants`` merchants, most popular first: chain store variants, then independents."""
+    chains = [(name, cat, subs, amount) for cat, subs, amount, names in CHAINS for name in names]
+    rng.shuffle(chains)
+    merchants: List[Merchant] = []
+    chain_slots = int(spec.merchants * 0.6)
+    stores = itertools.count(1001)
+    for i in range(chain_slots):
+        name, cat, subs, amount = chains[i % len(chains)]
+        city, prov = rng.choice(CITIES)
+        raw = name if i < len(chains) else f"{name} #{next(stores)} {city} {prov}"
+        merchants.append(Merchant(raw, rng.choice(DESCRIPTION_FORMATS).format(m=raw), cat, rng.choice(subs), amount))
+    for i in range(spec.merchants - chain_slots):
+        word, (kind, cat, sub, amount) = rng.choice(INDIE_WORDS), rng.choice(INDIE_KINDS)
+        raw = f"{rng.choice(INDIE_PREFIXES)}{word} {kind}{'' if i < 200 else f' {i}'}"
+        merchants.append(Merchant(raw, rng.choice(DESCRIPTION_FORMATS).format(m=raw), cat, sub, amount))
+
+    mapper = MappingService(None)
+    norms: Dict[Tuple[str, str], Tuple[str, str, str]] = {}
+    for m in merchants:
+        key = (m.raw, m.description)
+        if key not in norms:
+            norms[key] = (
+                mapper.normalize_merchant(m.raw, m.description) or "",
+                mapper.normalize_description(m.description) or "",
+                clean_final_merchant(m.raw, m.description) or "",
+            )
+        m.merchant_norm, m.description_norm, m.cleaned = norms[key]
+    return merchants
+
+
+def zipf_cum_weights(n: int, exponent: float = 1.07) -> List[float]:
+    return list(itertools.accumulate(1.0 / (rank ** exponent) for rank in range(1, n + 1)))
+
+
+def _insert(conn, table, rows: List[Dict[str, Any]]) -> None:
+    for start in range(0, len(rows), BATCH_SIZE):
+        conn.execute(table.insert(), rows[start:start + BATCH_SIZE])
+
+
+def _categories(conn, merchants: List[Merchant]) -> Dict[Tuple[str, str], Tuple[int, int]]:
+    """Parent/child categories; maps (category, subcategory) to (parent id, child id)."""
+    table = category.Category.__table__
+    tree: Dict[str, List[str]] = {"Income": ["Salary"], "Subscriptions": ["Streaming", "Software"]}
+    for m in merchants:
+        subs = tree.setdefault(m.category, [])
+        if m.subcategory not in subs:
+            subs.append(m.subcategory)
+    ids: Dict[Tuple[str, str], Tuple[int, int]] = {}
+    next_id = itertools.count(1)
+    for parent, children in tree.items():
+        parent_id = next(next_id)
+        conn.execute(table.insert(), {"id": parent_id, "name": parent, "color": "#6b7280"})
+        for child in children:
+            child_id = next(next_id)
+            conn.execute(table.insert(), {"id": child_id, "name": child, "parent_id": parent_id, "color": "#9ca3af"})
+            ids[(parent, child)] = (parent_id, child_id)
+    return ids
+
+
+def _accounts(conn, spec: DatasetSpec) -> List[Dict[str, Any]]:
+    kinds = [("Chequing", "asset", "checking"), ("Credit Card", "liability", "credit card"),
+             ("Savings", "asset", "savings")]
+    items = [{"id": i + 1, "plaid_item_id": f"syn-item-{i + 1}", "institution_name": f"Synthetic Bank {i + 1}",
+              "access_token_encrypted": "synthetic"} for i in range((spec.accounts + 2) // 3)]
+    _insert(conn, institution_item.InstitutionItem.__table__, items)
+    accounts = []
+    for i in range(spec.accounts):
+        name, acct_type, subtype = kinds[i % len(kinds)]
+        accounts.append({
+            "id": i + 1, "institution_item_id": i // 3 + 1, "plaid_account_id": f"syn-acct-{i + 1}",
+            "name": f"{name} {i + 1}", "mask": f"{1000 + i}", "account_type": acct_type,
+            "account_subtype": subtype, "currency": "CAD", "is_enabled_for_import": True,
+        })
+    _insert(conn, account.Account.__table__, accounts)
+    return accounts
+
+
+def _rules(spec: DatasetSpec, merchants: List[Merchant], categories) -> List[Dict[str, Any]]:
+    """EXACT rules for the most common normalized merchants, some CONTAINS and REGEX ones."""
+    rules, seen = [], set()
+    for m in merchants:
+        if len(rules) >= spec.rules:
+            break
+        if not m.merchant_norm or m.merchant_norm in seen:
+            continue
+        seen.add(m.merchant_norm)
+        parent_id, child_id = categories[(m.category, m.subcategory)]
+        n = len(rules)
+        if n % 20 == 19:
+            rule_type, pattern = RuleType.REGEX, rf"^{m.merchant_norm.split()[0]}\b"
+        elif n % 7 == 6:
+            rule_type, pattern = RuleType.CONTAINS, m.merchant_norm.split()[0]
+        else:
+            rule_type, pattern = RuleType.EXACT, m.merchant_norm
+        rules.append({
+            "rule_type": rule_type, "fields": RuleFields.MERCHANT, "pattern": pattern,
+            "merchant_norm": m.merchant_norm, "category_id": parent_id, "subcategory_id": child_id,
+            "priority": spec.rules - n,
+        })
+    return rules
+
+
+def _row(hash_id: str, account_id: int, day: date, cents: int, m: Merchant, category_ids, txn_type: str):
+    category_id, subcategory_id = category_ids if category_ids else (None, None)
+    return {
+        "account_id": account_id, "posted_date": day, "amount": cents / 100, "amount_cents": cents,
+        "currency": "CAD", "merchant_raw": m.raw, "description_raw": m.description,
+        "merchant_norm": m.merchant_norm, "description_norm": m.description_norm,
+        "cleaned_final_merchant": m.cleaned, "category_id": category_id, "subcategory_id": subcategory_id,
+        "source": "csv", "hash_dedupe": hash_id, "txn_type": txn_type, "is_deleted": False,
+    }
+
+
+def _fixed_rows(spec: DatasetSpec, rng: random.Random, accounts, categories, start: date) -> Iterator[Dict[str, Any]]:
+    """Payroll every other Friday into the first chequing account(s), monthly subscriptions on cards."""
+    chequing = [a["id"] for a in accounts if a["account_subtype"] == "checking"][:2]
+    cards = [a["id"] for a in accounts if a["account_subtype"] == "credit card"] or chequing
+    payroll = Merchant("PAYROLL DEPOSIT", "PAYROLL ACME CORP", "Income", "Salary", 0,
+                       "payroll deposit", "payroll acme corp", "PAYROLL DEPOSIT")
+    seq = itertools.count()
+    for k, account_id in enumerate(chequing):
+        day = start + timedelta(days=(4 - start.weekday()) % 7 + 7 * k)
+        salary = 2400_00 + 350_00 * k
+        while day <= spec.end_date:
+            if day.month == 1 and day.day <= 14:
+                salary = int(salary * 1.03)
+            yield _row(f"pay{next(seq)}", account_id, day, salary, payroll, categories[("Income", "Salary")], "income")
+            day += timedelta(days=14)
+
+    for name, price in SUBSCRIPTIONS[:max(3, len(SUBSCRIPTIONS) * spec.accounts // 10)]:
+        sub = Merchant(name, name, "Subscriptions", "Software" if "SOFT" in name or "365" in name else "Streaming", price)
+        sub.merchant_norm = MappingService(None).normalize_merchant(name, name) or ""
+        sub.description_norm, sub.cleaned = sub.merchant_norm, clean_final_merchant(name, name) or ""
+        account_id, cents, billing_day = rng.choice(cards), int(price * 100), rng.randint(1, 28)
+        month = date(start.year, start.month, 1)
+        while month <= spec.end_date:
+            day = month.replace(day=billing_day)
+            if start <= day <= spec.end_date:
+                if rng.random() < 0.02:
+                    cents = int(cents * 1.1)  # price increase
+                yield _row(f"sub{next(seq)}", account_id, day, -cents, sub,
+                           categories[("Subscriptions", sub.subcategory)], "expense")
+            month = (month + timedelta(days=32)).replace(day=1)
+
+
+def generate(engine: Engine, spec: DatasetSpec, progress: bool = False) -> Dict[str, int]:
+    """Create the schema on an empty database and fill it per ``spec``; returns row counts."""
+    rng = random.Random(spec.seed)
+    Base.metadata.create_all(bind=engine)
+    merchants = build_merchants(spec, rng)
+    start = spec.end_date.replace(year=spec.end_date.year - spec.years) + timedelta(days=1)
+    span_days = (spec.end_date - start).days + 1
+
+    with engine.begin() as conn:
+        categories = _categories(conn, merchants)
+        accounts = _accounts(conn, spec)
+        spending = [a["id"] for a in accounts if a["account_subtype"] != "savings"] or [accounts[0]["id"]]
+        rules = _rules(spec, merchants, categories)
+        _insert(conn, merchant_rule.MerchantRule.__table__, rules)
+
+        # Load without the per-row cube, net worth, subscription queue and
+        # write generation triggers; the tables they maintain are rebuilt once
+        # at the end (a new database has no readers to notify)
+        for cube in (*CUBE_KEYS, NETWORTH_TABLE):
+            for op in ("insert", "update", "delete"):
+                conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS trg_{cube}_{op}")
+        for trigger in (*DIRTY_TRIGGERS, *generation_trigger_names(["transactions"])):
+            conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+
+        table = transaction.Transaction.__table__
+        fixed = list(_fixed_rows(spec, rng, accounts, categories, start))
+        _insert(conn, table, fixed[:spec.transactions])
+        remaining = max(0, spec.transactions - len(fixed))
+
+        cum_weights = zipf_cum_weights(len(merchants))
+        total_weight = cum_weights[-1]
+        batch: List[Dict[str, Any]] = []
+        for i in range(remaining):
+            m = merchants[bisect.bisect(cum_weights, rng.random() * total_weight)]
+            day = start + timedelta(days=rng.randrange(span_days))
+            cents = -max(50, int(rng.lognormvariate(0, 0.6) * m.typical_amount * 100))
+            refund = rng.random() < 0.01
+            categorized = rng.random() >= spec.uncategorized_share
+            batch.append(_row(f"syn{i}", rng.choice(spending), day, -cents if refund else cents, m,
+                              categories[(m.category, m.subcategory)] if categorized else None,
+                              "income" if refund else "expense"))
+            if len(batch) == BATCH_SIZE:
+                _insert(conn, table, batch)
+                batch = []
+                if progress:
+                    print(f"  {i + 1:,} / {remaining:,} transactions", end="\r", flush=True)
+        _insert(conn, table, batch)
+        for ddl in cube_trigger_ddl() + networth_trigger_ddl() + generation_trigger_ddl(["transactions"]):
+            conn.exec_driver_sql(ddl)
+
+    with Session(bind=engine) as db:
+        backfill_canonical_merchants(db)
+        rebuild_monthly_aggregates(db)
+    with engine.begin() as conn:
+        for ddl in dirty_trigger_ddl():
+            conn.exec_driver_sql(ddl)
+    with Session(bind=engine) as db:
+        refresh_subscriptions(db, today=spec.end_date)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+    if engine.url.database and engine.url.database != ":memory:":
+        setup_fts5(engine.url.database)
+    with engine.connect() as conn:
+        return {
+            name: conn.execute(text(f"SELECT COUNT(*) FROM {name}")).scalar()
+            for name in ("transactions", "categories", "accounts", "merchant_rules")
+        }
+
+
+def plaid_transactions(spec: DatasetSpec, count: int, seed: int = 0, id_prefix: str = "syn") -> List[Dict[str, Any]]:
+    """Plaid-shaped transactions for the staging path, drawn from the same merchants."""
+    rng = random.Random(spec.seed * 1000 + seed)
+    merchants = build_merchants(spec, random.Random(spec.seed))
+    cum_weights = zipf_cum_weights(len(merchants))
+    out = []
+    for i in range(count):
+        m = merchants[bisect.bisect(cum_weights, rng.random() * cum_weights[-1])]
+        day = spec.end_date - timedelta(days=rng.randrange(60))
+        out.append({
+            "transaction_id": f"{id_prefix}-{seed}-{i}",
+            "pending_transaction_id": None,
+            "account_id": f"syn-acct-{rng.randint(1, spec.accounts)}",
+            "date": day.isoformat(),
+            "authorized_date": (day - timedelta(days=rng.randint(0, 2))).isoformat(),
+            "name": m.description,
+            "merchant_name": m.raw,
+            "amount": round(rng.lognormvariate(0, 0.6) * m.typical_amount, 2),  # Plaid: positive is outflow
+            "iso_currency_code": "CAD",
+            "pending": False,
+            "personal_finance_category": {"primary": PF_CATEGORIES.get(m.category, "GENERAL_MERCHANDISE"),
+                                          "detailed": m.subcategory.upper()},
+        })
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", required=True, help="SQLite file to create (must not exist)")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="large")
+    for field in ("transactions", "merchants", "rules", "accounts", "years", "seed"):
+        parser.add_argument(f"--{field}", type=int)
+    args = parser.parse_args()
+
+    out = Path(args.out)
+    if out.exists():
+        parser.error(f"{out} already exists")
+    overrides = {f: getattr(args, f) for f in ("transactions", "merchants", "rules", "accounts", "years", "seed")
+                 if getattr(args, f) is not None}
+    spec = replace(PRESETS[args.preset], **overrides)
+
+    engine = create_engine(f"sqlite:///{out.resolve().as_posix()}")
+    t0 = time.perf_counter()
+    counts = generate(engine, spec, progress=True)
+    elapsed = time.perf_counter() - t0
+    engine.dispose()
+    print(f"Generated {out} in {elapsed:.1f}s ({counts['transactions'] / elapsed:,.0f} transactions/s)")
+    for name, n in counts.items():
+        print(f"  {name:<16}{n:>12,}")
+
+
+if __name__ == "__main__":
+    main()
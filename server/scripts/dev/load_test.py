@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""HTTP load test with a realistic request mix and latency SLOs.
+
+Virtual users loop over a weighted mix of dashboard loads, transaction
+paging and search, Mapping Studio unmapped queries and rule creation, while
+a Plaid-import stand-in stages synthetic transactions straight into the
+database (what a Plaid fetch writes) and commits them over HTTP every few
+seconds. Reports p50/p95/p99 per endpoint and groups errors ("database is
+locked", HTTP 500, timeouts); exits 1 when an SLO is exceeded.
+
+By default the app runs in-process (one event loop, like a single uvicorn
+worker) on a dataset generated by ``generate_dataset.py``. To size a real
+deployment, point ``--base-url`` at the running server and ``--db`` at the
+SQLite file it serves.
+
+SLOs default to ``DEFAULT_SLOS``; ``--slo file.json`` overrides them per
+endpoint, e.g. ``{"dashboard": {"p95": 250}, "error_rate": 0.005}``.
+
+Usage:
+    python scripts/dev/load_test.py [--preset small] [--users 8] [--duration 60]
+    python scripts/dev/load_test.py --db big.db [--users 32]
+    python scripts/dev/load_test.py --base-url http://127.0.0.1:8000 --db bt_app/app.db
+"""
+import argparse
+import asyncio
+import importlib.util
+import itertools
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+SERVER_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(SERVER_DIR))
+
+# Latency SLOs in milliseconds per endpoint, and the overall error budget
+DEFAULT_SLOS: Dict[str, Any] = {
+    "dashboard": {"p95": 300, "p99": 800},
+    "transactions_page": {"p95": 200, "p99": 500},
+    "search": {"p95": 300, "p99": 800},
+    "unmapped_pairs": {"p95": 400, "p99": 1000},
+    "unmapped_merchants": {"p95": 400, "p99": 1000},
+    "create_rule": {"p95": 2000, "p99": 5000},
+    "plaid_import_commit": {"p95": 5000, "p99": 10000},
+    "error_rate": 0.01,
+}
+
+# (endpoint, weight) of each virtual user step
+MIX = [
+    ("dashboard", 30),
+    ("transactions_page", 24),
+    ("search", 14),
+    ("unmapped_pairs", 8),
+    ("unmapped_merchants", 6),
+    ("create_rule", 2),
+]
+
+SEARCH_TERMS = ["starbucks", "loblaws", "uber", "netflix", "amazon", "shell", "tim hortons", "rogers", "cafe"]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class Recorder:
+    """Latencies and errors per endpoint."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, endpoint: str, ms: float, error: Optional[str] = None) -> None:
+        self.latencies[endpoint].append(ms)
+        if error:
+            self.errors[endpoint][error] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, float]]:
+        out = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            errors = sum(self.errors[endpoint].values())
+            out[endpoint] = {
+                "count": len(samples), "errors": errors, "rps": len(samples) / elapsed,
+                "p50": percentile(samples, 50), "p95": percentile(samples, 95),
+                "p99": percentile(samples, 99), "max": max(samples),
+            }
+        return out
+
+
+def _error_of(response) -> Optional[str]:
+    if response.status_code < 400:
+        return None
+    if "database is locked" in response.text:
+        return "database is locked"
+    return f"HTTP {response.status_code}"
+
+
+async def timed_request(client, recorder: Recorder, endpoint: str, method: str, url: str, **kwargs):
+    t0 = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except Exception as e:
+        recorder.record(endpoint, (time.perf_counter() - t0) * 1000, type(e).__name__)
+        return None
+    recorder.record(endpoint, (time.perf_counter() - t0) * 1000, _error_of(response))
+    return response
+
+
+class Workload:
+    """Request parameters drawn from what is actually in the database."""
+
+    def __init__(self, db_path: Path, seed: int):
+        import sqlite3
+
+        self.rng = random.Random(seed)
+        conn = sqlite3.connect(db_path)
+        try:
+            self.months = [r[0] for r in conn.execute(
+                "SELECT DISTINCT strftime('%Y-%m', posted_date) FROM transactions ORDER BY 1 DESC LIMIT 12")]
+            self.categories = [r[0] for r in conn.execute("SELECT id FROM categories")]
+            self.unmapped = [r[0] for r in conn.execute(
+                "SELECT merchant_norm FROM transactions WHERE category_id IS NULL AND merchant_norm IS NOT NULL "
+                "GROUP BY merchant_norm ORDER BY COUNT(*) DESC LIMIT 500")]
+            self.item_id = conn.execute("SELECT MIN(id) FROM institution_items").fetchone()[0]
+        finally:
+            conn.close()
+        self.rules_created = itertools.count(1)
+
+    def request(self, endpoint: str) -> Tuple[str, str, Dict[str, Any]]:
+        rng = self.rng
+        if endpoint == "dashboard":
+            return "GET", "/api/dashboard/bundle", {"params": {"month": rng.choice(self.months)}}
+        if endpoint == "transactions_page":
+            params = {"page": rng.randint(1, 20), "per_page": 50}
+            if rng.random() < 0.3:
+                params["txn_type"] = "expense"
+            return "GET", "/api/transactions", {"params": params}
+        if endpoint == "search":
+            return "GET", "/api/transactions/search", {"params": {"q": rng.choice(SEARCH_TERMS), "limit": 50}}
+        if endpoint == "unmapped_pairs":
+            return "GET", "/api/transactions/unmapped/pairs", {"params": {"limit": 100}}
+        if endpoint == "unmapped_merchants":
+            return "GET", "/api/transactions/unmapped", {"params": {"limit": 100}}
+        if endpoint == "create_rule":
+            n = next(self.rules_created)
+            pattern = self.unmapped.pop(0) if self.unmapped else f"loadtest merchant {n}"
+            return "POST", "/api/rules", {"json": {
+                "rule_type": "EXACT", "pattern": pattern, "merchant_norm": pattern,
+                "category_id": rng.choice(self.categories), "priority": 0,
+            }}
+        raise ValueError(endpoint)
+
+
+async def virtual_user(client, workload: Workload, recorder: Recorder, deadline: float, think_ms: float):
+    endpoints, weights = zip(*MIX)
+    while time.perf_counter() < deadline:
+        endpoint = workload.rng.choices(endpoints, weights)[0]
+        method, url, kwargs = workload.request(endpoint)
+        await timed_request(client, recorder, endpoint, method, url, **kwargs)
+        if think_ms:
+            await asyncio.sleep(workload.rng.expovariate(1000 / think_ms))
+
+
+def stage_import(db_path: Path, item_id: int, rows: int, seed: int) -> int:
+    """Stage ``rows`` Plaid-shaped transactions as a new import; returns its id."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from bt_app.models.plaid_import import PlaidImport
+    from bt_app.services.plaid_import_service import PlaidImportService
+
+    generator = _load_generator()
+    payload = generator.plaid_transactions(generator.PRESETS["small"], rows, seed=seed, id_prefix="load")
+    engine = create_engine(f"sqlite:///{db_path.as_posix()}", connect_args={"timeout": 30})
+    try:
+        with Session(engine) as db:
+            plaid_import = PlaidImport(item_id=item_id, mode="get", created_by="load-test")
+            db.add(plaid_import)
+            db.flush()
+            PlaidImportService(db)._stage_transactions(plaid_import.id, payload)
+            db.commit()
+            return plaid_import.id
+    finally:
+        engine.dispose()
+
+
+async def plaid_import_standin(client, workload: Workload, recorder: Recorder, db_path: Path,
+                               deadline: float, interval: float, rows: int):
+    for seed in itertools.count(int(time.time())):
+        if time.perf_counter() >= deadline:
+            return
+        t0 = time.perf_counter()
+        try:
+            import_id = await asyncio.to_thread(stage_import, db_path, workload.item_id, rows, seed)
+            recorder.record("plaid_import_stage", (time.perf_counter() - t0) * 1000)
+        except Exception as e:
+            error = "database is locked" if "database is locked" in str(e) else type(e).__name__
+            recorder.record("plaid_import_stage", (time.perf_counter() - t0) * 1000, error)
+        else:
+            await timed_request(client, recorder, "plaid_import_commit", "POST",
+                                f"/api/plaid/imports/{import_id}/commit",
+                                json={"statuses": ["ready", "needs_category"]})
+        await asyncio.sleep(interval)
+
+
+def evaluate_slos(summary: Dict[str, Dict[str, float]], slos: Dict[str, Any]) -> List[str]:
+    """Human-readable SLO breaches (empty when all are met)."""
+    breaches = []
+    for endpoint, stats in summary.items():
+        for metric, limit in slos.get(endpoint, {}).items():
+            if stats[metric] > limit:
+                breaches.append(f"{endpoint} {metric} {stats[metric]:.0f} ms > {limit} ms")
+    total = sum(s["count"] for s in summary.values())
+    errors = sum(s["errors"] for s in summary.values())
+    if total and errors / total > slos.get("error_rate", 0):
+        breaches.append(f"error rate {errors / total:.2%} > {slos['error_rate']:.2%}")
+    return breaches
+
+
+def report(summary: Dict[str, Dict[str, float]], recorder: Recorder, breaches: List[str]) -> None:
+    print(f"\n{'endpoint':<22}{'count':>7}{'err':>6}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for endpoint, s in summary.items():
+        print(f"{endpoint:<22}{s['count']:>7}{s['errors']:>6}{s['rps']:>8.1f}"
+              f"{s['p50']:>9.1f}{s['p95']:>9.1f}{s['p99']:>9.1f}{s['max']:>9.1f}")
+    all_errors = Counter()
+    for counts in recorder.errors.values():
+        all_errors.update(counts)
+    if all_errors:
+        print("\nerrors:")
+        for error, n in all_errors.most_common():
+            print(f"  {n:>6}  {error}")
+    print()
+    if breaches:
+        print("SLO breached:")
+        for breach in breaches:
+            print(f"  - {breach}")
+    else:
+        print("All SLOs met")
+
+
+async def run(args, db_path: Path, slos: Dict[str, Any]) -> int:
+    import httpx
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # one INFO line per request otherwise
+    if args.base_url:
+        transport, base_url = None, args.base_url
+    else:
+        from bt_app.main import app
+        transport, base_url = httpx.ASGITransport(app=app), "http://load-test"
+
+    workload = Workload(db_path, args.seed)
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.users + 2)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        tasks = [virtual_user(client, workload, recorder, deadline, args.think_ms) for _ in range(args.users)]
+        if args.import_rows:
+            tasks.append(plaid_import_standin(client, workload, recorder, db_path, deadline,
+                                              args.import_interval, args.import_rows))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    summary = recorder.summary(elapsed)
+    breaches = evaluate_slos(summary, slos)
+    report(summary, recorder, breaches)
+    if args.json:
+        Path(args.json).write_text(json.dumps({"summary": summary, "breaches": breaches}, indent=2))
+    return 1 if breaches else 0
+
+
+def _load_generator():
+    spec = importlib.util.spec_from_file_location("generate_dataset", Path(__file__).with_name("generate_dataset.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", help="Load a running server instead of the in-process app")
+    parser.add_argument("--db", help="SQLite database to use (the server's file with --base-url)")
+    parser.add_argument("--preset", default="small", help="Dataset to generate when --db is not given")
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=60, help="Seconds")
+    parser.add_argument("--think-ms", type=float, default=50, help="Mean pause between a user's requests")
+    parser.add_argument("--import-interval", type=float, default=5, help="Seconds between stand-in imports")
+    parser.add_argument("--import-rows", type=int, default=50, help="Rows per stand-in import (0 disables it)")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--slo", help="JSON file with SLO overrides")
+    parser.add_argument("--json", help="Also write the summary to this file")
+    args = parser.parse_args()
+    if args.base_url and not args.db:
+        parser.error("--base-url needs --db (the server's database) to build the workload")
+
+    if args.db:
+        db_path = Path(args.db).resolve()
+    else:
+        db_path = Path(tempfile.mkdtemp()) / "load.db"
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{db_path.as_posix()}")
+    os.environ.setdefault("PLAID_CLIENT_ID", "load")
+    os.environ.setdefault("PLAID_SECRET", "load")
+    os.environ.setdefault("SECRET_KEY", "load")
+
+    if not args.db:
+        from sqlalchemy import create_engine
+
+        generator = _load_generator()
+        t0 = time.perf_counter()
+        engine = create_engine(f"sqlite:///{db_path.as_posix()}")
+        counts = generator.generate(engine, generator.PRESETS[args.preset])
+        engine.dispose()
+        print(f"Generated {counts['transactions']:,} transactions in {time.perf_counter() - t0:.1f}s")
+
+    slos = dict(DEFAULT_SLOS)
+    if args.slo:
+        for key, value in json.loads(Path(args.slo).read_text()).items():
+            slos[key] = {**slos.get(key, {}), **value} if isinstance(value, dict) else value
+
+    print(f"{args.users} users for {args.duration:.0f}s against {args.base_url or 'the in-process app'}")
+    sys.exit(asyncio.run(run(args, db_path, slos)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Recompute transactions.canonical_merchant from the merchant alias table.
+
+The key is set whenever a transaction is written; run this after adding or
+editing aliases, or after bulk loads that bypass the ORM.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the server directory to the Python path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv(project_root / ".env", override=True)
+
+from bt_app.core.db import SessionLocal
+from bt_app.services.canonical_merchants import backfill_canonical_merchants
+
+
+def main():
+    """Backfill every transaction's canonical merchant key."""
+    print("Backfilling canonical merchants...")
+
+    session = SessionLocal()
+
+    try:
+        updated = backfill_canonical_merchants(session)
+        print(f"✅ {updated} transactions updated")
+
+    except Exception as e:
+        print(f"❌ Error backfilling canonical merchants: {e}")
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
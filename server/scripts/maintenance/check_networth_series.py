@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Verify the stored net worth series against a full recompute from transactions.
+
+The series is kept current by triggers; this reports any month whose totals
+or running sums differ and exits non-zero, without changing anything. Run
+rebuild_monthly_aggregates.py to repair a drifted series.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the server directory to the Python path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv(project_root / ".env", override=True)
+
+from bt_app.core.db import SessionLocal
+from bt_app.services.monthly_aggregates import check_networth_series
+
+
+def main():
+    """Check the monthly_networth series; exit 1 on any mismatch."""
+    print("Checking net worth series...")
+
+    session = SessionLocal()
+
+    try:
+        mismatches = check_networth_series(session)
+    finally:
+        session.close()
+
+    if not mismatches:
+        print("✅ monthly_networth matches transactions")
+        return
+    for m in mismatches:
+        print(f"❌ {m['month']} {m['column']}: stored={m['stored']} expected={m['expected']}")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
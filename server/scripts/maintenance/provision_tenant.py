@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Create the database shard of one or more new tenants.
+
+With tenant shards enabled, requests for a tenant without a shard file are
+answered with 404; this script is how a tenant's shard is created.
+
+Usage:
+    python scripts/maintenance/provision_tenant.py <tenant_id> [<tenant_id> ...]
+"""
+
+import sys
+from pathlib import Path
+
+# Add the server directory to the Python path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv(project_root / ".env", override=True)
+
+from bt_app.core.tenancy import get_registry, provision_tenant
+
+
+def main():
+    """Provision every tenant named on the command line."""
+    tenant_ids = sys.argv[1:]
+    if not tenant_ids:
+        print(__doc__)
+        sys.exit(2)
+
+    registry = get_registry()
+    try:
+        for tenant_id in tenant_ids:
+            provision_tenant(tenant_id)
+            print(f"✅ {tenant_id}: {registry.path_for(tenant_id)}")
+
+    except Exception as e:
+        print(f"❌ Error provisioning tenant: {e}")
+        raise
+    finally:
+        registry.dispose()
+
+
+if __name__ == "__main__":
+    main()
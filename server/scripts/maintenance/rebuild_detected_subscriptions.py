@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Re-detect every recurring subscription from transactions.
+
+The stored subscriptions are refreshed incrementally after imports and by
+the scheduler; run this after changing the detection rules or restoring a
+database from a backup without the queue triggers.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the server directory to the Python path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv(project_root / ".env", override=True)
+
+from bt_app.core.db import SessionLocal
+from bt_app.services.detected_subscriptions import refresh_subscriptions
+
+
+def main():
+    """Rebuild the detected_subscriptions table."""
+    print("Rebuilding detected subscriptions...")
+
+    session = SessionLocal()
+
+    try:
+        summary = refresh_subscriptions(session)
+        print(f"✅ {summary['detected']} subscriptions detected across {summary['evaluated']} merchants")
+
+    except Exception as e:
+        print(f"❌ Error rebuilding detected subscriptions: {e}")
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Recompute the monthly aggregate tables from transactions.
+
+The tables are kept current by triggers; run this after restoring a backup,
+bulk-loading with triggers disabled, or if the totals are ever suspected to
+have drifted.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the server directory to the Python path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv(project_root / ".env", override=True)
+
+from bt_app.core.db import SessionLocal
+from bt_app.services.monthly_aggregates import rebuild_monthly_aggregates
+
+
+def main():
+    """Rebuild every monthly aggregate table."""
+    print("Rebuilding monthly aggregates...")
+
+    session = SessionLocal()
+
+    try:
+        counts = rebuild_monthly_aggregates(session)
+        for table, rows in counts.items():
+            print(f"✅ {table}: {rows} rows")
+
+    except Exception as e:
+        print(f"❌ Error rebuilding monthly aggregates: {e}")
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
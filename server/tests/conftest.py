@@ -0,0 +1,124 @@
+"""Shared pytest fixtures."""
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+# bt_app reads its settings at import time, so the environment has to be in
+# place before any test module imports it. Tests use their own engines.
+_bootstrap_db = Path(tempfile.mkdtemp()) / "bootstrap.db"
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_bootstrap_db.as_posix()}")
+os.environ.setdefault("PLAID_CLIENT_ID", "test")
+os.environ.setdefault("PLAID_SECRET", "test")
+os.environ.setdefault("SECRET_KEY", "test")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from bt_app.core.db import Base  # noqa: E402
+from bt_app.models import (  # noqa: E402,F401
+    account,
+    account_balance,
+    audit_log,
+    budget,
+    category,
+    detected_subscription,
+    external_integration,
+    institution_item,
+    merchant_alias,
+    merchant_rule,
+    monthly_aggregate,
+    plaid_import,
+    scheduler_lease,
+    staging_transaction,
+    transaction,
+    write_generation,
+)
+
+
+@pytest.fixture
+def db():
+    """Fresh in-memory database session with the full schema.
+
+    One shared connection, so the app's threadpool sees the same database.
+    """
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def seeded_db(db):
+    """Session populated with two years of deterministic transactions."""
+    from bt_app.models.account import Account
+    from bt_app.models.category import Category
+    from bt_app.models.institution_item import InstitutionItem
+    from bt_app.models.transaction import Transaction
+
+    item = InstitutionItem(plaid_item_id="item-1", institution_name="Test Bank", access_token_encrypted="x")
+    db.add(item)
+    db.flush()
+    acct = Account(institution_item_id=item.id, name="Chequing", account_type="asset")
+    db.add(acct)
+    food = Category(name="Food", color="#ff0000")
+    bills = Category(name="Bills", color="#00ff00")
+    db.add_all([food, bills])
+    db.flush()
+
+    merchants = ["LOBLAWS", "NETFLIX", "TIM HORTONS", "ROGERS", None]
+    start = date(2023, 1, 1)
+    for i in range(730):
+        day = start + timedelta(days=i)
+        merchant = merchants[i % len(merchants)]
+        db.add(Transaction(
+            account_id=acct.id,
+            posted_date=day,
+            amount=Decimal(f"-{(i % 97) + 1}.{i % 100:02d}"),
+            merchant_raw=merchant,
+            merchant_norm=merchant.lower() if merchant else None,
+            description_raw=f"{merchant or 'MISC'} PURCHASE",
+            category_id=(food.id, bills.id, None)[i % 3],
+            hash_dedupe=f"e{i}",
+            txn_type="expense",
+        ))
+        if day.day == 15:
+            db.add(Transaction(
+                account_id=acct.id,
+                posted_date=day,
+                amount=Decimal("2500.00"),
+                merchant_raw="PAYROLL",
+                description_raw="SALARY",
+                hash_dedupe=f"i{i}",
+                txn_type="income",
+            ))
+    db.commit()
+    return db
+
+
+@pytest.fixture
+def client(seeded_db):
+    """TestClient for the app with every request using the seeded session."""
+    from fastapi.testclient import TestClient
+
+    from bt_app.api.deps import get_database
+    from bt_app.main import app
+
+    def _override():
+        yield seeded_db
+
+    app.dependency_overrides[get_database] = _override
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_database, None)
@@ -0,0 +1,64 @@
+"""Tests for integer cents amounts."""
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from bt_app.models.account_balance import AccountBalance
+from bt_app.models.budget import Budget
+from bt_app.models.transaction import Transaction
+from bt_app.services.dashboard_service import DashboardService
+from bt_app.utils.money import from_cents, to_cents
+
+
+def test_to_cents_rounding():
+    """Amounts convert to cents without binary float drift."""
+    assert to_cents(Decimal("12.34")) == 1234
+    assert to_cents(-0.1) == -10
+    assert to_cents(19.99) == 1999
+    assert to_cents("1.005") == 101
+    assert to_cents(-1.005) == -101
+    assert to_cents(None) is None
+    assert from_cents(None) == 0.0
+    assert from_cents(-1999) == -19.99
+
+
+def test_cents_columns_follow_amount_writes():
+    """Setting an amount through the ORM keeps the cents column in sync."""
+    txn = Transaction(amount=Decimal("-42.50"))
+    assert txn.amount_cents == -4250
+    txn.amount = 10.1
+    assert txn.amount_cents == 1010
+
+    budget = Budget(amount=Decimal("300"))
+    assert budget.amount_cents == 30000
+
+    balance = AccountBalance(current=Decimal("1234.56"), available=None)
+    assert balance.current_cents == 123456
+    assert balance.available_cents is None
+
+
+def test_cents_persisted_for_every_row(seeded_db):
+    """Seeded rows are stored with matching amount_cents."""
+    mismatches = seeded_db.execute(text("""
+        SELECT COUNT(*) FROM transactions
+        WHERE amount_cents IS NULL OR amount_cents != CAST(ROUND(amount * 100) AS INTEGER)
+    """)).scalar()
+    assert mismatches == 0
+
+
+def test_month_totals_are_exact(seeded_db):
+    """Summing cents gives exact totals where float sums drift."""
+    account_id = seeded_db.query(Transaction.account_id).first()[0]
+    for i in range(10):
+        seeded_db.add(Transaction(
+            account_id=account_id,
+            posted_date=date(2025, 1, 1),
+            amount=Decimal("-0.10"),
+            hash_dedupe=f"dime{i}",
+            txn_type="expense",
+        ))
+    seeded_db.commit()
+
+    cards = DashboardService(seeded_db).get_cards("2025-01")
+    assert cards["expenses"] == 1.0
@@ -0,0 +1,122 @@
+"""Tests for the DuckDB analytics mirror and query router."""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+
+pytest.importorskip("duckdb")
+
+from bt_app.api import routes_analytics, routes_analytics_freq  # noqa: E402
+from bt_app.core.config import settings  # noqa: E402
+from bt_app.models.transaction import Transaction  # noqa: E402
+from bt_app.services.analytics_engine import DuckDBMirror, run_analytics_query, set_mirror  # noqa: E402
+from bt_app.services.analytics_engine.mirror import to_duckdb_sql  # noqa: E402
+from bt_app.services.analytics_service import AnalyticsService  # noqa: E402
+
+
+@pytest.fixture
+def mirror(seeded_db, monkeypatch):
+    """Fully loaded mirror installed as the process-wide one (result cache off)."""
+    monkeypatch.setattr(settings, "enable_duckdb_mirror", True)
+    monkeypatch.setattr(settings, "enable_result_cache", False)
+    m = DuckDBMirror()
+    m.refresh(seeded_db)
+    set_mirror(m)
+    yield m
+    set_mirror(None)
+    m.close()
+
+
+def _run_all(db):
+    return {
+        "summary": routes_analytics.get_analytics_summary_range("2023-03-01", "2024-10-31", db),
+        "series": routes_analytics.get_all_categories_series("2023-01-01", "2024-12-31", db),
+        "recurring": routes_analytics.get_recurring_subscriptions("2023-01-01", "2024-12-31", db).body,
+        "freq": routes_analytics_freq.transaction_frequency_by_category("2023-01-01", "2024-12-31", 10, db),
+        "monthly": AnalyticsService(db).monthly_income_expense(date(2023, 1, 1), date(2024, 12, 31)),
+        "networth": AnalyticsService(db).get_cumulative_networth(),
+    }
+
+
+def test_to_duckdb_sql():
+    """Parameters, LIKE and FLOAT casts are translated to DuckDB semantics."""
+    sql = to_duckdb_sql("SELECT CAST(x AS FLOAT) FROM t WHERE a LIKE '%X%' AND d >= :date_from AND s = '10:30'")
+    assert "$date_from" in sql
+    assert "ILIKE" in sql
+    assert "AS DOUBLE" in sql
+    assert "'10:30'" in sql
+
+
+def test_mirror_matches_sqlite(seeded_db, mirror, monkeypatch):
+    """Routed endpoints return the same payloads from DuckDB as from SQLite."""
+    served = []
+    original = mirror.execute
+    monkeypatch.setattr(mirror, "execute", lambda *a, **k: served.append(1) or original(*a, **k))
+    from_mirror = _run_all(seeded_db)
+    assert served
+
+    set_mirror(None)
+    monkeypatch.setattr(settings, "enable_duckdb_mirror", False)
+    from_sqlite = _run_all(seeded_db)
+
+    assert from_mirror == from_sqlite
+
+
+def test_incremental_refresh_picks_up_changes(seeded_db, mirror):
+    """Inserts and updates are synced past the watermark without a rebuild."""
+    account_id = seeded_db.query(Transaction.account_id).first()[0]
+    seeded_db.add(Transaction(
+        account_id=account_id, posted_date=date(2025, 1, 3), amount=Decimal("-12.34"),
+        hash_dedupe="new", txn_type="expense",
+    ))
+    seeded_db.commit()
+    assert not mirror.is_fresh(seeded_db)
+
+    result = mirror.refresh(seeded_db)
+    assert result == {"mode": "incremental", "rows": 1}
+    assert mirror.is_fresh(seeded_db)
+
+    rows = mirror.execute("SELECT SUM(amount_cents) AS cents FROM transactions WHERE posted_month = :m", {"m": "2025-01"})
+    assert rows[0].cents == -1234
+
+    seeded_db.execute(text("DELETE FROM transactions WHERE hash_dedupe = 'new'"))
+    seeded_db.commit()
+    assert mirror.refresh(seeded_db)["mode"] == "full"
+    assert mirror.execute("SELECT COUNT(*) AS n FROM transactions WHERE posted_month = '2025-01'")[0].n == 0
+
+
+def test_stale_mirror_falls_back_to_sqlite(seeded_db, mirror, monkeypatch):
+    """A mirror behind SQLite is bypassed and a background refresh is requested."""
+    account_id = seeded_db.query(Transaction.account_id).first()[0]
+    seeded_db.add(Transaction(
+        account_id=account_id, posted_date=date(2025, 2, 1), amount=Decimal("-5.00"),
+        hash_dedupe="stale", txn_type="expense",
+    ))
+    seeded_db.commit()
+
+    refreshes = []
+    monkeypatch.setattr(mirror, "refresh_in_background", lambda factory: refreshes.append(factory))
+    monkeypatch.setattr(mirror, "execute", lambda *a, **k: pytest.fail("stale mirror must not serve"))
+
+    rows = run_analytics_query(seeded_db, "SELECT SUM(amount_cents) AS cents FROM transactions WHERE posted_month = :m", {"m": "2025-02"})
+    assert rows[0].cents == -500
+    assert len(refreshes) == 1
+
+
+def test_same_second_update_is_seen(seeded_db, mirror):
+    """Freshness follows the write counters, not updated_at's one-second resolution."""
+    seeded_db.execute(text("UPDATE transactions SET updated_at = '2030-01-01 00:00:00'"))
+    seeded_db.commit()
+    mirror.refresh(seeded_db)
+    assert mirror.is_fresh(seeded_db)
+
+    txn_id = seeded_db.execute(text("SELECT MIN(id) FROM transactions")).scalar()
+    seeded_db.execute(text(
+        "UPDATE transactions SET amount_cents = 1, updated_at = '2030-01-01 00:00:00' WHERE id = :id"
+    ), {"id": txn_id})
+    seeded_db.commit()
+    assert not mirror.is_fresh(seeded_db)
+
+    mirror.refresh(seeded_db)
+    assert mirror.execute("SELECT amount_cents FROM transactions WHERE id = :id", {"id": txn_id})[0].amount_cents == 1
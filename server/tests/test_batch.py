@@ -0,0 +1,107 @@
+"""Tests for the in-process batch endpoint."""
+import pytest
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from bt_app.api import deps
+from bt_app.main import app
+
+URLS = {
+    "cards": "/api/dashboard/cards?month=2023-07",
+    "lines": "/api/dashboard/lines",
+    "freq": "/api/analytics/transaction-frequency-by-merchant?date_from=2023-01-01&date_to=2024-12-31",
+    "txns": "/api/transactions?per_page=5",
+}
+
+
+def test_batch_matches_individual_requests(client):
+    """Each sub-response carries exactly what the direct GET returns."""
+    response = client.post("/api/batch", json={
+        "requests": [{"id": key, "path": path} for key, path in URLS.items()],
+    })
+    assert response.status_code == 200
+    results = response.json()["responses"]
+    assert list(results) == list(URLS)
+    for key, path in URLS.items():
+        direct = client.get(path)
+        assert results[key]["status"] == 200
+        assert results[key]["body"] == direct.json()
+        assert results[key]["etag"] == direct.headers["etag"]
+
+
+def test_sub_request_failures_are_isolated(client):
+    """Bad paths and failing routes only affect their own slot."""
+    results = client.post("/api/batch", json={"requests": [
+        {"id": "outside", "path": "/docs"},
+        {"id": "nested", "path": "/api/batch"},
+        {"id": "missing", "path": "/api/transactions/similar-count/999999"},
+        {"id": "invalid", "path": "/api/analytics/category-series"},
+        {"id": "ok", "path": "/api/dashboard/meta"},
+    ]}).json()["responses"]
+    assert results["outside"]["status"] == 400
+    assert results["nested"]["status"] == 400
+    assert results["missing"]["status"] in (404, 500)
+    assert results["invalid"]["status"] == 422
+    assert results["ok"]["body"]["first_data_month"] == "2023-01"
+
+
+@pytest.fixture
+def failing_route():
+    """A route that leaves an uncaught exception (and an open write) behind."""
+    def boom(db=Depends(deps.get_database)):
+        db.execute(text("UPDATE categories SET name = 'Broken'"))
+        raise RuntimeError("boom")
+
+    app.add_api_route("/api/__test_boom", boom, methods=["GET"])
+    try:
+        yield "/api/__test_boom"
+    finally:
+        app.router.routes[:] = [r for r in app.router.routes if getattr(r, "path", None) != "/api/__test_boom"]
+
+
+def test_uncaught_route_errors_are_isolated(client, seeded_db, failing_route):
+    """An exception the route does not handle becomes a 500 in its slot only."""
+    response = client.post("/api/batch", json={"requests": [
+        {"id": "boom", "path": failing_route},
+        {"id": "ok", "path": "/api/dashboard/meta"},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["responses"]
+    assert results["boom"] == {"status": 500, "body": {"detail": "boom"}}
+    assert results["ok"]["status"] == 200
+    # The failed sub-request's write was rolled back
+    assert seeded_db.execute(text("SELECT COUNT(*) FROM categories WHERE name = 'Broken'")).scalar() == 0
+
+
+def test_conditional_sub_requests(client):
+    """Sub-requests honour If-None-Match through the ETag middleware."""
+    tag = client.get(URLS["cards"]).headers["etag"]
+    result = client.post("/api/batch", json={"requests": [
+        {"id": "cards", "path": URLS["cards"], "headers": {"If-None-Match": tag}},
+    ]}).json()["responses"]["cards"]
+    assert result == {"status": 304, "etag": tag, "body": None}
+
+
+def test_batch_validation(client):
+    """Duplicate ids and oversized batches are rejected up front."""
+    dup = [{"id": "a", "path": "/api/dashboard/meta"}] * 2
+    assert client.post("/api/batch", json={"requests": dup}).status_code == 422
+    many = [{"id": str(i), "path": "/api/dashboard/meta"} for i in range(26)]
+    assert client.post("/api/batch", json={"requests": many}).status_code == 422
+
+
+def test_one_session_per_batch(seeded_db, monkeypatch):
+    """All sub-requests reuse the batch's session instead of opening their own."""
+    opened = []
+
+    def _get_db():
+        opened.append(1)
+        yield seeded_db
+
+    monkeypatch.setattr(deps, "get_db", _get_db)
+    response = TestClient(app).post("/api/batch", json={
+        "requests": [{"id": key, "path": path} for key, path in URLS.items()],
+    })
+    assert all(r["status"] == 200 for r in response.json()["responses"].values())
+    assert len(opened) == 1
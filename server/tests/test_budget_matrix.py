@@ -0,0 +1,80 @@
+"""Tests for the multi-month budget vs actual matrix."""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+
+from bt_app.models.budget import Budget
+from bt_app.models.category import Category
+from bt_app.services.budget_matrix import budget_matrix
+
+
+def _actual_cents(db, category_id, month):
+    return db.execute(text("""
+        SELECT COALESCE(SUM(ABS(amount_cents)), 0) FROM transactions
+        WHERE category_id = :category_id AND posted_month = :month AND txn_type = 'expense'
+    """), {"category_id": category_id, "month": month}).scalar()
+
+
+@pytest.fixture
+def budgeted(seeded_db):
+    food = seeded_db.query(Category).filter_by(name="Food").one()
+    bills = seeded_db.query(Category).filter_by(name="Bills").one()
+    household = Category(name="Household", color="#000000")
+    seeded_db.add(household)
+    seeded_db.flush()
+    food.parent_id = household.id
+    bills.parent_id = household.id
+    for month in ("2024-01", "2024-02", "2024-03"):
+        seeded_db.add(Budget(category_id=food.id, month=month, amount=Decimal("500.00")))
+    seeded_db.add(Budget(category_id=household.id, month="2024-02", amount=Decimal("100.00")))
+    seeded_db.commit()
+    return seeded_db, food, bills, household
+
+
+def test_matrix_matches_budgets_and_spending(budgeted):
+    db, food, bills, household = budgeted
+    matrix = budget_matrix(db, date(2024, 1, 1), date(2024, 4, 1))
+    assert matrix["months"] == ["2024-01", "2024-02", "2024-03", "2024-04"]
+
+    rows = {row["category"]["id"]: row for row in matrix["categories"]}
+    assert set(rows) == {food.id, bills.id, household.id}
+    food_row = rows[food.id]
+    assert food_row["budget"] == [500.0, 500.0, 500.0, 0.0]
+    actual = [_actual_cents(db, food.id, month) for month in matrix["months"]]
+    assert food_row["actual"] == [cents / 100 for cents in actual]
+    assert food_row["variance"] == [(cents - budget) / 100 for cents, budget in zip(actual, (50000,) * 3 + (0,))]
+    assert food_row["is_over_budget"] == [cents > budget for cents, budget in zip(actual, (50000,) * 3 + (0,))]
+    assert food_row["variance_percent"][0] == pytest.approx((actual[0] - 50000) / 500)
+    assert food_row["variance_percent"][3] == 0
+    assert food_row["total_budget"] == 1500.0 and food_row["total_actual"] == sum(actual) / 100
+
+    # Household rolls up its own budget and both children
+    rollups = {row["category"]["id"]: row for row in matrix["rollups"]}
+    assert set(rollups) == {household.id}
+    assert rollups[household.id]["budget"] == [500.0, 600.0, 500.0, 0.0]
+    assert rollups[household.id]["actual"] == pytest.approx(
+        [f + b for f, b in zip(food_row["actual"], rows[bills.id]["actual"])]
+    )
+
+    totals = matrix["totals"]
+    assert totals["budget"] == [500.0, 600.0, 500.0, 0.0]
+    assert totals["total_actual"] == pytest.approx(sum(row["total_actual"] for row in rows.values()))
+
+
+def test_matrix_route(budgeted, client):
+    response = client.get("/api/budgets/matrix", params={"from": "2024-02", "to": "2024-03"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["months"] == ["2024-02", "2024-03"]
+    assert body["totals"]["total_budget"] == 1100.0
+
+    # Budget edits invalidate the cached matrix
+    budget_id = budgeted[0].query(Budget.id).filter_by(month="2024-03").scalar()
+    assert client.put(f"/api/budgets/{budget_id}", json={"amount": 650}).status_code == 200
+    body = client.get("/api/budgets/matrix", params={"from": "2024-02", "to": "2024-03"}).json()
+    assert body["totals"]["total_budget"] == 1250.0
+
+    assert client.get("/api/budgets/matrix", params={"from": "2024-03", "to": "2024-02"}).status_code == 400
+    assert client.get("/api/budgets/matrix", params={"from": "2024-13", "to": "2024-02"}).status_code == 400
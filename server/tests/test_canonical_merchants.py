@@ -0,0 +1,124 @@
+"""Tests for table-driven canonical merchant keys."""
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import create_engine, event, text
+
+from bt_app.api import routes_analytics
+from bt_app.core.db import Base
+from bt_app.models.merchant_alias import SUBSCRIPTION_ALWAYS, CanonicalMerchant, MerchantAlias
+from bt_app.models.transaction import Transaction
+from bt_app.services.canonical_merchants import (
+    CanonicalMatcher, backfill_canonical_merchants, canonical_matcher,
+)
+from bt_app.services.detected_subscriptions import refresh_dirty_subscriptions
+
+
+def _add(db, merchant, description, day=date(2024, 6, 1), **kwargs):
+    account_id = db.query(Transaction.account_id).first()[0]
+    txn = Transaction(
+        account_id=account_id, posted_date=day, amount=Decimal("-20.00"), merchant_raw=merchant,
+        description_raw=description, hash_dedupe=f"{merchant}-{description}-{day}", txn_type="expense", **kwargs,
+    )
+    db.add(txn)
+    db.commit()
+    return txn
+
+
+def test_matcher_follows_like_semantics_and_priority():
+    matcher = CanonicalMatcher([
+        ("OPENAI", "ONLINE PAYMENTS BY STRIPE", "%chatgpt%"),
+        ("MEMBERSHIP_FEE", None, "%PATREON% MEMBERSHIP%"),
+        ("OPENAI", "%OPENAI%", None),
+    ])
+    assert matcher("Online Payments by Stripe", "CHATGPT SUBSCRIPTION") == "OPENAI"
+    assert matcher("ONLINE PAYMENTS BY STRIPE", "VERCEL") == "ONLINE PAYMENTS BY STRIPE"
+    assert matcher("OpenAI *API", None) == "OPENAI"
+    assert matcher("CHECKOUT", "PATREON* MEMBERSHIP") == "MEMBERSHIP_FEE"
+    assert matcher("", "CHATGPT") is None
+
+
+def test_key_is_set_on_insert_and_when_merchant_changes(seeded_db):
+    txn = _add(seeded_db, "ONLINE PAYMENTS BY STRIPE", "OPENAI *CHATGPT SUBSCR")
+    assert txn.canonical_merchant == "OPENAI"
+
+    txn.merchant_raw = "Spotify"
+    seeded_db.commit()
+    assert txn.canonical_merchant == "SPOTIFY"
+
+    assert seeded_db.query(Transaction).filter(Transaction.merchant_raw == "NETFLIX").first().canonical_merchant == "NETFLIX"
+
+
+def test_new_alias_is_a_data_change(seeded_db):
+    """An alias added at runtime applies to new writes at once and to history after a backfill."""
+    old = _add(seeded_db, "DISNEY PLUS 800-123", "DISNEYPLUS")
+    assert old.canonical_merchant == "DISNEY PLUS 800-123"
+
+    seeded_db.add(CanonicalMerchant(key="DISNEY_PLUS", subscription=SUBSCRIPTION_ALWAYS))
+    seeded_db.add(MerchantAlias(canonical_key="DISNEY_PLUS", merchant_pattern="DISNEY PLUS%", priority=100))
+    seeded_db.commit()
+
+    new = _add(seeded_db, "DISNEY PLUS 800-456", "DISNEYPLUS", day=date(2024, 7, 1))
+    assert new.canonical_merchant == "DISNEY_PLUS"
+
+    assert backfill_canonical_merchants(seeded_db) == 1
+    seeded_db.refresh(old)
+    assert old.canonical_merchant == "DISNEY_PLUS"
+
+
+def test_recurring_subscriptions_use_table_policies(seeded_db):
+    """Whitelisted keys skip the category heuristics; excluded ones never show up."""
+    start = date(2024, 1, 10)
+    for i in range(4):
+        _add(seeded_db, f"OPENAI *CHATGPT {i}", "CHATGPT PLUS", day=start + timedelta(days=31 * i))
+    refresh_dirty_subscriptions(seeded_db)
+
+    body = json.loads(routes_analytics.get_recurring_subscriptions("2023-01-01", "2024-12-31", seeded_db).body)
+    merchants = {s["merchant"]: s for s in body["subscriptions"]}
+    assert merchants["OPENAI"]["months_count"] == 4
+    assert "NETFLIX" in merchants
+    assert "LOBLAWS" not in merchants and "TIM HORTONS" not in merchants
+
+
+def test_alias_added_by_another_process_reloads_the_matcher(tmp_path):
+    """The compiled matcher follows the shared counters, not just this process's writes."""
+    url = f"sqlite:///{(tmp_path / 'shared.db').as_posix()}"
+    ours, theirs = create_engine(url), create_engine(url)
+    Base.metadata.create_all(ours)
+    try:
+        with ours.connect() as conn:
+            assert canonical_matcher(conn)("VERCEL INC", None) == "VERCEL INC"
+        with theirs.begin() as conn:
+            conn.execute(text("INSERT INTO canonical_merchants (key) VALUES ('VERCEL')"))
+            conn.execute(text(
+                "INSERT INTO merchant_aliases (canonical_key, merchant_pattern, priority) VALUES ('VERCEL', 'VERCEL%', 0)"
+            ))
+        with ours.connect() as conn:
+            assert canonical_matcher(conn)("VERCEL INC", None) == "VERCEL"
+    finally:
+        ours.dispose()
+        theirs.dispose()
+
+
+def test_one_generation_check_per_flush(seeded_db):
+    """A flush of many rows checks the alias generations once, not once per row."""
+    account_id = seeded_db.query(Transaction.account_id).first()[0]
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(seeded_db.get_bind(), "before_cursor_execute", listener)
+    try:
+        seeded_db.add_all(
+            Transaction(
+                account_id=account_id, posted_date=date(2024, 6, 1), amount=Decimal("-5.00"),
+                merchant_raw=f"SHOP {i}", hash_dedupe=f"flush-{i}", txn_type="expense",
+            )
+            for i in range(50)
+        )
+        seeded_db.flush()
+    finally:
+        event.remove(seeded_db.get_bind(), "before_cursor_execute", listener)
+    seeded_db.commit()
+
+    assert sum("FROM write_generations" in statement for statement in statements) == 1
+    assert seeded_db.query(Transaction).filter(Transaction.hash_dedupe == "flush-7").one().canonical_merchant == "SHOP 7"
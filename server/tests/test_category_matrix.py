@@ -0,0 +1,68 @@
+"""Tests for the single-query category x month expense matrix."""
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from bt_app.models.category import Category
+from bt_app.services.analytics_service import AnalyticsService
+
+START, END = date(2023, 2, 10), date(2024, 3, 20)
+
+
+def _by_id(entries):
+    return {entry["category_id"]: entry for entry in entries}
+
+
+def test_matrix_rows_match_per_category_series(seeded_db):
+    service = AnalyticsService(seeded_db)
+    matrix = service.get_category_matrix(START, END)
+    assert matrix["months"] == service.month_range(START, END)
+
+    rows = _by_id(matrix["categories"])
+    assert {entry["name"] for entry in rows.values()} == {"Food", "Bills", "Uncategorized"}
+    for category_id, entry in rows.items():
+        if category_id is None:
+            continue
+        expected = service.get_category_series(category_id, START, END)
+        assert entry["values"] == expected["values"]
+        assert entry["total"] == pytest.approx(expected["total"])
+
+    counts = seeded_db.execute(text("""
+        SELECT COUNT(*) FROM transactions
+        WHERE txn_type = 'expense' AND posted_date BETWEEN :start AND :end
+    """), {"start": START.isoformat(), "end": END.isoformat()}).scalar()
+    assert sum(matrix["totals"]["txn_counts"]) == counts
+    assert matrix["totals"]["total"] == pytest.approx(sum(entry["total"] for entry in rows.values()))
+    assert matrix["rollups"] == []
+
+
+def test_parent_rollups_include_descendants(seeded_db):
+    food = seeded_db.query(Category).filter_by(name="Food").one()
+    bills = seeded_db.query(Category).filter_by(name="Bills").one()
+    household = Category(name="Household", color="#000000")
+    seeded_db.add(household)
+    seeded_db.flush()
+    food.parent_id = bills.id
+    bills.parent_id = household.id
+    seeded_db.commit()
+
+    matrix = AnalyticsService(seeded_db).get_category_matrix(START, END)
+    rows, rollups = _by_id(matrix["categories"]), _by_id(matrix["rollups"])
+    assert set(rollups) == {bills.id, household.id}
+    assert rollups[household.id]["values"] == rollups[bills.id]["values"] == [
+        round(f + b, 2) for f, b in zip(rows[food.id]["values"], rows[bills.id]["values"])
+    ]
+    assert rollups[bills.id]["txn_counts"] == [
+        f + b for f, b in zip(rows[food.id]["txn_counts"], rows[bills.id]["txn_counts"])
+    ]
+
+
+def test_matrix_route_zero_fills_empty_months(client):
+    response = client.get("/api/analytics/category-matrix",
+                          params={"date_from": "2030-01-01", "date_to": "2030-03-31"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["months"] == ["2030-01", "2030-02", "2030-03"]
+    assert body["categories"] == [] and body["rollups"] == []
+    assert body["totals"] == {"values": [0.0, 0.0, 0.0], "txn_counts": [0, 0, 0], "total": 0.0, "monthly_avg": 0.0}
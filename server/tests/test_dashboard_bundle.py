@@ -0,0 +1,57 @@
+"""Tests for the single-pass dashboard bundle."""
+import pytest
+from sqlalchemy import event, text
+
+from bt_app.core.config import settings
+from bt_app.services.dashboard_service import DashboardService
+
+
+def test_bundle_matches_separate_endpoints(seeded_db, monkeypatch):
+    """The bundle carries exactly what the individual endpoints return."""
+    monkeypatch.setattr(settings, "enable_result_cache", False)
+    service = DashboardService(seeded_db)
+
+    for month in ("2023-07", "2024-12", "2030-01"):
+        bundle = service.get_bundle(month)
+        assert bundle["meta"] == service.get_meta()
+        assert bundle["cards"] == service.get_cards(month)
+        assert bundle["lines"] == service.get_lines()
+        assert bundle["categories"] == service.get_categories(month)
+        assert bundle["top_merchants"] == service.get_top_merchants(month)
+    assert bundle["effective_month"] == "2024-12"
+
+
+def test_bundle_runs_two_queries(seeded_db, monkeypatch):
+    """First paint costs two SQL statements."""
+    monkeypatch.setattr(settings, "enable_result_cache", False)
+    statements = []
+    event.listen(seeded_db.get_bind(), "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    DashboardService(seeded_db).get_bundle("2023-07")
+    assert len(statements) == 2
+
+
+def test_bundle_on_empty_database(db):
+    """An empty database yields an empty but well-formed payload."""
+    bundle = DashboardService(db).get_bundle("2024-01")
+    assert bundle["meta"] == {"first_data_month": None, "latest_data_month": None}
+    assert bundle["cards"]["total_txns"] == 0
+    assert bundle["lines"]["income_by_month"] == []
+    assert bundle["top_merchants"] == []
+
+
+def test_bundle_skips_soft_deleted_rows(seeded_db, monkeypatch):
+    """Soft-deleted transactions drop out of the bundle's details like its totals."""
+    monkeypatch.setattr(settings, "enable_result_cache", False)
+    seeded_db.execute(text(
+        "UPDATE transactions SET is_deleted = 1 WHERE posted_month = '2023-07' AND id % 2 = 0"
+    ))
+    seeded_db.commit()
+
+    service = DashboardService(seeded_db)
+    categories = service.get_bundle("2023-07")["categories"]
+    assert categories == service.get_categories("2023-07")
+    totals = {row["category"]: row["amount"] for row in categories["breakdown"]}
+    details = {row["category"]: row["amount"] for row in categories["category_details"]}
+    assert details == pytest.approx(totals)
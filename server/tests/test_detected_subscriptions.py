@@ -0,0 +1,196 @@
+"""Tests for the persisted, incrementally refreshed subscription state."""
+import itertools
+import json
+import random
+from collections import Counter
+from datetime import date, timedelta
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+from sqlalchemy import text
+
+from bt_app.models.category import Category
+from bt_app.models.detected_subscription import DetectedSubscription, SubscriptionDirtyMerchant
+from bt_app.models.merchant_alias import SUBSCRIPTION_ALWAYS, SUBSCRIPTION_NEVER, CanonicalMerchant
+from bt_app.models.transaction import Transaction
+from bt_app.services.canonical_merchants import subscription_policies
+from bt_app.services.detected_subscriptions import (
+    ACTIVE_WINDOW_DAYS,
+    MONTHLY_CHARGES_SQL,
+    PRICE_BAND,
+    PRICE_WINDOW,
+    is_subscription,
+    list_subscriptions,
+    refresh_dirty_subscriptions,
+    refresh_subscriptions,
+    sweep_inactive_subscriptions,
+)
+
+TODAY = date(2024, 12, 31)
+
+
+def _reference_row(merchant_key, months, policy, today):
+    """Per-merchant, per-month loop version of the evaluation in ``refresh_subscriptions``."""
+    category = months[-1]["category_name"] or "Subscription"
+    if not is_subscription(category, policy, len(months)):
+        return None
+    cents = [round(Fraction(m["total_cents"], m["txn_count"])) for m in months]
+    dollars = [round(Fraction(c, 100)) for c in cents]
+
+    # Current price: mean of the most common dollar price of the last months
+    recent = list(zip(cents, dollars))[-PRICE_WINDOW:]
+    common = Counter(d for _, d in recent).most_common(1)[0][0]
+    matching = [c for c, d in recent if d == common]
+
+    # Price points lasting 2+ months, each a new start more than the band away
+    points, start, length = [], None, 0
+    for price in dollars:
+        if start is not None and abs(price - start) <= PRICE_BAND:
+            length += 1
+            continue
+        if length >= 2:
+            points.append(start)
+        start, length = price, 1
+    if length >= 2:
+        points.append(start)
+    history = list(dict.fromkeys(float(p) for p in points)) if len(months) >= 3 else []
+
+    last_charge = date.fromisoformat(months[-1]["last_date"])
+    return {
+        "merchant_key": merchant_key,
+        "category": category,
+        "current_price_cents": round(Fraction(sum(matching), len(matching))),
+        "price_history": json.dumps(history) if len(history) > 1 else None,
+        "months_count": len(months),
+        "total_cents": sum(m["total_cents"] for m in months),
+        "first_charge_date": date.fromisoformat(months[0]["first_date"]),
+        "last_charge_date": last_charge,
+        "is_active": last_charge >= today - timedelta(days=ACTIVE_WINDOW_DAYS),
+    }
+
+
+def _charge_monthly(db, merchant, category, months, amount="-45.00"):
+    account_id = db.query(Transaction.account_id).first()[0]
+    for month in months:
+        db.add(Transaction(
+            account_id=account_id, posted_date=date(2024, month, 3), amount=Decimal(amount),
+            merchant_raw=merchant, description_raw=merchant, category_id=category.id,
+            hash_dedupe=f"{merchant}-{month}", txn_type="expense",
+        ))
+    db.commit()
+
+
+def _queued(db):
+    return {key for key, in db.query(SubscriptionDirtyMerchant.merchant_key)}
+
+
+def _stored(db):
+    return {row.merchant_key: row for row in db.query(DetectedSubscription)}
+
+
+def test_only_queued_merchants_are_refreshed(seeded_db):
+    refresh_subscriptions(seeded_db, today=TODAY)
+    assert set(_stored(seeded_db)) == {"NETFLIX", "ROGERS"}
+    assert not _queued(seeded_db)
+
+    gym = Category(name="Gym", color="#0000ff")
+    seeded_db.add(gym)
+    seeded_db.commit()
+    _charge_monthly(seeded_db, "GOODLIFE FITNESS", gym, range(8, 13))
+    assert _queued(seeded_db) == {"GOODLIFE FITNESS"}
+
+    assert refresh_dirty_subscriptions(seeded_db, today=TODAY) == {"evaluated": 1, "detected": 1}
+    goodlife = _stored(seeded_db)["GOODLIFE FITNESS"]
+    assert (goodlife.current_price_cents, goodlife.months_count, goodlife.total_cents) == (4500, 5, 22500)
+    assert goodlife.is_active and goodlife.last_charge_date == date(2024, 12, 3)
+
+    body = list_subscriptions(seeded_db, date(2024, 1, 1), date(2024, 12, 31))
+    assert "GOODLIFE FITNESS" in {s["merchant"] for s in body["subscriptions"]}
+    assert refresh_dirty_subscriptions(seeded_db) == {"evaluated": 0, "detected": 0}
+
+
+def test_recategorized_and_excluded_merchants_drop_out(seeded_db):
+    gym = Category(name="Gym", color="#0000ff")
+    dining = Category(name="Restaurant", color="#ff00ff")
+    seeded_db.add_all([gym, dining])
+    seeded_db.commit()
+    _charge_monthly(seeded_db, "GOODLIFE FITNESS", gym, range(1, 7))
+    refresh_subscriptions(seeded_db, today=TODAY)
+    assert "GOODLIFE FITNESS" in _stored(seeded_db)
+
+    seeded_db.execute(text("UPDATE transactions SET category_id = :c WHERE merchant_raw = 'GOODLIFE FITNESS'"),
+                      {"c": dining.id})
+    seeded_db.get(CanonicalMerchant, "ROGERS").subscription = SUBSCRIPTION_NEVER
+    seeded_db.commit()
+    assert _queued(seeded_db) == {"GOODLIFE FITNESS", "ROGERS"}
+
+    refresh_dirty_subscriptions(seeded_db, today=TODAY)
+    assert set(_stored(seeded_db)) == {"NETFLIX"}
+
+
+def test_sweep_updates_active_flags(seeded_db):
+    refresh_subscriptions(seeded_db, today=TODAY)
+    assert all(row.is_active for row in _stored(seeded_db).values())
+
+    assert sweep_inactive_subscriptions(seeded_db, today=date(2025, 3, 1)) == 2
+    assert not any(row.is_active for row in _stored(seeded_db).values())
+    assert sweep_inactive_subscriptions(seeded_db, today=date(2025, 3, 1)) == 0
+
+    summary = list_subscriptions(seeded_db)["summary"]
+    assert summary["count"] == 0 and summary["total_monthly"] == 0
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_histories_match_reference(seeded_db, seed):
+    """Price steps, spikes, several charges a month (half-cent averages) and gaps give the loop's rows."""
+    rng = random.Random(seed)
+    categories = [Category(name=name, color="#000000") for name in ("Gym", "Streaming", "Restaurant", "Misc")]
+    seeded_db.add_all(categories)
+    seeded_db.flush()
+    account_id = seeded_db.query(Transaction.account_id).first()[0]
+    for i in range(16):
+        merchant = f"MERCHANT {chr(65 + i)}"
+        if i % 5 == 0:
+            seeded_db.add(CanonicalMerchant(key=merchant, subscription=rng.choice([SUBSCRIPTION_ALWAYS, SUBSCRIPTION_NEVER])))
+        category = rng.choice(categories)
+        price = rng.choice([999, 1549, 4900, 12000])
+        current = date(2023, rng.randint(1, 12), 1)
+        for n in range(rng.randint(1, 24)):
+            if rng.random() < 0.1:
+                current = (current + timedelta(days=32 * rng.randint(1, 3))).replace(day=1)
+            if rng.random() < 0.2:
+                price = round(price * rng.uniform(0.7, 1.5))
+            for k in range(1 if rng.random() < 0.7 else 2):
+                cents = price + rng.choice([0, 0, 1, 50, -250]) if rng.random() < 0.8 else price * 3
+                seeded_db.add(Transaction(
+                    account_id=account_id, posted_date=current.replace(day=rng.randint(1, 28)),
+                    amount=Decimal(-cents) / 100, merchant_raw=merchant, txn_type="expense",
+                    category_id=rng.choice([category.id] * 3 + [None]), hash_dedupe=f"{merchant}-{n}-{k}",
+                ))
+            current = (current + timedelta(days=32)).replace(day=1)
+    seeded_db.commit()
+
+    refresh_subscriptions(seeded_db, today=TODAY)
+    policies = subscription_policies(seeded_db)
+    monthly = seeded_db.execute(text(MONTHLY_CHARGES_SQL.format(merchant_filter=""))).mappings().all()
+    expected = {}
+    for key, months in itertools.groupby(monthly, key=lambda m: m["canonical_merchant"]):
+        row = _reference_row(key, list(months), policies.get(key), TODAY)
+        if row is not None:
+            expected[key] = row
+    assert any(row["price_history"] for row in expected.values())
+    columns = next(iter(expected.values())).keys()
+    stored = {key: {column: getattr(row, column) for column in columns} for key, row in _stored(seeded_db).items()}
+    assert stored == expected
+
+
+def test_endpoint_rejects_bad_dates(client, seeded_db):
+    refresh_subscriptions(seeded_db, today=TODAY)
+    url = "/api/analytics/recurring-subscriptions"
+    assert client.get(url, params={"date_from": "2024-13-01"}).status_code == 400
+    assert client.get(url, params={"date_to": "yesterday"}).status_code == 400
+
+    response = client.get(url, params={"date_from": "2024-06", "date_to": "2024-12-31"})
+    assert response.status_code == 200
+    assert {s["merchant"] for s in response.json()["subscriptions"]} == {"NETFLIX", "ROGERS"}
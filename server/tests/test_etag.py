@@ -0,0 +1,103 @@
+"""Tests for generation-driven conditional GET."""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from bt_app.core import etag
+from bt_app.core.db import Base
+from bt_app.core.etag import CACHE_CONTROL
+from bt_app.models.transaction import Transaction
+from bt_app.services.detected_subscriptions import refresh_subscriptions
+
+URL = "/api/dashboard/cards?month=2023-07"
+
+
+@pytest.fixture
+def etag_client(client, seeded_db, monkeypatch):
+    """Client whose ETags follow the seeded engine's write generations."""
+    monkeypatch.setattr(etag, "engine_for_request", lambda scope: seeded_db.get_bind())
+    return client
+
+
+def test_unchanged_view_is_304_without_route_queries(etag_client, seeded_db):
+    """A matching If-None-Match is answered from the shared counters before the handler runs."""
+    first = etag_client.get(URL)
+    assert first.status_code == 200
+    tag = first.headers["etag"]
+    assert first.headers["cache-control"] == CACHE_CONTROL
+
+    statements = []
+    event.listen(seeded_db.get_bind(), "before_cursor_execute", lambda *args: statements.append(1))
+    second = etag_client.get(URL, headers={"If-None-Match": tag})
+    assert second.status_code == 304
+    assert second.headers["etag"] == tag
+    assert second.content == b""
+    assert statements == [1]
+
+
+def test_write_changes_etag(etag_client, seeded_db):
+    """Committing to a table the route reads invalidates the tag."""
+    tag = etag_client.get(URL).headers["etag"]
+
+    account_id = seeded_db.query(Transaction.account_id).first()[0]
+    seeded_db.add(Transaction(
+        account_id=account_id, posted_date=date(2023, 7, 9), amount=Decimal("-10.00"),
+        hash_dedupe="etag-new", txn_type="expense",
+    ))
+    seeded_db.commit()
+
+    fresh = etag_client.get(URL, headers={"If-None-Match": tag})
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != tag
+
+
+def test_tag_varies_by_params_and_accept(etag_client):
+    """Different parameters or representations never share a tag."""
+    tags = {
+        etag_client.get(URL).headers["etag"],
+        etag_client.get("/api/dashboard/cards?month=2023-08").headers["etag"],
+        etag_client.get("/api/dashboard/lines").headers["etag"],
+        etag_client.get("/api/dashboard/lines", headers={"Accept": "application/vnd.bt.columnar+json"}).headers["etag"],
+    }
+    assert len(tags) == 4
+
+
+def test_unmanaged_paths_are_untouched(etag_client):
+    """Routes outside the policy table get no validator."""
+    assert "etag" not in etag_client.get("/api/system/health").headers
+
+
+def test_writes_from_other_processes_change_etag(tmp_path, monkeypatch):
+    """Tags come from the shared counters, so another worker's commit is not answered with 304."""
+    url = f"sqlite:///{(tmp_path / 'shared.db').as_posix()}"
+    ours, theirs = create_engine(url), create_engine(url)
+    Base.metadata.create_all(ours)
+    monkeypatch.setattr(etag, "engine_for_request", lambda scope: ours)
+    scope = {"type": "http", "path": "/api/dashboard/cards", "query_string": b"", "headers": []}
+    try:
+        tag = etag.compute_etag(scope, etag.tables_for_path(scope["path"]))
+        with theirs.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO accounts (institution_item_id, name, account_type) VALUES (1, 'Chequing', 'asset')"
+            ))
+        assert etag.compute_etag(scope, etag.tables_for_path(scope["path"])) != tag
+    finally:
+        ours.dispose()
+        theirs.dispose()
+
+
+def test_subscription_refresh_changes_etag(etag_client, seeded_db):
+    """The recurring-subscriptions tag follows the detected_subscriptions table a background job refreshes."""
+    url = "/api/analytics/recurring-subscriptions"
+    seeded_db.execute(text("DELETE FROM detected_subscriptions"))
+    seeded_db.commit()
+    first = etag_client.get(url)
+    assert first.json()["subscriptions"] == []
+
+    assert refresh_subscriptions(seeded_db)["detected"] > 0
+
+    fresh = etag_client.get(url, headers={"If-None-Match": first.headers["etag"]})
+    assert fresh.status_code == 200
+    assert fresh.json()["subscriptions"]
@@ -0,0 +1,76 @@
+"""Tests for request metrics, Server-Timing and N+1 detection."""
+import logging
+
+import pytest
+
+from bt_app.core import metrics
+from bt_app.core.cache import result_cache
+from bt_app.core.metrics import MetricsRegistry, collecting, fingerprint
+from bt_app.models.transaction import Transaction
+
+URL = "/api/dashboard/cards?month=2023-07"
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.registry.reset()
+    result_cache.clear()
+    yield
+    metrics.registry.reset()
+
+
+def test_server_timing_reports_queries_and_cache(client):
+    first = client.get(URL)
+    assert first.status_code == 200
+    timing = first.headers["server-timing"]
+    assert timing.startswith("app;dur=")
+    assert "db;dur=" in timing and "0 queries" not in timing
+
+    second = client.get(URL)
+    assert "hit, 0 miss" in second.headers["server-timing"]
+
+
+def test_metrics_endpoint_has_route_histograms(client):
+    client.get(URL)
+    client.get(URL)
+    response = client.get("/api/system/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    body = response.text
+    labels = 'method="GET",route="/api/dashboard/cards"'
+    assert f'bt_http_requests_total{{{labels},status="200"}} 2' in body
+    assert f'bt_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in body
+    assert f"bt_http_request_duration_seconds_count{{{labels}}} 2" in body
+    assert f"bt_http_request_sql_statements_count{{{labels}}} 2" in body
+    assert "bt_result_cache_hit_ratio " in body
+
+
+def test_fingerprint_collapses_literals():
+    assert fingerprint("SELECT * FROM t WHERE id = 12 AND name = 'x'") == fingerprint(
+        "SELECT *\n  FROM t WHERE id = 7 AND name = 'it''s'"
+    )
+    assert fingerprint("SELECT 1 FROM t WHERE id IN (1, 2, 3)") == "SELECT ? FROM t WHERE id IN (?)"
+
+
+def test_repeated_statement_is_flagged_once(seeded_db, caplog):
+    """A per-row query loop is counted per request and logged once per route."""
+    with collecting() as stats:
+        for txn_id in range(1, 16):
+            seeded_db.query(Transaction).filter(Transaction.id == txn_id).first()
+    assert stats.sql_count >= 15
+    [(shape, count)] = stats.repeated(10)
+    assert count == 15 and "transactions" in shape
+
+    registry = MetricsRegistry()
+    with caplog.at_level(logging.WARNING, logger=metrics.__name__):
+        registry.observe("GET", "/api/loop", 200, 0.01, stats)
+        registry.observe("GET", "/api/loop", 200, 0.01, stats)
+    assert registry.n_plus_one[("GET", "/api/loop")] == 2
+    assert sum("Possible N+1" in r.message for r in caplog.records) == 1
+
+
+def test_queries_outside_a_request_are_not_counted(seeded_db):
+    with collecting() as stats:
+        pass
+    seeded_db.query(Transaction).first()
+    assert stats.sql_count == 0
@@ -0,0 +1,203 @@
+"""Tests for the trigger-maintained monthly aggregate cubes."""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+
+from bt_app.api.routes_analytics import get_all_categories_series
+from bt_app.models.monthly_aggregate import CUBE_KEYS, cube_rebuild_sql
+from bt_app.models.transaction import Transaction
+from bt_app.services.analytics_service import AnalyticsService
+from bt_app.services.dashboard_service import DashboardService
+from bt_app.services.monthly_aggregates import (
+    CATEGORY_CUBE,
+    check_networth_series,
+    cube_source,
+    rebuild_monthly_aggregates,
+)
+
+
+def _cube_rows(db, table):
+    return sorted(tuple(r) for r in db.execute(text(f"SELECT * FROM {table}")).fetchall())
+
+
+def _expected_rows(db, table):
+    return sorted(tuple(r) for r in db.execute(text(cube_rebuild_sql(table))).fetchall())
+
+
+def _assert_consistent(db):
+    for table in CUBE_KEYS:
+        assert _cube_rows(db, table) == _expected_rows(db, table), table
+
+
+def test_cubes_follow_inserts(seeded_db):
+    """Triggers fill every cube as transactions are inserted."""
+    _assert_consistent(seeded_db)
+    total = seeded_db.execute(text("SELECT SUM(txn_count) FROM monthly_account_totals")).scalar()
+    assert total == seeded_db.query(Transaction).count()
+
+
+def test_cubes_follow_updates_and_deletes(seeded_db):
+    """ORM edits, raw SQL updates, soft deletes and deletes all keep cubes exact."""
+    txn = seeded_db.query(Transaction).filter(Transaction.txn_type == "expense").first()
+    txn.amount = Decimal("-999.99")
+    txn.posted_date = date(2024, 6, 30)
+    txn.merchant_norm = "renamed"
+    seeded_db.commit()
+    _assert_consistent(seeded_db)
+
+    seeded_db.execute(text("UPDATE transactions SET category_id = NULL WHERE id % 7 = 0"))
+    seeded_db.execute(text("UPDATE transactions SET is_deleted = 1 WHERE id % 11 = 0"))
+    seeded_db.commit()
+    _assert_consistent(seeded_db)
+
+    seeded_db.execute(text("UPDATE transactions SET is_deleted = 0 WHERE id % 22 = 0"))
+    seeded_db.query(Transaction).filter(Transaction.posted_date < date(2023, 3, 1)).delete()
+    seeded_db.commit()
+    _assert_consistent(seeded_db)
+    assert seeded_db.execute(text(
+        "SELECT COUNT(*) FROM monthly_category_totals WHERE month < '2023-03' OR txn_count = 0"
+    )).scalar() == 0
+
+
+def test_rebuild_restores_drifted_cubes(seeded_db):
+    """The rebuild command recomputes cubes from scratch."""
+    seeded_db.execute(text("UPDATE monthly_category_totals SET amount_cents = 0"))
+    seeded_db.execute(text("DELETE FROM monthly_merchant_totals"))
+    seeded_db.commit()
+
+    counts = rebuild_monthly_aggregates(seeded_db)
+    assert counts["monthly_merchant_totals"] > 0
+    _assert_consistent(seeded_db)
+
+
+def test_networth_series_follows_writes(seeded_db):
+    """Prefix sums stay exact through edits, soft deletes, deletes and out-of-order inserts."""
+    assert check_networth_series(seeded_db) == []
+
+    txn = seeded_db.query(Transaction).filter(Transaction.txn_type == "expense").first()
+    txn.amount = Decimal("-999.99")
+    txn.posted_date = date(2024, 6, 30)
+    seeded_db.execute(text("UPDATE transactions SET txn_type = 'transfer' WHERE id % 13 = 0"))
+    seeded_db.execute(text("UPDATE transactions SET is_deleted = 1 WHERE id % 11 = 0"))
+    seeded_db.commit()
+    assert check_networth_series(seeded_db) == []
+
+    account_id = txn.account_id
+    for i, (day, amount, kind) in enumerate([
+        (date(2022, 11, 5), "1200.00", "income"),  # new first month
+        (date(2025, 2, 1), "-80.00", "expense"),  # new last month
+        (date(2025, 1, 9), "40.00", "transfer"),  # new month between existing ones
+    ]):
+        seeded_db.add(Transaction(account_id=account_id, posted_date=day, amount=Decimal(amount),
+                                  hash_dedupe=f"nw{i}", txn_type=kind))
+    seeded_db.query(Transaction).filter(Transaction.posted_date < date(2023, 3, 1),
+                                        Transaction.posted_date >= date(2023, 1, 1)).delete()
+    seeded_db.commit()
+    assert check_networth_series(seeded_db) == []
+
+
+def test_networth_reads_match_running_sum(seeded_db):
+    """Net worth and running balance equal a running sum over raw transactions."""
+    rows = seeded_db.execute(text("""
+        SELECT posted_month,
+               SUM(CASE WHEN txn_type = 'income' THEN amount_cents ELSE 0 END),
+               SUM(CASE WHEN txn_type = 'expense' THEN ABS(amount_cents) ELSE 0 END)
+        FROM transactions GROUP BY posted_month ORDER BY posted_month
+    """)).fetchall()
+    running, expected = 0, []
+    for _, income, expense in rows:
+        running += income - expense
+        expected.append(running / 100)
+
+    service = AnalyticsService(seeded_db)
+    series = service.get_cumulative_networth()
+    assert series == {"months": [r[0] for r in rows], "networth_cumulative": expected}
+    assert service.get_latest_networth() == {"month": rows[-1][0], "networth": expected[-1]}
+    lines = DashboardService(seeded_db).get_lines()
+    assert [p["amount"] for p in lines["networth_cumulative"]] == expected
+
+
+def test_networth_checker_reports_drift(seeded_db):
+    seeded_db.execute(text("UPDATE monthly_networth SET cumulative_net_cents = cumulative_net_cents + 1 "
+                           "WHERE month >= '2024-06'"))
+    seeded_db.execute(text("DELETE FROM monthly_networth WHERE month = '2023-02'"))
+    seeded_db.commit()
+
+    mismatches = check_networth_series(seeded_db)
+    assert {m["month"] for m in mismatches} == {"2023-02", *(f"2024-{m:02d}" for m in range(6, 13))}
+    assert {"month": "2023-02", "column": "month", "stored": False, "expected": True} in mismatches
+
+    rebuild_monthly_aggregates(seeded_db)
+    assert check_networth_series(seeded_db) == []
+
+
+def test_cube_source_handles_partial_months(seeded_db):
+    """Ranges that start or end mid-month match a direct aggregation."""
+    for start, end in [
+        (date(2023, 1, 1), date(2024, 12, 31)),
+        (date(2023, 2, 14), date(2023, 11, 3)),
+        (date(2023, 5, 10), date(2023, 5, 20)),
+        (date(2023, 5, 10), date(2023, 6, 20)),
+    ]:
+        source, params = cube_source(CATEGORY_CUBE, start, end)
+        got = seeded_db.execute(text(f"""
+            SELECT txn_type, SUM(txn_count), SUM(amount_cents) FROM ({source}) m GROUP BY txn_type ORDER BY txn_type
+        """), params).fetchall()
+        expected = seeded_db.execute(text("""
+            SELECT txn_type, COUNT(*), SUM(amount_cents) FROM transactions
+            WHERE posted_date >= :s AND posted_date <= :e GROUP BY txn_type ORDER BY txn_type
+        """), {"s": start.isoformat(), "e": end.isoformat()}).fetchall()
+        assert [tuple(r) for r in got] == [tuple(r) for r in expected], (start, end)
+
+
+def test_dashboard_reads_match_transactions(seeded_db):
+    """Dashboard and analytics numbers from cubes equal the row-level totals."""
+    month = "2023-07"
+    cards = DashboardService(seeded_db).get_cards(month)
+    raw = seeded_db.execute(text("""
+        SELECT SUM(CASE WHEN txn_type = 'income' THEN amount_cents ELSE 0 END),
+               SUM(CASE WHEN txn_type = 'expense' THEN ABS(amount_cents) ELSE 0 END),
+               COUNT(*),
+               SUM(CASE WHEN txn_type = 'expense' AND category_id IS NULL THEN 1 ELSE 0 END)
+        FROM transactions WHERE posted_month = :m
+    """), {"m": month}).first()
+    assert cards["income"] == raw[0] / 100
+    assert cards["expenses"] == raw[1] / 100
+    assert cards["total_txns"] == raw[2]
+    assert cards["unmapped"] == raw[3]
+    assert cards["active_categories"] == 2
+
+    lines = DashboardService(seeded_db).get_lines()
+    assert len(lines["income_by_month"]) == 24
+
+    monthly = AnalyticsService(seeded_db).monthly_income_expense(date(2023, 1, 1), date(2023, 12, 31))
+    assert monthly["2023-07"]["income"] == cards["income"]
+    assert monthly["2023-07"]["expense"] == cards["expenses"]
+
+    series = get_all_categories_series("2023-07-01", "2023-07-31", seeded_db)
+    assert series["values"] == [cards["expenses"]]
+    assert series["txn_counts"] == [raw[2] - 1]
+
+
+def test_soft_deleted_rows_leave_totals_and_details_in_step(seeded_db):
+    """Row-level reads served next to cube reads skip soft-deleted transactions too."""
+    month = "2023-07"
+    seeded_db.execute(text("""
+        UPDATE transactions SET is_deleted = 1
+        WHERE posted_month = :m AND txn_type = 'expense' AND id % 2 = 0
+    """), {"m": month})
+    seeded_db.commit()
+
+    categories = DashboardService(seeded_db).get_categories(month)
+    totals = {row["category"]: row["amount"] for row in categories["breakdown"]}
+    details = {row["category"]: row["amount"] for row in categories["category_details"]}
+    assert details == pytest.approx(totals)
+
+    service = AnalyticsService(seeded_db)
+    matrix = service.get_category_matrix(date(2023, 7, 1), date(2023, 7, 31))
+    for entry in matrix["categories"]:
+        if entry["category_id"] is not None:
+            series = service.get_category_series(entry["category_id"], date(2023, 7, 1), date(2023, 7, 31))
+            assert series["values"] == entry["values"]
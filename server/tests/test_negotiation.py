@@ -0,0 +1,87 @@
+"""Tests for columnar JSON and MessagePack chart payloads."""
+import msgpack
+import pytest
+
+from bt_app.core.negotiation import COLUMNAR_JSON, MSGPACK, to_columnar, to_series
+
+CHART_URLS = [
+    ("/api/analytics/all-categories-series?date_from=2023-01-01&date_to=2024-12-31", to_series),
+    ("/api/analytics/category-series?category_id=1&date_from=2023-01-01&date_to=2024-12-31", to_series),
+    ("/api/analytics/category-matrix?date_from=2023-01-01&date_to=2024-12-31", to_series),
+    ("/api/analytics/transaction-frequency-by-merchant?date_from=2023-01-01&date_to=2024-12-31", to_columnar),
+    ("/api/dashboard/lines", to_columnar),
+]
+
+
+def test_to_columnar():
+    """Record lists become column dicts; ragged lists and scalars are left alone."""
+    payload = {
+        "series": [{"month": "2024-01", "amount": 1.5}, {"month": "2024-02", "amount": 2.0}],
+        "ragged": [{"a": 1}, {"b": 2}],
+        "values": [1, 2],
+        "total": 3.5,
+    }
+    assert to_columnar(payload) == {
+        "series": {"month": ["2024-01", "2024-02"], "amount": [1.5, 2.0]},
+        "ragged": [{"a": 1}, {"b": 2}],
+        "values": [1, 2],
+        "total": 3.5,
+    }
+    assert to_columnar([]) == []
+
+
+def test_to_series():
+    """Category series are keyed by category id on one shared month axis."""
+    matrix = {
+        "months": ["2024-01", "2024-02"],
+        "categories": [
+            {"category_id": 3, "name": "Food", "parent_id": None, "values": [1.0, 2.0], "txn_counts": [1, 2],
+             "total": 3.0, "monthly_avg": 1.5},
+            {"category_id": None, "name": "Uncategorized", "parent_id": None, "values": [0.0, 1.0],
+             "txn_counts": [0, 1], "total": 1.0, "monthly_avg": 0.5},
+        ],
+        "rollups": [],
+        "totals": {"values": [1.0, 3.0], "txn_counts": [1, 3], "total": 4.0, "monthly_avg": 2.0},
+    }
+    encoded = to_series(matrix)
+    assert encoded["months"] == ["2024-01", "2024-02"]
+    assert encoded["series"] == {"3": [1.0, 2.0], "0": [0.0, 1.0]}
+    assert encoded["txn_counts"] == {"3": [1, 2], "0": [0, 1]}
+    assert encoded["categories"]["3"] == {"name": "Food", "parent_id": None, "total": 3.0, "monthly_avg": 1.5}
+    assert encoded["rollups"] == {"series": {}, "txn_counts": {}, "categories": {}}
+    assert encoded["totals"] == matrix["totals"]
+
+    single = {
+        "series": [{"month": "2024-01", "amount": 1.0, "txn_count": 1}],
+        "months": ["2024-01"], "values": [1.0], "txn_counts": [1], "total": 1.0, "category_id": 7,
+    }
+    assert to_series(single) == {
+        "months": ["2024-01"], "series": {"7": [1.0]}, "txn_counts": {"7": [1]}, "total": 1.0, "category_id": 7,
+    }
+    assert to_series([{"a": 1}, {"a": 2}]) == {"a": [1, 2]}
+
+
+@pytest.mark.parametrize("url,encoder", CHART_URLS)
+def test_formats_carry_the_same_data(client, url, encoder):
+    """Columnar JSON and MessagePack are transposed views of the row payload."""
+    rows = client.get(url)
+    assert rows.headers["content-type"] == "application/json"
+
+    columnar = client.get(url, headers={"Accept": COLUMNAR_JSON})
+    assert columnar.headers["content-type"] == COLUMNAR_JSON
+    assert columnar.json() == encoder(rows.json())
+    assert len(columnar.content) < len(rows.content)
+
+    packed = client.get(url, headers={"Accept": MSGPACK})
+    assert packed.headers["content-type"] == MSGPACK
+    assert msgpack.unpackb(packed.content) == columnar.json()
+    assert len(packed.content) < len(columnar.content)
+
+    assert client.get(url + ("&" if "?" in url else "?") + "format=columnar").json() == columnar.json()
+
+
+def test_record_heavy_payload_shrinks(client):
+    """Long per-month series shrink several-fold in the columnar encodings."""
+    url = "/api/dashboard/lines"
+    rows = len(client.get(url).content)
+    assert len(client.get(url, headers={"Accept": MSGPACK}).content) * 2 < rows
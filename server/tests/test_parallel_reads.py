@@ -0,0 +1,82 @@
+"""Tests for concurrent summary reads on pooled connections."""
+import sqlite3
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from bt_app.api import routes_summary
+from bt_app.core import parallel
+from bt_app.core.config import settings
+from bt_app.core.parallel import DeadlineExceeded, run_parallel_reads
+
+
+@pytest.fixture
+def file_db(seeded_db, tmp_path):
+    """Copy of the seeded database in a WAL-mode file, so sessions can share it."""
+    path = tmp_path / "summary.db"
+    target = sqlite3.connect(path)
+    seeded_db.connection().connection.driver_connection.backup(target)
+    target.execute("PRAGMA journal_mode=WAL")
+    target.close()
+
+    engine = create_engine(f"sqlite:///{path.as_posix()}", connect_args={"check_same_thread": False})
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_parallel_summary_matches_sequential(file_db, monkeypatch):
+    """Fanning out the sub-queries does not change the summary."""
+    monkeypatch.setattr(settings, "enable_result_cache", False)
+    threads = set()
+    original = parallel._run_task
+
+    def _tracking(engine, task):
+        threads.add(threading.current_thread().name)
+        return original(engine, task)
+
+    monkeypatch.setattr(parallel, "_run_task", _tracking)
+    concurrent = routes_summary.get_summary(month="2023-07", db=file_db)
+    assert threads and all(name.startswith("bt-read") for name in threads)
+
+    monkeypatch.setattr(parallel, "_shares_connections", lambda engine: False)
+    sequential = routes_summary.get_summary(month="2023-07", db=file_db)
+    assert concurrent == sequential
+    assert list(concurrent) == list(sequential)
+    assert concurrent["unmapped_count"] > 0
+
+
+def test_reads_overlap(file_db):
+    """Slow independent reads take about as long as the slowest one."""
+    def slow(session):
+        session.execute(text("SELECT 1"))
+        time.sleep(0.2)
+        return True
+
+    started = time.monotonic()
+    results = run_parallel_reads(file_db, {"a": slow, "b": slow, "c": slow}, deadline_seconds=5)
+    assert results == {"a": True, "b": True, "c": True}
+    assert time.monotonic() - started < 0.5
+
+
+def test_deadline_exceeded(file_db):
+    """Work still running at the deadline is reported rather than awaited."""
+    with pytest.raises(DeadlineExceeded) as exc:
+        run_parallel_reads(file_db, {
+            "fast": lambda s: 1,
+            "slow": lambda s: time.sleep(0.5),
+        }, deadline_seconds=0.05)
+    assert exc.value.pending == ["slow"]
+
+
+def test_in_memory_falls_back_to_caller_session(seeded_db):
+    """Private in-memory databases run the tasks on the request's own session."""
+    seen = []
+    run_parallel_reads(seeded_db, {"a": seen.append, "b": seen.append})
+    assert seen == [seeded_db, seeded_db]
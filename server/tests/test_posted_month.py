@@ -0,0 +1,105 @@
+"""Tests for the indexed posted_month column."""
+import pytest
+from sqlalchemy import text
+
+from bt_app.services.analytics_service import AnalyticsService
+from bt_app.services.dashboard_service import DashboardService
+
+
+def _legacy_month_totals(db, month):
+    """Month totals computed the pre-posted_month way (strftime per row)."""
+    income = db.execute(text("""
+        SELECT COALESCE(SUM(amount), 0) FROM transactions
+        WHERE strftime('%Y-%m', posted_date) = :month
+            AND (txn_type = 'income' OR amount > 0)
+            AND txn_type != 'expense'
+    """), {"month": month}).scalar()
+    expenses = db.execute(text("""
+        SELECT COALESCE(SUM(ABS(amount)), 0) FROM transactions
+        WHERE strftime('%Y-%m', posted_date) = :month AND txn_type = 'expense'
+    """), {"month": month}).scalar()
+    count = db.execute(text("""
+        SELECT COUNT(*) FROM transactions WHERE strftime('%Y-%m', posted_date) = :month
+    """), {"month": month}).scalar()
+    return float(income), float(expenses), count
+
+
+def test_posted_month_matches_posted_date(seeded_db):
+    """Every row's posted_month equals strftime('%Y-%m', posted_date)."""
+    mismatches = seeded_db.execute(text("""
+        SELECT COUNT(*) FROM transactions
+        WHERE posted_month IS NOT strftime('%Y-%m', posted_date)
+    """)).scalar()
+    assert mismatches == 0
+
+
+def test_month_lookup_uses_index(seeded_db):
+    """Month equality filters are answered from the covering index."""
+    plan = seeded_db.execute(text("""
+        EXPLAIN QUERY PLAN
+        SELECT SUM(ABS(amount)) FROM transactions
+        WHERE posted_month = '2023-06' AND txn_type = 'expense'
+    """)).fetchall()
+    assert any("ix_transactions_month_type_cat_cents" in row[-1] for row in plan)
+
+
+def test_dashboard_results_unchanged(seeded_db):
+    """Dashboard cards and lines match the legacy strftime queries."""
+    service = DashboardService(seeded_db)
+    for month in ("2023-01", "2023-07", "2024-02", "2024-12"):
+        cards = service.get_cards(month)
+        income, expenses, count = _legacy_month_totals(seeded_db, month)
+        assert cards["income"] == pytest.approx(income)
+        assert cards["expenses"] == pytest.approx(expenses)
+        assert cards["total_txns"] == count
+
+    lines = service.get_lines()
+    legacy = seeded_db.execute(text("""
+        SELECT strftime('%Y-%m', posted_date) AS month,
+               SUM(CASE WHEN txn_type = 'expense' THEN ABS(amount) ELSE 0 END) AS expenses
+        FROM transactions
+        GROUP BY strftime('%Y-%m', posted_date)
+        ORDER BY month
+    """)).fetchall()
+    assert [p["month"] for p in lines["expenses_by_month"]] == [row.month for row in legacy]
+    assert [p["amount"] for p in lines["expenses_by_month"]] == pytest.approx(
+        [float(row.expenses) for row in legacy]
+    )
+
+
+def test_category_and_merchant_breakdowns_unchanged(seeded_db):
+    """Month breakdowns match the legacy strftime queries."""
+    month = "2024-03"
+    legacy_categories = seeded_db.execute(text("""
+        SELECT COALESCE(c.name, 'Uncategorized') AS category, SUM(ABS(t.amount)) AS amount
+        FROM transactions t
+        LEFT JOIN categories c ON t.category_id = c.id
+        WHERE strftime('%Y-%m', t.posted_date) = :month AND t.txn_type = 'expense'
+        GROUP BY c.name
+        ORDER BY amount DESC
+    """), {"month": month}).fetchall()
+    breakdown = DashboardService(seeded_db).get_categories(month)["breakdown"]
+    assert [b["category"] for b in breakdown] == [row.category for row in legacy_categories]
+    assert [b["amount"] for b in breakdown] == pytest.approx(
+        [float(row.amount) for row in legacy_categories]
+    )
+
+    legacy_merchants = seeded_db.execute(text("""
+        SELECT COALESCE(merchant_norm, merchant_raw, 'Unknown') AS merchant, SUM(ABS(amount)) AS amount
+        FROM transactions
+        WHERE strftime('%Y-%m', posted_date) = :month AND txn_type = 'expense'
+        GROUP BY merchant
+        ORDER BY amount DESC
+        LIMIT 10
+    """), {"month": month}).fetchall()
+    merchants = DashboardService(seeded_db).get_top_merchants(month)
+    assert [m["merchant"] for m in merchants] == [row.merchant for row in legacy_merchants]
+    assert [m["amount"] for m in merchants] == pytest.approx(
+        [float(row.amount) for row in legacy_merchants]
+    )
+
+    latest = AnalyticsService(seeded_db).get_latest_month_breakdowns()
+    assert latest["latest_month"] == "2024-12"
+    assert [m["merchant"] for m in latest["top_merchants"]] == [
+        m["merchant"] for m in DashboardService(seeded_db).get_top_merchants("2024-12")
+    ]
@@ -0,0 +1,63 @@
+"""Tests for the on-demand request profiler."""
+import pytest
+
+from bt_app.core import profiler
+from bt_app.core.cache import result_cache
+from bt_app.core.config import settings
+from bt_app.core.profiler import PROFILE_HEADER, PROFILE_ID_HEADER, ProfilerMiddleware
+
+URL = "/api/dashboard/cards?month=2023-07"
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def profiled_client(client, tmp_path, monkeypatch):
+    """Client for the app behind the profiler, as installed when a token is configured."""
+    from fastapi.testclient import TestClient
+
+    from bt_app.main import app
+
+    monkeypatch.setattr(settings, "profiler_token", TOKEN)
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path / "profiles"))
+    profiler.instrument_endpoints(app.routes)
+    result_cache.clear()
+    return TestClient(ProfilerMiddleware(app))
+
+
+def test_requests_without_the_token_are_not_profiled(profiled_client, tmp_path):
+    assert PROFILE_ID_HEADER.lower() not in profiled_client.get(URL).headers
+    assert PROFILE_ID_HEADER.lower() not in profiled_client.get(URL, headers={PROFILE_HEADER: "wrong"}).headers
+    assert not (tmp_path / "profiles").exists()
+
+
+def test_profiled_request_report_is_stored(profiled_client):
+    response = profiled_client.get(URL, headers={PROFILE_HEADER: TOKEN})
+    assert response.status_code == 200
+    profile_id = response.headers[PROFILE_ID_HEADER]
+
+    report = profiled_client.get(f"/api/system/profiles/{profile_id}", headers={PROFILE_HEADER: TOKEN}).json()
+    assert report["id"] == profile_id
+    assert report["path"] == "/api/dashboard/cards" and report["status"] == 200
+    [profile] = report["profiles"]
+    assert "get_dashboard_cards" in profile["text"]
+    assert report["allocations"]
+
+    assert report["sql"]["count"] > 0
+    slowest = report["sql"]["slowest"]
+    assert 0 < len(slowest) <= settings.profile_slow_sql
+    assert slowest == sorted(slowest, key=lambda s: s["ms"], reverse=True)
+    assert any(s["query_plan"] for s in slowest if s["statement"].lstrip().upper().startswith("SELECT"))
+
+    listing = profiled_client.get("/api/system/profiles", headers={PROFILE_HEADER: TOKEN}).json()
+    assert [p["id"] for p in listing] == [profile_id]
+
+
+def test_query_flag_and_fetch_auth(profiled_client, monkeypatch):
+    response = profiled_client.get(f"{URL}&_profile={TOKEN}")
+    profile_id = response.headers[PROFILE_ID_HEADER]
+
+    assert profiled_client.get(f"/api/system/profiles/{profile_id}").status_code == 403
+    assert profiled_client.get("/api/system/profiles/../../etc", headers={PROFILE_HEADER: TOKEN}).status_code == 404
+
+    monkeypatch.setattr(settings, "profiler_token", None)
+    assert profiled_client.get(f"/api/system/profiles/{profile_id}", headers={PROFILE_HEADER: TOKEN}).status_code == 404
@@ -0,0 +1,136 @@
+"""Tests for the write-generation invalidated result cache."""
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from bt_app.api.routes_analytics_freq import spending_amount_by_category
+from bt_app.core import cache as cache_module
+from bt_app.core.cache import ResultCache, result_cache
+from bt_app.core.db import Base
+from bt_app.models.transaction import Transaction
+from bt_app.services.dashboard_service import DashboardService
+
+
+def _count_queries(db):
+    counter = {"n": 0}
+
+    def _on_execute(*args):
+        counter["n"] += 1
+
+    event.listen(db.get_bind(), "before_cursor_execute", _on_execute)
+    return counter
+
+
+def test_repeat_calls_hit_cache(seeded_db):
+    """A second identical call is served after one read of the shared write counters."""
+    service = DashboardService(seeded_db)
+    first = service.get_cards("2023-07")
+    queries = _count_queries(seeded_db)
+    hits = result_cache.hits
+
+    second = DashboardService(seeded_db).get_cards(month="2023-07")
+    assert second is first
+    assert queries["n"] == 1
+    assert result_cache.hits == hits + 1
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        service.get_cards("2023-07")
+    assert (time.perf_counter() - start) / 1000 < 0.001
+
+
+def test_orm_commit_invalidates(seeded_db):
+    """Committing a new transaction makes the next call recompute."""
+    service = DashboardService(seeded_db)
+    before = service.get_cards("2023-07")["expenses"]
+
+    account_id = seeded_db.query(Transaction.account_id).first()[0]
+    seeded_db.add(Transaction(
+        account_id=account_id, posted_date=date(2023, 7, 9), amount=Decimal("-10.00"),
+        hash_dedupe="cache-new", txn_type="expense",
+    ))
+    seeded_db.flush()
+    # Uncommitted writes in the caller's own session bypass the cache
+    assert service.get_cards("2023-07")["expenses"] == before + 10
+    seeded_db.commit()
+
+    assert service.get_cards("2023-07")["expenses"] == before + 10
+
+
+def test_raw_sql_invalidates(seeded_db):
+    """Raw UPDATEs (rule application, fix-up endpoints) invalidate dependents too."""
+    kwargs = dict(date_from="2023-01-01", date_to="2024-12-31", limit=10, db=seeded_db)
+    names = [row["category"] for row in spending_amount_by_category(**kwargs)["data"]]
+    assert "Food" in names
+
+    seeded_db.execute(text("UPDATE categories SET name = 'Groceries' WHERE name = 'Food'"))
+    seeded_db.commit()
+
+    names = [row["category"] for row in spending_amount_by_category(**kwargs)["data"]]
+    assert "Groceries" in names and "Food" not in names
+
+
+def test_writes_from_other_processes_invalidate(tmp_path):
+    """A commit through another engine (another worker or a script) is seen at once."""
+    url = f"sqlite:///{(tmp_path / 'shared.db').as_posix()}"
+    ours, theirs = create_engine(url), create_engine(url)
+    Base.metadata.create_all(ours)
+    try:
+        with Session(ours) as db:
+            assert DashboardService(db).get_meta()["first_data_month"] is None
+
+            with theirs.begin() as conn:
+                conn.execute(text(
+                    "INSERT INTO accounts (institution_item_id, name, account_type) VALUES (1, 'Chequing', 'asset')"
+                ))
+                conn.execute(text(
+                    "INSERT INTO transactions (account_id, posted_date, amount, hash_dedupe, txn_type) "
+                    "VALUES (1, '2023-03-01', -5, 'other-process', 'expense')"
+                ))
+            assert DashboardService(db).get_meta()["first_data_month"] == "2023-03"
+    finally:
+        ours.dispose()
+        theirs.dispose()
+
+
+def test_keys_normalize_arguments_and_follow_the_date(seeded_db, monkeypatch):
+    """Defaults and keywords share one entry; entries do not outlive the day they were made."""
+    service = DashboardService(seeded_db)
+    first = service.get_cards()
+    assert service.get_cards(None) is first
+    assert service.get_cards(month=None) is first
+
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date.today() + timedelta(days=1)
+
+    monkeypatch.setattr(cache_module, "date", Tomorrow)
+    assert service.get_cards() is not first
+
+
+def test_lru_ttl_and_memory_budget():
+    """Entries are evicted by count, by size budget and by age."""
+    cache = ResultCache(max_entries=2, max_bytes=10_000, ttl_seconds=60)
+    cache.put(("a",), (0,), 1)
+    cache.put(("b",), (0,), 2)
+    assert cache.get(("a",), (0,)) == (True, 1)
+    cache.put(("c",), (0,), 3)  # evicts b, the least recently used
+    assert cache.get(("b",), (0,)) == (False, None)
+    assert cache.get(("a",), (0,)) == (True, 1)
+    assert cache.get(("a",), (1,)) == (False, None)  # generation moved on
+
+    cache.put(("big",), (0,), "x" * 20_000)
+    assert cache.get(("big",), (0,)) == (False, None)
+
+    cache.put(("old",), (0,), 4, ttl=-1)
+    assert cache.get(("old",), (0,)) == (False, None)
+
+    stats = cache.stats()
+    assert stats["evictions"] >= 1
+    assert stats["stale_invalidations"] == 1
+    assert stats["expired"] == 1
+    assert 0 < stats["hit_ratio"] < 1
@@ -0,0 +1,32 @@
+"""Guard against route handlers that block the event loop."""
+import inspect
+
+from fastapi.routing import APIRoute
+
+from bt_app.main import app
+
+# Upload handlers await the request body, then hand parsing to the threadpool
+ASYNC_ALLOWED = {
+    "preview_historical",
+    "commit_historical",
+    "preview_csv",
+    "import_csv",
+    "preview_excel",
+    "import_budgets_excel",
+    "import_rules_excel",
+    # Dispatches GET sub-requests through the ASGI app in-process
+    "run_batch",
+}
+
+
+def test_database_routes_run_in_threadpool():
+    """API routes are sync ``def`` so FastAPI runs them off the event loop."""
+    offenders = [
+        route.path
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        and route.path.startswith("/api")
+        and inspect.iscoroutinefunction(route.endpoint)
+        and route.endpoint.__name__ not in ASYNC_ALLOWED
+    ]
+    assert offenders == []
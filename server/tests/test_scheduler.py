@@ -0,0 +1,111 @@
+"""Tests for the single-leader scheduler, its job store and the overlap guard."""
+import pickle
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from bt_app.core import scheduler
+from bt_app.core.config import settings
+from bt_app.core.scheduler import JOBSTORE_TABLE, LeaderLease, guarded
+from bt_app.models.scheduler_lease import SchedulerLease
+
+
+@pytest.fixture
+def engine(tmp_path):
+    eng = create_engine(f"sqlite:///{(tmp_path / 'sched.db').as_posix()}")
+    SchedulerLease.__table__.create(eng)
+    try:
+        yield eng
+    finally:
+        eng.dispose()
+
+
+@pytest.fixture
+def leader_scheduler(engine, monkeypatch):
+    """start_scheduler on the temp database, always stopped afterwards."""
+    monkeypatch.setattr(settings, "scheduler_leader_election", True)
+    try:
+        yield lambda: scheduler.start_scheduler(engine)
+    finally:
+        scheduler.stop_scheduler()
+
+
+def test_only_one_holder_until_release_or_expiry(engine, monkeypatch):
+    first = LeaderLease(engine, ttl_seconds=60, holder="worker-1")
+    second = LeaderLease(engine, ttl_seconds=60, holder="worker-2")
+
+    assert first.acquire()
+    assert not second.acquire()
+    assert first.acquire()  # renewal
+
+    first.release()
+    assert second.acquire()
+    assert not first.acquire()
+
+    # worker-2 stops renewing; once its lease expires worker-1 takes over
+    later = datetime.utcnow() + timedelta(seconds=120)
+    monkeypatch.setattr(scheduler, "_utcnow", lambda: later)
+    assert first.acquire()
+
+
+def test_guard_skips_overlapping_run():
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    @guarded("test_overlap")
+    def job():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "done"
+
+    worker = threading.Thread(target=job)
+    worker.start()
+    started.wait(5)
+    assert job() is None  # still running: skipped
+    release.set()
+    worker.join(5)
+    assert calls == [1]
+    assert job() == "done"
+
+
+def test_only_the_leader_runs_jobs(engine, leader_scheduler):
+    """The first worker starts jobs in the persistent store; a second one stands by."""
+    leader_scheduler()
+    assert scheduler.scheduler is not None
+    with engine.connect() as conn:
+        assert set(conn.execute(text(f"SELECT id FROM {JOBSTORE_TABLE}")).scalars()) == {
+            "daily_sync", "subscription_refresh", "subscription_sweep",
+        }
+
+    standby = scheduler._LeaderLoop(LeaderLease(engine, ttl_seconds=60, holder="other-worker"))
+    assert standby.tick() is False
+
+    scheduler.stop_scheduler()
+    assert scheduler.scheduler is None
+    assert standby.lease.acquire()  # released on shutdown
+
+
+def test_missed_run_is_caught_up_after_restart(engine, leader_scheduler, monkeypatch):
+    """A run missed while no process was leader fires once when a leader starts."""
+    leader_scheduler()
+    scheduler.stop_scheduler()
+
+    # Rewind the stored job as if the process had been down at its run time
+    missed = datetime.now().astimezone() - timedelta(hours=1)
+    with engine.begin() as conn:
+        state = pickle.loads(conn.execute(
+            text(f"SELECT job_state FROM {JOBSTORE_TABLE} WHERE id = 'daily_sync'")
+        ).scalar())
+        state["next_run_time"] = missed
+        conn.execute(text(f"UPDATE {JOBSTORE_TABLE} SET job_state = :state, next_run_time = :t WHERE id = 'daily_sync'"),
+                     {"state": pickle.dumps(state), "t": missed.timestamp()})
+
+    ran = threading.Event()
+    monkeypatch.setattr(scheduler, "sync_transactions_job", ran.set)
+    leader_scheduler()
+    assert ran.wait(5)
+    job = scheduler.scheduler.get_job("daily_sync")
+    assert job.next_run_time.timestamp() > datetime.now().timestamp()
@@ -0,0 +1,47 @@
+"""Cold-start budget for importing the API (see scripts/dev/bench_startup.py)."""
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+_BENCH = Path(__file__).resolve().parents[1] / "scripts" / "dev" / "bench_startup.py"
+_spec = importlib.util.spec_from_file_location("bench_startup", _BENCH)
+bench_startup = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench_startup)
+
+# bt_app's own import cost, relative to importing FastAPI/SQLAlchemy/pydantic
+# themselves, so the budget holds on slow CI machines and fast laptops alike.
+# BT_STARTUP_BUDGET_MS sets an absolute budget instead.
+FRAMEWORK_RATIO_BUDGET = 1.0
+
+
+@pytest.fixture(scope="module")
+def startup():
+    """Best of three fresh-interpreter imports of bt_app.main."""
+    runs = [bench_startup.run_once() for _ in range(3)]
+    return min(runs, key=lambda r: r["app_ms"] / r["framework_ms"])
+
+
+def test_heavy_dependencies_are_deferred(startup):
+    """pandas, Plaid models, ccxt, APScheduler etc. load on first use, not at import."""
+    assert startup["loaded"] == []
+
+
+def test_import_does_not_touch_the_database(tmp_path):
+    """Importing the app neither stats nor creates the SQLite file."""
+    db_path = tmp_path / "never-created.db"
+    env = bench_startup.probe_env()
+    env["DATABASE_URL"] = f"sqlite:///{db_path.as_posix()}"
+    subprocess.run([sys.executable, "-c", "import bt_app.main"], cwd=bench_startup.SERVER_DIR, env=env, check=True)
+    assert not db_path.exists()
+
+
+def test_import_time_budget(startup):
+    absolute = os.environ.get("BT_STARTUP_BUDGET_MS")
+    if absolute:
+        assert startup["app_ms"] <= float(absolute), startup
+    else:
+        assert startup["app_ms"] <= FRAMEWORK_RATIO_BUDGET * startup["framework_ms"], startup
@@ -0,0 +1,128 @@
+"""Tests for the per-tenant SQLite shard registry."""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import inspect, text
+
+from bt_app.core import scheduler, tenancy
+from bt_app.core.config import settings
+from bt_app.core.tenancy import InvalidTenant, ShardRegistry, UnknownTenant
+from bt_app.models.account import Account
+from bt_app.models.institution_item import InstitutionItem
+from bt_app.models.transaction import Transaction
+
+
+def _add_transaction(registry: ShardRegistry, tenant_id: str, merchant: str) -> None:
+    db = registry.session(tenant_id)
+    try:
+        item = InstitutionItem(plaid_item_id=f"item-{tenant_id}", institution_name="Bank", access_token_encrypted="x")
+        db.add(item)
+        db.flush()
+        acct = Account(institution_item_id=item.id, name="Chequing", account_type="asset")
+        db.add(acct)
+        db.flush()
+        db.add(Transaction(
+            account_id=acct.id, posted_date=date(2024, 1, 5), amount=Decimal("-12.00"),
+            merchant_raw=merchant, hash_dedupe=f"{tenant_id}-1", txn_type="expense",
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    """Sharding enabled with a fresh registry rooted in a temp directory."""
+    reg = ShardRegistry(tmp_path / "tenants", max_open=2)
+    monkeypatch.setattr(settings, "enable_tenant_shards", True)
+    tenancy.set_registry(reg)
+    try:
+        yield reg
+    finally:
+        reg.dispose()
+        tenancy.set_registry(None)
+
+
+def test_shard_is_created_and_migrated_when_provisioned(registry):
+    """Nothing touches disk until a tenant is provisioned; then the schema is at the Alembic heads."""
+    assert registry.tenant_ids() == []
+
+    engine = registry.provision("acme")
+    assert registry.path_for("acme").exists()
+    assert "transactions" in inspect(engine).get_table_names()
+    with engine.connect() as conn:
+        versions = {row[0] for row in conn.execute(text("SELECT version_num FROM alembic_version"))}
+    assert versions == {"015_add_cleaned_final_merchant", "027_add_write_generations"}
+    assert registry.tenant_ids() == ["acme"]
+
+
+def test_unknown_tenants_do_not_create_shards(registry):
+    """Opening an unprovisioned tenant raises instead of creating a database file."""
+    with pytest.raises(UnknownTenant):
+        registry.engine("nobody")
+    with pytest.raises(UnknownTenant):
+        registry.session("nobody")
+    assert not registry.path_for("nobody").exists()
+    assert registry.tenant_ids() == []
+
+
+def test_lru_closes_least_recently_used_engine(registry):
+    """The cap bounds open engines; an evicted shard reopens with its data intact."""
+    for tenant_id in ("a", "b", "c"):
+        registry.provision(tenant_id)
+    _add_transaction(registry, "a", "A-MART")
+    registry.engine("b")
+    registry.engine("a")
+    registry.engine("c")
+    assert registry.open_tenants() == ["a", "c"]
+
+    with registry.engine("b").connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM transactions")).scalar() == 0
+    with registry.engine("a").connect() as conn:
+        assert conn.execute(text("SELECT merchant_raw FROM transactions")).scalar() == "A-MART"
+    assert len(registry.open_tenants()) == 2
+
+
+@pytest.mark.parametrize("tenant_id", ["", "../main", "a/b", "x" * 65, ".hidden"])
+def test_unsafe_tenant_ids_are_rejected(registry, tenant_id):
+    with pytest.raises(InvalidTenant):
+        registry.provision(tenant_id)
+
+
+def test_requests_are_isolated_per_tenant(registry):
+    """The tenant header picks the shard, ETags differ between tenants and unknown tenants get 404."""
+    from fastapi.testclient import TestClient
+
+    from bt_app.main import app
+
+    registry.provision("alpha")
+    registry.provision("beta")
+    _add_transaction(registry, "alpha", "ALPHA STORE")
+    client = TestClient(app)
+
+    alpha = client.get("/api/transactions", headers={settings.tenant_header: "alpha"})
+    beta = client.get("/api/transactions", headers={settings.tenant_header: "beta"})
+    assert [t["merchant_raw"] for t in alpha.json()["transactions"]] == ["ALPHA STORE"]
+    assert beta.json()["transactions"] == []
+    assert alpha.headers["etag"] != beta.headers["etag"]
+
+    bad = client.get("/api/transactions", headers={settings.tenant_header: "../etc"})
+    assert bad.status_code == 400
+
+    unknown = client.get("/api/transactions", headers={settings.tenant_header: "gamma"})
+    assert unknown.status_code == 404
+    assert "gamma" not in registry.tenant_ids()
+
+
+def test_scheduler_visits_every_shard(registry, monkeypatch):
+    """The sync job runs once for the main database and once per shard on disk."""
+    registry.provision("one")
+    registry.provision("two")
+    visited = []
+    monkeypatch.setattr(scheduler, "_sync_database", lambda db: visited.append(str(db.get_bind().url)))
+
+    scheduler.sync_transactions_job()
+
+    assert len(visited) == 3
+    assert visited[1].endswith("one.db") and visited[2].endswith("two.db")
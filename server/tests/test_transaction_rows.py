@@ -0,0 +1,33 @@
+"""Tests for the tuple-based transaction list serialization."""
+import orjson
+
+from bt_app.core.responses import dumps
+from bt_app.models.category import Category
+from bt_app.models.transaction import Transaction
+from bt_app.schemas.transactions import Transaction as TransactionSchema
+from bt_app.services.transaction_rows import transaction_rows
+
+
+def test_rows_match_schema_serialization(seeded_db):
+    """Fast rows encode to exactly what the Pydantic schema produced."""
+    food = seeded_db.query(Category).filter(Category.name == "Food").one()
+    takeout = Category(name="Takeout", parent_id=food.id, color="#ff8800")
+    seeded_db.add(takeout)
+    seeded_db.flush()
+    seeded_db.query(Transaction).filter(Transaction.id % 4 == 0).update(
+        {Transaction.subcategory_id: takeout.id}, synchronize_session=False
+    )
+    seeded_db.commit()
+
+    query = seeded_db.query(Transaction).order_by(Transaction.posted_date.desc(), Transaction.id.desc()).limit(200)
+    expected = [TransactionSchema.model_validate(t).model_dump(mode="json") for t in query.all()]
+    fast = transaction_rows(seeded_db, query)
+
+    assert orjson.loads(dumps(fast)) == expected
+    assert any(row["subcategory"] and row["subcategory"]["full_path"] == "Food > Takeout" for row in fast)
+    assert {row["amount"] for row in fast} >= {"2500.00"}
+
+
+def test_empty_page(db):
+    """An empty result skips the category lookup entirely."""
+    assert transaction_rows(db, db.query(Transaction)) == []
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useMemo } from 'react'
 import { useQuery } from '@tanstack/react-query'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select'
@@ -50,20 +50,24 @@ export function CategoryFocus({ dateFrom, dateTo, disabled }: CategoryFocusProps
     }
   }, [categories]) // Only depend on categories, not hasInitialized
 
-  // Get category series data
-  const { data: categoryData, isLoading: categoryLoading } = useQuery({
-    queryKey: ['analytics-category-series-v2', selectedCategoryId, dateFrom, dateTo], // v2 to bust cache
-    queryFn: () => {
-      if (!selectedCategoryId) return Promise.resolve(null);
-      if (selectedCategoryId === -1) {
-        // For "All Categories", we'll need a new endpoint or aggregate the data
-        return apiClient.getAnalyticsAllCategoriesSeries(dateFrom, dateTo);
-      }
-      return apiClient.getAnalyticsCategorySeries(selectedCategoryId, dateFrom, dateTo);
-    },
-    enabled: !!selectedCategoryId && !!dateFrom && !!dateTo,
+  // Every category's series for the range in one request; switching category needs no fetch
+  const { data: matrix, isLoading: categoryLoading } = useQuery({
+    queryKey: ['analytics-category-matrix', dateFrom, dateTo],
+    queryFn: () => apiClient.getAnalyticsCategoryMatrix(dateFrom, dateTo),
+    enabled: !!dateFrom && !!dateTo,
   })
 
+  const categoryData = useMemo((): CategorySeries | null => {
+    if (!matrix || !selectedCategoryId) return null
+    if (selectedCategoryId === -1) return { months: matrix.months, ...matrix.totals }
+    // Parent categories chart their rollup (own spending plus all descendants)
+    const row = matrix.rollups.find(r => r.category_id === selectedCategoryId)
+      ?? matrix.categories.find(r => r.category_id === selectedCategoryId)
+    if (row) return { months: matrix.months, ...row }
+    const zeros = matrix.months.map(() => 0)
+    return { months: matrix.months, values: zeros, txn_counts: zeros, total: 0, monthly_avg: 0 }
+  }, [matrix, selectedCategoryId])
+
   const handleCategoryChange = (value: string) => {
     if (value === '' || value === '__none__') {
       setSelectedCategoryId(null)
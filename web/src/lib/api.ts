@@ -137,6 +137,32 @@ export interface BudgetItem {
   is_over_budget: boolean
 }
 
+export interface BudgetMatrixFigures {
+  budget: number[]
+  actual: number[]
+  variance: number[]
+  variance_percent: number[]
+  is_over_budget: boolean[]
+  total_budget: number
+  total_actual: number
+  total_variance: number
+  total_variance_percent: number
+}
+
+export interface BudgetMatrixRow extends BudgetMatrixFigures {
+  category: Category
+  parent_id: number | null
+}
+
+export interface BudgetMatrix {
+  months: string[]
+  categories: BudgetMatrixRow[]
+  rollups: BudgetMatrixRow[]
+  totals: BudgetMatrixFigures
+  from: string
+  to: string
+}
+
 export interface TopCategory {
   category: Category
   total_amount: number
@@ -278,6 +304,16 @@ export interface DashboardTopMerchant {
   amount: number
 }
 
+export interface DashboardBundle {
+  month: string
+  effective_month: string
+  meta: DashboardMeta
+  cards: DashboardCards
+  lines: DashboardLines
+  categories: DashboardCategories
+  top_merchants: DashboardTopMerchant[]
+}
+
 // New Analytics types
 export interface AvailableMonths {
   min_month: string | null
@@ -306,6 +342,19 @@ export interface CategorySeries {
   monthly_avg: number
 }
 
+export interface CategoryMatrixRow extends Omit<CategorySeries, 'months'> {
+  category_id: number | null
+  name: string
+  parent_id: number | null
+}
+
+export interface CategoryMatrix {
+  months: string[]
+  categories: CategoryMatrixRow[]
+  rollups: CategoryMatrixRow[]
+  totals: Omit<CategorySeries, 'months'>
+}
+
 export interface LatestMonthBreakdowns {
   latest_month: string | null
   category_details: Array<{
@@ -421,6 +470,20 @@ export interface SpendingAmountByMerchantResponse {
   }
 }
 
+export interface BatchResult<T = unknown> {
+  status: number
+  etag?: string
+  body: T
+}
+
+export interface AnalyticsPageData {
+  summary: SummaryRange
+  categoryFrequency: TransactionFrequencyByCategoryResponse
+  merchantFrequency: TransactionFrequencyByMerchantResponse
+  categorySpending: SpendingAmountByCategoryResponse
+  merchantSpending: SpendingAmountByMerchantResponse
+}
+
 // API functions
 export const apiClient = {
   // Plaid
@@ -574,6 +637,11 @@ export const apiClient = {
     return response.data
   },
 
+  async getBudgetMatrix(monthFrom: string, monthTo: string): Promise<BudgetMatrix> {
+    const response = await api.get('/budgets/matrix', { params: { from: monthFrom, to: monthTo } })
+    return response.data
+  },
+
   // Summary
   async getSummary(month?: string): Promise<SummaryData> {
     const response = await api.get('/summary', { params: { month } })
@@ -732,6 +800,11 @@ export const apiClient = {
     return response.data
   },
 
+  async getDashboardBundle(month: string): Promise<DashboardBundle> {
+    const response = await api.get('/dashboard/bundle', { params: { month } })
+    return response.data
+  },
+
   // New Analytics (Range-aware)
   async getAnalyticsAvailableMonths(): Promise<AvailableMonths> {
     const response = await api.get('/analytics/available-months')
@@ -759,6 +832,13 @@ export const apiClient = {
     return response.data
   },
 
+  async getAnalyticsCategoryMatrix(dateFrom: string, dateTo: string): Promise<CategoryMatrix> {
+    const response = await api.get('/analytics/category-matrix', { 
+      params: { date_from: dateFrom, date_to: dateTo } 
+    })
+    return response.data
+  },
+
   async getAnalyticsLatestMonthBreakdowns(): Promise<LatestMonthBreakdowns> {
     const response = await api.get('/analytics/latest-month-breakdowns')
     return response.data
@@ -824,6 +904,32 @@ export const apiClient = {
     const response = await api.get(`/analytics/spending-amount-by-merchant?${params}`)
     return response.data
   },
+
+  // Batch: several GETs (paths relative to /api) in one round trip
+  async batchGet(paths: Record<string, string>): Promise<Record<string, BatchResult>> {
+    const requests = Object.entries(paths).map(([id, path]) => ({ id, path: `/api${path}` }))
+    const response = await api.post('/batch', { requests })
+    return response.data.responses
+  },
+
+  async getAnalyticsPage(dateFrom: string, dateTo: string, limit: number = 10): Promise<AnalyticsPageData> {
+    const range = new URLSearchParams({ date_from: dateFrom, date_to: dateTo })
+    const ranged = new URLSearchParams({ date_from: dateFrom, date_to: dateTo, limit: limit.toString() })
+    const results = await apiClient.batchGet({
+      summary: `/analytics/summary-range?${range}`,
+      categoryFrequency: `/analytics/transaction-frequency-by-category?${ranged}`,
+      merchantFrequency: `/analytics/transaction-frequency-by-merchant?${ranged}`,
+      categorySpending: `/analytics/spending-amount-by-category?${ranged}`,
+      merchantSpending: `/analytics/spending-amount-by-merchant?${ranged}`,
+    })
+    const failed = Object.entries(results).find(([, result]) => result.status !== 200)
+    if (failed) {
+      throw new Error(`Batch request ${failed[0]} failed with status ${failed[1].status}`)
+    }
+    return Object.fromEntries(
+      Object.entries(results).map(([id, result]) => [id, result.body])
+    ) as unknown as AnalyticsPageData
+  },
 }
 
 export default api
@@ -22,38 +22,17 @@ export default function AnalyticsDashboard() {
   const [dateTo, setDateTo] = useState('')
   const [isRefreshing, setIsRefreshing] = useState(false)
 
-  // Get summary data for the selected range
-  const { data: summaryData, isLoading: summaryLoading, refetch: refetchSummary } = useQuery({
-    queryKey: ['analytics-summary-range', dateFrom, dateTo],
-    queryFn: () => apiClient.getAnalyticsSummaryRange(dateFrom, dateTo),
-    enabled: !!dateFrom && !!dateTo,
-  })
-
-  // Transaction frequency data
-  const { data: categoryFrequency, isLoading: categoryFrequencyLoading } = useQuery({
-    queryKey: ['transaction-frequency-category', dateFrom, dateTo],
-    queryFn: () => apiClient.getTransactionFrequencyByCategory(dateFrom, dateTo, 10),
-    enabled: !!dateFrom && !!dateTo,
-  })
-
-  const { data: merchantFrequency, isLoading: merchantFrequencyLoading } = useQuery({
-    queryKey: ['transaction-frequency-merchant', dateFrom, dateTo],
-    queryFn: () => apiClient.getTransactionFrequencyByMerchant(dateFrom, dateTo, 10),
-    enabled: !!dateFrom && !!dateTo,
-  })
-
-  // Spending amount data
-  const { data: categorySpending, isLoading: categorySpendingLoading } = useQuery({
-    queryKey: ['spending-amount-category', dateFrom, dateTo],
-    queryFn: () => apiClient.getSpendingAmountByCategory(dateFrom, dateTo, 10),
-    enabled: !!dateFrom && !!dateTo,
-  })
-
-  const { data: merchantSpending, isLoading: merchantSpendingLoading } = useQuery({
-    queryKey: ['spending-amount-merchant', dateFrom, dateTo],
-    queryFn: () => apiClient.getSpendingAmountByMerchant(dateFrom, dateTo, 10),
+  // Summary and the four frequency/amount panels arrive in one batched round trip
+  const { data: pageData, isLoading: pageLoading, refetch: refetchPage } = useQuery({
+    queryKey: ['analytics-page', dateFrom, dateTo],
+    queryFn: () => apiClient.getAnalyticsPage(dateFrom, dateTo, 10),
     enabled: !!dateFrom && !!dateTo,
   })
+  const summaryData = pageData?.summary
+  const categoryFrequency = pageData?.categoryFrequency
+  const merchantFrequency = pageData?.merchantFrequency
+  const categorySpending = pageData?.categorySpending
+  const merchantSpending = pageData?.merchantSpending
 
   const handleDateRangeChange = (startDate: string, endDate: string) => {
     setDateFrom(startDate)
@@ -64,13 +43,13 @@ export default function AnalyticsDashboard() {
     setIsRefreshing(true)
     try {
       await apiClient.refreshData()
-      await refetchSummary()
+      await refetchPage()
     } finally {
       setIsRefreshing(false)
     }
   }
 
-  const isLoading = summaryLoading
+  const isLoading = pageLoading
   const hasDateRange = !!dateFrom && !!dateTo
 
   return (
@@ -121,12 +100,12 @@ export default function AnalyticsDashboard() {
           <div className="grid gap-6 md:grid-cols-2">
             <TransactionFrequencyByCategory 
               data={categoryFrequency}
-              isLoading={categoryFrequencyLoading}
+              isLoading={pageLoading}
               dateRange={`${dateFrom} to ${dateTo}`}
             />
             <TransactionFrequencyByMerchant 
               data={merchantFrequency}
-              isLoading={merchantFrequencyLoading}
+              isLoading={pageLoading}
               dateRange={`${dateFrom} to ${dateTo}`}
             />
           </div>
@@ -135,12 +114,12 @@ export default function AnalyticsDashboard() {
           <div className="grid gap-6 md:grid-cols-2">
             <SpendingAmountByCategory 
               data={categorySpending}
-              isLoading={categorySpendingLoading}
+              isLoading={pageLoading}
               dateRange={`${dateFrom} to ${dateTo}`}
             />
             <SpendingAmountByMerchant 
               data={merchantSpending}
-              isLoading={merchantSpendingLoading}
+              isLoading={pageLoading}
               dateRange={`${dateFrom} to ${dateTo}`}
             />
           </div>
@@ -19,64 +19,39 @@ export default function Dashboard() {
   const [selectedMonth, setSelectedMonth] = useState(getCurrentMonth())
   const [isRefreshing, setIsRefreshing] = useState(false)
 
-  // Get metadata for effective month logic
-  const { data: meta } = useQuery({
-    queryKey: ['dashboard-meta'],
-    queryFn: () => apiClient.getDashboardMeta(),
+  // Whole dashboard in one round trip (server resolves the effective month)
+  const { data: bundle, isLoading, error: bundleError, refetch: refetchBundle } = useQuery({
+    queryKey: ['dashboard-bundle', selectedMonth],
+    queryFn: () => apiClient.getDashboardBundle(selectedMonth),
+    enabled: !!selectedMonth,
   })
 
-  // Calculate effective month (min of selected and latest available)
-  const effectiveMonth = meta?.latest_data_month && selectedMonth > meta.latest_data_month 
-    ? meta.latest_data_month 
-    : selectedMonth
-
-  const showFallbackBanner = meta?.latest_data_month && selectedMonth > meta.latest_data_month
-
-  // Dashboard queries
-  const { data: cards, isLoading: cardsLoading, refetch: refetchCards } = useQuery({
-    queryKey: ['dashboard-cards', effectiveMonth],
-    queryFn: () => apiClient.getDashboardCards(effectiveMonth),
-    enabled: !!effectiveMonth,
-  })
-
-  const { data: lines, isLoading: linesLoading, error: linesError } = useQuery({
-    queryKey: ['dashboard-lines'],
-    queryFn: () => apiClient.getDashboardLines(),
-  })
-
-  // Debug logging
-  console.log('Dashboard lines query result:', { lines, linesLoading, linesError })
-  
-  // If there's an error, log it
-  if (linesError) {
-    console.error('Dashboard lines query error:', linesError)
+  if (bundleError) {
+    console.error('Dashboard bundle query error:', bundleError)
   }
 
-  const { data: categories, isLoading: categoriesLoading } = useQuery({
-    queryKey: ['dashboard-categories', effectiveMonth],
-    queryFn: () => apiClient.getDashboardCategories(effectiveMonth),
-    enabled: !!effectiveMonth,
-  })
+  const meta = bundle?.meta
+  const cards = bundle?.cards
+  const lines = bundle?.lines
+  const categories = bundle?.categories
+  const topMerchants = bundle?.top_merchants
 
-  const { data: topMerchants, isLoading: merchantsLoading } = useQuery({
-    queryKey: ['dashboard-merchants', effectiveMonth],
-    queryFn: () => apiClient.getDashboardTopMerchants(effectiveMonth),
-    enabled: !!effectiveMonth,
-  })
+  // Effective month = min of selected and latest available
+  const effectiveMonth = bundle?.effective_month ?? selectedMonth
+
+  const showFallbackBanner = meta?.latest_data_month && selectedMonth > meta.latest_data_month
 
 
   const handleRefresh = async () => {
     setIsRefreshing(true)
     try {
       await apiClient.refreshData()
-      await refetchCards()
+      await refetchBundle()
     } finally {
       setIsRefreshing(false)
     }
   }
 
-  const isLoading = cardsLoading || linesLoading || categoriesLoading || merchantsLoading
-
   // Loading skeleton
   if (isLoading) {
     return (